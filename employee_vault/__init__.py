@@ -3,13 +3,16 @@ Employee Vault - Modular Package
 Complete employee management system
 """
 
+import importlib
+
 __version__ = "4.0.2-MODULAR"
 
-# Main modules can be imported from here
-from . import config
-from . import validators
-from . import utils
-from . import database
-from . import models
+# Main modules can be imported from here. They are loaded on first attribute
+# access so importing one submodule does not pull in Qt models, PIL, etc.
+__all__ = ['config', 'validators', 'utils', 'database', 'models', 'metrics']
+
 
-__all__ = ['config', 'validators', 'utils', 'database', 'models']
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,288 @@
+"""
+Alert Engine for EmployeeVault
+One place that derives contract / data-quality alerts from the employee list.
+
+The engine re-evaluates only when the employee data revision changes (the
+main window bumps it after every reload) or when the calendar day rolls over,
+and it does the work on a background thread. Subscribers receive the full
+alert set plus a diff (added / removed / changed) instead of each widget
+re-scanning the employee table on its own timer.
+"""
+
+import os
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
+
+from employee_vault.config import ALERT_DAYS, FILES_DIR, PHOTOS_DIR, contract_days_left
+
+# Alert rules
+RULE_CONTRACT_EXPIRED = "contract_expired"
+RULE_CONTRACT_EXPIRING = "contract_expiring"
+RULE_MISSING_PHOTO = "missing_photo"
+RULE_MISSING_GOV_IDS = "missing_gov_ids"
+
+GOV_ID_FIELDS = (
+    ("sss_number", "SSS"),
+    ("tin_number", "TIN"),
+    ("pagibig_number", "Pag-IBIG"),
+    ("philhealth_number", "PhilHealth"),
+)
+
+_IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.tiff'}
+
+
+def _expiring_severity(days_left: int) -> str:
+    if days_left <= 7:
+        return "critical"
+    if days_left <= 14:
+        return "warning"
+    return "info"
+
+
+# Photo folder listings, re-read only when the folder's mtime changes:
+# {emp_id: (mtime_ns, has_photo)} and (mtime_ns, emp_ids) for the legacy photos folder
+_photo_folders: Dict[str, tuple] = {}
+_legacy_photos: tuple = (None, frozenset())
+
+
+def _folder_has_photo(folder: str) -> bool:
+    with os.scandir(folder) as entries:
+        return any(e.is_file() and os.path.splitext(e.name)[1].lower() in _IMAGE_EXTENSIONS for e in entries)
+
+
+def _legacy_photo_ids() -> frozenset:
+    global _legacy_photos
+    try:
+        mtime = os.stat(PHOTOS_DIR).st_mtime_ns
+        if mtime != _legacy_photos[0]:
+            _legacy_photos = (mtime, frozenset(os.path.splitext(name)[0] for name in os.listdir(PHOTOS_DIR)))
+    except OSError:
+        _legacy_photos = (None, frozenset())
+    return _legacy_photos[1]
+
+
+def _employees_with_photos(emp_ids) -> set:
+    """
+    emp_ids that have a photo in employee_files/{id}/photos or the legacy photos folder.
+    One listing of employee_files finds the employees that have a folder at all; each
+    photos folder is then only re-listed when its mtime moved since the last evaluation.
+    """
+    found = set()
+    legacy = _legacy_photo_ids()
+    try:
+        with os.scandir(FILES_DIR) as entries:
+            folders = {e.name for e in entries if e.is_dir()}
+    except OSError:
+        folders = set()
+    for emp_id in emp_ids:
+        if emp_id in legacy:
+            found.add(emp_id)
+            continue
+        if emp_id not in folders:
+            continue
+        folder = os.path.join(FILES_DIR, emp_id, "photos")
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+            cached = _photo_folders.get(emp_id)
+            if cached is None or cached[0] != mtime:
+                cached = _photo_folders[emp_id] = (mtime, _folder_has_photo(folder))
+        except OSError:
+            _photo_folders.pop(emp_id, None)
+            continue
+        if cached[1]:
+            found.add(emp_id)
+    return found
+
+
+def evaluate_alerts(employees: List[dict], check_photos: bool = True,
+                    expiring_days: int = ALERT_DAYS) -> Dict[tuple, dict]:
+    """
+    Evaluate every alert rule against an employee list.
+    Contracts ending within expiring_days raise RULE_CONTRACT_EXPIRING.
+
+    Returns {(rule, emp_id): alert}. Each alert carries 'rule', 'severity',
+    'emp_id', 'name', 'message' and rule-specific fields; 'employee' holds the
+    source record and is not part of the diff.
+    """
+    alerts = {}
+
+    def add(rule, emp, severity, message, **extra):
+        emp_id = emp.get('emp_id', '')
+        alerts[(rule, emp_id)] = dict(rule=rule, severity=severity, emp_id=emp_id,
+                                      name=emp.get('name', ''), message=message,
+                                      employee=emp, **extra)
+
+    for emp in employees:
+        if emp.get('resign_date'):
+            continue
+
+        days = contract_days_left(emp)
+        if days is not None:
+            if days < 0:
+                add(RULE_CONTRACT_EXPIRED, emp, "critical", f"Contract expired {-days} day(s) ago",
+                    days_left=days, expiry_date=emp.get('contract_expiry'))
+            elif days <= expiring_days:
+                add(RULE_CONTRACT_EXPIRING, emp, _expiring_severity(days), f"Contract expires in {days} day(s)",
+                    days_left=days, expiry_date=emp.get('contract_expiry'))
+
+        missing = [label for field, label in GOV_ID_FIELDS if not (emp.get(field) or "").strip()]
+        if missing:
+            add(RULE_MISSING_GOV_IDS, emp, "info", f"Missing {', '.join(missing)}", missing=missing)
+
+    if check_photos:
+        ids = [emp.get('emp_id', '') for emp in employees if emp.get('emp_id')]
+        with_photos = _employees_with_photos(ids)
+        for emp in employees:
+            if emp.get('emp_id') and emp['emp_id'] not in with_photos:
+                add(RULE_MISSING_PHOTO, emp, "info", "No photo on file")
+
+    return alerts
+
+
+def diff_alerts(old: Dict[tuple, dict], new: Dict[tuple, dict]) -> dict:
+    """Return {'added': [...], 'removed': [...], 'changed': [...]} between two alert sets"""
+    def payload(alert):
+        return {k: v for k, v in alert.items() if k != 'employee'}
+
+    added = [new[k] for k in new.keys() - old.keys()]
+    removed = [old[k] for k in old.keys() - new.keys()]
+    changed = [new[k] for k in new.keys() & old.keys() if payload(new[k]) != payload(old[k])]
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+class _AlertEvaluationWorker(QThread):
+    """Runs evaluate_alerts off the UI thread"""
+    evaluated = Signal(int, object, object)  # revision, evaluation date, alerts
+
+    def __init__(self, employees: List[dict], revision: int, day: date, parent=None):
+        super().__init__(parent)
+        self.employees = employees
+        self.revision = revision
+        self.day = day
+
+    def run(self):
+        try:
+            alerts = evaluate_alerts(self.employees)
+        except Exception as e:
+            logging.error(f"Alert evaluation failed: {e}")
+            alerts = None
+        self.evaluated.emit(self.revision, self.day, alerts)
+
+
+class AlertEngine(QObject):
+    """
+    Shared alert engine.
+
+    Usage:
+        engine = AlertEngine(parent)
+        engine.alerts_changed.connect(on_changed)   # (alerts, diff)
+        engine.set_employees(employees)             # after each data reload
+
+    alerts is a dict {(rule, emp_id): alert}; helpers such as by_rule()
+    give widgets the slices they need.
+    """
+
+    alerts_changed = Signal(object, object)  # alerts dict, diff dict
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.alerts: Dict[tuple, dict] = {}
+        self.revision = 0
+        self._employees: List[dict] = []
+        self._evaluated_revision = -1
+        self._evaluated_day: Optional[date] = None
+        self._worker: Optional[_AlertEvaluationWorker] = None
+        self._failed: Optional[tuple] = None  # (revision, day) of a failed pass, not retried
+        self._has_result = False
+
+        # Single-shot timer armed for just after the next midnight
+        self._day_timer = QTimer(self)
+        self._day_timer.setSingleShot(True)
+        self._day_timer.timeout.connect(self._on_day_boundary)
+        self._arm_day_timer()
+
+    # ------------------------------------------------------------------
+    # Inputs
+    # ------------------------------------------------------------------
+
+    def set_employees(self, employees: List[dict]):
+        """Provide a freshly loaded employee list; bumps the data revision"""
+        self._employees = list(employees)
+        self.revision += 1
+        self._schedule()
+
+    def invalidate(self):
+        """Force a re-evaluation (e.g. after photos were uploaded outside the form)"""
+        self.revision += 1
+        self._schedule()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def has_result(self) -> bool:
+        return self._has_result
+
+    def by_rule(self, rule: str) -> List[dict]:
+        """Alerts for one rule, most urgent first for contract rules"""
+        items = [a for (r, _), a in self.alerts.items() if r == rule]
+        items.sort(key=lambda a: (a.get('days_left', 0), a.get('name', '')))
+        return items
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _schedule(self):
+        today = date.today()
+        if self.revision == self._evaluated_revision and today == self._evaluated_day:
+            return
+        if self._failed == (self.revision, today):
+            return
+        if self._worker is not None:
+            return  # _on_worker_finished re-checks once the running pass finishes
+        self._worker = _AlertEvaluationWorker(self._employees, self.revision, today, self)
+        self._worker.evaluated.connect(self._on_evaluated)
+        self._worker.finished.connect(self._on_worker_finished)
+        self._worker.start()
+
+    def _on_evaluated(self, revision: int, day: date, alerts):
+        if alerts is None:
+            self._failed = (revision, day)
+        else:
+            self._evaluated_revision = revision
+            self._evaluated_day = day
+            diff = diff_alerts(self.alerts, alerts)
+            self.alerts = alerts
+            first = not self._has_result
+            self._has_result = True
+            if first or diff['added'] or diff['removed'] or diff['changed']:
+                logging.info(f"Alerts updated: {len(alerts)} active "
+                             f"(+{len(diff['added'])} -{len(diff['removed'])} ~{len(diff['changed'])})")
+                self.alerts_changed.emit(self.alerts, diff)
+
+    def _on_worker_finished(self):
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.deleteLater()
+        # Newer data (or a new day) may have arrived while that pass ran
+        self._schedule()
+
+    def _arm_day_timer(self):
+        now = datetime.now()
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        self._day_timer.start(int((next_midnight - now).total_seconds() * 1000) + 1000)
+
+    def _on_day_boundary(self):
+        self._arm_day_timer()
+        self._schedule()
+
+    def stop(self):
+        """Stop the day timer and wait for a running evaluation"""
+        self._day_timer.stop()
+        if self._worker is not None:
+            self._worker.wait(2000)
@@ -60,6 +60,7 @@ class AnimationManager(QObject):
     
     animation_started = Signal(str)
     animation_finished = Signal(str)
+    performance_mode_changed = Signal(str)  # Frame governor re-reads its floor level
     
     _instance = None
     
@@ -163,12 +164,14 @@ class AnimationManager(QObject):
             self.performance_mode = mode
             self.settings.setValue("performance_mode", mode)
             logging.info(f"Animation performance mode set to: {mode}")
+            self.performance_mode_changed.emit(mode)
     
     def set_animations_enabled(self, enabled: bool):
         """Enable or disable all animations"""
         self.animations_enabled = enabled
         self.settings.setValue("animations_enabled", enabled)
         logging.info(f"Animations {'enabled' if enabled else 'disabled'}")
+        self.performance_mode_changed.emit(self.performance_mode)
 
     def set_theme_profile(self, profile):
         """Set the current theme's animation profile"""
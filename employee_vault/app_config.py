@@ -1911,8 +1911,12 @@ def initialize_directories():
             pass
 
 
-# Initialize on import
-initialize_directories()
+# Directories are created by initialize_directories(), called from main() at startup
+# (not on import, so tools and tests importing config do not touch the share)
 
-# Get default stylesheet for backwards compatibility
-APP_QSS = get_modern_stylesheet(load_theme_preference())
+
+def __getattr__(name):
+    # Default stylesheet for backwards compatibility - built on first access only
+    if name == "APP_QSS":
+        return get_modern_stylesheet(load_theme_preference())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
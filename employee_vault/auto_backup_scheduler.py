@@ -48,17 +48,16 @@ class AutoBackupScheduler(QObject):
     def _load_settings(self):
         """Load auto-backup settings from database"""
         try:
-            enabled_str = self.db.get_setting('auto_backup_enabled', 'false')
-            self.enabled = enabled_str.lower() == 'true'
+            settings = self.db.settings.snapshot
+            self.enabled = settings.get('auto_backup_enabled', 'false').lower() == 'true'
             
-            time_str = self.db.get_setting('auto_backup_time', '02:00')
+            time_str = settings.get('auto_backup_time', '02:00')
             hour, minute = map(int, time_str.split(':'))
             self.backup_time = dt_time(hour, minute)
             
-            retention_str = self.db.get_setting('auto_backup_retention', '30')
-            self.retention_days = int(retention_str)
+            self.retention_days = int(settings.get('auto_backup_retention', '30'))
             
-            self.last_backup_date = self.db.get_setting('last_auto_backup', None)
+            self.last_backup_date = settings.get('last_auto_backup', None)
             
             logging.info(f"Auto-backup settings loaded: enabled={self.enabled}, time={self.backup_time}, retention={self.retention_days} days")
         except Exception as e:
@@ -67,9 +66,11 @@ class AutoBackupScheduler(QObject):
     def _save_settings(self):
         """Save auto-backup settings to database"""
         try:
-            self.db.set_setting('auto_backup_enabled', 'true' if self.enabled else 'false')
-            self.db.set_setting('auto_backup_time', self.backup_time.strftime('%H:%M'))
-            self.db.set_setting('auto_backup_retention', str(self.retention_days))
+            self.db.settings.set_many({
+                'auto_backup_enabled': 'true' if self.enabled else 'false',
+                'auto_backup_time': self.backup_time.strftime('%H:%M'),
+                'auto_backup_retention': str(self.retention_days),
+            })
             self.db.conn.commit()
             logging.info("Auto-backup settings saved")
         except Exception as e:
@@ -0,0 +1,18 @@
+"""
+Headless benchmark suite for Employee Vault
+
+Times the data, model and rendering hot paths against deterministic
+synthetic datasets (1k / 10k / 100k employees by default) on the Qt
+offscreen platform, and compares runs against saved JSON baselines:
+
+    python -m employee_vault.benchmarks --sizes 1000 10000 --save logs/bench_baseline.json
+    python -m employee_vault.benchmarks --compare logs/bench_baseline.json
+
+--compare exits with status 1 when any case regressed, so it can gate a build.
+"""
+
+from .suite import run_suite, run_size, compare, format_comparison, case_names
+from .synthetic import generate_dataset, make_employees
+
+__all__ = ['run_suite', 'run_size', 'compare', 'format_comparison', 'case_names',
+           'generate_dataset', 'make_employees']
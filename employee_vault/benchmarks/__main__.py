@@ -0,0 +1,71 @@
+"""Command line entry point: python -m employee_vault.benchmarks --help"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+
+# Must be set before anything creates the QApplication
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from employee_vault.benchmarks.suite import (
+    run_suite, compare, format_comparison, case_names,
+    DEFAULT_SIZES, DEFAULT_REPEAT, DEFAULT_TOLERANCE, DEFAULT_MIN_DELTA_MS
+)
+from employee_vault.benchmarks.synthetic import DEFAULT_SEED
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m employee_vault.benchmarks",
+                                     description="Benchmark Employee Vault against synthetic datasets")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="dataset sizes (employees)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per case")
+    parser.add_argument("--only", nargs="+", metavar="PREFIX",
+                        help="run only cases whose name starts with one of these (e.g. db. model.)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--work-dir", help="where the temporary datasets are created")
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON (a new baseline)")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown as a fraction of the baseline median")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="ignore slowdowns smaller than this")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(case_names()))
+        return 0
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    report = run_suite(args.sizes, args.repeat, args.only, args.seed, args.work_dir,
+                       progress=lambda line: print(line, flush=True))
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to {args.save}")
+
+    if baseline is None:
+        return 0
+    if baseline.get('environment', {}).get('host') != report['environment']['host']:
+        print("Note: baseline was recorded on a different machine")
+    rows = compare(report, baseline, args.tolerance, args.min_delta_ms)
+    print(format_comparison(rows))
+    failed = [r for r in rows if r['status'] in ('regression', 'error')]
+    if failed:
+        print(f"{len(failed)} case(s) regressed or failed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,453 @@
+"""
+Benchmark cases, runner and baseline comparison
+
+Every case times a real entry point against a synthetic dataset (see
+synthetic.py) in a temporary folder. The app's path constants (DB_FILE,
+FILES_DIR, BACKUPS_DIR, ...) are redirected into that folder while the
+suite runs, so backups and photo lookups never touch the real data.
+
+A case is registered with @case(name) and returns the zero-argument
+callable to time; everything before the return is untimed setup:
+
+    @case("db.all_employees")
+    def _all_employees(ctx):
+        return lambda: ctx.db.all_employees()
+
+Results are JSON (see run_suite) and compare() flags cases whose median got
+slower than a saved baseline by more than the tolerance.
+"""
+
+import os
+import sys
+import time
+import shutil
+import random
+import logging
+import platform
+import statistics
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from employee_vault.benchmarks.synthetic import generate_dataset, make_photo_bytes, DEFAULT_SEED
+
+SUITE_VERSION = 1
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_REPEAT = 5
+# A case is a regression when its median is this much slower than the baseline...
+DEFAULT_TOLERANCE = 0.25
+# ...and at least this many ms slower (ignores noise on sub-millisecond cases)
+DEFAULT_MIN_DELTA_MS = 2.0
+# Rows written per run by the insert/update cases
+WRITE_BATCH = 100
+# Timed runs of one case are cut short once they would take longer than this (s)
+CASE_TIME_BUDGET = 60.0
+
+# name -> (factory(ctx) -> callable, max_size)
+_CASES: Dict[str, tuple] = {}
+
+_PATH_NAMES = ('DB_FILE', 'LOCAL_DB_PATH', 'FILES_DIR', 'PHOTOS_DIR', 'LETTERS_DIR', 'BACKUPS_DIR', 'JSON_FALLBACK')
+
+
+def case(name: str, max_size: int = None):
+    """Register a benchmark case (skipped for datasets larger than max_size)"""
+    def decorator(factory):
+        _CASES[name] = (factory, max_size)
+        return factory
+    return decorator
+
+
+def case_names() -> List[str]:
+    return list(_CASES)
+
+
+class BenchContext:
+    """What a case factory gets: the open DB, the dataset and a scratch folder"""
+
+    def __init__(self, dataset: dict, db, app):
+        self.root = dataset['root']
+        self.db_path = dataset['db_path']
+        self.size = dataset['size']
+        self.seed = dataset['seed']
+        self.db = db
+        self.app = app
+        self.employees = db.all_employees()
+        self.scratch = os.path.join(self.root, "scratch")
+        os.makedirs(self.scratch, exist_ok=True)
+        self.rng = random.Random(self.seed + 2)
+
+    def process_events(self):
+        self.app.processEvents()
+
+
+@contextmanager
+def redirected_paths(root: str, db_path: str):
+    """Point the app's path constants (in every loaded employee_vault module) into root"""
+    import employee_vault.config as config
+
+    targets = {
+        'DB_FILE': db_path,
+        'LOCAL_DB_PATH': db_path,
+        'FILES_DIR': os.path.join(root, "employee_files"),
+        'PHOTOS_DIR': os.path.join(root, "employee_photos"),
+        'LETTERS_DIR': os.path.join(root, "employee_letters"),
+        'BACKUPS_DIR': os.path.join(root, "backups"),
+        'JSON_FALLBACK': os.path.join(root, "employees_data.json"),
+    }
+    originals = {name: getattr(config, name) for name in _PATH_NAMES}
+    patched = []
+    for module in list(sys.modules.values()):
+        if module is None or not getattr(module, '__name__', '').startswith('employee_vault'):
+            continue
+        for name, old in originals.items():
+            if getattr(module, name, None) == old:
+                setattr(module, name, targets[name])
+                patched.append((module, name, old))
+    try:
+        yield
+    finally:
+        for module, name, old in patched:
+            setattr(module, name, old)
+
+
+def _import_entry_points():
+    """Import every module the cases use before the path constants are redirected"""
+    import employee_vault.models  # noqa: F401
+    import employee_vault.ui.pages.dashboard  # noqa: F401
+    import employee_vault.ui.dialogs.id_card  # noqa: F401
+    import employee_vault.utils.helpers  # noqa: F401
+
+
+# ----------------------------------------------------------------------
+# Cases
+# ----------------------------------------------------------------------
+
+@case("db.all_employees")
+def _all_employees(ctx):
+    return lambda: ctx.db.all_employees()
+
+
+@case("db.all_employees_page")
+def _all_employees_page(ctx):
+    offset = ctx.size // 2
+    return lambda: ctx.db.all_employees(limit=100, offset=offset)
+
+
+@case("db.search")
+def _search(ctx):
+    def run():
+        ctx.db.all_employees(search="santos", limit=100)
+        ctx.db.count_employees(search="santos")
+    return run
+
+
+@case("db.insert_employee")
+def _insert_employee(ctx):
+    template = dict(ctx.employees[0])
+    counter = iter(range(10 ** 9))
+
+    def run():
+        futures = []
+        for _ in range(WRITE_BATCH):
+            n = next(counter)
+            row = dict(template, emp_id=f"B-{n:06d}-99", name=f"Bench Insert {n}", modified_by="admin",
+                       sss_number=None, tin_number=None, pagibig_number=None, philhealth_number=None)
+            futures.append(ctx.db.insert_employee(row))
+        for future in futures:
+            future.result()
+    return run
+
+
+@case("db.update_employee")
+def _update_employee(ctx):
+    targets = ctx.rng.sample(ctx.employees, min(WRITE_BATCH, len(ctx.employees)))
+
+    def run():
+        futures = []
+        for emp in targets:
+            data = dict(emp, position="Supervisor" if emp['position'] != "Supervisor" else "Cashier",
+                        modified_by="admin")
+            emp['position'] = data['position']
+            futures.append(ctx.db.update_employee(emp['emp_id'], data))
+        for future in futures:
+            future.result()
+    return run
+
+
+@case("model.reset")
+def _model_reset(ctx):
+    from employee_vault.models import EmployeesTableModel
+
+    model = EmployeesTableModel([])
+    return lambda: model.setDataList(list(ctx.employees))
+
+
+def _proxy(ctx):
+    from employee_vault.models import EmployeesTableModel, EmployeesFilter
+
+    model = EmployeesTableModel(list(ctx.employees))
+    proxy = EmployeesFilter()
+    proxy.setSourceModel(model)
+    return model, proxy
+
+
+@case("model.filter")
+def _model_filter(ctx):
+    model, proxy = _proxy(ctx)
+
+    def run():
+        proxy.setStatus("Active")
+        proxy.setDepartment("Store")
+        proxy.setTerm("santos")
+        proxy.rowCount()
+        proxy.setTerm("")
+        proxy.setDepartment("All Depts")
+        proxy.setStatus("All Status")
+        proxy.rowCount()
+    run.keep = (model, proxy)
+    return run
+
+
+@case("model.sort")
+def _model_sort(ctx):
+    from PySide6.QtCore import Qt
+
+    model, proxy = _proxy(ctx)
+
+    def run():
+        proxy.sort(3, Qt.AscendingOrder)   # Name
+        proxy.sort(2, Qt.AscendingOrder)   # Emp ID (natural sort)
+    run.keep = (model, proxy)
+    return run
+
+
+@case("ui.dashboard_refresh")
+def _dashboard_refresh(ctx):
+    from employee_vault.ui.pages.dashboard import EnhancedDashboardPage
+
+    page = EnhancedDashboardPage()
+
+    def run():
+        page.refresh(ctx.employees)
+        ctx.process_events()
+    run.keep = page
+    return run
+
+
+@case("idcard.generate_card")
+def _generate_card(ctx):
+    from employee_vault.ui.dialogs.id_card import IDCardGeneratorBackend
+
+    backend = IDCardGeneratorBackend(ctx.db_path, template_dir=os.path.join(ctx.scratch, "templates"))
+    emp_id = ctx.employees[0]['emp_id']
+    return lambda: backend.generate_card(emp_id, side="both")
+
+
+@case("photo.compress_image")
+def _compress_image(ctx):
+    from employee_vault.utils import compress_image
+
+    source = os.path.join(ctx.scratch, "camera_original.jpg")
+    with open(source, 'wb') as f:
+        f.write(make_photo_bytes(random.Random(ctx.seed), 1800, 2400))
+    target = os.path.join(ctx.scratch, "compress_target.jpg")
+
+    def run():
+        shutil.copyfile(source, target)
+        if not compress_image(target, derivatives=True):
+            raise RuntimeError("compress_image failed")
+    return run
+
+
+@case("backup.database")
+def _backup_database(ctx):
+    backup_dir = os.path.join(ctx.root, "backups")
+
+    def run():
+        if not ctx.db.backup_database(backup_dir=backup_dir):
+            raise RuntimeError("backup_database failed")
+    return run
+
+
+@case("backup.encrypted")
+def _backup_encrypted(ctx):
+    try:
+        import cryptography  # noqa: F401
+    except ImportError:
+        return None  # Optional dependency - case is reported as skipped
+    backup_dir = os.path.join(ctx.root, "backups_encrypted")
+
+    def run():
+        path = ctx.db.backup_database_encrypted("benchmark-password", backup_dir=backup_dir)
+        if not path:
+            raise RuntimeError("backup_database_encrypted failed")
+        os.remove(path)
+    return run
+
+
+@case("db.verify_security_audit_integrity")
+def _verify_security_audit(ctx):
+    def run():
+        result = ctx.db.verify_security_audit_integrity()
+        if not result.get('valid'):
+            raise RuntimeError(f"security audit chain invalid: {result.get('details')}")
+    return run
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+
+def _time_case(func: Callable, repeat: int, budget: float = CASE_TIME_BUDGET) -> dict:
+    start = time.perf_counter()
+    func()  # Warm-up (imports, caches, first-use allocations)
+    warm_up = time.perf_counter() - start
+    # Slow cases at large sizes get fewer runs (at least one) instead of stalling the suite
+    if warm_up * repeat > budget:
+        repeat = max(1, int(budget / max(warm_up, 1e-9)))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        'median_ms': round(statistics.median(samples), 3),
+        'min_ms': round(min(samples), 3),
+        'max_ms': round(max(samples), 3),
+        'runs': repeat,
+    }
+
+
+def _environment() -> dict:
+    try:
+        import PySide6
+        qt_version = PySide6.__version__
+    except ImportError:
+        qt_version = None
+    return {
+        'host': platform.node(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'python': platform.python_version(),
+        'pyside6': qt_version,
+    }
+
+
+def run_size(size: int, repeat: int = DEFAULT_REPEAT, only: Optional[List[str]] = None,
+             seed: int = DEFAULT_SEED, work_dir: str = None, progress: Callable[[str], None] = None) -> dict:
+    """Generate one dataset and run every (selected) case against it"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    from employee_vault.database import DB
+
+    app = QApplication.instance() or QApplication([])
+    _import_entry_points()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix=f"ev_bench_{size}_", dir=work_dir) as root:
+        started = time.perf_counter()
+        dataset = generate_dataset(root, size, seed=seed)
+        if progress:
+            progress(f"{size} employees generated in {time.perf_counter() - started:.1f}s")
+        with redirected_paths(root, dataset['db_path']):
+            db = DB(dataset['db_path'])
+            try:
+                ctx = BenchContext(dataset, db, app)
+                for name, (factory, max_size) in _CASES.items():
+                    if only and not any(name.startswith(prefix) for prefix in only):
+                        continue
+                    if max_size is not None and size > max_size:
+                        results[name] = {'skipped': f"dataset larger than {max_size}"}
+                        continue
+                    try:
+                        func = factory(ctx)
+                        if func is None:
+                            results[name] = {'skipped': "optional dependency missing"}
+                        else:
+                            results[name] = _time_case(func, repeat)
+                    except Exception as e:
+                        logging.error(f"Benchmark {name} ({size}) failed: {e}")
+                        results[name] = {'error': str(e)}
+                    if progress:
+                        progress(f"  {name:<36} {_describe(results[name])}")
+            finally:
+                db.close()
+    return results
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat: int = DEFAULT_REPEAT, only: Optional[List[str]] = None,
+              seed: int = DEFAULT_SEED, work_dir: str = None, progress: Callable[[str], None] = None) -> dict:
+    """
+    Run the suite for every dataset size. Returns:
+        {'suite_version', 'created', 'seed', 'repeat', 'environment',
+         'results': {"<size>": {"<case>": {'median_ms', 'min_ms', 'max_ms', 'runs'}
+                                          | {'skipped': why} | {'error': message}}}}
+    """
+    report = {
+        'suite_version': SUITE_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'seed': seed,
+        'repeat': repeat,
+        'environment': _environment(),
+        'results': {},
+    }
+    for size in sizes:
+        report['results'][str(size)] = run_size(size, repeat, only, seed, work_dir, progress)
+    return report
+
+
+def _describe(result: dict) -> str:
+    if 'median_ms' in result:
+        return f"{result['median_ms']:10.2f} ms  (min {result['min_ms']:.2f}, max {result['max_ms']:.2f})"
+    return result.get('skipped') and f"skipped: {result['skipped']}" or f"ERROR: {result.get('error')}"
+
+
+# ----------------------------------------------------------------------
+# Baselines
+# ----------------------------------------------------------------------
+
+def compare(current: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[dict]:
+    """
+    Compare two run_suite() reports case by case. Each row has size, case,
+    baseline_ms, current_ms, change (fraction) and status: "regression",
+    "improvement", "ok", "new", "missing" or "error".
+    """
+    rows = []
+    for size, cases in current.get('results', {}).items():
+        base_cases = baseline.get('results', {}).get(size, {})
+        for name, result in cases.items():
+            base = base_cases.get(name, {})
+            row = {'size': int(size), 'case': name,
+                   'baseline_ms': base.get('median_ms'), 'current_ms': result.get('median_ms'), 'change': None}
+            if 'error' in result:
+                row['status'] = 'error'
+            elif row['current_ms'] is None:
+                continue  # Skipped this run
+            elif row['baseline_ms'] is None:
+                row['status'] = 'new'
+            else:
+                delta = row['current_ms'] - row['baseline_ms']
+                row['change'] = delta / row['baseline_ms'] if row['baseline_ms'] else 0.0
+                if delta > min_delta_ms and row['change'] > tolerance:
+                    row['status'] = 'regression'
+                elif -delta > min_delta_ms and -row['change'] > tolerance:
+                    row['status'] = 'improvement'
+                else:
+                    row['status'] = 'ok'
+            rows.append(row)
+        for name, base in base_cases.items():
+            if name not in cases and 'median_ms' in base:
+                rows.append({'size': int(size), 'case': name, 'baseline_ms': base['median_ms'],
+                             'current_ms': None, 'change': None, 'status': 'missing'})
+    return rows
+
+
+def format_comparison(rows: List[dict]) -> str:
+    lines = [f"{'size':>7}  {'case':<36} {'baseline':>10} {'current':>10} {'change':>8}  status"]
+    for row in rows:
+        base = f"{row['baseline_ms']:.2f}" if row['baseline_ms'] is not None else "-"
+        cur = f"{row['current_ms']:.2f}" if row['current_ms'] is not None else "-"
+        change = f"{row['change'] * 100:+.0f}%" if row['change'] is not None else ""
+        lines.append(f"{row['size']:>7}  {row['case']:<36} {base:>10} {cur:>10} {change:>8}  {row['status']}")
+    return "\n".join(lines)
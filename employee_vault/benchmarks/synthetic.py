@@ -0,0 +1,224 @@
+"""
+Deterministic synthetic datasets for the benchmark suite
+
+generate_dataset(root, size) builds a complete EmployeeVault data folder
+under root: a database created through DB() (so the real schema, indexes
+and migrations apply), employees with contract dates spread around "today",
+audit history, a valid security-audit hash chain, and photo / attachment
+files in the employee_files/{emp_id}/ layout.
+
+The same (size, seed) always produces the same rows (dates are relative to
+the day of the run, so the share of expiring contracts stays constant), so
+timings from different runs and machines compare like with like. Photos and
+attachments are capped (max_photos / max_files) to keep a 100k dataset to a
+few hundred MB; employees past the cap simply have none, as many real ones do.
+"""
+
+import io
+import os
+import random
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+DEFAULT_SEED = 20240601
+DEFAULT_MAX_PHOTOS = 500
+DEFAULT_MAX_FILES = 500
+
+_FIRST_NAMES = [
+    "Juan", "Maria", "Jose", "Ana", "Mark", "Kristine", "John Paul", "Angelica", "Carlo", "Jasmine",
+    "Miguel", "Patricia", "Rafael", "Camille", "Joshua", "Nicole", "Paolo", "Bea", "Christian", "Mae",
+    "Adrian", "Rowena", "Jerome", "Liza", "Ramon", "Divina", "Francis", "Joy", "Noel", "Cristina",
+]
+_LAST_NAMES = [
+    "Dela Cruz", "Santos", "Reyes", "Garcia", "Mendoza", "Bautista", "Villanueva", "Ramos", "Castillo",
+    "Aquino", "Navarro", "Torres", "Flores", "Gonzales", "Rivera", "Lopez", "Hernandez", "Domingo",
+    "Pascual", "Salazar", "Manalo", "Cruz", "Mercado", "Fernandez", "Soriano", "Del Rosario",
+]
+_DEPARTMENTS = [
+    ("O", "Office", 0.2),
+    ("S", "Store - SM Novaliches", 0.2),
+    ("S", "Store - SM San Fernando", 0.15),
+    ("S", "Store - SM Fairview", 0.15),
+    ("W", "Warehouse - Valenzuela", 0.2),
+    ("W", "Warehouse - Caloocan", 0.1),
+]
+_POSITIONS = ["Sales Associate", "Cashier", "Stock Clerk", "Supervisor", "Merchandiser",
+              "Admin Assistant", "Accounting Staff", "Driver", "Helper", "Store Manager"]
+_AGENCIES = ["SUN WU", "PEOPLES LINK", "TDEVS", "VITASTAR", "MHAX RADIANT", "NEXUS", None]
+_EDIT_FIELDS = ["position", "department", "salary", "contract_expiry", "phone", "agency"]
+
+
+def _pick_department(rng: random.Random):
+    roll = rng.random()
+    acc = 0.0
+    for letter, name, share in _DEPARTMENTS:
+        acc += share
+        if roll <= acc:
+            return letter, name
+    return _DEPARTMENTS[-1][:2]
+
+
+def _digits(rng: random.Random, count: int) -> str:
+    return "".join(str(rng.randrange(10)) for _ in range(count))
+
+
+def make_employees(size: int, seed: int = DEFAULT_SEED, today: date = None) -> List[Dict]:
+    """Employee dicts with the columns insert_employee() writes"""
+    rng = random.Random(seed)
+    today = today or date.today()
+    employees = []
+    for n in range(1, size + 1):
+        letter, department = _pick_department(rng)
+        hire = today - timedelta(days=rng.randrange(30, 8 * 365))
+        months = rng.choice([3, 5, 6, 6, 12])
+        # Renewed contracts start some whole number of terms after hiring
+        start = hire + timedelta(days=30 * months * rng.randrange(0, 4))
+        if start > today:
+            start = hire
+        expiry = start + timedelta(days=30 * months)
+        resigned = rng.random() < 0.15
+        resign = hire + timedelta(days=rng.randrange(30, max(31, (today - hire).days))) if resigned else None
+        first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        employees.append({
+            'emp_id': f"{letter}-{n:03d}-{hire.year % 100:02d}",
+            'name': f"{first} {last}",
+            'email': f"{first.lower().replace(' ', '')}.{last.lower().replace(' ', '')}{n}@example.com",
+            'phone': "09" + _digits(rng, 9),
+            'department': department,
+            'position': rng.choice(_POSITIONS),
+            'hire_date': hire.isoformat(),
+            'resign_date': resign.isoformat() if resign else None,
+            'salary': float(rng.randrange(12000, 45000, 250)),
+            'notes': "" if rng.random() < 0.7 else "Synthetic benchmark record",
+            'modified': datetime.combine(hire, datetime.min.time()).isoformat(),
+            'modified_by': "admin",
+            'contract_expiry': expiry.isoformat(),
+            'agency': rng.choice(_AGENCIES),
+            # Government IDs embed n so they stay unique (the columns have unique indexes)
+            'sss_number': f"{_digits(rng, 2)}-{n:07d}-{_digits(rng, 1)}",
+            'emergency_contact_name': f"{rng.choice(_FIRST_NAMES)} {last}",
+            'emergency_contact_phone': "09" + _digits(rng, 9),
+            'contract_start_date': start.isoformat(),
+            'contract_months': months,
+            'tin_number': f"{_digits(rng, 3)}-{n // 1000:03d}-{n % 1000:03d}-000",
+            'pagibig_number': f"{_digits(rng, 4)}-{n // 10000:04d}-{n % 10000:04d}",
+            'philhealth_number': f"{_digits(rng, 2)}-{n:09d}-{_digits(rng, 1)}",
+        })
+    return employees
+
+
+def make_photo_bytes(rng: random.Random, width: int = 600, height: int = 800) -> bytes:
+    """A portrait-like JPEG with gradients and noise, so it compresses like a real photo"""
+    from PIL import Image, ImageDraw, ImageFilter
+
+    base = tuple(rng.randrange(60, 200) for _ in range(3))
+    img = Image.effect_noise((width, height), rng.randrange(30, 70)).convert("RGB")
+    tint = Image.new("RGB", (width, height), base)
+    img = Image.blend(img, tint, 0.6)
+    draw = ImageDraw.Draw(img)
+    skin = (rng.randrange(170, 235), rng.randrange(130, 190), rng.randrange(100, 160))
+    draw.ellipse((width * 0.3, height * 0.18, width * 0.7, height * 0.55), fill=skin)
+    draw.rectangle((width * 0.18, height * 0.6, width * 0.82, height), fill=tuple(c // 2 for c in base))
+    img = img.filter(ImageFilter.GaussianBlur(1.2))
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=92)
+    return buf.getvalue()
+
+
+def _write_files(root: str, employees: List[Dict], rng: random.Random,
+                 max_photos: int, max_files: int) -> List[tuple]:
+    """Photos and attachments in the employee_files layout; returns employee_files rows"""
+    files_dir = os.path.join(root, "employee_files")
+    # A handful of distinct photos is enough: decode cost depends on size, not content
+    photos = [make_photo_bytes(rng) for _ in range(8)]
+    attachment = b"%PDF-1.4\n" + bytes(rng.randrange(256) for _ in range(48 * 1024))
+    rows = []
+    for index, emp in enumerate(employees):
+        if index >= max(max_photos, max_files):
+            break
+        folder = os.path.join(files_dir, emp['emp_id'])
+        if index < max_photos:
+            os.makedirs(os.path.join(folder, "photos"), exist_ok=True)
+            with open(os.path.join(folder, "photos", f"{emp['emp_id']}.jpg"), 'wb') as f:
+                f.write(photos[index % len(photos)])
+        if index < max_files:
+            os.makedirs(os.path.join(folder, "files"), exist_ok=True)
+            for name in ("contract.pdf", "nbi_clearance.pdf")[:1 + index % 2]:
+                with open(os.path.join(folder, "files", name), 'wb') as f:
+                    f.write(attachment)
+                rows.append((emp['emp_id'], name, emp['modified']))
+    return rows
+
+
+def _audit_rows(employees: List[Dict], rng: random.Random) -> List[tuple]:
+    rows = []
+    for emp in employees:
+        stamp = datetime.fromisoformat(emp['modified'])
+        rows.append((stamp.strftime("%Y-%m-%d %H:%M:%S"), "admin", "ADDED", "employees",
+                     emp['emp_id'], None, None, f"Added employee: {emp['name']}"))
+        for _ in range(rng.randrange(0, 6)):
+            stamp += timedelta(days=rng.randrange(1, 120), seconds=rng.randrange(86400))
+            field = rng.choice(_EDIT_FIELDS)
+            rows.append((stamp.strftime("%Y-%m-%d %H:%M:%S"), rng.choice(["admin", "hr1", "hr2"]), "EDITED",
+                         "employees", emp['emp_id'], f"{field}: old", f"{field}: new", f"Updated {field}"))
+    rows.sort(key=lambda r: r[0])
+    return rows
+
+
+def generate_dataset(root: str, size: int, seed: int = DEFAULT_SEED,
+                     max_photos: int = DEFAULT_MAX_PHOTOS, max_files: int = DEFAULT_MAX_FILES) -> dict:
+    """
+    Create a data folder with size employees under root (which must be empty
+    or not exist). Returns {'db_path', 'root', 'employees', ...} for the suite.
+    """
+    from employee_vault.database import DB
+
+    os.makedirs(root, exist_ok=True)
+    db_path = os.path.join(root, "employee_vault.db")
+    rng = random.Random(seed + 1)
+    employees = make_employees(size, seed)
+
+    db = DB(db_path)
+    try:
+        columns = list(employees[0].keys()) if employees else []
+        conn = db.conn
+        with conn:
+            conn.executemany(
+                f"INSERT INTO employees({','.join(columns)}) VALUES({','.join('?' * len(columns))})",
+                [tuple(emp[c] for c in columns) for emp in employees])
+            conn.executemany(
+                "INSERT INTO audit_log(timestamp, username, action, table_name, record_id, old_value, new_value, details) "
+                "VALUES(?,?,?,?,?,?,?,?)", _audit_rows(employees, rng))
+            conn.executemany("INSERT OR IGNORE INTO employee_files(emp_id, filename, added_at) VALUES(?,?,?)",
+                             _write_files(root, employees, rng, max_photos, max_files))
+
+            # Security audit with a valid hash chain (one event per 10 employees)
+            previous = None
+            stamp = datetime(2024, 1, 1, 8, 0, 0)
+            security = []
+            for n in range(max(1, size // 10)):
+                stamp += timedelta(minutes=rng.randrange(1, 240), microseconds=rng.randrange(10 ** 6))
+                ts = stamp.strftime("%Y-%m-%d %H:%M:%S.%f")
+                event = rng.choice(["LOGIN_SUCCESS", "LOGIN_SUCCESS", "LOGIN_FAILED", "LOGOUT", "PIN_RESET"])
+                user = rng.choice(["admin", "hr1", "hr2"])
+                details = f"Synthetic event {n}"
+                entry_hash = db._compute_entry_hash(ts, event, user, details, previous)
+                security.append((ts, event, user, "127.0.0.1", "BENCH-PC", details, "INFO", previous, entry_hash))
+                previous = entry_hash
+            conn.executemany(
+                "INSERT INTO security_audit(timestamp, event_type, username, ip_address, computer_name, "
+                "details, severity, previous_hash, entry_hash) VALUES(?,?,?,?,?,?,?,?,?)", security)
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        db.close()
+
+    logging.info(f"Benchmark dataset: {size} employees in {root}")
+    return {
+        'root': root,
+        'db_path': db_path,
+        'size': size,
+        'seed': seed,
+        'employees': employees,
+    }
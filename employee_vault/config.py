@@ -48,7 +48,8 @@ def load_network_config() -> dict:
     default_config = {
         "network_db_path": r"\\extra\EmployeeVault\employee_vault.db",
         "network_enabled": True,
-        "fallback_to_local": True
+        "fallback_to_local": True,
+        "read_replica_enabled": False
     }
     
     try:
@@ -85,6 +86,10 @@ else:
     DB_FILE = LOCAL_DB_PATH
     USE_NETWORK_DB = False
 
+# Local read replica of the network database (network mode, opt-in via network_config.json)
+READ_REPLICA_ENABLED = bool(_network_config.get("read_replica_enabled", False))
+READ_REPLICA_PATH = str(APP_ROOT / "cache" / "employee_vault.replica.db")
+
 JSON_FALLBACK = str(APP_ROOT / "employees_data.json")
 FILES_DIR = str(APP_ROOT / "employee_files")
 PHOTOS_DIR = str(APP_ROOT / "employee_photos")  # Legacy - kept for migration
@@ -2547,8 +2552,12 @@ def initialize_directories():
             pass
 
 
-# Initialize on import
-initialize_directories()
+# Directories are created by initialize_directories(), called from main() at startup
+# (not on import, so tools and tests importing config do not touch the share)
+
 
-# Get default stylesheet for backwards compatibility
-APP_QSS = get_modern_stylesheet(load_theme_preference())
+def __getattr__(name):
+    # Default stylesheet for backwards compatibility - built on first access only
+    if name == "APP_QSS":
+        return get_modern_stylesheet(load_theme_preference())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
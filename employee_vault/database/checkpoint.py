@@ -0,0 +1,209 @@
+"""
+WAL checkpoint manager for local mode
+
+SQLite's automatic checkpoint runs inside whichever commit pushes the WAL past
+wal_autocheckpoint pages, so a save or keepalive occasionally pays for copying
+the whole WAL back into the database. Forcing TRUNCATE checkpoints on a timer
+is worse: TRUNCATE waits for readers and resets the WAL file every time.
+
+The manager moves checkpointing onto one long-lived background thread with
+its own connection:
+
+- PASSIVE checkpoints (never wait for readers or writers) once the WAL has
+  changed and either a save asked for one, it grew by passive_pages frames,
+  or passive_interval seconds have passed since the last one
+- TRUNCATE only after idle_seconds without WAL writes, and at shutdown
+  (DB.close), so the file is reset when nobody is waiting on it
+
+Application connections keep a high wal_autocheckpoint as a backstop in case
+the manager falls behind. Network databases use DELETE journal mode and do
+not need the manager at all.
+"""
+
+import os
+import time
+import logging
+import sqlite3
+import threading
+from typing import Optional
+
+from employee_vault import metrics
+
+# Seconds between looks at the WAL file
+CHECKPOINT_POLL_SECONDS = 2.0
+# PASSIVE checkpoint at least this often while the WAL keeps changing (seconds)
+CHECKPOINT_PASSIVE_SECONDS = 10.0
+# ...or as soon as the WAL has grown by this many frames
+CHECKPOINT_PASSIVE_PAGES = 1000
+# Seconds without WAL writes before the WAL file is truncated
+CHECKPOINT_IDLE_SECONDS = 60.0
+# How long a TRUNCATE may wait for readers before giving up until the next idle period
+CHECKPOINT_BUSY_TIMEOUT_MS = 100
+# wal_autocheckpoint for application connections while the manager runs (pages)
+WAL_AUTOCHECKPOINT_BACKSTOP = 10000
+
+_WAL_HEADER_BYTES = 32
+_WAL_FRAME_HEADER_BYTES = 24
+
+
+class CheckpointManager:
+    """
+    Background WAL checkpointing for one database file.
+
+    Usage:
+        manager = CheckpointManager(db_path)
+        manager.start()
+        manager.request()      # after an important save - PASSIVE soon
+        manager.stop()         # DB.close() then runs the final TRUNCATE
+    """
+
+    def __init__(self, path: str,
+                 poll_interval: float = CHECKPOINT_POLL_SECONDS,
+                 passive_interval: float = CHECKPOINT_PASSIVE_SECONDS,
+                 passive_pages: int = CHECKPOINT_PASSIVE_PAGES,
+                 idle_seconds: float = CHECKPOINT_IDLE_SECONDS):
+        self.path = path
+        self.wal_path = path + "-wal"
+        self.poll_interval = poll_interval
+        self.passive_interval = passive_interval
+        self.passive_pages = passive_pages
+        self.idle_seconds = idle_seconds
+
+        self.passive_count = 0
+        self.truncate_count = 0
+        self.busy_count = 0
+        self.backlog_frames = 0      # Frames the last PASSIVE could not copy (readers in the way)
+        self.last_error: Optional[str] = None
+
+        self._requested = False
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="DBCheckpoint", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the checkpoint thread (a checkpoint in progress finishes first)"""
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logging.warning(f"Checkpoint thread did not stop within {timeout}s")
+
+    def request(self):
+        """Ask for a PASSIVE checkpoint soon (e.g. after an employee save)"""
+        self._requested = True
+        self._wakeup.set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def status(self) -> dict:
+        """Snapshot for diagnostics screens"""
+        signature = self._wal_signature()
+        return {
+            'running': self.running,
+            'wal_bytes': signature[0] if signature else 0,
+            'passive': self.passive_count,
+            'truncate': self.truncate_count,
+            'busy': self.busy_count,
+            'backlog_frames': self.backlog_frames,
+            'last_error': self.last_error,
+        }
+
+    # ------------------------------------------------------------------
+    # Checkpoint thread
+    # ------------------------------------------------------------------
+
+    def _wal_signature(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.wal_path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _run(self):
+        try:
+            conn = sqlite3.connect(self.path, timeout=CHECKPOINT_BUSY_TIMEOUT_MS / 1000,
+                                   check_same_thread=False, uri=self.path.startswith('file:'))
+            conn.execute(f"PRAGMA busy_timeout={CHECKPOINT_BUSY_TIMEOUT_MS};")
+            frame_bytes = conn.execute("PRAGMA page_size").fetchone()[0] + _WAL_FRAME_HEADER_BYTES
+        except sqlite3.Error as e:
+            self.last_error = str(e)
+            logging.error(f"Checkpoint manager disabled - could not open {self.path}: {e}")
+            return
+
+        seen = self._wal_signature()
+        size_at_checkpoint = seen[0] if seen else 0
+        last_write = time.monotonic()
+        last_passive = 0.0
+        dirty = bool(seen and seen[0] > _WAL_HEADER_BYTES)
+        truncated = not dirty
+
+        while not self._stop_event.is_set():
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            if self._stop_event.is_set():
+                break
+            requested, self._requested = self._requested, False
+
+            now = time.monotonic()
+            signature = self._wal_signature()
+            if signature != seen:
+                seen = signature
+                last_write = now
+                dirty = True
+                truncated = False
+
+            wal_bytes = seen[0] if seen else 0
+            grown_frames = max(0, wal_bytes - size_at_checkpoint) // frame_bytes
+            try:
+                if dirty and (requested or grown_frames >= self.passive_pages
+                              or self.backlog_frames >= self.passive_pages
+                              or now - last_passive >= self.passive_interval):
+                    busy, log_frames, done = self._checkpoint(conn, "PASSIVE")
+                    self.passive_count += 1
+                    self.backlog_frames = max(0, log_frames - done)
+                    dirty = self.backlog_frames > 0
+                    last_passive = now
+                    size_at_checkpoint = wal_bytes
+                elif not truncated and wal_bytes and now - last_write >= self.idle_seconds:
+                    busy, log_frames, done = self._checkpoint(conn, "TRUNCATE")
+                    if busy:
+                        self.busy_count += 1
+                        metrics.incr("db.checkpoint_busy")
+                        last_write = now  # Readers active - try again after another idle period
+                    else:
+                        self.truncate_count += 1
+                        self.backlog_frames = 0
+                        truncated = True
+                        dirty = False
+                        seen = self._wal_signature()
+                        size_at_checkpoint = 0
+                self.last_error = None
+            except sqlite3.Error as e:
+                self.last_error = str(e)
+                logging.warning(f"Background checkpoint failed: {e}")
+
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _checkpoint(conn: sqlite3.Connection, mode: str) -> tuple:
+        with metrics.timer(f"db.checkpoint_{mode.lower()}"):
+            busy, log_frames, done = conn.execute(f"PRAGMA wal_checkpoint({mode});").fetchone()
+        if mode != "PASSIVE" or done:
+            logging.debug(f"WAL checkpoint {mode}: {done}/{log_frames} frames" + (" (busy)" if busy else ""))
+        return busy, log_frames, done
@@ -13,16 +13,90 @@ import logging
 import hashlib
 import threading
 import socket
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Tuple, Optional
+from concurrent.futures import Future
 
 # Import from config module
 from employee_vault.config import (
     DB_FILE, JSON_FALLBACK, SEED_AGENCIES, DATABASE_VERSION,
     BACKUPS_DIR, _hash_pwd, _hash_pin, _verify_pin
 )
-from employee_vault.utils import retry_on_lock, check_permission
+from employee_vault.utils import retry_on_lock, check_permission, require_permission
+from employee_vault.database.write_executor import DBWriteExecutor
+from employee_vault.database.replica import ReadReplica
+from employee_vault.database.checkpoint import CheckpointManager, WAL_AUTOCHECKPOINT_BACKSTOP
+from employee_vault.database.tiering import (
+    ARCHIVE_BACKUP_SUFFIX, archived_chain_head, archived_years, backup_archives, open_archive, query_tiers,
+    restore_archives,
+)
+from employee_vault.database.settings_cache import SettingsCache
+from employee_vault.database.maintenance import MaintenanceScheduler, last_successful_run
+from employee_vault.database.name_index import ensure_name_index, find_name_candidates, pending_name_sync, sync_name_index
+from employee_vault.database.gov_ids import (
+    GOV_ID_FIELDS, ensure_gov_id_index, find_gov_id_conflicts, find_gov_id_batch_conflicts,
+)
+from employee_vault import metrics
+
+# Columns that may be changed through DB.bulk_update (whitelist - they are interpolated into SQL)
+BULK_UPDATABLE_FIELDS = {
+    'department', 'position', 'agency', 'resign_date', 'contract_expiry',
+    'contract_start_date', 'contract_months', 'salary', 'notes',
+}
+
+# Employee columns copied into archived_employees
+ARCHIVE_COLUMNS = (
+    'emp_id', 'name', 'email', 'phone', 'department', 'position', 'hire_date', 'resign_date',
+    'salary', 'notes', 'modified', 'modified_by', 'contract_expiry', 'agency', 'sss_number',
+    'emergency_contact_name', 'emergency_contact_phone', 'contract_start_date', 'contract_months',
+    'tin_number', 'pagibig_number', 'philhealth_number',
+)
+
+# Lease lengths (seconds). Expiry is stored as integer epoch seconds so the
+# "still held?" checks are plain indexed comparisons; expired rows are simply
+# ignored and reclaimed by the periodic sweep in heartbeat().
+LOCK_LEASE_SECONDS = 30 * 60
+SESSION_LEASE_SECONDS = 60 * 60
+LEASE_SWEEP_INTERVAL = 10 * 60
+# Clients older than the epoch columns write only the legacy timestamps
+# (lock_expires_at is local time, last_activity is UTC). These triggers derive
+# the epoch from them whenever such a client inserts or renews a row without
+# setting it, so every query can compare the bare indexed epoch column and a
+# legacy lock is still honoured until it really expires.
+LEGACY_LEASE_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS trg_record_locks_legacy_insert AFTER INSERT ON record_locks
+    WHEN NEW.lock_expires_epoch IS NULL
+    BEGIN
+        UPDATE record_locks SET lock_expires_epoch = CAST(strftime('%s', NEW.lock_expires_at, 'utc') AS INTEGER)
+        WHERE record_id = NEW.record_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_record_locks_legacy_update AFTER UPDATE OF lock_expires_at ON record_locks
+    WHEN NEW.lock_expires_epoch IS OLD.lock_expires_epoch
+    BEGIN
+        UPDATE record_locks SET lock_expires_epoch = CAST(strftime('%s', NEW.lock_expires_at, 'utc') AS INTEGER)
+        WHERE record_id = NEW.record_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_active_sessions_legacy_insert AFTER INSERT ON active_sessions
+    WHEN NEW.expires_epoch IS NULL
+    BEGIN
+        UPDATE active_sessions
+        SET expires_epoch = CAST(strftime('%s', NEW.last_activity) AS INTEGER) + {SESSION_LEASE_SECONDS}
+        WHERE id = NEW.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_active_sessions_legacy_update AFTER UPDATE OF last_activity ON active_sessions
+    WHEN NEW.expires_epoch IS OLD.expires_epoch
+    BEGIN
+        UPDATE active_sessions
+        SET expires_epoch = CAST(strftime('%s', NEW.last_activity) AS INTEGER) + {SESSION_LEASE_SECONDS}
+        WHERE id = NEW.id;
+    END""",
+)
+# Start-up skips the full integrity_check while the scheduler's last quick_check is this recent
+INTEGRITY_CHECK_TRUST_DAYS = 8
+
+# Queries slower than this (ms) are logged as well as recorded in the metrics
+DB_SLOW_QUERY_MS = 50
 
 class DB:
     def __init__(self, path: str):
@@ -86,6 +160,10 @@ class DB:
 
         # PRAGMA optimizations for multi-user performance
         try:
+            # A new file gets incremental auto-vacuum, so the maintenance scheduler can
+            # return free pages in small steps (only possible before WAL and the first table)
+            if self.conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0:
+                self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL;")
             self.conn.execute("PRAGMA foreign_keys=ON;")
             
             if is_network_path:
@@ -151,30 +229,194 @@ class DB:
         self._ensure_schema()
         self._migrate_password_to_pin()  # Run PIN migration
         if newdb: self._maybe_import_json()
+        self.conn.commit()
+
+        # Dedicated writer thread: fire-and-forget writes (keepalives, lock refreshes,
+        # login attempts, security events) are queued here so lock contention on the
+        # network share is waited out off the UI thread. self.conn stays the reader.
+        self.writer = DBWriteExecutor(path, is_network_path=self._is_network_path)
+
+        # This client's employee/settings writes, for read replica freshness
+        # (heartbeat, lease and audit writes are left out, see _track_local_revisions)
+        self._local_revision = 0
+        self._writer_revision_generation = 0
+        self._track_local_revisions(self.conn)
+        self.writer.submit(self._track_local_revisions, label="track_local_revisions")
+
+        # Pending name-index work (employees added before the index or by other clients)
+        self._name_sync = None
+        self._schedule_name_sync()
+
+        # Leases held by this client, renewed together by heartbeat()
+        self._session_ids: Dict[str, int] = {}
+        self._held_locks: Dict[str, str] = {}  # record_id -> username
+        self._last_lease_sweep = 0.0
+
+        # Optional local read replica (network mode only, see enable_read_replica)
+        self.path = path
+        self.replica: Optional[ReadReplica] = None
+
+        # Side connection for control_plane_status(), opened on first use
+        self._probe_conn: Optional[sqlite3.Connection] = None
+        self._probe_lock = threading.Lock()
+
+        # Optional background WAL checkpointing (local mode only, see enable_checkpoint_manager)
+        self.checkpointer: Optional[CheckpointManager] = None
+        # total_changes right after a log_action() that left only audit rows uncommitted
+        # (see commit_pending); None while the open transaction belongs to someone else
+        self._pending_audit_changes: Optional[int] = None
+
+
+        # Optional lease-elected maintenance (see enable_maintenance_scheduler)
+        self.maintenance: Optional[MaintenanceScheduler] = None
+
+        # Cached settings table; a restore re-runs __init__ and keeps the cache
+        # (and its subscribers), which reloads on the next read
+        if getattr(self, 'settings', None) is None:
+            self.settings = SettingsCache(self)
+        else:
+            self.settings.invalidate()
 
-    def _profile_query(self, query, params=None):
+    def enable_read_replica(self, replica_path: str) -> bool:
         """
-        Performance instrumentation (Phase 0) - Profile database queries
-        Logs queries that take longer than 50ms
+        Serve read-heavy queries (employee list, dashboard, reports) from a local
+        copy of the network database. Writes still go to the network database.
+        Has no effect for a database that is already on a local drive.
         """
-        start = time.perf_counter()
-        if params:
-            cursor = self.conn.execute(query, params)
+        if not self._is_network_path or self.replica is not None:
+            return False
+        self.replica = ReadReplica(self.path, replica_path, local_generation=self._local_write_generation)
+        self.replica.start()
+        logging.info(f"Read replica enabled: {replica_path}")
+        return True
+
+    def enable_checkpoint_manager(self) -> bool:
+        """
+        Move WAL checkpointing onto a background thread: PASSIVE checkpoints
+        while the WAL is busy, TRUNCATE once writes go quiet and at close().
+        Commits then no longer pay for SQLite's automatic checkpoint.
+        Has no effect for a network database (DELETE journal mode).
+        """
+        if self._is_network_path or self.checkpointer is not None:
+            return False
+        self.checkpointer = CheckpointManager(self.path)
+        self.checkpointer.start()
+        # Automatic checkpoints stay on as a backstop, at a size the manager should never reach
+        pragma = f"PRAGMA wal_autocheckpoint={WAL_AUTOCHECKPOINT_BACKSTOP};"
+        self.conn.execute(pragma)
+        self.writer.submit(lambda conn: conn.execute(pragma), label="wal_autocheckpoint")
+        logging.info("Checkpoint manager enabled")
+        return True
+
+    def _shutdown_checkpointer(self):
+        checkpointer, self.checkpointer = self.checkpointer, None
+        if checkpointer is not None:
+            checkpointer.stop()
+
+    def enable_maintenance_scheduler(self) -> bool:
+        """
+        Let this client take part in the maintenance election: whichever client
+        holds the maintenance lease archives old audit history, runs PRAGMA
+        optimize, ANALYZE, incremental vacuum and quick_check while the
+        database is quiet, yielding to users.
+        """
+        if self.maintenance is not None:
+            return False
+        self.maintenance = MaintenanceScheduler(self.path)
+        self.maintenance.start()
+        logging.info(f"Maintenance scheduler enabled ({self.maintenance.holder})")
+        return True
+
+    def _shutdown_maintenance(self):
+        maintenance, self.maintenance = self.maintenance, None
+        if maintenance is not None:
+            maintenance.stop()
+
+    @metrics.timed("db.get_maintenance_runs", slow_ms=DB_SLOW_QUERY_MS)
+    def get_maintenance_runs(self, limit: int = 50, task: Optional[str] = None) -> List[Dict]:
+        """Recent maintenance runs (task, holder, started_at, duration_ms, status, result), newest first"""
+        query = "SELECT * FROM maintenance_runs"
+        params = []
+        if task:
+            query += " WHERE task = ?"
+            params.append(task)
+        query += " ORDER BY started_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        return [self.row_to_dict(row) for row in self.conn.execute(query, params).fetchall()]
+
+    def _track_local_revisions(self, conn: sqlite3.Connection):
+        """
+        Count the writes on conn that bump data_revision or settings_revision.
+        TEMP triggers fire only for the connection that created them, so other
+        clients' writes, and this client's heartbeat and lease traffic, are not counted.
+        """
+        conn.create_function("note_local_revision", 0, self._note_local_revision)
+        for table in ("data_revision", "settings_revision"):
+            conn.execute(f"""
+            CREATE TEMP TRIGGER IF NOT EXISTS trg_local_{table} AFTER UPDATE ON main.{table}
+            BEGIN SELECT note_local_revision(); END""")
+
+    def _note_local_revision(self):
+        # Runs inside the writing transaction: a writer job's change counts once
+        # the writer has committed it, a self.conn change once self.conn has
+        if self.writer.is_writer_thread():
+            self._writer_revision_generation = self.writer.generation + 1
         else:
-            cursor = self.conn.execute(query)
+            self._local_revision += 1
 
+    def _local_write_generation(self):
+        """Changes whenever this client changes employee data or settings; None while such a write is uncommitted"""
+        if self.conn.in_transaction:
+            return None
+        writer_generation = self._writer_revision_generation
+        if self.writer.generation < writer_generation:
+            return None
+        return (self._local_revision, writer_generation)
+
+    @property
+    def read_conn(self) -> sqlite3.Connection:
+        """Connection for read-only queries: the local replica when fresh, else the main connection"""
+        replica = self.replica
+        if replica is not None:
+            conn = replica.connection()
+            if conn is not None:
+                return conn
+        return self.conn
+
+    def _shutdown_replica(self):
+        replica, self.replica = self.replica, None
+        if replica is not None:
+            replica.stop()
+
+    def _shutdown_writer(self, timeout: float = 5.0):
+        """Flush queued writes and stop the writer thread (before closing or replacing the DB file)"""
+        writer = getattr(self, 'writer', None)
+        if writer is not None:
+            writer.shutdown(timeout=timeout)
+
+    def _profile_query(self, name: str, query: str, params=(), conn: sqlite3.Connection = None):
+        """
+        Execute a query and record its time under db.<name> in the metrics
+        registry. Slow queries are logged with the start of their SQL.
+        """
+        start = time.perf_counter()
+        cursor = (conn or self.conn).execute(query, params)
         elapsed = (time.perf_counter() - start) * 1000
-        if elapsed > 50:  # Log queries >50ms
-            query_preview = query[:100].replace('\n', ' ')
-            print(f"[PERF] SLOW QUERY ({elapsed:.2f}ms): {query_preview}")
-
+        query_preview = " ".join(query[:120].split())
+        metrics.observe(f"db.{name}", elapsed, query_preview)
+        if elapsed > DB_SLOW_QUERY_MS:
+            logging.warning(f"Slow query db.{name} ({elapsed:.1f}ms): {query_preview}")
         return cursor
 
-    def checkpoint_database(self):
+    def checkpoint_database(self, mode: str = "TRUNCATE"):
         """
         Force WAL checkpoint to merge changes from WAL file to main database.
         Only applies to WAL mode (local drives). For network drives using DELETE mode,
         this is a no-op since there's no WAL file.
+
+        TRUNCATE waits for readers and resets the WAL file, so it is meant for
+        shutdown and maintenance; while the app runs the checkpoint manager
+        does the routine (PASSIVE) checkpoints.
         """
         # Skip checkpoint for network paths (DELETE mode doesn't use WAL)
         if getattr(self, '_is_network_path', False):
@@ -187,7 +429,7 @@ class DB:
             
         try:
             # Force all WAL changes into main database
-            result = self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+            result = self.conn.execute(f"PRAGMA wal_checkpoint({mode});")
             checkpoint_result = result.fetchone()
             if checkpoint_result:
                 busy, log, checkpointed = checkpoint_result
@@ -206,6 +448,11 @@ class DB:
         Always checkpoint before closing to ensure all changes are in main DB.
         """
         try:
+            self._shutdown_replica()
+            self._close_probe_connection()
+            self._shutdown_writer()
+            self._shutdown_checkpointer()
+            self._shutdown_maintenance()
             # Checkpoint before closing to merge WAL to main database
             self.checkpoint_database()
             self.conn.close()
@@ -217,14 +464,38 @@ class DB:
             except:
                 pass
 
+    def commit_pending(self) -> bool:
+        """
+        Commit audit rows that log_action() left uncommitted on the main
+        connection, so they do not keep holding the database write lock.
+
+        Only a transaction that holds nothing but those rows is committed: once
+        any other statement has written in it, it belongs to an operation still
+        in progress, which commits or rolls back itself. Returns True if it
+        committed.
+        """
+        if not self.conn.in_transaction:
+            self._pending_audit_changes = None
+            return False
+        if self._pending_audit_changes != self.conn.total_changes:
+            return False
+        self.conn.commit()
+        self._pending_audit_changes = None
+        return True
+
     def commit_and_checkpoint(self):
         """
-        Commit current transaction AND force checkpoint.
-        Use this after important changes to ensure visibility across PCs.
+        Commit current transaction and schedule a checkpoint.
+        Use this after important changes so they reach the main database file soon.
+        The checkpoint is PASSIVE: on the manager's thread when it runs, else
+        inline (it never waits for readers).
         """
         try:
             self.conn.commit()
-            self.checkpoint_database()
+            if self.checkpointer is not None:
+                self.checkpointer.request()
+            else:
+                self.checkpoint_database("PASSIVE")
             return True
         except sqlite3.Error as e:
             logging.error(f"Commit and checkpoint failed: {e}")
@@ -445,6 +716,11 @@ class DB:
             "CREATE INDEX IF NOT EXISTS idx_emp_first_name ON employees(first_name);",
             "CREATE INDEX IF NOT EXISTS idx_emp_last_name ON employees(last_name);",
             "CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_log(action, timestamp);",
+
+            # Audit browser: record history and table filters page by (timestamp, id)
+            "CREATE INDEX IF NOT EXISTS idx_audit_timestamp_id ON audit_log(timestamp, id);",
+            "CREATE INDEX IF NOT EXISTS idx_audit_record ON audit_log(record_id, timestamp);",
+            "CREATE INDEX IF NOT EXISTS idx_audit_table ON audit_log(table_name, timestamp);",
         ]
         for idx in indexes:
             try:
@@ -569,7 +845,8 @@ class DB:
             login_time TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
             last_activity TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
             ip_address TEXT,
-            computer_name TEXT
+            computer_name TEXT,
+            expires_epoch INTEGER
         );""")
 
         # Database version table
@@ -586,9 +863,105 @@ class DB:
             locked_by TEXT NOT NULL,
             locked_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
             computer_name TEXT,
-            lock_expires_at TEXT NOT NULL
+            lock_expires_at TEXT NOT NULL,
+            lock_expires_epoch INTEGER
         );""")
+
+        # Lease columns for databases created before they existed
+        session_cols = {r[1] for r in self.conn.execute("PRAGMA table_info(active_sessions)").fetchall()}
+        if "expires_epoch" not in session_cols:
+            self.conn.execute("ALTER TABLE active_sessions ADD COLUMN expires_epoch INTEGER;")
+        lock_cols = {r[1] for r in self.conn.execute("PRAGMA table_info(record_locks)").fetchall()}
+        if "lock_expires_epoch" not in lock_cols:
+            self.conn.execute("ALTER TABLE record_locks ADD COLUMN lock_expires_epoch INTEGER;")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_record_locks_expires_epoch ON record_locks(lock_expires_epoch)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_active_sessions_expires ON active_sessions(expires_epoch)")
+        for trigger in LEGACY_LEASE_TRIGGERS:
+            self.conn.execute(trigger)
+        # Rows written by legacy clients before the triggers existed (checked
+        # first: no write lock once filled)
+        if self.conn.execute("SELECT 1 FROM active_sessions WHERE expires_epoch IS NULL LIMIT 1").fetchone():
+            self.conn.execute(
+                "UPDATE active_sessions SET expires_epoch = CAST(strftime('%s', last_activity) AS INTEGER) + ? "
+                "WHERE expires_epoch IS NULL", (SESSION_LEASE_SECONDS,))
+        if self.conn.execute("SELECT 1 FROM record_locks WHERE lock_expires_epoch IS NULL LIMIT 1").fetchone():
+            # lock_expires_at was written as local time
+            self.conn.execute(
+                "UPDATE record_locks SET lock_expires_epoch = CAST(strftime('%s', lock_expires_at, 'utc') AS INTEGER) "
+                "WHERE lock_expires_epoch IS NULL")
         
+        # Employee data revision, bumped by triggers on every employee change so
+        # clients can tell "the employee list changed" apart from lease and audit
+        # traffic (see control_plane_status)
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS data_revision(
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            revision INTEGER NOT NULL DEFAULT 0
+        );""")
+        # Checked first so opening an up-to-date database does not take the write lock
+        if self.conn.execute("SELECT 1 FROM data_revision WHERE id = 1").fetchone() is None:
+            self.conn.execute("INSERT INTO data_revision(id, revision) VALUES (1, 0)")
+        for table in ("employees", "archived_employees"):
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                self.conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_revision AFTER {event} ON {table}
+                BEGIN UPDATE data_revision SET revision = revision + 1 WHERE id = 1; END""")
+
+        # Blocking-key index for the duplicate-name warning (see name_index.py)
+        ensure_name_index(self.conn)
+
+        # Separator-free government IDs, unique per type (see gov_ids.py)
+        ensure_gov_id_index(self.conn)
+
+        # Same idea for the settings table, so clients reload their settings
+        # snapshot only when some client changed a setting (see SettingsCache)
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS settings_revision(
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            revision INTEGER NOT NULL DEFAULT 0
+        );""")
+        if self.conn.execute("SELECT 1 FROM settings_revision WHERE id = 1").fetchone() is None:
+            self.conn.execute("INSERT INTO settings_revision(id, revision) VALUES (1, 0)")
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            self.conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_settings_{event.lower()}_revision AFTER {event} ON settings
+            BEGIN UPDATE settings_revision SET revision = revision + 1 WHERE id = 1; END""")
+
+        # Maintenance election and run history (see maintenance.py)
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS maintenance_lease(
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            holder TEXT,
+            expires_epoch INTEGER NOT NULL DEFAULT 0,
+            acquired_at TEXT
+        );""")
+        if self.conn.execute("SELECT 1 FROM maintenance_lease WHERE id = 1").fetchone() is None:
+            self.conn.execute("INSERT INTO maintenance_lease(id) VALUES (1)")
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS maintenance_runs(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task TEXT NOT NULL,
+            holder TEXT,
+            started_at TEXT NOT NULL,
+            duration_ms INTEGER,
+            status TEXT NOT NULL,
+            result TEXT
+        );""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_maintenance_runs_task ON maintenance_runs(task, status, started_at)")
+
+        # Archived audit history: rows and chain head per table and year (see tiering.py)
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS audit_tiers(
+            table_name TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            rows INTEGER NOT NULL DEFAULT 0,
+            first_id INTEGER,
+            last_id INTEGER,
+            last_hash TEXT,
+            updated_at TEXT,
+            PRIMARY KEY (table_name, year)
+        );""")
+
         # Security audit table with tamper detection (hash chain)
         self.conn.execute("""
         CREATE TABLE IF NOT EXISTS security_audit(
@@ -1149,42 +1522,147 @@ Respectfully yours,
     def create_session(self, username: str, ip_address: str = "", computer_name: str = ""):
         """Create session"""
         try:
-            self.conn.execute("INSERT INTO active_sessions (username, ip_address, computer_name) VALUES (?, ?, ?)",
-                            (username, ip_address, computer_name))
+            cursor = self.conn.execute("""
+                INSERT INTO active_sessions (username, ip_address, computer_name, expires_epoch)
+                VALUES (?, ?, ?, ?)
+            """, (username, ip_address, computer_name, int(time.time()) + SESSION_LEASE_SECONDS))
             self.conn.commit()
+            self._session_ids[username] = cursor.lastrowid
             logging.info(f"Session created for {username}")
         except Exception as e:
             logging.error(f"Error creating session: {e}")
 
     def update_session_activity(self, username: str):
-        """Update session activity"""
+        """Keepalive timer entry point - renews this client's session and lock leases"""
+        return self.heartbeat(username)
+
+    @metrics.timed("db.heartbeat", slow_ms=DB_SLOW_QUERY_MS)
+    def heartbeat(self, username: str):
+        """
+        Renew every lease this client holds in one queued transaction:
+        the user's session, all record locks acquired through this DB object,
+        and (every LEASE_SWEEP_INTERVAL) a sweep of expired leases.
+        Returns the writer Future.
+        """
+        now = int(time.time())
+        session_id = self._session_ids.get(username)
+        lock_ids = [rid for rid, owner in self._held_locks.items() if owner == username]
+        sweep = time.monotonic() - self._last_lease_sweep >= LEASE_SWEEP_INTERVAL
+        if sweep:
+            self._last_lease_sweep = time.monotonic()
+
+        def _heartbeat(conn):
+            if session_id is not None:
+                conn.execute("""
+                    UPDATE active_sessions SET last_activity = CURRENT_TIMESTAMP, expires_epoch = ?
+                    WHERE id = ?
+                """, (now + SESSION_LEASE_SECONDS, session_id))
+            else:
+                conn.execute("""
+                    UPDATE active_sessions SET last_activity = CURRENT_TIMESTAMP, expires_epoch = ?
+                    WHERE id = (SELECT MAX(id) FROM active_sessions WHERE username = ?)
+                """, (now + SESSION_LEASE_SECONDS, username))
+            if lock_ids:
+                lock_expires_at = datetime.fromtimestamp(now + LOCK_LEASE_SECONDS).isoformat()
+                conn.executemany("""
+                    UPDATE record_locks SET lock_expires_at = ?, lock_expires_epoch = ?
+                    WHERE record_id = ? AND locked_by = ?
+                """, [(lock_expires_at, now + LOCK_LEASE_SECONDS, rid, username) for rid in lock_ids])
+            if sweep:
+                self._sweep_expired_leases(conn, now)
+
+        return self.writer.submit(_heartbeat, label="heartbeat")
+
+    @staticmethod
+    def _sweep_expired_leases(conn, now: int):
+        """Reclaim expired lock and session rows (indexed range deletes)"""
+        locks = conn.execute("DELETE FROM record_locks WHERE lock_expires_epoch <= ?", (now,)).rowcount
+        sessions = conn.execute("DELETE FROM active_sessions WHERE expires_epoch <= ?", (now,)).rowcount
+        if locks or sessions:
+            logging.info(f"Lease sweep reclaimed {locks} lock(s) and {sessions} session(s)")
+
+    @metrics.timed("db.control_plane_status", slow_ms=DB_SLOW_QUERY_MS)
+    def control_plane_status(self, username: str) -> dict:
+        """
+        Everything the heartbeat needs in one read: the employee data and
+        settings revisions, the raw force-close setting, this user's session and lock leases, and
+        how many users are online. Runs on a dedicated read-only connection
+        that stays open between calls (call it from one background thread).
+        """
+        now = int(time.time())
+        session_id = self._session_ids.get(username)
+        with self._probe_lock:
+            if self._probe_conn is None:
+                conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False,
+                                       uri=self.path.startswith('file:'))
+                conn.execute("PRAGMA query_only=ON;")
+                self._probe_conn = conn
+            try:
+                row = self._probe_conn.execute("""
+                    SELECT
+                        (SELECT revision FROM data_revision WHERE id = 1),
+                        (SELECT revision FROM settings_revision WHERE id = 1),
+                        (SELECT value FROM settings WHERE key = 'force_close'),
+                        (SELECT COUNT(*) FROM active_sessions
+                         WHERE (id = ? OR (? IS NULL AND username = ?)) AND expires_epoch > ?),
+                        (SELECT COUNT(*) FROM record_locks WHERE locked_by = ? AND lock_expires_epoch > ?),
+                        (SELECT COUNT(DISTINCT username) FROM active_sessions WHERE expires_epoch > ?)
+                """, (session_id, session_id, username, now, username, now, now)).fetchone()
+            except sqlite3.Error:
+                # Reopen on the next call (the file may have been replaced or the share dropped)
+                self._close_probe_connection(locked=True)
+                raise
+        return {
+            'data_revision': row[0],
+            'settings_revision': row[1],
+            'force_close': row[2],
+            'session': row[3] > 0,
+            'locks': row[4],
+            'users_online': row[5],
+        }
+
+    def _close_probe_connection(self, locked: bool = False):
+        lock = getattr(self, '_probe_lock', None)
+        if lock is None:
+            return
+        if not locked:
+            lock.acquire()
         try:
-            self.conn.execute("""
-                UPDATE active_sessions SET last_activity = CURRENT_TIMESTAMP
-                WHERE username = ? AND id = (SELECT MAX(id) FROM active_sessions WHERE username = ?)
-            """, (username, username))
-            self.conn.commit()
-        except Exception as e:
-            logging.error(f"Error updating session: {e}")
+            conn, self._probe_conn = self._probe_conn, None
+            if conn is not None:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+        finally:
+            if not locked:
+                lock.release()
 
     def close_session(self, username: str):
         """Close session"""
         try:
-            self.conn.execute("""
-                DELETE FROM active_sessions
-                WHERE username = ? AND id = (SELECT MAX(id) FROM active_sessions WHERE username = ?)
-            """, (username, username))
+            session_id = self._session_ids.pop(username, None)
+            if session_id is not None:
+                self.conn.execute("DELETE FROM active_sessions WHERE id = ?", (session_id,))
+            else:
+                self.conn.execute("""
+                    DELETE FROM active_sessions
+                    WHERE username = ? AND id = (SELECT MAX(id) FROM active_sessions WHERE username = ?)
+                """, (username, username))
             self.conn.commit()
             logging.info(f"Session closed for {username}")
         except Exception as e:
             logging.error(f"Error closing session: {e}")
 
+    @metrics.timed("db.get_active_sessions", slow_ms=DB_SLOW_QUERY_MS)
     def get_active_sessions(self) -> List[Dict]:
-        """Get active sessions (clean up old ones first)"""
+        """Get sessions whose lease has not expired"""
         try:
-            # Clean up sessions older than 1 hour
-            self.conn.execute("DELETE FROM active_sessions WHERE datetime(last_activity) < datetime('now', '-1 hour')")
-            cursor = self.conn.execute("SELECT * FROM active_sessions ORDER BY last_activity DESC")
+            cursor = self.conn.execute("""
+                SELECT * FROM active_sessions
+                WHERE expires_epoch > ?
+                ORDER BY last_activity DESC
+            """, (int(time.time()),))
             return [self.row_to_dict(row) for row in cursor.fetchall()]
         except Exception as e:
             logging.error(f"Error fetching sessions: {e}")
@@ -1207,36 +1685,32 @@ Respectfully yours,
         """
         Attempt to acquire exclusive lock on record.
         Returns True if lock acquired, False if already locked by someone else.
-        Auto-expires locks older than 30 minutes.
+
+        A single upsert: it inserts a new lease, takes over an expired one, or
+        renews one already held by the same user. Leases last LOCK_LEASE_SECONDS
+        and are kept alive by heartbeat() while this client holds them.
         """
         try:
-            import socket
-            from datetime import datetime, timedelta
-
-            # Clean up expired locks first
-            self.cleanup_expired_locks()
-
-            # Check if record is already locked
-            lock_info = self.get_lock_info(record_id)
-            if lock_info and lock_info['locked']:
-                # Check if it's locked by the same user
-                if lock_info['locked_by'] == username:
-                    # Refresh existing lock
-                    return self.refresh_lock(record_id, username)
-                else:
-                    # Locked by someone else
-                    return False
-
-            # Acquire new lock (30 minute expiry)
-            computer_name = socket.gethostname()
-            lock_expires_at = (datetime.now() + timedelta(minutes=30)).isoformat()
-
-            self.conn.execute("""
-                INSERT OR REPLACE INTO record_locks (record_id, locked_by, locked_at, computer_name, lock_expires_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP, ?, ?)
-            """, (record_id, username, computer_name, lock_expires_at))
+            now = int(time.time())
+            expires_epoch = now + LOCK_LEASE_SECONDS
+            cursor = self.conn.execute("""
+                INSERT INTO record_locks (record_id, locked_by, locked_at, computer_name, lock_expires_at, lock_expires_epoch)
+                VALUES (?, ?, CURRENT_TIMESTAMP, ?, ?, ?)
+                ON CONFLICT(record_id) DO UPDATE SET
+                    locked_by = excluded.locked_by,
+                    locked_at = excluded.locked_at,
+                    computer_name = excluded.computer_name,
+                    lock_expires_at = excluded.lock_expires_at,
+                    lock_expires_epoch = excluded.lock_expires_epoch
+                WHERE record_locks.locked_by = excluded.locked_by
+                   OR record_locks.lock_expires_epoch <= ?
+            """, (record_id, username, socket.gethostname(),
+                  datetime.fromtimestamp(expires_epoch).isoformat(), expires_epoch, now))
             self.conn.commit()
 
+            if cursor.rowcount == 0:
+                return False
+            self._held_locks[record_id] = username
             logging.info(f"Lock acquired: {record_id} by {username}")
             return True
 
@@ -1247,6 +1721,7 @@ Respectfully yours,
     def release_lock(self, record_id: str, username: str) -> bool:
         """Release lock (on form close or save)"""
         try:
+            self._held_locks.pop(record_id, None)
             self.conn.execute("""
                 DELETE FROM record_locks
                 WHERE record_id = ? AND locked_by = ?
@@ -1266,8 +1741,8 @@ Respectfully yours,
             row = self.conn.execute("""
                 SELECT locked_by, locked_at, computer_name, lock_expires_at
                 FROM record_locks
-                WHERE record_id = ? AND datetime(lock_expires_at) > datetime('now')
-            """, (record_id,)).fetchone()
+                WHERE record_id = ? AND lock_expires_epoch > ?
+            """, (record_id, int(time.time()))).fetchone()
 
             if row:
                 return {
@@ -1285,40 +1760,17 @@ Respectfully yours,
             return {'locked': False}
 
     def refresh_lock(self, record_id: str, username: str) -> bool:
-        """Update lock_expires_at timestamp (call every 5 min)"""
-        try:
-            from datetime import datetime, timedelta
-
-            lock_expires_at = (datetime.now() + timedelta(minutes=30)).isoformat()
-
-            self.conn.execute("""
-                UPDATE record_locks
-                SET lock_expires_at = ?, locked_at = CURRENT_TIMESTAMP
-                WHERE record_id = ? AND locked_by = ?
-            """, (lock_expires_at, record_id, username))
-            self.conn.commit()
-
-            logging.debug(f"Lock refreshed: {record_id} by {username}")
-            return True
-
-        except Exception as e:
-            logging.error(f"Error refreshing lock for {record_id}: {e}")
-            return False
+        """
+        Mark a lock as held by this client so the next heartbeat() renews it.
+        Lock leases are not written individually any more.
+        """
+        if record_id not in self._held_locks:
+            self._held_locks[record_id] = username
+        return True
 
     def cleanup_expired_locks(self):
-        """Remove locks older than 30 minutes (background task)"""
-        try:
-            result = self.conn.execute("""
-                DELETE FROM record_locks
-                WHERE datetime(lock_expires_at) <= datetime('now')
-            """)
-            self.conn.commit()
-
-            if result.rowcount > 0:
-                logging.info(f"Cleaned up {result.rowcount} expired locks")
-
-        except Exception as e:
-            logging.error(f"Error cleaning up expired locks: {e}")
+        """Queue an immediate sweep of expired locks and sessions (normally done by heartbeat)"""
+        return self.writer.submit(self._sweep_expired_leases, int(time.time()), label="lease_sweep")
 
     def get_all_locks(self) -> List[Dict[str, Any]]:
         """Get all active locks (for debugging/monitoring)"""
@@ -1326,9 +1778,9 @@ Respectfully yours,
             cursor = self.conn.execute("""
                 SELECT record_id, locked_by, locked_at, computer_name, lock_expires_at
                 FROM record_locks
-                WHERE datetime(lock_expires_at) > datetime('now')
+                WHERE lock_expires_epoch > ?
                 ORDER BY locked_at DESC
-            """)
+            """, (int(time.time()),))
             return [self.row_to_dict(row) for row in cursor.fetchall()]
         except Exception as e:
             logging.error(f"Error fetching locks: {e}")
@@ -1347,86 +1799,74 @@ Respectfully yours,
                 # Database may already be closed or not have close method
                 pass
         event.accept()
+    @metrics.timed("db.get_user", slow_ms=DB_SLOW_QUERY_MS)
     def get_user(self, username):
         """Get user by username, returns dict"""
         row = self.conn.execute("SELECT * FROM users WHERE username=?", (username,)).fetchone()
         return dict(row) if row else None
 
+    @metrics.timed("db.all_users", slow_ms=DB_SLOW_QUERY_MS)
     def all_users(self):
         """Get all users"""
         return [dict(r) for r in self.conn.execute("SELECT username, name, role FROM users ORDER BY username").fetchall()]
 
-    def create_user(self, username, name, pin, role="user"):
-        """Create a new user with PIN authentication (bcrypt hashed)"""
-        # Retry logic for concurrent access on network shares
-        max_retries = 5
-        retry_delay = 0.1  # Start with 100ms
-        
-        for attempt in range(max_retries):
-            try:
-                self.conn.execute(
-                    "INSERT INTO users(username, password, pin, pin_change_required, role, name) VALUES(?, ?, ?, ?, ?, ?)",
-                    (username, None, _hash_pin(pin), 0, role, name)  # password=None, pin_change_required=0 for new users
-                )
+    def create_user(self, username, name, pin, role="user") -> Future:
+        """
+        Create a new user with PIN authentication (bcrypt hashed) on the writer thread.
 
-                # Set permissions based on role
-                if role == "admin":
-                    # Admin gets full permissions
-                    default_permissions = {
-                        "dashboard": True,
-                        "employees": True,
-                        "add_employee": True,
-                        "edit_employee": True,
-                        "delete_employee": True,
-                        "print_system": True,
-                        "bulk_operations": True,
-                        "reports": True,
-                        "letters": True,
-                        "user_management": True,  # Admin can manage users
-                        "settings": True,
-                        "audit_log": True,
-                        "backup_restore": True,
-                        "archive": True,
-                    }
-                else:
-                    # Regular user gets limited permissions
-                    default_permissions = {
-                        "dashboard": True,
-                        "employees": True,
-                        "add_employee": True,
-                        "edit_employee": True,
-                        "delete_employee": False,  # Delete disabled by default for safety
-                        "print_system": True,
-                        "bulk_operations": True,
-                        "reports": True,
-                        "letters": True,
-                        "user_management": False,  # Regular users cannot manage users
-                        "settings": True,
-                        "audit_log": True,
-                        "backup_restore": True,
-                        "archive": True,
-                    }
-
-                # Apply default permissions
-                import json
-                perms_json = json.dumps(default_permissions)
-                self.conn.execute("INSERT OR REPLACE INTO user_permissions (username, permissions) VALUES (?, ?)",
-                                (username, perms_json))
-                self.conn.commit()
-                logging.info(f"Created {role} user {username} with appropriate permissions")
-                return  # Success - exit retry loop
-                
-            except sqlite3.OperationalError as e:
-                if "locked" in str(e).lower() and attempt < max_retries - 1:
-                    import time
-                    logging.warning(f"Database locked on create_user attempt {attempt + 1}/{max_retries}, retrying in {retry_delay}s...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                else:
-                    raise  # Re-raise if not a lock error or max retries reached
-            except sqlite3.IntegrityError:
-                # Username already exists - don't retry, just raise
-                raise
+        Returns the writer Future; it raises sqlite3.IntegrityError if the username is taken.
+        """
+        # Set permissions based on role
+        if role == "admin":
+            # Admin gets full permissions
+            default_permissions = {
+                "dashboard": True,
+                "employees": True,
+                "add_employee": True,
+                "edit_employee": True,
+                "delete_employee": True,
+                "print_system": True,
+                "bulk_operations": True,
+                "reports": True,
+                "letters": True,
+                "user_management": True,  # Admin can manage users
+                "settings": True,
+                "audit_log": True,
+                "backup_restore": True,
+                "archive": True,
+            }
+        else:
+            # Regular user gets limited permissions
+            default_permissions = {
+                "dashboard": True,
+                "employees": True,
+                "add_employee": True,
+                "edit_employee": True,
+                "delete_employee": False,  # Delete disabled by default for safety
+                "print_system": True,
+                "bulk_operations": True,
+                "reports": True,
+                "letters": True,
+                "user_management": False,  # Regular users cannot manage users
+                "settings": True,
+                "audit_log": True,
+                "backup_restore": True,
+                "archive": True,
+            }
+
+        return self.writer.submit(self._create_user, username, name, _hash_pin(pin), role,
+                                  json.dumps(default_permissions), label=f"create_user:{username}")
+
+    @staticmethod
+    def _create_user(conn, username, name, pin_hash, role, perms_json):
+        conn.execute(
+            "INSERT INTO users(username, password, pin, pin_change_required, role, name) VALUES(?, ?, ?, ?, ?, ?)",
+            (username, None, pin_hash, 0, role, name)  # password=None, pin_change_required=0 for new users
+        )
+        # Apply default permissions
+        conn.execute("INSERT OR REPLACE INTO user_permissions (username, permissions) VALUES (?, ?)",
+                     (username, perms_json))
+        logging.info(f"Created {role} user {username} with appropriate permissions")
 
     def update_user(self, username, name, role):
         """Update user details (name and role)"""
@@ -1478,6 +1918,7 @@ Respectfully yours,
     # v2.1: DATABASE BACKUP AND MAINTENANCE
     # ============================================================================
 
+    @metrics.timed("db.check_database_integrity", slow_ms=DB_SLOW_QUERY_MS)
     def check_database_integrity(self) -> Tuple[bool, List[str]]:
         """
         Check database integrity and report any issues
@@ -1488,10 +1929,14 @@ Respectfully yours,
         issues = []
 
         try:
-            # 1. Run SQLite integrity check
-            result = self.conn.execute("PRAGMA integrity_check").fetchone()
-            if result and result[0] != 'ok':
-                issues.append(f"Database integrity check failed: {result[0]}")
+            # 1. Run SQLite integrity check, unless the maintenance scheduler checked recently
+            last_check = last_successful_run(self.conn, 'quick_check')
+            if last_check and datetime.now() - datetime.fromisoformat(last_check) < timedelta(days=INTEGRITY_CHECK_TRUST_DAYS):
+                logging.info(f"Skipping integrity_check: quick_check passed at {last_check}")
+            else:
+                result = self.conn.execute("PRAGMA integrity_check").fetchone()
+                if result and result[0] != 'ok':
+                    issues.append(f"Database integrity check failed: {result[0]}")
 
             # 2. Check that all required tables exist
             required_tables = [
@@ -1571,6 +2016,7 @@ Respectfully yours,
             logging.error(f"Error during database integrity check: {e}")
             return (False, [f"Integrity check error: {str(e)}"])
 
+    @metrics.timed("backup.database")
     @retry_on_lock(max_attempts=3, delay=0.5)
     def backup_database(self, backup_dir=BACKUPS_DIR):
         """
@@ -1600,7 +2046,11 @@ Respectfully yours,
                 if os.path.exists(src):
                     shutil.copy2(src, backup_path + ext)
 
-            logging.info(f"Database backed up to: {backup_path}")
+            # Archived audit history lives only in the yearly archives
+            archives = backup_archives(DB_FILE, backup_path + ARCHIVE_BACKUP_SUFFIX)
+
+            logging.info(f"Database backed up to: {backup_path}"
+                         + (f" (+{len(archives)} audit archive(s))" if archives else ""))
 
             # Keep only last 10 backups
             self._cleanup_old_backups(backup_dir, keep_count=10)
@@ -1622,11 +2072,12 @@ Respectfully yours,
             for old_backup in backups[keep_count:]:
                 try:
                     old_backup.unlink()
-                    # Also remove WAL/SHM files
+                    # Also remove WAL/SHM files and the audit archive copies
                     for ext in ['-wal', '-shm']:
                         wal_file = Path(str(old_backup) + ext)
                         if wal_file.exists():
                             wal_file.unlink()
+                    shutil.rmtree(str(old_backup) + ARCHIVE_BACKUP_SUFFIX, ignore_errors=True)
                     logging.info(f"Removed old backup: {old_backup.name}")
                 except Exception as e:
                     logging.warning(f"Could not remove old backup {old_backup}: {e}")
@@ -1647,6 +2098,7 @@ Respectfully yours,
         key = pbkdf2_hmac('sha256', password.encode(), salt, 100000, dklen=32)
         return base64.urlsafe_b64encode(key)
 
+    @metrics.timed("backup.encrypted")
     def backup_database_encrypted(self, password: str, backup_dir: str = None) -> Optional[str]:
         """
         Create an encrypted backup of the database.
@@ -1686,7 +2138,19 @@ Respectfully yours,
                 # Write header for identification
                 f.write(b'EVAULT_ENC_V1\n')
                 f.write(encrypted_data)
-            
+
+            # Audit archives, each encrypted the same way next to the backup
+            import tempfile
+            with tempfile.TemporaryDirectory() as temp_dir:
+                for archive in backup_archives(DB_FILE, temp_dir):
+                    archive_dir = backup_path + ARCHIVE_BACKUP_SUFFIX
+                    os.makedirs(archive_dir, exist_ok=True)
+                    with open(archive, 'rb') as f:
+                        archive_data = fernet.encrypt(f.read())
+                    with open(os.path.join(archive_dir, os.path.basename(archive) + ".enc"), 'wb') as f:
+                        f.write(b'EVAULT_ENC_V1\n')
+                        f.write(archive_data)
+
             logging.info(f"Encrypted backup created: {backup_path}")
             
             # Log security event
@@ -1740,6 +2204,21 @@ Respectfully yours,
             # Verify decrypted data is a valid SQLite database
             if not db_data.startswith(b'SQLite format 3'):
                 return False, "Decrypted data is not a valid SQLite database"
+
+            # Audit archives saved with the backup (decrypted up front, like the database)
+            archives = {}
+            archive_dir = backup_path + ARCHIVE_BACKUP_SUFFIX
+            if os.path.isdir(archive_dir):
+                for name in sorted(os.listdir(archive_dir)):
+                    if not name.endswith(".db.enc"):
+                        continue
+                    with open(os.path.join(archive_dir, name), 'rb') as f:
+                        if f.readline() != b'EVAULT_ENC_V1\n':
+                            return False, f"Invalid encrypted audit archive: {name}"
+                        try:
+                            archives[name[:-len(".enc")]] = fernet.decrypt(f.read())
+                        except InvalidToken:
+                            return False, f"Invalid password or corrupted audit archive: {name}"
             
             # Create safety backup
             if create_backup_first:
@@ -1747,12 +2226,24 @@ Respectfully yours,
                 if not safety_backup:
                     return False, "Could not create safety backup"
             
-            # Close current connection
+            # Close current connections
+            self._shutdown_replica()
+            self._close_probe_connection()
+            self._shutdown_writer()
+            self._shutdown_checkpointer()
+            self._shutdown_maintenance()
             self.conn.close()
             
             # Write decrypted database
             with open(DB_FILE, 'wb') as f:
                 f.write(db_data)
+            if archives:
+                import tempfile
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    for name, data in archives.items():
+                        with open(os.path.join(temp_dir, name), 'wb') as f:
+                            f.write(data)
+                    restore_archives(temp_dir, DB_FILE)
             
             # Reconnect
             self.__init__(DB_FILE)
@@ -1814,6 +2305,7 @@ Respectfully yours,
         except Exception as e:
             return False, f"Restore test failed: {e}"
 
+    @metrics.timed("backup.restore")
     def restore_from_backup(self, backup_path: str, create_backup_first: bool = True) -> Tuple[bool, str]:
         """
         Restore database from backup file.
@@ -1840,7 +2332,12 @@ Respectfully yours,
                     return False, "Could not create safety backup of current database"
                 logging.info(f"Safety backup created: {safety_backup}")
 
-            # Close current connection
+            # Close current connections
+            self._shutdown_replica()
+            self._close_probe_connection()
+            self._shutdown_writer()
+            self._shutdown_checkpointer()
+            self._shutdown_maintenance()
             self.conn.close()
 
             # Replace database file
@@ -1852,6 +2349,9 @@ Respectfully yours,
                 if os.path.exists(backup_extra):
                     shutil.copy2(backup_extra, DB_FILE + ext)
 
+            # The audit archives the restored manifest refers to
+            restore_archives(backup_path + ARCHIVE_BACKUP_SUFFIX, DB_FILE)
+
             # Reconnect
             self.__init__(DB_FILE)
 
@@ -1900,14 +2400,16 @@ Respectfully yours,
         except Exception as e:
             return False, f"Integrity check failed: {e}"
 
+    @metrics.timed("db.get_database_stats", slow_ms=DB_SLOW_QUERY_MS)
     def get_database_stats(self):
         """Get database statistics"""
         try:
             stats = {}
-            stats['total_employees'] = self.conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
-            stats['active_employees'] = self.conn.execute("SELECT COUNT(*) FROM employees WHERE resign_date IS NULL OR resign_date = ''").fetchone()[0]
-            stats['total_users'] = self.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
-            stats['total_agencies'] = self.conn.execute("SELECT COUNT(*) FROM agencies").fetchone()[0]
+            conn = self.read_conn
+            stats['total_employees'] = conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+            stats['active_employees'] = conn.execute("SELECT COUNT(*) FROM employees WHERE resign_date IS NULL OR resign_date = ''").fetchone()[0]
+            stats['total_users'] = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+            stats['total_agencies'] = conn.execute("SELECT COUNT(*) FROM agencies").fetchone()[0]
 
             # Get database file size
             if os.path.exists(DB_FILE):
@@ -1921,6 +2423,7 @@ Respectfully yours,
             return {}
 
     # Agencies
+    @metrics.timed("db.get_agencies", slow_ms=DB_SLOW_QUERY_MS)
     def get_agencies(self, force_refresh=False):
         """QUICK WIN #4: Get agencies with caching (5-minute TTL) - Thread-safe"""
         import time
@@ -1932,7 +2435,7 @@ Respectfully yours,
                     return self._agencies_cache
 
             # Fetch fresh data and update cache
-            self._agencies_cache = [r[0] for r in self.conn.execute("SELECT name FROM agencies ORDER BY name").fetchall()]
+            self._agencies_cache = [r[0] for r in self.read_conn.execute("SELECT name FROM agencies ORDER BY name").fetchall()]
             self._agencies_cache_time = time.time()
             return self._agencies_cache
 
@@ -1994,7 +2497,7 @@ Respectfully yours,
             query += " LIMIT ? OFFSET ?"
             params.extend([limit, offset])
         
-        return [dict(r) for r in self.conn.execute(query, params).fetchall()]
+        return [dict(r) for r in self._profile_query("all_employees", query, params, self.read_conn).fetchall()]
     
     def count_employees(self, search: str = None, filters: Dict[str, Any] = None) -> int:
         """Get total count of employees matching criteria (for pagination)."""
@@ -2022,97 +2525,312 @@ Respectfully yours,
         if where_clauses:
             query += " WHERE " + " AND ".join(where_clauses)
         
-        return self.conn.execute(query, params).fetchone()[0]
+        return self._profile_query("count_employees", query, params, self.read_conn).fetchone()[0]
+
+    _INSERT_EMPLOYEE_SQL = """INSERT INTO employees(emp_id,name,email,phone,department,position,hire_date,resign_date,salary,notes,modified,modified_by,contract_expiry,agency,sss_number,emergency_contact_name,emergency_contact_phone,contract_start_date,contract_months,tin_number,pagibig_number,philhealth_number)
+                        VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)"""
+    _UPDATE_EMPLOYEE_SQL = """UPDATE employees SET
+                        name=?,email=?,phone=?,department=?,position=?,hire_date=?,resign_date=?,salary=?,notes=?,modified=?,modified_by=?,contract_expiry=?,agency=?,sss_number=?,emergency_contact_name=?,emergency_contact_phone=?,contract_start_date=?,contract_months=?,tin_number=?,pagibig_number=?,philhealth_number=?
+                        WHERE emp_id=?"""
+
+    @staticmethod
+    def _employee_values(data: Dict[str, Any]) -> tuple:
+        """Column values after emp_id, in _INSERT_EMPLOYEE_SQL / _UPDATE_EMPLOYEE_SQL order"""
+        return (data["name"], data.get("email",""), data.get("phone",""), data.get("department",""),
+                data.get("position",""), data["hire_date"], data.get("resign_date"),
+                float(data.get("salary") or 0), data.get("notes",""), data.get("modified",""),
+                data.get("modified_by",""), data.get("contract_expiry",""), data.get("agency"),
+                data.get("sss_number"), data.get("emergency_contact_name"), data.get("emergency_contact_phone"),
+                data.get("contract_start_date"), data.get("contract_months"),
+                data.get("tin_number"), data.get("pagibig_number"), data.get("philhealth_number"))
+
+    @staticmethod
+    def _update_details(old_dict: Dict[str, Any], data: Dict[str, Any]) -> str:
+        """Audit details for an employee update, listing the changed key fields"""
+        changes = []
+        if old_dict.get('name') != data['name']:
+            changes.append(f"name: {old_dict.get('name')} → {data['name']}")
+        if old_dict.get('department') != data.get('department'):
+            changes.append(f"department: {old_dict.get('department')} → {data.get('department')}")
+        if old_dict.get('position') != data.get('position'):
+            changes.append(f"position: {old_dict.get('position')} → {data.get('position')}")
+        # Fix salary comparison to handle None and 0 properly
+        old_salary = float(old_dict.get('salary') or 0)
+        new_salary = float(data.get('salary') or 0)
+        if old_salary != new_salary:
+            changes.append(f"salary: ₱{old_salary:.2f} → ₱{new_salary:.2f}")
+
+        details = f"Updated employee: {data['name']}"
+        if changes:
+            details += " | Changes: " + "; ".join(changes[:5])  # Limit to 5 changes
+        return details
 
     @check_permission('add_employee')
-    @retry_on_lock(max_attempts=3, delay=0.5)
-    def insert_employee(self, data: Dict[str, Any]) -> None:
-        self.conn.execute("""INSERT INTO employees(emp_id,name,email,phone,department,position,hire_date,resign_date,salary,notes,modified,modified_by,contract_expiry,agency,sss_number,emergency_contact_name,emergency_contact_phone,contract_start_date,contract_months,tin_number,pagibig_number,philhealth_number)
-                              VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-                          (data["emp_id"], data["name"], data.get("email",""), data.get("phone",""),
-                           data.get("department",""), data.get("position",""), data["hire_date"], data.get("resign_date"),
-                           float(data.get("salary") or 0), data.get("notes",""), data.get("modified",""),
-                           data.get("modified_by",""), data.get("contract_expiry",""), data.get("agency"),
-                           data.get("sss_number"), data.get("emergency_contact_name"), data.get("emergency_contact_phone"),
-                           data.get("contract_start_date"), data.get("contract_months"),
-                           data.get("tin_number"), data.get("pagibig_number"), data.get("philhealth_number"))) # <-- ADDED 3 NEW FIELDS
+    def insert_employee(self, data: Dict[str, Any]) -> Future:
+        """
+        Queue a new employee (and its audit row) on the writer thread.
+
+        Returns the writer Future; it raises sqlite3.IntegrityError for a
+        duplicate emp_id or government ID.
+        """
+        return self.writer.submit(self._insert_employee, dict(data), label=f"insert_employee:{data.get('emp_id')}")
+
+    @staticmethod
+    @metrics.timed("db.insert_employee", slow_ms=DB_SLOW_QUERY_MS)
+    def _insert_employee(conn, data: Dict[str, Any]) -> None:
+        conn.execute(DB._INSERT_EMPLOYEE_SQL, (data["emp_id"],) + DB._employee_values(data))
         # Log the action
-        self.log_action(
-            username=data.get("modified_by", "system"),
-            action="ADDED",
-            table_name="employees",
-            record_id=data["emp_id"],
-            details=f"Added employee: {data['name']}"
-        )
+        DB._write_audit(conn, data.get("modified_by", "system"), "ADDED", "employees", data["emp_id"],
+                        details=f"Added employee: {data['name']}")
 
     @check_permission('edit_employee')
-    @retry_on_lock(max_attempts=3, delay=0.5)
-    def update_employee(self, emp_id: str, data: Dict[str, Any]) -> None:
+    def update_employee(self, emp_id: str, data: Dict[str, Any]) -> Future:
+        """Queue an employee update (and its audit row) on the writer thread. Returns the writer Future."""
+        return self.writer.submit(self._update_employee, emp_id, dict(data), label=f"update_employee:{emp_id}")
+
+    @staticmethod
+    @metrics.timed("db.update_employee", slow_ms=DB_SLOW_QUERY_MS)
+    def _update_employee(conn, emp_id: str, data: Dict[str, Any]) -> None:
         # Get old data for comparison
-        old_data = self.conn.execute("SELECT * FROM employees WHERE emp_id=?", (emp_id,)).fetchone()
-
-        self.conn.execute("""UPDATE employees SET
-                             name=?,email=?,phone=?,department=?,position=?,hire_date=?,resign_date=?,salary=?,notes=?,modified=?,modified_by=?,contract_expiry=?,agency=?,sss_number=?,emergency_contact_name=?,emergency_contact_phone=?,contract_start_date=?,contract_months=?,tin_number=?,pagibig_number=?,philhealth_number=?
-                             WHERE emp_id=?""",
-                          (data["name"], data.get("email",""), data.get("phone",""), data.get("department",""),
-                           data.get("position",""), data["hire_date"], data.get("resign_date"),
-                           float(data.get("salary") or 0), data.get("notes",""), data.get("modified",""),
-                           data.get("modified_by",""), data.get("contract_expiry",""), data.get("agency"),
-                           data.get("sss_number"), data.get("emergency_contact_name"), data.get("emergency_contact_phone"),
-                           data.get("contract_start_date"), data.get("contract_months"),
-                           data.get("tin_number"), data.get("pagibig_number"), data.get("philhealth_number"), emp_id))
+        old_data = conn.execute("SELECT * FROM employees WHERE emp_id=?", (emp_id,)).fetchone()
+
+        conn.execute(DB._UPDATE_EMPLOYEE_SQL, DB._employee_values(data) + (emp_id,))
 
         # Log the action with changed fields
         if old_data:
             # Convert sqlite3.Row to dict properly
             old_dict = {key: old_data[key] for key in old_data.keys()}
-            changes = []
-            if old_dict.get('name') != data['name']:
-                changes.append(f"name: {old_dict.get('name')} → {data['name']}")
-            if old_dict.get('department') != data.get('department'):
-                changes.append(f"department: {old_dict.get('department')} → {data.get('department')}")
-            if old_dict.get('position') != data.get('position'):
-                changes.append(f"position: {old_dict.get('position')} → {data.get('position')}")
-            # Fix salary comparison to handle None and 0 properly
-            old_salary = float(old_dict.get('salary') or 0)
-            new_salary = float(data.get('salary') or 0)
-            if old_salary != new_salary:
-                changes.append(f"salary: ₱{old_salary:.2f} → ₱{new_salary:.2f}")
-
-            details = f"Updated employee: {data['name']}"
-            if changes:
-                details += " | Changes: " + "; ".join(changes[:5])  # Limit to 5 changes
-
-            self.log_action(
-                username=data.get("modified_by", "system"),
-                action="EDITED",
-                table_name="employees",
-                record_id=emp_id,
-                details=details
-            )
+            DB._write_audit(conn, data.get("modified_by", "system"), "EDITED", "employees", emp_id,
+                            details=DB._update_details(old_dict, data))
 
+    @metrics.timed("db.delete_employees", slow_ms=DB_SLOW_QUERY_MS)
     @check_permission('delete_employee')
     def delete_employees(self, emp_ids: List[str], username: str = "system") -> None:
-        # Get employee names before deleting
-        names = {}
-        for emp_id in emp_ids:
-            row = self.conn.execute("SELECT name FROM employees WHERE emp_id=?", (emp_id,)).fetchone()
-            if row:
-                names[emp_id] = row[0]
+        """Delete employees in one set-based transaction (names captured for the audit log in one query)"""
+        ids = self._stage_emp_ids(emp_ids)
+        if not ids:
+            return
+        try:
+            names = dict(self.conn.execute(
+                "SELECT emp_id, name FROM employees WHERE emp_id IN (SELECT emp_id FROM temp._bulk_ids)"
+            ).fetchall())
 
-        self.conn.executemany("DELETE FROM employees WHERE emp_id=?", [(i,) for i in emp_ids])
+            self.conn.execute("DELETE FROM employees WHERE emp_id IN (SELECT emp_id FROM temp._bulk_ids)")
+
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.conn.executemany("""
+                INSERT INTO audit_log(timestamp, username, action, table_name, record_id, details)
+                VALUES(?, ?, 'DELETED', 'employees', ?, ?)
+            """, [(timestamp, username, emp_id, f"Deleted employee: {names.get(emp_id, 'Unknown')}") for emp_id in ids])
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    # ==================== SET-BASED BULK MUTATIONS ====================
+
+    def _stage_emp_ids(self, emp_ids: List[str], conn: sqlite3.Connection = None) -> List[str]:
+        """
+        Load emp_ids into the connection's temp._bulk_ids table for set-based statements
+        (self.conn unless a writer job passes its own). The temp table lives in memory
+        (temp_store=MEMORY), so this never touches the share and avoids SQLite's
+        bound-parameter limit for large IN lists.
+        """
+        conn = conn or self.conn
+        ids = list(dict.fromkeys(i for i in emp_ids if i))
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _bulk_ids(emp_id TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM temp._bulk_ids")
+        conn.executemany("INSERT INTO temp._bulk_ids(emp_id) VALUES(?)", [(i,) for i in ids])
+        return ids
+
+    @check_permission('bulk_operations')
+    def bulk_update(self, emp_ids: List[str], field_changes: Dict[str, Any], username: str = "system") -> Future:
+        """
+        Apply the same field changes to many employees in one transaction on the writer thread.
+
+        Old values are captured with a single SELECT, the change is one UPDATE over
+        the staged id set, and the audit entries are written with executemany.
+
+        Args:
+            emp_ids: Employee IDs to update
+            field_changes: {column: new_value}; columns must be in BULK_UPDATABLE_FIELDS
+                (ValueError, raised here, otherwise)
+            username: User performing the change (permission-checked)
+
+        Returns:
+            The writer Future, resolving to the number of employees updated
+        """
+        unknown = set(field_changes) - BULK_UPDATABLE_FIELDS
+        if unknown:
+            raise ValueError(f"Fields not allowed in bulk update: {', '.join(sorted(unknown))}")
+        return self.writer.submit(self._bulk_update, list(emp_ids), dict(field_changes), username, label="bulk_update")
+
+    @metrics.timed("db.bulk_update", slow_ms=DB_SLOW_QUERY_MS)
+    def _bulk_update(self, conn, emp_ids: List[str], field_changes: Dict[str, Any], username: str) -> int:
+        if not field_changes:
+            return 0
+        columns = sorted(field_changes)
+        ids = self._stage_emp_ids(emp_ids, conn)
+        if not ids:
+            return 0
+
+        old_rows = conn.execute(
+            f"SELECT emp_id, name, {', '.join(columns)} FROM employees "
+            f"WHERE emp_id IN (SELECT emp_id FROM temp._bulk_ids)"
+        ).fetchall()
+
+        modified = datetime.now().strftime("%m-%d-%Y %H:%M")
+        assignments = ", ".join(f"{col}=?" for col in columns)
+        conn.execute(
+            f"UPDATE employees SET {assignments}, modified=?, modified_by=? "
+            f"WHERE emp_id IN (SELECT emp_id FROM temp._bulk_ids)",
+            [field_changes[col] for col in columns] + [modified, username]
+        )
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        new_json = json.dumps({col: field_changes[col] for col in columns})
+        audit_rows = []
+        for row in old_rows:
+            old_values = {col: row[col] for col in columns}
+            changes = [f"{col}: {old_values[col]} → {field_changes[col]}"
+                       for col in columns if old_values[col] != field_changes[col]]
+            if not changes:
+                continue
+            audit_rows.append((
+                timestamp, username, row['emp_id'], json.dumps(old_values), new_json,
+                f"Bulk updated employee: {row['name']} | Changes: " + "; ".join(changes)
+            ))
+        conn.executemany("""
+            INSERT INTO audit_log(timestamp, username, action, table_name, record_id, old_value, new_value, details)
+            VALUES(?, ?, 'BULK_EDITED', 'employees', ?, ?, ?, ?)
+        """, audit_rows)
+
+        logging.info(f"Bulk update by {username}: {', '.join(columns)} on {len(old_rows)} employee(s)")
+        return len(old_rows)
+
+    @check_permission('delete_employee')
+    def bulk_archive(self, emp_ids: List[str], username: str, reason: str = "") -> Future:
+        """
+        Archive (soft delete) many employees in one transaction on the writer thread.
+
+        Rows are copied into archived_employees with INSERT ... SELECT, removed
+        from employees with one DELETE, and audited with executemany.
+
+        Returns:
+            The writer Future, resolving to the emp_ids that were archived
+            (ids not found are skipped)
+        """
+        return self.writer.submit(self._bulk_archive, list(emp_ids), username, reason, label="bulk_archive")
+
+    @metrics.timed("db.bulk_archive", slow_ms=DB_SLOW_QUERY_MS)
+    def _bulk_archive(self, conn, emp_ids: List[str], username: str, reason: str) -> List[str]:
+        cols = ", ".join(ARCHIVE_COLUMNS)
+        ids = self._stage_emp_ids(emp_ids, conn)
+        if not ids:
+            return []
+
+        names = dict(conn.execute(
+            "SELECT emp_id, name FROM employees WHERE emp_id IN (SELECT emp_id FROM temp._bulk_ids)"
+        ).fetchall())
+        if not names:
+            return []
+
+        conn.execute(f"""
+            INSERT INTO archived_employees({cols}, archived_date, archived_by, archive_reason)
+            SELECT {cols}, ?, ?, ? FROM employees
+            WHERE emp_id IN (SELECT emp_id FROM temp._bulk_ids)
+        """, (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), username, reason))
+        conn.execute("DELETE FROM employees WHERE emp_id IN (SELECT emp_id FROM temp._bulk_ids)")
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        archived = [emp_id for emp_id in ids if emp_id in names]
+        conn.executemany("""
+            INSERT INTO audit_log(timestamp, username, action, table_name, record_id, details)
+            VALUES(?, ?, 'ARCHIVED', 'employees', ?, ?)
+        """, [(timestamp, username, emp_id,
+               f"Archived employee: {names[emp_id]} - Reason: {reason or 'None specified'}")
+              for emp_id in archived])
+
+        logging.info(f"Bulk archive by {username}: {len(archived)} employee(s)")
+        return archived
+
+    @check_permission('add_employee')
+    def import_employees(self, employees: List[Dict[str, Any]], username: str = "system",
+                         update_existing: bool = False) -> Future:
+        """
+        Import employee records (e.g. a JSON export) in one transaction on the writer thread.
+
+        Rows whose government IDs are already used by another employee, or
+        repeated within the batch, are skipped up front with one set-based
+        check instead of failing on the unique index part-way through.
+
+        Args:
+            employees: Employee dicts keyed by column name
+            username: User performing the import (permission-checked)
+            update_existing: Overwrite employees whose emp_id already exists (else skip them)
+
+        Returns:
+            The writer Future, resolving to {'added': n, 'updated': n, 'skipped': n,
+            'conflicts': [...]} where conflicts are find_gov_id_batch_conflicts()
+            dicts, one per skipped row
+        """
+        if update_existing:
+            require_permission(self, username, 'edit_employee', 'import_employees')
+        return self.writer.submit(self._import_employees, [dict(emp) for emp in employees], username,
+                                  update_existing, label="import_employees")
+
+    @metrics.timed("db.import_employees", slow_ms=DB_SLOW_QUERY_MS)
+    def _import_employees(self, conn, employees: List[Dict[str, Any]], username: str,
+                          update_existing: bool) -> Dict[str, Any]:
+        conflicts = {}
+        for conflict in find_gov_id_batch_conflicts(conn, employees):
+            conflicts.setdefault(conflict['row'], conflict)
+        result = {'added': 0, 'updated': 0, 'skipped': len(conflicts), 'conflicts': list(conflicts.values())}
+
+        # Every existing row the batch touches, in one query over the staged ids
+        self._stage_emp_ids([emp.get('emp_id') for emp in employees], conn)
+        existing = {row['emp_id']: dict(row) for row in conn.execute(
+            "SELECT * FROM employees WHERE emp_id IN (SELECT emp_id FROM temp._bulk_ids)")}
+
+        modified = datetime.now().strftime("%m-%d-%Y %H:%M")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        inserts, updates, audit_rows = [], [], []
+        for row_no, emp in enumerate(employees):
+            if row_no in conflicts:
+                continue
+            emp_id = emp.get('emp_id')
+            old = existing.get(emp_id) if emp_id else None
+            if not emp_id or not emp.get('name') or (old is None and not emp.get('hire_date')):
+                result['skipped'] += 1
+            elif old is None:
+                data = {**emp, 'modified': modified, 'modified_by': username}
+                inserts.append((emp_id,) + self._employee_values(data))
+                audit_rows.append((timestamp, username, 'ADDED', emp_id, f"Added employee: {data['name']}"))
+                existing[emp_id] = data  # A repeat of this emp_id later in the batch updates it
+                result['added'] += 1
+            elif update_existing:
+                values = {k: v for k, v in emp.items() if v not in (None, '')}
+                data = {**old, **values, 'modified': modified, 'modified_by': username}
+                updates.append(self._employee_values(data) + (emp_id,))
+                audit_rows.append((timestamp, username, 'EDITED', emp_id, self._update_details(old, data)))
+                existing[emp_id] = data
+                result['updated'] += 1
+            else:
+                result['skipped'] += 1
+
+        # Inserts first, so an update of an emp_id added earlier in the batch finds its row
+        conn.executemany(self._INSERT_EMPLOYEE_SQL, inserts)
+        conn.executemany(self._UPDATE_EMPLOYEE_SQL, updates)
+        conn.executemany("""
+            INSERT INTO audit_log(timestamp, username, action, table_name, record_id, details)
+            VALUES(?, ?, ?, 'employees', ?, ?)
+        """, audit_rows)
+        logging.info(f"Import by {username}: {result['added']} added, {result['updated']} updated, "
+                     f"{result['skipped']} skipped ({len(conflicts)} duplicate government IDs)")
+        return result
 
-        # Log deletions
-        for emp_id in emp_ids:
-            self.log_action(
-                username=username,
-                action="DELETED",
-                table_name="employees",
-                record_id=emp_id,
-                details=f"Deleted employee: {names.get(emp_id, 'Unknown')}"
-            )
     def employee_exists(self, emp_id): return bool(self.conn.execute("SELECT 1 FROM employees WHERE emp_id=?", (emp_id,)).fetchone())
 
+    @metrics.timed("db.get_employee", slow_ms=DB_SLOW_QUERY_MS)
     def get_employee(self, emp_id):
         """Get employee by ID, returns dict or None"""
         row = self.conn.execute("SELECT * FROM employees WHERE emp_id=?", (emp_id,)).fetchone()
@@ -2142,7 +2860,46 @@ Respectfully yours,
             logging.error(f"Failed to delete file record: {e}")
             return False
 
+    @metrics.timed("db.find_name_candidates", slow_ms=DB_SLOW_QUERY_MS)
+    def find_name_candidates(self, name: str, exclude_emp_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Employees whose names could be duplicates of name, from the blocking-key
+        index: a small block to score instead of the whole employee table.
+        """
+        candidates = find_name_candidates(self.conn, name, exclude_emp_id)
+        self._schedule_name_sync()
+        return candidates
+
+    @metrics.timed("db.find_gov_id_conflicts", slow_ms=DB_SLOW_QUERY_MS)
+    def find_gov_id_conflicts(self, ids: Dict[str, Optional[str]], exclude_emp_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Employees other than exclude_emp_id that already hold any of the given
+        government IDs ({'sss_number': ..., 'tin_number': ..., ...}), matched
+        without separators, in one indexed query.
+        """
+        return find_gov_id_conflicts(self.conn, ids, exclude_emp_id)
+
+    @metrics.timed("db.find_gov_id_batch_conflicts", slow_ms=DB_SLOW_QUERY_MS)
+    def find_gov_id_batch_conflicts(self, employees: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Government-ID conflicts of a whole import batch, against the database and within the batch"""
+        in_transaction = self.conn.in_transaction
+        conflicts = find_gov_id_batch_conflicts(self.conn, employees)
+        if not in_transaction:
+            self.conn.commit()  # only the temp staging table was written; don't leave it open
+        return conflicts
+
+    def _schedule_name_sync(self):
+        """Index queued employees on the writer thread (at most one sync queued at a time)"""
+        if self._name_sync is not None and not self._name_sync.done():
+            return
+        try:
+            if pending_name_sync(self.conn):
+                self._name_sync = self.writer.submit(sync_name_index, label="name_index_sync")
+        except sqlite3.Error as e:
+            logging.debug(f"Name index sync deferred: {e}")
+
     # Archive/Restore Methods (Priority #2 - Delete Protection)
+    @metrics.timed("db.archive_employee", slow_ms=DB_SLOW_QUERY_MS)
     def archive_employee(self, emp_id, username, reason=""):
         """Archive (soft delete) an employee"""
         # Get employee data
@@ -2187,8 +2944,20 @@ Respectfully yours,
 
         return True
 
+    def find_restore_conflicts(self, emp_id) -> List[Dict[str, Any]]:
+        """Active employees already holding a government ID of archived employee emp_id"""
+        emp = self.conn.execute("SELECT * FROM archived_employees WHERE emp_id=?", (emp_id,)).fetchone()
+        if not emp:
+            return []
+        return find_gov_id_conflicts(self.conn, {field: emp[field] for field in GOV_ID_FIELDS}, emp_id)
+
     def restore_employee(self, emp_id, username):
-        """Restore an archived employee"""
+        """
+        Restore an archived employee (committed on success, rolled back on failure).
+
+        Raises sqlite3.IntegrityError when one of its government IDs now
+        belongs to an active employee; see find_restore_conflicts().
+        """
         # Get archived employee data
         emp = self.conn.execute("SELECT * FROM archived_employees WHERE emp_id=?", (emp_id,)).fetchone()
         if not emp:
@@ -2196,42 +2965,48 @@ Respectfully yours,
 
         emp_dict = dict(emp)
 
-        # Insert back into employees
-        self.conn.execute("""
-            INSERT INTO employees(
-                emp_id, name, email, phone, department, position, hire_date, resign_date,
-                salary, notes, modified, modified_by, contract_expiry, agency, sss_number,
-                emergency_contact_name, emergency_contact_phone, contract_start_date, contract_months,
-                tin_number, pagibig_number, philhealth_number
-            ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-        """, (
-            emp_dict.get('emp_id'), emp_dict.get('name'), emp_dict.get('email'), emp_dict.get('phone'),
-            emp_dict.get('department'), emp_dict.get('position'), emp_dict.get('hire_date'),
-            emp_dict.get('resign_date'), emp_dict.get('salary'), emp_dict.get('notes'),
-            datetime.now().strftime("%m-%d-%Y %H:%M"), username,
-            emp_dict.get('contract_expiry'), emp_dict.get('agency'), emp_dict.get('sss_number'),
-            emp_dict.get('emergency_contact_name'), emp_dict.get('emergency_contact_phone'),
-            emp_dict.get('contract_start_date'), emp_dict.get('contract_months'),
-            emp_dict.get('tin_number'), emp_dict.get('pagibig_number'), emp_dict.get('philhealth_number') # <-- ADDED 3 NEW FIELDS
-        ))
-
-        # Delete from archive
-        self.conn.execute("DELETE FROM archived_employees WHERE emp_id=?", (emp_id,))
+        try:
+            # Insert back into employees
+            self.conn.execute("""
+                INSERT INTO employees(
+                    emp_id, name, email, phone, department, position, hire_date, resign_date,
+                    salary, notes, modified, modified_by, contract_expiry, agency, sss_number,
+                    emergency_contact_name, emergency_contact_phone, contract_start_date, contract_months,
+                    tin_number, pagibig_number, philhealth_number
+                ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+            """, (
+                emp_dict.get('emp_id'), emp_dict.get('name'), emp_dict.get('email'), emp_dict.get('phone'),
+                emp_dict.get('department'), emp_dict.get('position'), emp_dict.get('hire_date'),
+                emp_dict.get('resign_date'), emp_dict.get('salary'), emp_dict.get('notes'),
+                datetime.now().strftime("%m-%d-%Y %H:%M"), username,
+                emp_dict.get('contract_expiry'), emp_dict.get('agency'), emp_dict.get('sss_number'),
+                emp_dict.get('emergency_contact_name'), emp_dict.get('emergency_contact_phone'),
+                emp_dict.get('contract_start_date'), emp_dict.get('contract_months'),
+                emp_dict.get('tin_number'), emp_dict.get('pagibig_number'), emp_dict.get('philhealth_number') # <-- ADDED 3 NEW FIELDS
+            ))
+
+            # Delete from archive
+            self.conn.execute("DELETE FROM archived_employees WHERE emp_id=?", (emp_id,))
 
-        # Log the action
-        self.log_action(
-            username=username,
-            action="RESTORED",
-            table_name="employees",
-            record_id=emp_id,
-            details=f"Restored employee: {emp_dict.get('name')}"
-        )
+            # Log the action
+            self.log_action(
+                username=username,
+                action="RESTORED",
+                table_name="employees",
+                record_id=emp_id,
+                details=f"Restored employee: {emp_dict.get('name')}"
+            )
 
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
         return True
 
+    @metrics.timed("db.get_archived_employees", slow_ms=DB_SLOW_QUERY_MS)
     def get_archived_employees(self):
         """Get all archived employees"""
-        return [dict(r) for r in self.conn.execute("SELECT * FROM archived_employees ORDER BY archived_date DESC").fetchall()]
+        return [dict(r) for r in self.read_conn.execute("SELECT * FROM archived_employees ORDER BY archived_date DESC").fetchall()]
 
     def permanently_delete_archived(self, emp_id, username):
         """Permanently delete an archived employee"""
@@ -2253,10 +3028,30 @@ Respectfully yours,
     def log_action(self, username, action, table_name=None, record_id=None, old_value=None, new_value=None, details=None):
         """Log user action to audit trail"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        standalone = (not self.conn.in_transaction
+                      or self._pending_audit_changes == self.conn.total_changes)
         self.conn.execute("""
             INSERT INTO audit_log(timestamp, username, action, table_name, record_id, old_value, new_value, details)
             VALUES(?, ?, ?, ?, ?, ?, ?, ?)
         """, (timestamp, username, action, table_name, record_id, old_value, new_value, details))
+        # Not part of another caller's transaction: commit_pending() may release it
+        self._pending_audit_changes = self.conn.total_changes if standalone else None
+
+    def log_action_async(self, username, action, table_name=None, record_id=None, old_value=None, new_value=None, details=None):
+        """log_action through the write executor: committed on its own, from any thread"""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self.writer.submit(self._write_audit, username, action, table_name, record_id, old_value, new_value,
+                                  details, timestamp, label=f"audit:{action}")
+
+    @staticmethod
+    def _write_audit(conn, username, action, table_name=None, record_id=None, old_value=None, new_value=None,
+                     details=None, timestamp=None):
+        """Audit row written inside a writer job's transaction"""
+        conn.execute("""
+            INSERT INTO audit_log(timestamp, username, action, table_name, record_id, old_value, new_value, details)
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+        """, (timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S"), username, action, table_name, record_id,
+              old_value, new_value, details))
 
     def get_audit_log(self, limit=100, username=None, action=None, record_id=None):
         """Get audit log entries with optional filters"""
@@ -2278,12 +3073,98 @@ Respectfully yours,
 
         return [self.row_to_dict(row) for row in self.conn.execute(query, params).fetchall()]
 
+    # Columns the audit browser can filter on (filter key -> column)
+    AUDIT_FILTER_COLUMNS = {'username': 'username', 'action': 'action',
+                            'table_name': 'table_name', 'record_id': 'record_id'}
+
+    def get_audit_page(self, limit=200, after=None, date_from=None, date_to=None, **filters):
+        """
+        Get one page of audit log entries, newest first, using keyset pagination.
+
+        Args:
+            limit: Page size
+            after: (timestamp, id) of the last row of the previous page, or None for the first page
+            date_from: Inclusive start date 'YYYY-MM-DD'
+            date_to: Inclusive end date 'YYYY-MM-DD'
+            **filters: Exact matches on username, action, table_name and record_id
+
+        Each page is an index range scan, so deep pages cost the same as the first.
+        """
+        query = "SELECT * FROM audit_log WHERE 1=1"
+        params = []
+
+        for key, value in filters.items():
+            column = self.AUDIT_FILTER_COLUMNS.get(key)
+            if column is None:
+                raise ValueError(f"Unknown audit filter: {key}")
+            if value:
+                query += f" AND {column} = ?"
+                params.append(value)
+        if date_from:
+            query += " AND timestamp >= ?"
+            params.append(date_from)
+        if date_to:
+            # Timestamps are 'YYYY-MM-DD HH:MM:SS', so compare against the next day
+            next_day = (datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+            query += " AND timestamp < ?"
+            params.append(next_day)
+        if after is not None:
+            # Range on timestamp keeps the index usable; id breaks ties within a second
+            query += " AND timestamp <= ? AND (timestamp < ? OR id < ?)"
+            params.extend([after[0], after[0], after[1]])
+
+        query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        return [self.row_to_dict(row) for row in
+                self._profile_query("get_audit_page", query, params, self.read_conn).fetchall()]
+
+    @metrics.timed("db.get_audit_distinct", slow_ms=DB_SLOW_QUERY_MS)
+    def get_audit_distinct(self, column: str) -> List[str]:
+        """
+        Distinct non-empty values of username / action / table_name in audit_log.
+
+        Walks the column's index with a recursive skip-scan (one index seek per
+        distinct value) instead of reading every audit row.
+        """
+        if column not in ('username', 'action', 'table_name'):
+            raise ValueError(f"Unsupported audit column: {column}")
+        rows = self.read_conn.execute(f"""
+            WITH RECURSIVE vals(v) AS (
+                SELECT MIN({column}) FROM audit_log WHERE {column} > ''
+                UNION ALL
+                SELECT (SELECT MIN({column}) FROM audit_log WHERE {column} > vals.v)
+                FROM vals WHERE vals.v IS NOT NULL
+            )
+            SELECT v FROM vals WHERE v IS NOT NULL
+        """).fetchall()
+        return [r[0] for r in rows]
+
+    @metrics.timed("db.get_employee_history", slow_ms=DB_SLOW_QUERY_MS)
     def get_employee_history(self, emp_id):
-        """Get complete history for an employee"""
-        return [self.row_to_dict(row) for row in self.conn.execute(
-            "SELECT * FROM audit_log WHERE record_id = ? ORDER BY timestamp DESC",
-            (emp_id,)
-        ).fetchall()]
+        """Get complete history for an employee (archived years included)"""
+        return self.query_audit_history('audit_log', "record_id = ?", (emp_id,))
+
+    @metrics.timed("db.query_audit_history", slow_ms=DB_SLOW_QUERY_MS)
+    def query_audit_history(self, table: str = 'audit_log', where: str = "1=1", params=(),
+                            date_from: str = None, date_to: str = None, limit: int = None,
+                            include_archives: bool = True) -> List[Dict]:
+        """
+        Rows of audit_log, security_audit or login_attempts across the hot table
+        and the yearly archives, newest first. Each row has a 'tier' key ('hot'
+        or the archive year).
+
+        Args:
+            table: One of the tiered tables
+            where: SQL condition on the table's own columns
+            params: Parameters for where
+            date_from: Inclusive start date 'YYYY-MM-DD' (also skips older archives)
+            date_to: Inclusive end date 'YYYY-MM-DD' (also skips newer archives)
+            limit: Maximum rows returned
+            include_archives: False to search the hot table only
+        """
+        return query_tiers(self.path, self.conn, table, where, params, date_from=date_from,
+                           date_to=date_to, limit=limit, include_archives=include_archives)
 
     # Security Audit Methods with Tamper Detection
     def _get_computer_name(self) -> str:
@@ -2293,12 +3174,13 @@ Respectfully yours,
         except Exception:
             return "unknown"
 
-    def _get_last_security_hash(self) -> Optional[str]:
-        """Get the hash of the last security audit entry"""
-        row = self.conn.execute(
+    def _get_last_security_hash(self, conn: sqlite3.Connection = None) -> Optional[str]:
+        """Get the hash of the last security audit entry (archived if the hot table is empty)"""
+        conn = conn or self.conn
+        row = conn.execute(
             "SELECT entry_hash FROM security_audit ORDER BY id DESC LIMIT 1"
         ).fetchone()
-        return row[0] if row else None
+        return row[0] if row else archived_chain_head(conn)
 
     def _compute_entry_hash(self, timestamp: str, event_type: str, username: Optional[str],
                             details: Optional[str], previous_hash: Optional[str]) -> str:
@@ -2320,46 +3202,66 @@ Respectfully yours,
             ip_address: IP address of the user
         
         Returns:
-            True if logged successfully, False otherwise
+            True if the event was queued for writing, False otherwise
         """
         try:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
             computer_name = self._get_computer_name()
-            previous_hash = self._get_last_security_hash()
-            entry_hash = self._compute_entry_hash(timestamp, event_type, username, details, previous_hash)
-            
-            self.conn.execute("""
-                INSERT INTO security_audit(timestamp, event_type, username, ip_address, 
-                                          computer_name, details, severity, previous_hash, entry_hash)
-                VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (timestamp, event_type, username, ip_address, computer_name, 
-                  details, severity, previous_hash, entry_hash))
-            self.conn.commit()
-            logging.debug(f"Security event logged: {event_type} by {username}")
+
+            def write(conn):
+                # Read the chain head inside the writer's IMMEDIATE transaction so
+                # concurrent events (from this or another PC) cannot fork the chain
+                previous_hash = self._get_last_security_hash(conn)
+                entry_hash = self._compute_entry_hash(timestamp, event_type, username, details, previous_hash)
+                conn.execute("""
+                    INSERT INTO security_audit(timestamp, event_type, username, ip_address, 
+                                              computer_name, details, severity, previous_hash, entry_hash)
+                    VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (timestamp, event_type, username, ip_address, computer_name, 
+                      details, severity, previous_hash, entry_hash))
+
+            self.writer.submit(write, label=f"security_event:{event_type}")
+            logging.debug(f"Security event queued: {event_type} by {username}")
             return True
         except Exception as e:
             logging.error(f"Failed to log security event: {e}")
             return False
 
-    def verify_security_audit_integrity(self) -> Dict[str, Any]:
+    def verify_security_audit_integrity(self, include_archives: bool = False) -> Dict[str, Any]:
         """
         Verify the integrity of the security audit log using hash chain.
-        
+
+        The hot table's first entry must link to the last archived entry.
+        With include_archives every archived year is re-verified as well, all
+        tiers merged in id order (the order the chain was written in).
+
         Returns:
             Dict with 'valid' boolean and 'details' with any issues found
         """
         try:
-            rows = self.conn.execute(
-                "SELECT id, timestamp, event_type, username, details, previous_hash, entry_hash "
-                "FROM security_audit ORDER BY id ASC"
-            ).fetchall()
-            
-            if not rows:
-                return {"valid": True, "details": "Audit log is empty"}
-            
+            query = ("SELECT id, timestamp, event_type, username, details, previous_hash, entry_hash "
+                     "FROM security_audit ORDER BY id ASC")
+            rows = []
             issues = []
-            expected_previous = None
-            
+            if include_archives:
+                for year in archived_years(self.conn, 'security_audit'):
+                    archive = open_archive(self.path, year)
+                    if archive is None:
+                        issues.append(f"Archive {year}: file missing (chain cannot be verified)")
+                        continue
+                    try:
+                        rows.extend(archive.execute(query).fetchall())
+                    finally:
+                        archive.close()
+                expected_previous = None
+            else:
+                expected_previous = archived_chain_head(self.conn)
+            rows.extend(self.conn.execute(query).fetchall())
+            rows.sort(key=lambda row: row[0])
+
+            if not rows and not issues:
+                return {"valid": True, "details": "Audit log is empty"}
+
             for row in rows:
                 row_id, timestamp, event_type, username, details, previous_hash, entry_hash = row
                 
@@ -2425,13 +3327,16 @@ Respectfully yours,
 
     # Settings Methods
     def get_setting(self, key, default=None):
-        """Get a setting value"""
-        row = self.conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
-        return row[0] if row else default
+        """Get a setting value (from the cached snapshot, see SettingsCache)"""
+        return self.settings.get(key, default)
 
     def set_setting(self, key, value):
-        """Set a setting value"""
-        self.conn.execute("INSERT OR REPLACE INTO settings(key, value) VALUES(?, ?)", (key, value))
+        """Set a setting value (visible to this client's readers immediately)"""
+        self.settings.set(key, value)
+
+    def delete_setting(self, key):
+        """Remove a setting"""
+        self.settings.delete(key)
 
     def set_force_close(self, requested_by: str, message: str = ""):
         """Admin triggers force close for all users (for updates)"""
@@ -2441,37 +3346,46 @@ Respectfully yours,
             'message': message or 'Application update in progress. Please restart.',
             'timestamp': datetime.now().isoformat()
         })
-        self.conn.execute("INSERT OR REPLACE INTO settings(key, value) VALUES(?, ?)", ('force_close', data))
+        self.set_setting('force_close', data)
         self.conn.commit()
         logging.info(f"Force close requested by {requested_by}")
 
     def clear_force_close(self):
         """Clear the force close flag after update is complete"""
-        self.conn.execute("DELETE FROM settings WHERE key = ?", ('force_close',))
+        self.delete_setting('force_close')
         self.conn.commit()
         logging.info("Force close flag cleared")
 
     def check_force_close(self) -> dict:
         """Check if force close is active. Returns dict with status or None"""
-        row = self.conn.execute("SELECT value FROM settings WHERE key = ?", ('force_close',)).fetchone()
-        if row and row[0]:
+        self.settings.refresh()
+        data = self.settings.get_json('force_close')
+        return dict(data) if data and data.get('active') else None
+
+    @staticmethod
+    def parse_force_close(value: Optional[str]) -> Optional[dict]:
+        """Decode the force_close setting; None unless a close is active"""
+        if value:
             try:
-                data = json.loads(row[0])
+                data = json.loads(value)
                 if data.get('active'):
                     return data
-            except (json.JSONDecodeError, TypeError):
+            except (json.JSONDecodeError, TypeError, AttributeError):
                 pass
         return None
 
     # Login Throttling Methods
     def record_login_attempt(self, username: str, success: bool, ip_address: str = None):
-        """Record a login attempt for throttling"""
+        """
+        Record a login attempt for throttling (queued on the writer thread).
+
+        Returns a Future; wait on it before counting attempts if the new row must be visible.
+        """
         timestamp = datetime.now().isoformat()
-        self.conn.execute("""
+        return self.writer.execute("""
             INSERT INTO login_attempts(username, attempt_time, success, ip_address)
             VALUES(?, ?, ?, ?)
-        """, (username, timestamp, 1 if success else 0, ip_address))
-        self.conn.commit()
+        """, (username, timestamp, 1 if success else 0, ip_address), label="record_login_attempt")
 
     def get_recent_failed_attempts(self, username: str, minutes: int = 15) -> int:
         """Get count of failed login attempts in last N minutes"""
@@ -2560,39 +3474,24 @@ Respectfully yours,
         return False
 
     def clear_login_attempts(self, username: str):
-        """Clear failed login attempts for a user (after successful login)"""
-        import time
-        max_retries = 5
-        retry_delay = 0.1  # Start with 100ms
-        
-        for attempt in range(max_retries):
-            try:
-                self.conn.execute("""
-                    DELETE FROM login_attempts
-                    WHERE username = ? AND success = 0
-                """, (username,))
-                self.conn.commit()
-                return  # Success, exit
-            except sqlite3.OperationalError as e:
-                if "locked" in str(e) and attempt < max_retries - 1:
-                    logging.warning(f"Database locked, retry {attempt + 1}/{max_retries} in {retry_delay}s")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                else:
-                    logging.error(f"Failed to clear login attempts after {max_retries} retries: {e}")
-                    # Non-critical operation, just log and continue
-                    return
+        """
+        Clear failed login attempts for a user (after successful login).
+        Queued on the writer thread, which waits out lock contention.
+        """
+        return self.writer.execute("""
+            DELETE FROM login_attempts
+            WHERE username = ? AND success = 0
+        """, (username,), label="clear_login_attempts")
 
     def cleanup_old_login_attempts(self, days: int = 30):
-        """Clean up old login attempts older than N days"""
+        """Clean up old login attempts older than N days (queued on the writer thread)"""
         from datetime import timedelta
         cutoff_time = (datetime.now() - timedelta(days=days)).isoformat()
         
-        self.conn.execute("""
+        return self.writer.execute("""
             DELETE FROM login_attempts
             WHERE attempt_time < ?
-        """, (cutoff_time,))
-        self.conn.commit()
+        """, (cutoff_time,), label="cleanup_old_login_attempts")
 
     def next_sequence(self):
         used = set()
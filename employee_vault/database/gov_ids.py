@@ -0,0 +1,178 @@
+"""
+Normalized government IDs for EmployeeVault
+
+SSS, TIN, PhilHealth and Pag-IBIG numbers are stored as typed, so one
+employee's "12-3456789-0" and another's "1234567890" never compared equal and
+the duplicate check needed one query per ID type. employee_gov_ids holds a
+separator-free copy of every non-empty ID:
+
+- maintained by triggers on employees, so the form, imports, restores and
+  other clients all go through it
+- unique on (id_type, norm), so a second employee with the same number is
+  rejected by the database itself (IntegrityError), whichever path writes
+- looked up by find_gov_id_conflicts() (one form) and
+  find_gov_id_batch_conflicts() (a whole import) in a single query each
+
+The copies live in their own table rather than as extra employees columns so
+that exports and JSON backups built from SELECT * keep their shape.
+"""
+
+import sqlite3
+import logging
+from typing import Dict, List, Optional
+
+# Government ID columns of employees -> label shown to users
+GOV_ID_FIELDS = {
+    'sss_number': 'SSS Number',
+    'tin_number': 'TIN Number',
+    'philhealth_number': 'PhilHealth Number',
+    'pagibig_number': 'Pag-IBIG Number',
+}
+# Characters dropped when normalizing (the SQL triggers drop exactly the same)
+GOV_ID_SEPARATORS = ("-", " ", ".", "/")
+
+_UNIQUE_INDEX = "idx_employee_gov_ids_unique"
+
+
+def normalize_gov_id(value) -> str:
+    """Government ID without separators ('' for empty values)"""
+    text = "" if value is None else str(value)
+    for separator in GOV_ID_SEPARATORS:
+        text = text.replace(separator, "")
+    return text
+
+
+def _normalize_sql(column: str) -> str:
+    expr = f"COALESCE({column}, '')"
+    for separator in GOV_ID_SEPARATORS:
+        expr = f"REPLACE({expr}, '{separator}', '')"
+    return expr
+
+
+def _rows_sql(prefix: str, table: str = None) -> str:
+    """SELECT of (emp_id, id_type, norm) for the non-empty IDs of NEW, or of every row of table"""
+    source = f" FROM {table} {prefix}" if table else ""
+    arms = []
+    for field in GOV_ID_FIELDS:
+        norm = _normalize_sql(f"{prefix}.{field}")
+        arms.append(f"SELECT {prefix}.emp_id, '{field}', {norm}{source} WHERE {norm} <> ''")
+    return " UNION ALL ".join(arms)
+
+
+def ensure_gov_id_index(conn: sqlite3.Connection):
+    """Create the table and triggers, backfill it once, and add the unique index when possible"""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS employee_gov_ids(
+        id_type TEXT NOT NULL,
+        norm TEXT NOT NULL,
+        emp_id TEXT NOT NULL,
+        PRIMARY KEY (id_type, norm, emp_id)
+    ) WITHOUT ROWID;""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employee_gov_ids_emp ON employee_gov_ids(emp_id)")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_employees_insert_gov_ids AFTER INSERT ON employees
+    BEGIN
+        INSERT INTO employee_gov_ids(emp_id, id_type, norm) {_rows_sql('NEW')};
+    END""")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_employees_update_gov_ids
+    AFTER UPDATE OF emp_id, {", ".join(GOV_ID_FIELDS)} ON employees
+    BEGIN
+        DELETE FROM employee_gov_ids WHERE emp_id = OLD.emp_id;
+        INSERT INTO employee_gov_ids(emp_id, id_type, norm) {_rows_sql('NEW')};
+    END""")
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_employees_delete_gov_ids AFTER DELETE ON employees
+    BEGIN DELETE FROM employee_gov_ids WHERE emp_id = OLD.emp_id; END""")
+
+    # Employees saved before the table existed (checked first: no write lock once filled)
+    if (conn.execute("SELECT 1 FROM employee_gov_ids LIMIT 1").fetchone() is None
+            and conn.execute(f"{_rows_sql('e', 'employees')} LIMIT 1").fetchone()):
+        conn.execute(f"INSERT OR IGNORE INTO employee_gov_ids(emp_id, id_type, norm) {_rows_sql('e', 'employees')}")
+
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (_UNIQUE_INDEX,)).fetchone():
+        return
+    duplicates = conn.execute("""
+        SELECT id_type, COUNT(*) FROM (
+            SELECT id_type, norm FROM employee_gov_ids GROUP BY id_type, norm HAVING COUNT(*) > 1
+        ) GROUP BY id_type
+    """).fetchall()
+    if duplicates:
+        summary = ", ".join(f"{GOV_ID_FIELDS.get(t, t)}: {n}" for t, n in duplicates)
+        logging.warning(f"Duplicate government IDs ({summary}) - uniqueness is not enforced until they are fixed")
+        return
+    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {_UNIQUE_INDEX} ON employee_gov_ids(id_type, norm)")
+    logging.info("Government IDs: unique index created")
+
+
+def find_gov_id_conflicts(conn: sqlite3.Connection, ids: Dict[str, Optional[str]],
+                          exclude_emp_id: Optional[str] = None) -> List[Dict]:
+    """
+    Employees already holding any of ids ({'sss_number': '12-3456789-0', ...}),
+    other than exclude_emp_id. One dict per conflict: field, label, value
+    (as stored on the other employee), emp_id and name.
+    """
+    wanted = [(field, normalize_gov_id(value)) for field, value in ids.items()
+              if field in GOV_ID_FIELDS and normalize_gov_id(value)]
+    if not wanted:
+        return []
+    values = ", ".join("(?, ?)" for _ in wanted)
+    rows = conn.execute(f"""
+        WITH wanted(id_type, norm) AS (VALUES {values})
+        SELECT g.id_type, e.emp_id, e.name,
+               CASE g.id_type WHEN 'sss_number' THEN e.sss_number WHEN 'tin_number' THEN e.tin_number
+                              WHEN 'philhealth_number' THEN e.philhealth_number ELSE e.pagibig_number END
+        FROM wanted w
+        JOIN employee_gov_ids g ON g.id_type = w.id_type AND g.norm = w.norm
+        JOIN employees e ON e.emp_id = g.emp_id
+        WHERE g.emp_id IS NOT ?
+    """, (*[v for pair in wanted for v in pair], exclude_emp_id)).fetchall()
+    return [{'field': r[0], 'label': GOV_ID_FIELDS[r[0]], 'emp_id': r[1], 'name': r[2], 'value': r[3]}
+            for r in rows]
+
+
+def find_gov_id_batch_conflicts(conn: sqlite3.Connection, employees: List[Dict]) -> List[Dict]:
+    """
+    Government-ID conflicts for a batch of employee dicts about to be written
+    (an import): against saved employees other than the row's own emp_id,
+    and between rows of the batch. One dict per conflict: row (index into
+    employees), field, label, value, and the emp_id / name it collides with;
+    a collision inside the batch also has other_row, the earlier row's index.
+    """
+    staged = []
+    for row_no, emp in enumerate(employees):
+        for field in GOV_ID_FIELDS:
+            norm = normalize_gov_id(emp.get(field))
+            if norm:
+                staged.append((row_no, emp.get('emp_id'), field, norm, emp.get(field)))
+    if not staged:
+        return []
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS _gov_batch(
+            row_no INTEGER, emp_id TEXT, id_type TEXT, norm TEXT, value TEXT
+        )""")
+    conn.execute("DELETE FROM temp._gov_batch")
+    conn.executemany("INSERT INTO temp._gov_batch VALUES (?, ?, ?, ?, ?)", staged)
+    rows = conn.execute("""
+        SELECT b.row_no, b.id_type, b.value, g.emp_id, e.name, NULL
+        FROM temp._gov_batch b
+        JOIN employee_gov_ids g ON g.id_type = b.id_type AND g.norm = b.norm
+        JOIN employees e ON e.emp_id = g.emp_id
+        WHERE g.emp_id IS NOT b.emp_id
+        UNION ALL
+        SELECT b.row_no, b.id_type, b.value, o.emp_id, NULL, o.row_no
+        FROM temp._gov_batch b
+        JOIN temp._gov_batch o ON o.id_type = b.id_type AND o.norm = b.norm AND o.row_no < b.row_no
+        WHERE o.emp_id IS NOT b.emp_id OR b.emp_id IS NULL
+        ORDER BY 1
+    """).fetchall()
+    conn.execute("DELETE FROM temp._gov_batch")
+    conflicts = []
+    for row_no, field, value, emp_id, name, other_row in rows:
+        conflict = {'row': row_no, 'field': field, 'label': GOV_ID_FIELDS[field], 'value': value,
+                    'emp_id': emp_id, 'name': name}
+        if other_row is not None:
+            conflict['other_row'] = other_row
+            conflict['name'] = employees[other_row].get('name')
+        conflicts.append(conflict)
+    return conflicts
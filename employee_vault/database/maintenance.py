@@ -0,0 +1,437 @@
+"""
+Coordinated database maintenance
+
+Nothing used to keep the shared database in shape: the query planner ran on
+statistics from whenever someone last ran ANALYZE (usually never), deleted
+pages were never returned to the file system, and every client ran a full
+integrity_check at every start-up. MaintenanceScheduler runs that work on one
+client at a time, elected through the maintenance_lease row:
+
+- tiering      moves audit history past the hot horizon into the yearly
+               archives (database/tiering.py), daily; runs first so the
+               tasks after it see the smaller tables
+- optimize     PRAGMA optimize (bounded by analysis_limit), daily
+- analyze      ANALYZE on tables whose row count drifted from sqlite_stat1, weekly
+- vacuum       PRAGMA incremental_vacuum in VACUUM_STEP_PAGES steps, daily;
+               a database created before auto_vacuum=INCREMENTAL is converted
+               by one full VACUUM during off-hours while nobody else is online
+- quick_check  PRAGMA quick_check, weekly (start-up then skips integrity_check)
+
+Work starts only after the database has been quiet for idle_seconds (a
+shorter wait during off-hours) - no employee, settings or audit writes from
+any client and no input on this one - and yields as soon as that changes: a
+progress handler interrupts the running statement, the lease is released and
+the task is retried at the next quiet period. Every run is recorded in
+maintenance_runs with its duration and result.
+"""
+
+import os
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from employee_vault import metrics
+from employee_vault.database.tiering import AuditTiering
+
+# Seconds between looks at the database for activity
+MAINTENANCE_POLL_SECONDS = 60
+# Quiet seconds required before maintenance starts (business hours / off-hours)
+MAINTENANCE_IDLE_SECONDS = 15 * 60
+MAINTENANCE_OFF_HOURS_IDLE_SECONDS = 2 * 60
+# Local hours [start, end) treated as off-hours
+MAINTENANCE_OFF_HOURS = (22, 6)
+# Lease length; renewed before each task (seconds)
+MAINTENANCE_LEASE_SECONDS = 10 * 60
+# How often the progress handler re-reads the activity signature (seconds)
+MAINTENANCE_YIELD_POLL_SECONDS = 1.0
+# SQLite VM steps between progress handler calls
+MAINTENANCE_PROGRESS_OPS = 20000
+
+# Task -> seconds between successful runs
+MAINTENANCE_TASKS = {
+    'tiering': 24 * 3600,
+    'optimize': 24 * 3600,
+    'analyze': 7 * 24 * 3600,
+    'vacuum': 24 * 3600,
+    'quick_check': 7 * 24 * 3600,
+}
+# A table is re-analyzed when its row count moved this much from sqlite_stat1
+ANALYZE_DRIFT_RATIO = 0.10
+# Rows sampled per index by optimize / analyze (PRAGMA analysis_limit)
+ANALYSIS_LIMIT = 1000
+# Free pages released per incremental_vacuum step, and the least worth a run
+VACUUM_STEP_PAGES = 500
+VACUUM_MIN_FREE_PAGES = 256
+# Free-page share that justifies converting an old database with a full VACUUM
+VACUUM_CONVERT_FREE_RATIO = 0.20
+
+STATUS_OK = "ok"
+STATUS_YIELDED = "yielded"
+STATUS_FAILED = "failed"
+
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+class MaintenanceYield(Exception):
+    """Raised inside a task when users became active (the task is retried later)"""
+
+
+def last_successful_run(conn: sqlite3.Connection, task: str) -> Optional[str]:
+    """started_at of the last successful run of task, or None"""
+    try:
+        row = conn.execute("""
+            SELECT MAX(started_at) FROM maintenance_runs WHERE task = ? AND status = ?
+        """, (task, STATUS_OK)).fetchone()
+    except sqlite3.OperationalError:
+        return None  # Database from before the scheduler
+    return row[0] if row else None
+
+
+def in_off_hours(now: datetime = None, window=MAINTENANCE_OFF_HOURS) -> bool:
+    hour = (now or datetime.now()).hour
+    start, end = window
+    return start <= hour < end if start < end else hour >= start or hour < end
+
+
+class MaintenanceScheduler:
+    """
+    Lease-elected background maintenance for one database file.
+
+    Usage:
+        scheduler = MaintenanceScheduler(db_path)
+        scheduler.start()
+        scheduler.note_activity()     # on user input (cheap, call from event filters)
+        scheduler.run_due(force=True) # synchronous pass (tests, admin tools)
+        scheduler.stop()
+    """
+
+    def __init__(self, path: str, poll_interval: float = MAINTENANCE_POLL_SECONDS,
+                 idle_seconds: float = MAINTENANCE_IDLE_SECONDS,
+                 off_hours_idle_seconds: float = MAINTENANCE_OFF_HOURS_IDLE_SECONDS):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.idle_seconds = idle_seconds
+        self.off_hours_idle_seconds = off_hours_idle_seconds
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self.runs = 0
+        self.yields = 0
+        self.last_results: Dict[str, str] = {}
+        self.last_error: Optional[str] = None
+
+        self._last_local_activity = 0.0
+        self._run_started = 0.0
+        self._signature = None
+        self._quiet_since = time.monotonic()
+        self._next_yield_poll = 0.0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._probe: Optional[sqlite3.Connection] = None
+        self._run_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="DBMaintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the thread; a running task is interrupted and its lease released"""
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logging.warning(f"Maintenance thread did not stop within {timeout}s")
+
+    def note_activity(self):
+        """Record user input on this client; a running task yields at its next progress check"""
+        self._last_local_activity = time.monotonic()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def status(self) -> dict:
+        """Snapshot for diagnostics screens"""
+        return {
+            'running': self.running,
+            'holder': self.holder,
+            'runs': self.runs,
+            'yields': self.yields,
+            'last_results': dict(self.last_results),
+            'last_error': self.last_error,
+        }
+
+    def run_due(self, force: bool = False) -> Dict[str, str]:
+        """
+        Run every due task (all of them with force) if this client gets the
+        lease. Returns task -> status; empty when another client holds the lease.
+        """
+        with self._run_lock:
+            conn = self._connect()
+            try:
+                due = list(MAINTENANCE_TASKS) if force else self._due_tasks(conn)
+                if not due or not self._acquire_lease(conn):
+                    return {}
+                results = {}
+                self._run_started = time.monotonic()
+                self._signature = self._read_signature(self._probe_conn())
+                self._next_yield_poll = 0.0
+                conn.set_progress_handler(self._should_yield, MAINTENANCE_PROGRESS_OPS)
+                try:
+                    for task in due:
+                        if not self._renew_lease(conn):
+                            break
+                        results[task] = self._run_task(conn, task)
+                        if results[task] == STATUS_YIELDED:
+                            break
+                finally:
+                    conn.set_progress_handler(None, 0)
+                    self._release_lease(conn)
+                self.runs += 1
+                self.last_results.update(results)
+                return results
+            finally:
+                self._close()
+
+    # ------------------------------------------------------------------
+    # Scheduler thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            if self._stop_event.is_set():
+                break
+            try:
+                if self._quiet_long_enough():
+                    self.run_due()
+                self.last_error = None
+            except sqlite3.Error as e:
+                self.last_error = str(e)
+                logging.warning(f"Database maintenance pass failed: {e}")
+        self._close()
+
+    def _quiet_long_enough(self) -> bool:
+        now = time.monotonic()
+        signature = self._read_signature(self._probe_conn())
+        if signature != self._signature:
+            self._signature = signature
+            self._quiet_since = now
+        quiet_since = max(self._quiet_since, self._last_local_activity)
+        needed = self.off_hours_idle_seconds if in_off_hours() else self.idle_seconds
+        return now - quiet_since >= needed
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None,
+                                         check_same_thread=False, uri=self.path.startswith('file:'))
+        return self._conn
+
+    def _probe_conn(self) -> sqlite3.Connection:
+        if self._probe is None:
+            self._probe = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False,
+                                          uri=self.path.startswith('file:'))
+            self._probe.execute("PRAGMA query_only=ON;")
+        return self._probe
+
+    def _close(self):
+        for attr in ('_conn', '_probe'):
+            conn = getattr(self, attr)
+            setattr(self, attr, None)
+            if conn is not None:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+
+    @staticmethod
+    def _read_signature(conn: sqlite3.Connection) -> tuple:
+        """
+        Changes whenever any client saves an employee, changes a setting or logs
+        an action. Audit activity is read from sqlite_sequence, which only moves
+        on inserts, so the tiering task deleting archived rows is not mistaken
+        for users.
+        """
+        return conn.execute("""
+            SELECT
+                (SELECT revision FROM data_revision WHERE id = 1),
+                (SELECT revision FROM settings_revision WHERE id = 1),
+                (SELECT seq FROM sqlite_sequence WHERE name = 'audit_log'),
+                (SELECT seq FROM sqlite_sequence WHERE name = 'security_audit')
+        """).fetchone()
+
+    def _should_yield(self) -> int:
+        """Progress handler: non-zero interrupts the running statement"""
+        if self._stop_event.is_set() or self._last_local_activity > self._run_started:
+            return 1
+        now = time.monotonic()
+        if now >= self._next_yield_poll:
+            self._next_yield_poll = now + MAINTENANCE_YIELD_POLL_SECONDS
+            try:
+                if self._read_signature(self._probe_conn()) != self._signature:
+                    return 1
+            except sqlite3.Error:
+                return 1  # Share busy or gone - not a good moment either
+        return 0
+
+    # ------------------------------------------------------------------
+    # Lease
+    # ------------------------------------------------------------------
+
+    def _acquire_lease(self, conn: sqlite3.Connection) -> bool:
+        now = int(time.time())
+        try:
+            taken = conn.execute("""
+                UPDATE maintenance_lease SET holder = ?, expires_epoch = ?, acquired_at = ?
+                WHERE id = 1 AND (holder IS NULL OR holder = ? OR expires_epoch <= ?)
+            """, (self.holder, now + MAINTENANCE_LEASE_SECONDS,
+                  datetime.now().strftime("%Y-%m-%d %H:%M:%S"), self.holder, now)).rowcount
+        except sqlite3.OperationalError as e:
+            logging.debug(f"Maintenance lease unavailable: {e}")
+            return False
+        return taken == 1
+
+    def _renew_lease(self, conn: sqlite3.Connection) -> bool:
+        return conn.execute("""
+            UPDATE maintenance_lease SET expires_epoch = ? WHERE id = 1 AND holder = ?
+        """, (int(time.time()) + MAINTENANCE_LEASE_SECONDS, self.holder)).rowcount == 1
+
+    def _release_lease(self, conn: sqlite3.Connection):
+        try:
+            conn.execute("UPDATE maintenance_lease SET holder = NULL, expires_epoch = 0 WHERE id = 1 AND holder = ?",
+                         (self.holder,))
+        except sqlite3.Error as e:
+            logging.warning(f"Could not release maintenance lease (expires on its own): {e}")
+
+    # ------------------------------------------------------------------
+    # Tasks
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _due_tasks(conn: sqlite3.Connection) -> List[str]:
+        due = []
+        for task, interval in MAINTENANCE_TASKS.items():
+            last = last_successful_run(conn, task)
+            if last is None or datetime.now() - datetime.fromisoformat(last) >= timedelta(seconds=interval):
+                due.append(task)
+        return due
+
+    def _run_task(self, conn: sqlite3.Connection, task: str) -> str:
+        started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        start = time.perf_counter()
+        try:
+            with metrics.timer(f"db.maintenance_{task}"):
+                result = getattr(self, f"_task_{task}")(conn)
+            status = STATUS_OK
+        except (MaintenanceYield, sqlite3.OperationalError) as e:
+            if isinstance(e, sqlite3.OperationalError) and "interrupt" not in str(e):
+                status, result = STATUS_FAILED, str(e)
+            else:
+                status, result = STATUS_YIELDED, "users became active"
+                self.yields += 1
+                metrics.incr("db.maintenance_yield")
+        except sqlite3.Error as e:
+            status, result = STATUS_FAILED, str(e)
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        duration_ms = int((time.perf_counter() - start) * 1000)
+
+        log = logging.warning if status == STATUS_FAILED else logging.info
+        log(f"Database maintenance {task}: {status} in {duration_ms} ms ({result})")
+        conn.set_progress_handler(None, 0)  # Recording the run must not be interrupted
+        try:
+            conn.execute("""
+                INSERT INTO maintenance_runs(task, holder, started_at, duration_ms, status, result)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (task, self.holder, started_at, duration_ms, status, result))
+        except sqlite3.Error as e:
+            logging.warning(f"Could not record maintenance run: {e}")
+        finally:
+            conn.set_progress_handler(self._should_yield, MAINTENANCE_PROGRESS_OPS)
+        return status
+
+    def _task_tiering(self, conn: sqlite3.Connection) -> str:
+        moved = AuditTiering(self.path).run_once(conn, should_stop=self._should_yield)
+        if self._should_yield():
+            raise MaintenanceYield()
+        total = sum(moved.values())
+        return f"archived {total} row(s): {moved}" if total else "nothing past the hot horizon"
+
+    def _task_optimize(self, conn: sqlite3.Connection) -> str:
+        conn.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT};")
+        conn.execute("PRAGMA optimize;")
+        return "optimize complete"
+
+    def _task_analyze(self, conn: sqlite3.Connection) -> str:
+        conn.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT};")
+        analyzed_rows = {}
+        try:
+            for tbl, stat in conn.execute("SELECT tbl, stat FROM sqlite_stat1").fetchall():
+                analyzed_rows.setdefault(tbl, int(str(stat).split()[0]))
+        except sqlite3.OperationalError:
+            pass  # Never analyzed: sqlite_stat1 does not exist yet
+        tables = [r[0] for r in conn.execute("""
+            SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+        """).fetchall()]
+        analyzed = []
+        for table in tables:
+            rows = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+            before = analyzed_rows.get(table)
+            if before is None and not rows:
+                continue
+            if before is None or abs(rows - before) > max(before, 1) * ANALYZE_DRIFT_RATIO:
+                conn.execute(f'ANALYZE "{table}"')
+                analyzed.append(table)
+        return f"analyzed {len(analyzed)} table(s): {', '.join(analyzed)}" if analyzed else "statistics current"
+
+    def _task_vacuum(self, conn: sqlite3.Connection) -> str:
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != _AUTO_VACUUM_INCREMENTAL:
+            pages = conn.execute("PRAGMA page_count").fetchone()[0]
+            if free < VACUUM_MIN_FREE_PAGES or free < pages * VACUUM_CONVERT_FREE_RATIO:
+                return f"{free} free page(s), conversion not needed yet"
+            if not in_off_hours() or self._others_online(conn):
+                return f"{free} free page(s), conversion waits for off-hours with nobody online"
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+            conn.execute("VACUUM")
+            return f"converted to incremental auto-vacuum, released {free} page(s)"
+        released = 0
+        while free >= VACUUM_MIN_FREE_PAGES or (released and free):
+            if self._should_yield():
+                raise MaintenanceYield()
+            conn.execute(f"PRAGMA incremental_vacuum({VACUUM_STEP_PAGES});").fetchall()
+            remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            released += free - remaining
+            if remaining >= free:
+                break
+            free = remaining
+        return f"released {released} page(s), {free} free"
+
+    def _task_quick_check(self, conn: sqlite3.Connection) -> str:
+        problems = [r[0] for r in conn.execute("PRAGMA quick_check(20)").fetchall()]
+        if problems != ['ok']:
+            logging.error(f"Database quick_check found problems: {problems}")
+            raise sqlite3.DatabaseError("; ".join(problems))
+        return "ok"
+
+    def _others_online(self, conn: sqlite3.Connection) -> bool:
+        try:
+            count = conn.execute("SELECT COUNT(*) FROM active_sessions WHERE expires_epoch > ?",
+                                 (int(time.time()),)).fetchone()[0]
+        except sqlite3.OperationalError:
+            return False
+        return count > 1
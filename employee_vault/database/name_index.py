@@ -0,0 +1,180 @@
+"""
+Blocking-key index for duplicate-name detection
+
+The duplicate-name warning used to score the entered name against every
+employee, so each save cost one fuzzy comparison per employee. The
+employee_name_keys table indexes each active employee's name under three
+kinds of blocking keys:
+
+- t:<token>     normalized name tokens (accents folded, punctuation dropped)
+- p:<soundex>   a phonetic key per token, so "Jon" and "John" meet
+- g:<trigram>   padded character trigrams per token, for typos
+
+find_name_candidates() looks up the entered name's rarest keys (common
+surnames and trigrams like "san" would pull in half the company) and returns
+the employees sharing most of them; only those are scored.
+
+Triggers on employees keep the index honest whichever code path writes: a
+deleted (or archived) employee loses its keys immediately, and an inserted or
+renamed one is queued in employee_name_dirty. sync_name_index() turns the
+queue into keys (on the write executor); until it has run, queued employees
+are simply returned as candidates, so a lookup never misses a fresh name.
+"""
+
+import re
+import sqlite3
+import logging
+import unicodedata
+from typing import Dict, List, Optional, Set
+
+# Index entries a lookup may read: keys are taken rarest first up to this budget...
+NAME_BLOCK_MAX_POSTINGS = 4000
+# ...but never fewer than this many keys
+NAME_BLOCK_MIN_KEYS = 4
+# Most candidates returned per lookup (those sharing the most keys)
+NAME_BLOCK_LIMIT = 100
+# Queued employees indexed per sync transaction
+NAME_SYNC_BATCH = 2000
+
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"), **dict.fromkeys("dt", "3"),
+    "l": "4", **dict.fromkeys("mn", "5"), "r": "6",
+}
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, accents folded (ñ -> n), punctuation removed, single spaces"""
+    folded = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode("ascii")
+    return " ".join(_NON_ALNUM.sub(" ", folded.lower()).split())
+
+
+def soundex(token: str) -> str:
+    """American Soundex code of one token ('' for tokens without letters)"""
+    letters = [c for c in token if c.isalpha()]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES.get(c, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if c not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def name_keys(name: str) -> Set[str]:
+    """Blocking keys of one name (see module docstring)"""
+    keys = set()
+    for token in normalize_name(name).split():
+        keys.add(f"t:{token}")
+        if len(token) == 1:
+            continue  # Initials: the token key is enough
+        phonetic = soundex(token)
+        if phonetic:
+            keys.add(f"p:{phonetic}")
+        padded = f" {token} "
+        keys.update(f"g:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    return keys
+
+
+def ensure_name_index(conn: sqlite3.Connection):
+    """Create the index tables and triggers, and queue employees that have no keys yet"""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS employee_name_keys(
+        key TEXT NOT NULL,
+        emp_id TEXT NOT NULL,
+        PRIMARY KEY (key, emp_id)
+    ) WITHOUT ROWID;""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employee_name_keys_emp ON employee_name_keys(emp_id)")
+    conn.execute("CREATE TABLE IF NOT EXISTS employee_name_dirty(emp_id TEXT PRIMARY KEY) WITHOUT ROWID;")
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_employees_insert_name_index AFTER INSERT ON employees
+    BEGIN INSERT OR IGNORE INTO employee_name_dirty(emp_id) VALUES (NEW.emp_id); END""")
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_employees_update_name_index AFTER UPDATE OF emp_id, name ON employees
+    BEGIN
+        DELETE FROM employee_name_keys WHERE emp_id = OLD.emp_id;
+        DELETE FROM employee_name_dirty WHERE emp_id = OLD.emp_id;
+        INSERT OR IGNORE INTO employee_name_dirty(emp_id) VALUES (NEW.emp_id);
+    END""")
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_employees_delete_name_index AFTER DELETE ON employees
+    BEGIN
+        DELETE FROM employee_name_keys WHERE emp_id = OLD.emp_id;
+        DELETE FROM employee_name_dirty WHERE emp_id = OLD.emp_id;
+    END""")
+    # Employees written before the index existed (or by a client without the triggers);
+    # checked first so opening an indexed database does not take the write lock
+    unindexed = """
+        SELECT emp_id FROM employees e
+        WHERE NOT EXISTS (SELECT 1 FROM employee_name_keys k WHERE k.emp_id = e.emp_id)
+          AND NOT EXISTS (SELECT 1 FROM employee_name_dirty d WHERE d.emp_id = e.emp_id)
+    """
+    if conn.execute(f"{unindexed} LIMIT 1").fetchone() is not None:
+        conn.execute(f"INSERT OR IGNORE INTO employee_name_dirty(emp_id) {unindexed}")
+
+
+def pending_name_sync(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM employee_name_dirty LIMIT 1").fetchone() is not None
+
+
+def sync_name_index(conn: sqlite3.Connection) -> int:
+    """Index every queued employee (run in a write transaction); returns how many"""
+    indexed = 0
+    while True:
+        rows = conn.execute("""
+            SELECT d.emp_id, e.name FROM employee_name_dirty d
+            LEFT JOIN employees e ON e.emp_id = d.emp_id
+            LIMIT ?
+        """, (NAME_SYNC_BATCH,)).fetchall()
+        if not rows:
+            break
+        ids = [(r[0],) for r in rows]
+        conn.executemany("DELETE FROM employee_name_keys WHERE emp_id = ?", ids)
+        conn.executemany("INSERT OR IGNORE INTO employee_name_keys(key, emp_id) VALUES (?, ?)",
+                         [(key, emp_id) for emp_id, name in rows if name for key in name_keys(name)])
+        conn.executemany("DELETE FROM employee_name_dirty WHERE emp_id = ?", ids)
+        indexed += len(rows)
+    if indexed:
+        logging.debug(f"Name index: indexed {indexed} employee(s)")
+    return indexed
+
+
+def find_name_candidates(conn: sqlite3.Connection, name: str, exclude_emp_id: Optional[str] = None,
+                         limit: int = NAME_BLOCK_LIMIT) -> List[Dict]:
+    """
+    Employees sharing the most of name's rarest blocking keys (at most
+    limit), plus any not indexed yet. Returns full employee rows as dicts for
+    the caller to score.
+    """
+    keys = sorted(name_keys(name))
+    if not keys:
+        return []
+    frequency = dict(conn.execute(f"""
+        SELECT key, COUNT(*) FROM employee_name_keys WHERE key IN ({",".join("?" * len(keys))}) GROUP BY key
+    """, keys).fetchall())
+    block_keys, postings = [], 0
+    for key in sorted(frequency, key=frequency.get):
+        if len(block_keys) >= NAME_BLOCK_MIN_KEYS and postings + frequency[key] > NAME_BLOCK_MAX_POSTINGS:
+            break
+        block_keys.append(key)
+        postings += frequency[key]
+
+    rows = conn.execute(f"""
+        SELECT e.* FROM (
+            SELECT emp_id, COUNT(*) AS hits FROM employee_name_keys
+            WHERE key IN ({",".join("?" * len(block_keys))})
+            GROUP BY emp_id ORDER BY hits DESC LIMIT ?
+        ) b JOIN employees e ON e.emp_id = b.emp_id
+        UNION
+        SELECT e.* FROM employee_name_dirty d JOIN employees e ON e.emp_id = d.emp_id
+    """, (*block_keys, limit)).fetchall()
+    candidates = [dict(r) for r in rows]
+    if exclude_emp_id:
+        candidates = [c for c in candidates if c.get('emp_id') != exclude_emp_id]
+    return candidates
@@ -0,0 +1,272 @@
+"""
+Local read replica for network mode
+
+Reads against a database on an SMB share pay a network round trip (and a
+shared file lock) for every page they touch. The replica keeps a copy of the
+network database on the local disk and serves read-heavy screens from it,
+while every write still goes to the authoritative network database.
+
+A background thread polls the employee data and settings revisions - the
+counters bumped by triggers on every employee and settings write (the same
+ones the heartbeat reads). Only when one moves is the copy refreshed, so
+heartbeat, lease, session and audit traffic never causes a resync. The copy
+uses the online backup API in small steps so the network file is never locked
+for the whole copy and other clients can keep writing between steps; if those
+writes keep restarting it, the rest is copied in one step.
+
+Staleness is bounded: the replica is only used while it was verified against
+the network database within max_staleness seconds and this process has not
+changed employee data or settings since. Otherwise callers fall back to the
+direct connection.
+"""
+
+import os
+import time
+import logging
+import sqlite3
+import threading
+from typing import Callable, Optional
+
+# Seconds between revision checks
+REPLICA_SYNC_INTERVAL = 5.0
+# The replica is not used once it is older than this (seconds)
+REPLICA_MAX_STALENESS = 30.0
+# Pages copied per backup step before the source lock is released
+REPLICA_PAGES_PER_STEP = 256
+# Stepped copies restarted by concurrent writes before the rest is copied in one step
+REPLICA_MAX_RESTARTS = 2
+
+_REVISIONS_SQL = """
+    SELECT (SELECT revision FROM data_revision WHERE id = 1),
+           (SELECT revision FROM settings_revision WHERE id = 1)
+"""
+
+
+class _CopyRestarted(Exception):
+    """Raised from the backup progress callback to stop a copy that keeps restarting"""
+
+
+class ReadReplica:
+    """
+    Local copy of the network database for reads.
+
+    Usage:
+        replica = ReadReplica(network_path, local_path, local_generation=fn)
+        replica.start()
+        conn = replica.connection()   # None when stale - use the direct connection
+        ...
+        replica.stop()
+
+    local_generation() returns a value that changes whenever this process
+    changes employee data or settings (None while a write transaction is open).
+    The replica is bypassed until a sync has caught up with that value, so a
+    screen never reads older data than the user just saved.
+    """
+
+    def __init__(self, source_path: str, replica_path: str,
+                 local_generation: Callable[[], object] = None,
+                 sync_interval: float = REPLICA_SYNC_INTERVAL,
+                 max_staleness: float = REPLICA_MAX_STALENESS,
+                 pages_per_step: int = REPLICA_PAGES_PER_STEP):
+        self.source_path = source_path
+        self.replica_path = replica_path
+        self.sync_interval = sync_interval
+        self.max_staleness = max_staleness
+        self.pages_per_step = pages_per_step
+        self._local_generation = local_generation or (lambda: 0)
+
+        self._reader: Optional[sqlite3.Connection] = None
+        self._source: Optional[sqlite3.Connection] = None  # Sync thread only
+        self._synced_revisions: Optional[tuple] = None
+        self._synced_generation = object()  # Matches nothing until the first sync
+        self._pending_generation = None
+        self._verified_at = 0.0             # time.monotonic() of the last successful check
+        self.last_error: Optional[str] = None
+        self.sync_count = 0
+
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Open the local copy and start the sync thread"""
+        if self._thread is not None:
+            return
+        os.makedirs(os.path.dirname(self.replica_path) or ".", exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="DBReplica", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the sync thread and close the reader connection"""
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        reader, self._reader = self._reader, None
+        if reader is not None:
+            try:
+                reader.close()
+            except sqlite3.Error:
+                pass
+
+    def request_sync(self):
+        """Ask the sync thread to check the network database now"""
+        self._wakeup.set()
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the replica was last verified current (None if never)"""
+        if not self._verified_at:
+            return None
+        return time.monotonic() - self._verified_at
+
+    def is_fresh(self) -> bool:
+        """True when reads may be served from the replica"""
+        if self._reader is None or self._stop_event.is_set():
+            return False
+        age = self.age
+        if age is None or age > self.max_staleness:
+            return False
+        generation = self._local_generation()
+        return generation is not None and generation == self._synced_generation
+
+    def connection(self) -> Optional[sqlite3.Connection]:
+        """The replica's read connection, or None when it is stale or unavailable"""
+        return self._reader if self.is_fresh() else None
+
+    def status(self) -> dict:
+        """Snapshot for diagnostics screens"""
+        return {
+            'fresh': self.is_fresh(),
+            'age_seconds': self.age,
+            'syncs': self.sync_count,
+            'last_error': self.last_error,
+            'path': self.replica_path,
+        }
+
+    # ------------------------------------------------------------------
+    # Sync thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        try:
+            dst = self._open_local()
+        except sqlite3.Error as e:
+            self.last_error = str(e)
+            logging.error(f"Read replica disabled - could not open {self.replica_path}: {e}")
+            return
+
+        while not self._stop_event.is_set():
+            self._sync_once(dst)
+            self._wakeup.wait(self.sync_interval)
+            self._wakeup.clear()
+
+        self._close_source()
+        try:
+            dst.close()
+        except sqlite3.Error:
+            pass
+
+    def _open_local(self) -> sqlite3.Connection:
+        """Open the local copy for writing (returned) and for the UI's reads"""
+        dst = sqlite3.connect(self.replica_path)
+        try:
+            # WAL lets the UI keep reading the previous snapshot while a sync writes
+            dst.execute("PRAGMA journal_mode=WAL;")
+            dst.execute("PRAGMA synchronous=OFF;")  # A lost replica is simply re-copied
+            self._open_reader()
+        except sqlite3.Error:
+            dst.close()
+            raise
+        # The very first copy needs no confirmation pass
+        self._pending_generation = self._local_generation()
+        return dst
+
+    def _open_reader(self):
+        reader = sqlite3.connect(self.replica_path, check_same_thread=False)
+        reader.row_factory = sqlite3.Row
+        reader.execute("PRAGMA query_only=ON;")
+        reader.execute("PRAGMA cache_size=-64000;")
+        reader.execute("PRAGMA temp_store=MEMORY;")
+        self._reader = reader
+
+    def _source_connection(self) -> sqlite3.Connection:
+        if self._source is None:
+            # Plain path rather than a mode=ro URI: UNC paths are not valid URI authorities
+            src = sqlite3.connect(self.source_path, timeout=30.0)
+            src.execute("PRAGMA query_only=ON;")
+            self._source = src
+        return self._source
+
+    def _close_source(self):
+        src, self._source = self._source, None
+        if src is not None:
+            try:
+                src.close()
+            except sqlite3.Error:
+                pass
+
+    def _copy(self, src: sqlite3.Connection, dst: sqlite3.Connection):
+        """Copy src into dst in steps, finishing in one step if other writers keep restarting it"""
+        restarts = 0
+        last_remaining = None
+
+        def _progress(status, remaining, total):
+            nonlocal restarts, last_remaining
+            if last_remaining is not None and remaining > last_remaining:
+                restarts += 1
+                if restarts > REPLICA_MAX_RESTARTS:
+                    raise _CopyRestarted()
+            last_remaining = remaining
+
+        try:
+            src.backup(dst, pages=self.pages_per_step, progress=_progress, sleep=0.005)
+        except _CopyRestarted:
+            logging.info(f"Read replica copy restarted {restarts} times by other writers - copying in one step")
+            src.backup(dst)
+
+    def _sync_once(self, dst: sqlite3.Connection):
+        # Capture our own write generation before looking at the network file, so a
+        # write that lands in between leaves the replica marked stale, never fresh
+        generation = self._local_generation()
+        if generation is None:
+            return  # A write transaction is open on this client - check again later
+        started = time.monotonic()
+        try:
+            src = self._source_connection()
+            revisions = tuple(src.execute(_REVISIONS_SQL).fetchall()[0])
+            if revisions != self._synced_revisions:
+                copy_start = time.perf_counter()
+                self._copy(src, dst)
+                self.sync_count += 1
+                logging.info(f"Read replica refreshed in {time.perf_counter() - copy_start:.2f}s "
+                             f"(data/settings revision {self._synced_revisions} -> {revisions})")
+                # Writes that landed during the copy bump the revisions again and are picked up next pass
+                self._synced_revisions = revisions
+        except sqlite3.Error as e:
+            # Reopen on the next pass (the file may have been replaced or the share dropped)
+            self._close_source()
+            self._record_error(f"Replica sync failed: {e}")
+            return
+
+        if self.last_error:
+            logging.info("Read replica back in sync with the network database")
+            self.last_error = None
+        if generation != self._synced_generation and generation != self._pending_generation:
+            # First sighting of a local write: its COMMIT may still be reaching the
+            # share (the connection leaves transaction state before the file is
+            # updated), so only trust the replica after the next pass
+            self._pending_generation = generation
+            return
+        self._pending_generation = None
+        self._synced_generation = generation
+        self._verified_at = started
+
+    def _record_error(self, message: str):
+        if message != self.last_error:
+            logging.warning(f"{message} - reads fall back to the network database")
+        self.last_error = message
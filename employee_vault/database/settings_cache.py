@@ -0,0 +1,246 @@
+"""
+Settings snapshot for EmployeeVault
+
+DB.get_setting used to run one query per key, so assembling the e-mail or
+backup configuration cost a round trip to the share per value and JSON
+settings were parsed again by every reader. SettingsCache keeps the whole
+settings table as one immutable SettingsSnapshot:
+
+- loaded with a single query, JSON values parsed (and frozen) once
+- reloaded only when settings_revision changes - a counter bumped by
+  triggers on the settings table, read by the heartbeat's control-plane probe
+  (see MainWindow), or checked directly when the snapshot is older than
+  SETTINGS_MAX_AGE_SECONDS and nobody is driving refreshes
+- written through, so this client sees its own set_setting immediately
+
+Subscribers are told which keys changed, whether by a local write or a
+reload after another client's write.
+"""
+
+import json
+import time
+import logging
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+# A snapshot older than this checks settings_revision before answering (seconds)
+SETTINGS_MAX_AGE_SECONDS = 5.0
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_MISSING = object()
+
+
+def _freeze(value):
+    """Read-only view of a parsed JSON value (dicts -> mappingproxy, lists -> tuples)"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _parse_json(value):
+    if isinstance(value, str) and value[:1] in ('{', '['):
+        try:
+            return _freeze(json.loads(value))
+        except ValueError:
+            pass
+    return _MISSING
+
+
+class SettingsSnapshot:
+    """
+    Immutable view of the settings table at one revision.
+
+    get() returns the stored text; get_bool / get_int / get_json convert it.
+    JSON objects and arrays are parsed when the snapshot is built and handed
+    out as read-only mappings / tuples, so repeated reads cost a dict lookup.
+    """
+
+    __slots__ = ('revision', '_values', '_json')
+
+    def __init__(self, values: Dict[str, Optional[str]], revision: Optional[int]):
+        self.revision = revision
+        self._values = MappingProxyType(dict(values))
+        parsed = {}
+        for key, value in self._values.items():
+            result = _parse_json(value)
+            if result is not _MISSING:
+                parsed[key] = result
+        self._json = MappingProxyType(parsed)
+
+    def get(self, key: str, default=None):
+        value = self._values.get(key)
+        return default if value is None else value
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        value = self._values.get(key)
+        if value is None:
+            return default
+        return str(value).strip().lower() in _TRUE_VALUES
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        try:
+            return int(self._values[key])
+        except (KeyError, TypeError, ValueError):
+            return default
+
+    def get_json(self, key: str, default=None):
+        """Parsed JSON object / array stored under key (read-only), or default"""
+        return self._json.get(key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+
+    def keys(self):
+        return self._values.keys()
+
+    def as_dict(self) -> Dict[str, Optional[str]]:
+        return dict(self._values)
+
+    def with_changes(self, updates: Dict[str, Optional[str]] = None, deleted: Iterable[str] = ()) -> 'SettingsSnapshot':
+        """Copy with local writes applied (same revision - the next reload confirms them)"""
+        values = dict(self._values)
+        values.update(updates or {})
+        for key in deleted:
+            values.pop(key, None)
+        return SettingsSnapshot(values, self.revision)
+
+    @staticmethod
+    def changed_keys(old: Optional['SettingsSnapshot'], new: 'SettingsSnapshot') -> FrozenSet[str]:
+        if old is None:
+            return frozenset(new.keys())
+        keys = set(old.keys()) | set(new.keys())
+        return frozenset(k for k in keys if old._values.get(k, _MISSING) != new._values.get(k, _MISSING))
+
+
+class SettingsCache:
+    """
+    Settings for one DB instance.
+
+    Usage:
+        db.settings.get_bool('email_notifications_enabled')
+        config = db.settings.get_json('backup_config', {})
+        snapshot = db.settings.snapshot            # several reads at one revision
+        db.settings.subscribe(on_settings_changed) # callback(frozenset_of_keys)
+        db.settings.refresh(revision)              # from the heartbeat's settings_revision
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.reloads = 0
+        self._snapshot: Optional[SettingsSnapshot] = None
+        self._checked = 0.0
+        self._stale = True
+        self._lock = threading.RLock()
+        self._subscribers: List[Callable[[FrozenSet[str]], None]] = []
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @property
+    def snapshot(self) -> SettingsSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None or self._stale or time.monotonic() - self._checked > SETTINGS_MAX_AGE_SECONDS:
+            self.refresh()
+            snapshot = self._snapshot
+        return snapshot
+
+    def get(self, key: str, default=None):
+        return self.snapshot.get(key, default)
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        return self.snapshot.get_bool(key, default)
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        return self.snapshot.get_int(key, default)
+
+    def get_json(self, key: str, default=None):
+        return self.snapshot.get_json(key, default)
+
+    # ------------------------------------------------------------------
+    # Writes (caller commits, as with the other DB write methods)
+    # ------------------------------------------------------------------
+
+    def set(self, key: str, value: Optional[str]):
+        self.set_many({key: value})
+
+    def set_many(self, values: Dict[str, Optional[str]]):
+        with self._lock:
+            self.db.conn.executemany("INSERT OR REPLACE INTO settings(key, value) VALUES(?, ?)",
+                                     list(values.items()))
+            changed = self._apply_local(updates=values)
+        self._notify(changed)
+
+    def delete(self, key: str):
+        with self._lock:
+            self.db.conn.execute("DELETE FROM settings WHERE key = ?", (key,))
+            changed = self._apply_local(deleted=(key,))
+        self._notify(changed)
+
+    def _apply_local(self, updates=None, deleted=()) -> FrozenSet[str]:
+        if self._snapshot is None:
+            self._stale = True  # Loaded (with this write) on the next read
+            return frozenset(updates or {}) | frozenset(deleted)
+        new = self._snapshot.with_changes(updates, deleted)
+        changed = SettingsSnapshot.changed_keys(self._snapshot, new)
+        self._snapshot = new
+        return changed
+
+    # ------------------------------------------------------------------
+    # Revision tracking
+    # ------------------------------------------------------------------
+
+    def invalidate(self):
+        """Reload on the next read (e.g. the database file was restored)"""
+        self._stale = True
+
+    def refresh(self, revision: Optional[int] = None) -> FrozenSet[str]:
+        """
+        Reload if the settings revision moved. With revision (already read by
+        the caller, e.g. the heartbeat) no query runs unless it differs.
+        Returns the keys that changed.
+        """
+        with self._lock:
+            current = self._snapshot
+            if revision is None or self._stale or current is None or revision != current.revision:
+                conn = self.db.conn
+                row = conn.execute("SELECT revision FROM settings_revision WHERE id = 1").fetchone()
+                revision = row[0] if row else None
+                if self._stale or current is None or revision != current.revision:
+                    rows = conn.execute("SELECT key, value FROM settings").fetchall()
+                    new = SettingsSnapshot({r[0]: r[1] for r in rows}, revision)
+                    changed = SettingsSnapshot.changed_keys(current, new) if current is not None else frozenset()
+                    self._snapshot = new
+                    self._stale = False
+                    self.reloads += 1
+                    logging.debug(f"Settings reloaded at revision {revision}: {len(rows)} keys, {len(changed)} changed")
+                else:
+                    changed = frozenset()
+            else:
+                changed = frozenset()
+            self._checked = time.monotonic()
+        self._notify(changed)
+        return changed
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback: Callable[[FrozenSet[str]], None]):
+        """callback(changed_keys) after a local write or a reload that changed something"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[FrozenSet[str]], None]):
+        self._subscribers = [c for c in self._subscribers if c != callback]
+
+    def _notify(self, changed: FrozenSet[str]):
+        if not changed:
+            return
+        for callback in list(self._subscribers):
+            try:
+                callback(changed)
+            except Exception as e:
+                logging.error(f"Settings subscriber failed: {e}", exc_info=True)
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from employee_vault.database.db import DB
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    database = DB(str(tmp_path / "bulk.db"))
+    for n, dept in enumerate(["Office", "Office", "Store"], start=1):
+        database.insert_employee({'emp_id': f'E-{n}', 'name': f'Employee {n}', 'department': dept,
+                                  'hire_date': '01-02-2024', 'modified_by': 'admin'}).result()
+    database.create_user("clerk", "Clerk", "1234").result()
+    database.update_user_permissions("clerk", {"employees": True, "bulk_operations": False, "delete_employee": False})
+    yield database
+    database.close()
+
+
+def _audit(db, action):
+    return db.conn.execute(
+        "SELECT record_id, old_value, new_value, details FROM audit_log WHERE action = ? ORDER BY record_id",
+        (action,)).fetchall()
+
+
+def test_bulk_update_rejects_fields_outside_the_whitelist(db):
+    with pytest.raises(ValueError, match="emp_id, name"):
+        db.bulk_update(['E-1'], {'name': 'X', 'emp_id': 'E-9', 'department': 'Store'}, username='admin')
+    db.writer.flush()
+    assert db.get_employee('E-1')['department'] == 'Office'
+    assert _audit(db, 'BULK_EDITED') == []
+
+
+def test_bulk_update_audits_only_rows_that_changed(db):
+    assert db.bulk_update(['E-1', 'E-2', 'E-3', 'E-404'], {'department': 'Store'}, username='admin').result() == 3
+
+    assert {db.get_employee(f'E-{n}')['department'] for n in (1, 2, 3)} == {'Store'}
+    assert db.get_employee('E-3')['modified_by'] == 'admin'
+    rows = _audit(db, 'BULK_EDITED')
+    assert [r['record_id'] for r in rows] == ['E-1', 'E-2']  # E-3 already was in Store
+    assert json.loads(rows[0]['old_value']) == {'department': 'Office'}
+    assert json.loads(rows[0]['new_value']) == {'department': 'Store'}
+    assert "department: Office → Store" in rows[0]['details']
+    assert not db.conn.in_transaction
+
+
+@pytest.mark.parametrize("call", [
+    lambda db: db.bulk_update(['E-1'], {'department': 'Store'}, username='clerk'),
+    lambda db: db.bulk_archive(['E-1'], username='clerk'),
+    lambda db: db.bulk_archive(['E-1'], username=None),
+])
+def test_bulk_writes_check_permission_in_the_database_layer(db, call):
+    with pytest.raises(PermissionError):
+        call(db)
+    assert db.get_employee('E-1')['department'] == 'Office'
+
+
+def test_bulk_archive_moves_rows_and_audits_them(db):
+    assert db.bulk_archive(['E-1', 'E-3'], username='admin', reason='Contract ended').result() == ['E-1', 'E-3']
+
+    assert [r[0] for r in db.conn.execute("SELECT emp_id FROM employees")] == ['E-2']
+    archived = db.conn.execute("SELECT emp_id, archived_by, archive_reason FROM archived_employees ORDER BY emp_id")
+    assert [tuple(r) for r in archived] == [('E-1', 'admin', 'Contract ended'), ('E-3', 'admin', 'Contract ended')]
+    assert [r['record_id'] for r in _audit(db, 'ARCHIVED')] == ['E-1', 'E-3']
+
+
+def test_import_reads_existing_rows_in_one_query(db):
+    statements = []
+    db.writer.submit(lambda conn: conn.set_trace_callback(statements.append)).result()
+    batch = [
+        {'emp_id': 'E-1', 'name': 'Employee 1', 'department': 'Store'},
+        {'emp_id': 'E-4', 'name': 'Employee 4', 'hire_date': '01-02-2024'},
+        {'emp_id': 'E-4', 'name': 'Employee 4', 'position': 'Clerk'},  # repeat: updates the new row
+        {'emp_id': 'E-5', 'name': 'No hire date'},
+    ]
+
+    result = db.import_employees(batch, username='admin', update_existing=True).result()
+    db.writer.submit(lambda conn: conn.set_trace_callback(None)).result()
+
+    assert (result['added'], result['updated'], result['skipped']) == (1, 2, 1)
+    assert sum('FROM employees' in s and s.lstrip().startswith('SELECT') for s in statements) == 1
+    assert db.get_employee('E-1')['department'] == 'Store'
+    assert db.get_employee('E-4')['position'] == 'Clerk'
+    actions = db.conn.execute("SELECT action, record_id FROM audit_log WHERE username = 'admin' "
+                              "AND action IN ('ADDED', 'EDITED') AND record_id IN ('E-1', 'E-4') ORDER BY id")
+    assert [tuple(r) for r in actions][-3:] == [('EDITED', 'E-1'), ('ADDED', 'E-4'), ('EDITED', 'E-4')]
@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+
+from employee_vault.database.db import DB
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    database = DB(str(tmp_path / "gov_ids.db"))
+    yield database
+    database.close()
+
+
+def _employee(emp_id, name, **ids):
+    return {'emp_id': emp_id, 'name': name, 'hire_date': '01-02-2024', 'modified_by': 'admin', **ids}
+
+
+def _add(db, emp_id, name, **ids):
+    db.insert_employee(_employee(emp_id, name, **ids)).result()
+
+
+def test_insert_rejects_gov_id_matching_without_separators(db):
+    _add(db, 'E-1', 'Ana Cruz', sss_number='12-3456789-0')
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db.insert_employee(_employee('E-2', 'Ben Reyes', sss_number='1234567890')).result()
+    assert db.get_employee('E-2') is None
+
+    conflicts = db.find_gov_id_conflicts({'sss_number': '12 3456789 0'})
+    assert [(c['emp_id'], c['value']) for c in conflicts] == [('E-1', '12-3456789-0')]
+    assert db.find_gov_id_conflicts({'sss_number': '1234567890'}, exclude_emp_id='E-1') == []
+
+
+def test_restore_with_reassigned_gov_id_is_reported_and_rolled_back(db):
+    _add(db, 'E-1', 'Ana Cruz', tin_number='123-456-789')
+    assert db.archive_employee('E-1', 'admin')
+    db.conn.commit()
+    _add(db, 'E-2', 'Ben Reyes', tin_number='123456789')
+
+    conflicts = db.find_restore_conflicts('E-1')
+    assert [(c['field'], c['emp_id']) for c in conflicts] == [('tin_number', 'E-2')]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db.restore_employee('E-1', 'admin')
+    assert not db.conn.in_transaction
+    assert db.conn.execute("SELECT COUNT(*) FROM archived_employees WHERE emp_id = 'E-1'").fetchone()[0] == 1
+    assert db.get_employee('E-1') is None
+
+    # Once the active employee's ID is corrected the restore goes through
+    db.conn.execute("UPDATE employees SET tin_number = '999-999-999' WHERE emp_id = 'E-2'")
+    db.conn.commit()
+    assert db.find_restore_conflicts('E-1') == []
+    assert db.restore_employee('E-1', 'admin')
+    assert not db.conn.in_transaction
+    assert db.get_employee('E-1')['tin_number'] == '123-456-789'
+
+
+def test_import_skips_rows_with_duplicate_gov_ids(db):
+    _add(db, 'E-1', 'Ana Cruz', sss_number='12-3456789-0', pagibig_number='1234-5678-9012')
+    batch = [
+        _employee('E-2', 'Ben Reyes', sss_number='1234567890'),          # taken by E-1
+        _employee('E-3', 'Carla Diaz', philhealth_number='11-222222222-3'),
+        _employee('E-4', 'Dan Lim', philhealth_number='112222222223'),   # repeats row 2
+        _employee('E-1', 'Ana Cruz-Santos', pagibig_number='123456789012'),  # its own ID
+    ]
+
+    conflicts = db.find_gov_id_batch_conflicts(batch)
+    assert sorted((c['row'], c.get('other_row')) for c in conflicts) == [(0, None), (2, 1)]
+
+    result = db.import_employees(batch, username='admin', update_existing=True).result()
+    assert (result['added'], result['updated'], result['skipped']) == (1, 1, 2)
+    assert sorted(c['row'] for c in result['conflicts']) == [0, 2]
+    assert not db.conn.in_transaction
+    assert sorted(r[0] for r in db.conn.execute("SELECT emp_id FROM employees")) == ['E-1', 'E-3']
+    assert db.get_employee('E-1')['name'] == 'Ana Cruz-Santos'
+
+
+def test_import_is_all_or_nothing(db):
+    _add(db, 'E-1', 'Ana Cruz')
+    batch = [_employee('E-2', 'Ben Reyes'), _employee('E-3', 'Carla Diaz', salary='not a number')]
+
+    with pytest.raises(ValueError):
+        db.import_employees(batch, username='admin').result()
+    assert not db.conn.in_transaction
+    assert db.get_employee('E-2') is None
@@ -0,0 +1,120 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from employee_vault.database.db import DB
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    database = DB(str(tmp_path / "leases.db"))
+    yield database
+    database.close()
+
+
+def _legacy_lock(db, record_id, user, expires_at):
+    # What a client older than the epoch columns writes: no lock_expires_epoch
+    db.conn.execute("""
+        INSERT OR REPLACE INTO record_locks (record_id, locked_by, locked_at, computer_name, lock_expires_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP, 'old-pc', ?)
+    """, (record_id, user, expires_at.isoformat()))
+    db.conn.commit()
+
+
+def test_acquire_lock_takes_free_and_expired_leases(db):
+    assert db.acquire_lock("E-1", "alice")
+    assert not db.acquire_lock("E-1", "bob")
+    assert db.acquire_lock("E-1", "alice")  # renewal by the holder
+
+    db.conn.execute("UPDATE record_locks SET lock_expires_epoch = ? WHERE record_id = 'E-1'",
+                    (int(time.time()) - 1,))
+    db.conn.commit()
+    assert db.acquire_lock("E-1", "bob")
+    assert db.get_lock_info("E-1")["locked_by"] == "bob"
+
+
+def test_live_legacy_lock_without_epoch_is_honoured(db):
+    _legacy_lock(db, "E-2", "old-client", datetime.now() + timedelta(minutes=20))
+
+    assert not db.acquire_lock("E-2", "bob")
+    info = db.get_lock_info("E-2")
+    assert info["locked"] and info["locked_by"] == "old-client"
+    assert [lock["record_id"] for lock in db.get_all_locks()] == ["E-2"]
+
+    DB._sweep_expired_leases(db.conn, int(time.time()))
+    db.conn.commit()
+    assert db.conn.execute("SELECT COUNT(*) FROM record_locks").fetchone()[0] == 1
+
+
+def test_expired_legacy_lock_without_epoch_is_taken_over(db):
+    _legacy_lock(db, "E-3", "old-client", datetime.now() - timedelta(minutes=1))
+
+    assert not db.get_lock_info("E-3")["locked"]
+    assert db.acquire_lock("E-3", "bob")
+    assert db.get_lock_info("E-3")["locked_by"] == "bob"
+
+
+def test_legacy_sessions_without_epoch_expire_from_last_activity(db):
+    db.conn.execute("""
+        INSERT INTO active_sessions (username, computer_name, last_activity)
+        VALUES ('recent', 'old-pc', datetime('now', '-5 minutes')),
+               ('stale', 'old-pc', datetime('now', '-2 hours'))
+    """)
+    db.conn.commit()
+
+    assert [s["username"] for s in db.get_active_sessions()] == ["recent"]
+
+    DB._sweep_expired_leases(db.conn, int(time.time()))
+    db.conn.commit()
+    remaining = [r[0] for r in db.conn.execute("SELECT username FROM active_sessions")]
+    assert remaining == ["recent"]
+
+
+def test_legacy_renewal_moves_the_epoch(db):
+    _legacy_lock(db, "E-4", "old-client", datetime.now() + timedelta(minutes=1))
+    renewed = datetime.now() + timedelta(minutes=30)
+    db.conn.execute("UPDATE record_locks SET lock_expires_at = ? WHERE record_id = 'E-4'", (renewed.isoformat(),))
+    db.conn.commit()
+
+    epoch = db.conn.execute("SELECT lock_expires_epoch FROM record_locks WHERE record_id = 'E-4'").fetchone()[0]
+    assert abs(epoch - int(renewed.timestamp())) <= 1
+
+
+def test_rows_left_without_epoch_are_backfilled_on_open(tmp_path, db):
+    db.conn.execute("DROP TRIGGER trg_record_locks_legacy_insert")
+    _legacy_lock(db, "E-5", "old-client", datetime.now() + timedelta(minutes=20))
+    db.close()
+
+    reopened = DB(str(tmp_path / "leases.db"))
+    try:
+        assert reopened.conn.execute(
+            "SELECT COUNT(*) FROM record_locks WHERE lock_expires_epoch IS NULL").fetchone()[0] == 0
+        assert not reopened.acquire_lock("E-5", "bob")
+    finally:
+        reopened.close()
+
+
+def test_lease_queries_use_the_epoch_indexes(db):
+    db.acquire_lock("E-6", "alice")
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        DB._sweep_expired_leases(db.conn, int(time.time()))
+        db.get_lock_info("E-6")
+        db.get_all_locks()
+        db.get_active_sessions()
+    finally:
+        db.conn.set_trace_callback(None)
+    db.conn.commit()
+
+    plans = {}
+    for sql in statements:
+        if "expires_epoch" in sql:
+            plans[sql] = " | ".join(row[3] for row in db.conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+    assert len(plans) == 5
+    for sql, plan in plans.items():
+        assert "SCAN record_locks" not in plan and "SCAN active_sessions" not in plan, (sql, plan)
+    sweep = next(plan for sql, plan in plans.items() if sql.startswith("DELETE FROM record_locks"))
+    assert "idx_record_locks_expires_epoch" in sweep
@@ -0,0 +1,106 @@
+import sqlite3
+import time
+
+import pytest
+
+from employee_vault.database.db import DB
+from employee_vault.database.replica import ReadReplica
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    database = DB(str(tmp_path / "network.db"))
+    database.writer.flush()
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def replica(db, tmp_path):
+    rep = ReadReplica(db.path, str(tmp_path / "replica" / "copy.db"),
+                      local_generation=db._local_write_generation, max_staleness=0.5)
+    yield rep
+    rep.stop()
+
+
+@pytest.fixture
+def dst(replica, tmp_path):
+    (tmp_path / "replica").mkdir()
+    conn = replica._open_local()
+    yield conn
+    replica._close_source()
+    conn.close()
+
+
+def _add(db, emp_id):
+    db.insert_employee({'emp_id': emp_id, 'name': f'Employee {emp_id}', 'hire_date': '01-02-2024',
+                        'modified_by': 'admin'}).result()
+
+
+def _replica_ids(replica):
+    return [r[0] for r in replica.connection().execute("SELECT emp_id FROM employees ORDER BY emp_id")]
+
+
+def test_replica_is_fresh_only_after_a_sync_and_within_max_staleness(replica, dst):
+    assert not replica.is_fresh()
+    replica._sync_once(dst)
+    assert replica.is_fresh()
+    assert replica.sync_count == 1
+
+    time.sleep(0.6)
+    assert replica.connection() is None
+
+
+def test_lease_heartbeat_and_audit_writes_do_not_resync(db, replica, dst):
+    replica._sync_once(dst)
+
+    db.log_action_async('admin', 'LOGIN', details='audit only').result()
+    db.writer.execute("UPDATE maintenance_lease SET holder = 'pc-1', expires_epoch = 4102444800 WHERE id = 1").result()
+    db.heartbeat('admin').result()
+    assert replica.is_fresh()
+
+    replica._sync_once(dst)
+    assert replica.sync_count == 1
+    assert replica.is_fresh()
+
+
+def test_own_employee_write_is_not_read_from_an_older_copy(db, replica, dst):
+    replica._sync_once(dst)
+    _add(db, 'E-1')
+    assert not replica.is_fresh()
+
+    replica._sync_once(dst)  # Copies the new revision, then waits one confirmation pass
+    assert replica.sync_count == 2
+    assert not replica.is_fresh()
+    replica._sync_once(dst)
+    assert replica.sync_count == 2
+    assert _replica_ids(replica) == ['E-1']
+
+
+def test_other_clients_employee_writes_resync_without_making_the_copy_stale(db, replica, dst):
+    replica._sync_once(dst)
+    other = sqlite3.connect(db.path)
+    other.execute("INSERT INTO employees(emp_id, name, hire_date) VALUES ('E-9', 'Elsewhere', '01-02-2024')")
+    other.commit()
+    other.close()
+
+    # Bounded staleness: still served until the next pass picks the change up
+    assert replica.is_fresh()
+    replica._sync_once(dst)
+    assert replica.sync_count == 2
+    assert _replica_ids(replica) == ['E-9']
+
+
+def test_uncommitted_local_write_keeps_the_replica_stale(db, replica, dst):
+    replica._sync_once(dst)
+    db.conn.execute("INSERT OR REPLACE INTO settings(key, value) VALUES ('theme', 'dark')")
+    assert not replica.is_fresh()
+    replica._sync_once(dst)
+    assert not replica.is_fresh()
+
+    db.conn.commit()
+    replica._sync_once(dst)
+    assert replica.sync_count == 2
+    replica._sync_once(dst)
+    assert replica.is_fresh()
@@ -0,0 +1,111 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from employee_vault.database.db import DB
+from employee_vault.database.maintenance import MaintenanceScheduler
+from employee_vault.database.tiering import (
+    AuditTiering, archive_files, archive_path, backup_archives, restore_archives,
+)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    database = DB(str(tmp_path / "tiering.db"))
+    yield database
+    database.close()
+
+
+def _chain(db, timestamps):
+    """Append hash-chained security_audit rows with the given timestamps, in id order"""
+    previous = db._get_last_security_hash()
+    for i, ts in enumerate(timestamps):
+        entry_hash = db._compute_entry_hash(ts, 'EVENT', 'alice', f'event {i}', previous)
+        db.conn.execute("""
+            INSERT INTO security_audit(timestamp, event_type, username, details, previous_hash, entry_hash)
+            VALUES (?, 'EVENT', 'alice', ?, ?, ?)
+        """, (ts, f'event {i}', previous, entry_hash))
+        previous = entry_hash
+    db.conn.commit()
+
+
+def _days_ago(days):
+    return (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def test_skewed_clocks_do_not_break_the_chain(db):
+    # id 2 was stamped by a PC whose clock ran ahead: later than id 3
+    _chain(db, [_days_ago(800), _days_ago(100), _days_ago(700)])
+    assert db.verify_security_audit_integrity()['valid']
+
+    moved = AuditTiering(db.path).run_once(hot_days=365)
+
+    # The whole id prefix up to id 3 moves, not just the rows dated before the horizon
+    assert moved['security_audit'] == 3
+    assert db.conn.execute("SELECT COUNT(*) FROM security_audit").fetchone()[0] == 0
+    assert db.verify_security_audit_integrity()['valid']
+    result = db.verify_security_audit_integrity(include_archives=True)
+    assert result['valid'], result['details']
+    assert result['total_entries'] == 3
+
+
+def test_hot_chain_continues_from_archived_head(db):
+    _chain(db, [_days_ago(900), _days_ago(800), _days_ago(10)])
+    AuditTiering(db.path).run_once(hot_days=365)
+    _chain(db, [_days_ago(1)])
+
+    assert [r[0] for r in db.conn.execute("SELECT id FROM security_audit ORDER BY id")] == [3, 4]
+    assert db.verify_security_audit_integrity()['valid']
+    assert db.verify_security_audit_integrity(include_archives=True)['total_entries'] == 4
+
+
+def test_tampered_archive_is_reported(db):
+    _chain(db, [_days_ago(800), _days_ago(790), _days_ago(5)])
+    AuditTiering(db.path).run_once(hot_days=365)
+
+    year = int(_days_ago(800)[:4])
+    archive = sqlite3.connect(archive_path(db.path, year))
+    with pytest.raises(sqlite3.DatabaseError):
+        archive.execute("UPDATE security_audit SET details = 'edited' WHERE id = 1")
+    archive.execute("DROP TRIGGER trg_security_audit_no_update")
+    archive.execute("UPDATE security_audit SET details = 'edited' WHERE id = 1")
+    archive.commit()
+    archive.close()
+
+    result = db.verify_security_audit_integrity(include_archives=True)
+    assert not result['valid']
+    assert any(issue.startswith("Entry 1:") for issue in result['details'])
+
+
+def test_tiering_runs_as_maintenance_task_of_lease_holder(db):
+    _chain(db, [_days_ago(800), _days_ago(5)])
+    db.conn.execute("UPDATE maintenance_lease SET holder = 'other-pc', expires_epoch = 4102444800 WHERE id = 1")
+    db.conn.commit()
+
+    scheduler = MaintenanceScheduler(db.path)
+    assert scheduler.run_due(force=True) == {}
+    assert db.conn.execute("SELECT COUNT(*) FROM security_audit").fetchone()[0] == 2
+
+    db.conn.execute("UPDATE maintenance_lease SET holder = NULL, expires_epoch = 0 WHERE id = 1")
+    db.conn.commit()
+    assert scheduler.run_due(force=True)['tiering'] == 'ok'
+    assert db.conn.execute("SELECT COUNT(*) FROM security_audit").fetchone()[0] == 1
+    assert db.verify_security_audit_integrity(include_archives=True)['valid']
+
+
+def test_archives_round_trip_through_backup(db, tmp_path):
+    _chain(db, [_days_ago(800), _days_ago(5)])
+    AuditTiering(db.path).run_once(hot_days=365)
+    originals = archive_files(db.path)
+    assert len(originals) == 1
+
+    copies = backup_archives(db.path, str(tmp_path / "backup.archive"))
+    assert [os.path.basename(p) for p in copies] == [os.path.basename(p) for p in originals]
+
+    os.remove(originals[0])
+    assert not db.verify_security_audit_integrity(include_archives=True)['valid']
+    restore_archives(str(tmp_path / "backup.archive"), db.path)
+    assert db.verify_security_audit_integrity(include_archives=True)['valid']
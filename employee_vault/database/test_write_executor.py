@@ -0,0 +1,108 @@
+import sqlite3
+import threading
+
+import pytest
+
+from employee_vault.database.write_executor import DBWriteExecutor
+
+
+@pytest.fixture
+def path(tmp_path):
+    db_path = str(tmp_path / "writer.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE t(v TEXT UNIQUE)")
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def writer(path):
+    executor = DBWriteExecutor(path)
+    yield executor
+    executor.shutdown()
+
+
+def _rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return [r[0] for r in conn.execute("SELECT v FROM t ORDER BY rowid")]
+    finally:
+        conn.close()
+
+
+def _hold_writer(writer):
+    """Park the writer thread on a job so the next submissions queue up behind it"""
+    started, release = threading.Event(), threading.Event()
+
+    def _block(conn):
+        started.set()
+        release.wait(5)
+
+    writer.submit(_block, label="block")
+    assert started.wait(5)
+    return release
+
+
+def _insert(conn, value):
+    conn.execute("INSERT INTO t(v) VALUES(?)", (value,))
+    return value
+
+
+def test_queued_jobs_commit_in_one_transaction(writer, path):
+    release = _hold_writer(writer)
+    generation = writer.generation
+    futures = [writer.submit(_insert, f"v{i}") for i in range(10)]
+    release.set()
+
+    assert [f.result(5) for f in futures] == [f"v{i}" for i in range(10)]
+    # One commit for the blocking job, one for the ten jobs queued behind it
+    assert writer.generation == generation + 2
+    assert _rows(path) == [f"v{i}" for i in range(10)]
+
+
+def test_failing_job_is_split_out_of_its_batch(writer, path):
+    def _bad(conn):
+        conn.execute("INSERT INTO t(v) VALUES('bad')")
+        raise ValueError("bad job")
+
+    release = _hold_writer(writer)
+    good1 = writer.submit(_insert, "a")
+    bad = writer.submit(_bad)
+    duplicate = writer.submit(_insert, "a")
+    good2 = writer.submit(_insert, "b")
+    release.set()
+
+    assert good1.result(5) == "a"
+    assert good2.result(5) == "b"
+    with pytest.raises(ValueError, match="bad job"):
+        bad.result(5)
+    with pytest.raises(sqlite3.IntegrityError):
+        duplicate.result(5)
+    # The failed jobs' partial writes were rolled back
+    assert _rows(path) == ["a", "b"]
+
+
+def test_lock_contention_is_waited_out(writer, path):
+    other = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    other.execute("BEGIN IMMEDIATE")
+    future = writer.submit(_insert, "late")
+    threading.Timer(0.3, other.execute, ("COMMIT",)).start()
+
+    assert future.result(5) == "late"
+    other.close()
+    assert _rows(path) == ["late"]
+
+
+def test_lock_held_past_the_timeout_fails_the_job(path):
+    writer = DBWriteExecutor(path, lock_wait_timeout=0.2)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            writer.submit(_insert, "never").result(5)
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+        writer.shutdown()
+    assert _rows(path) == []
@@ -0,0 +1,376 @@
+"""
+Hot/cold tiering for the audit tables
+
+audit_log, security_audit and login_attempts only ever grow, so every query,
+backup, VACUUM and integrity check of the main database got slower each year.
+AuditTiering moves rows older than the hot horizon (settings key
+'audit_hot_days', TIERING_HOT_DAYS by default) into one archive database per
+year, archive/<db name>_archive_<year>.db next to the main database. It runs
+as the 'tiering' task of the maintenance scheduler, so only the client
+holding the maintenance lease ever writes the archives:
+
+- rows are taken in id order, each batch one run of ids from the same year;
+  security_audit moves a contiguous id prefix (everything up to the newest
+  id dated before the horizon), because PCs stamp their own clocks and the
+  hash chain follows ids, not timestamps
+- each batch is first copied into the archive (INSERT OR IGNORE on the
+  original id) and committed, then deleted from the hot table only where the
+  archive already holds the row, so a crash between the two steps leaves a
+  duplicate that the next run cleans up, never a lost row
+- archive tables carry the hot table's columns and indexes and triggers that
+  reject UPDATE and DELETE (append-only)
+- the audit_tiers table in the main database records, per table and year,
+  how many rows were archived and the hash of the last archived
+  security_audit entry, so the chain can be verified across tiers and new
+  entries still link to it when the hot table is empty
+
+query_tiers() reads the hot table and the archives that overlap a date range
+for the rare lookups that need full history (employee history, compliance).
+Once rows move, an archive is their only copy: backup_archives() and
+restore_archives() carry the archive files along with database backups.
+"""
+
+import os
+import re
+import glob
+import shutil
+import sqlite3
+import logging
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Rows older than this many days leave the hot tables (settings key below overrides)
+TIERING_HOT_DAYS = 365
+TIERING_HOT_DAYS_SETTING = "audit_hot_days"
+# Rows moved per transaction, so the main database's write lock is held briefly
+TIERING_BATCH_ROWS = 5000
+# Folder (next to the main database) that holds the yearly archives
+ARCHIVE_FOLDER = "archive"
+# A database backup's archive copies go to <backup file><suffix>/
+ARCHIVE_BACKUP_SUFFIX = ".archive"
+
+# Tiered table -> the column that dates its rows
+TIERED_TABLES = {
+    'audit_log': 'timestamp',
+    'security_audit': 'timestamp',
+    'login_attempts': 'attempt_time',
+}
+
+_ARCHIVE_ALIAS = "archive_tier"
+
+
+def archive_path(db_path: str, year) -> str:
+    """Archive file for one year of db_path's audit history"""
+    folder, filename = os.path.split(os.path.abspath(db_path))
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(folder, ARCHIVE_FOLDER, f"{stem}_archive_{year}.db")
+
+
+def archive_files(db_path: str) -> List[str]:
+    """Every yearly archive file of db_path, oldest year first"""
+    return sorted(glob.glob(archive_path(db_path, "*")))
+
+
+def backup_archives(db_path: str, dest_folder: str) -> List[str]:
+    """
+    Copy every archive of db_path into dest_folder with SQLite's backup API
+    (consistent even while the maintenance client appends). Returns the copies.
+    """
+    copies = []
+    for path in archive_files(db_path):
+        os.makedirs(dest_folder, exist_ok=True)
+        dest = os.path.join(dest_folder, os.path.basename(path))
+        source = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30.0)
+        try:
+            target = sqlite3.connect(dest)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        finally:
+            source.close()
+        copies.append(dest)
+    return copies
+
+
+def restore_archives(src_folder: str, db_path: str) -> List[str]:
+    """
+    Put the archive copies of a backup back next to db_path (replacing the
+    same years), so the restored audit_tiers manifest matches its archives.
+    """
+    restored = []
+    for path in sorted(glob.glob(os.path.join(src_folder, "*_archive_*.db"))):
+        year = os.path.splitext(os.path.basename(path))[0].rsplit("_archive_", 1)[1]
+        dest = archive_path(db_path, year)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.copy2(path, dest)
+        restored.append(dest)
+    return restored
+
+
+def archived_years(conn: sqlite3.Connection, table: str) -> List[int]:
+    """Years of table that have rows in an archive, oldest first"""
+    try:
+        rows = conn.execute("SELECT year FROM audit_tiers WHERE table_name = ? AND rows > 0 ORDER BY year",
+                            (table,)).fetchall()
+    except sqlite3.OperationalError:
+        return []  # Database from before tiering
+    return [r[0] for r in rows]
+
+
+def archived_chain_head(conn: sqlite3.Connection) -> Optional[str]:
+    """
+    entry_hash of the archived security_audit row with the highest id; the
+    archives hold a contiguous id prefix, so the hot chain continues from it
+    """
+    try:
+        row = conn.execute("""
+            SELECT last_hash FROM audit_tiers
+            WHERE table_name = 'security_audit' AND last_hash IS NOT NULL
+            ORDER BY last_id DESC LIMIT 1
+        """).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def open_archive(db_path: str, year: int) -> Optional[sqlite3.Connection]:
+    """Read-only connection to one year's archive, or None if it does not exist"""
+    path = archive_path(db_path, year)
+    if not os.path.exists(path):
+        return None
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=5.0)
+
+
+def query_tiers(db_path: str, conn: sqlite3.Connection, table: str, where: str = "1=1",
+                params: Sequence = (), date_from: str = None, date_to: str = None,
+                limit: int = None, include_archives: bool = True) -> List[Dict]:
+    """
+    Rows of table matching where, from the hot table and (optionally) every
+    archive year that overlaps date_from / date_to, newest first.
+
+    where must only reference the table's own columns. Dates are 'YYYY-MM-DD'
+    and inclusive.
+    """
+    column = TIERED_TABLES[table]
+    clauses, args = [f"({where})"], list(params)
+    if date_from:
+        clauses.append(f"{column} >= ?")
+        args.append(date_from)
+    if date_to:
+        clauses.append(f"{column} < ?")
+        args.append((datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d"))
+    sql = f"SELECT * FROM {table} WHERE {' AND '.join(clauses)} ORDER BY {column} DESC, id DESC"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+
+    def fetch(source: sqlite3.Connection, tier: str) -> List[Dict]:
+        cursor = source.execute(sql, args)
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row), tier=tier) for row in cursor.fetchall()]
+
+    rows = fetch(conn, "hot")
+    if include_archives:
+        first_year = int(date_from[:4]) if date_from else None
+        last_year = int(date_to[:4]) if date_to else None
+        for year in archived_years(conn, table):
+            if (first_year and year < first_year) or (last_year and year > last_year):
+                continue
+            archive = open_archive(db_path, year)
+            if archive is None:
+                logging.warning(f"Audit archive for {year} is missing: {archive_path(db_path, year)}")
+                continue
+            try:
+                rows.extend(fetch(archive, str(year)))
+            except sqlite3.Error as e:
+                logging.warning(f"Could not read audit archive {year}: {e}")
+            finally:
+                archive.close()
+        rows.sort(key=lambda r: (r.get(column) or "", r.get('id') or 0), reverse=True)
+    return rows[:limit] if limit else rows
+
+
+class AuditTiering:
+    """
+    Mover from the hot audit tables to the yearly archives.
+
+    Run by the maintenance scheduler's 'tiering' task on the lease holder's
+    connection; tests and tools can also call it on a connection of their own.
+
+    Usage:
+        moved = AuditTiering(db_path).run_once(conn, should_stop=scheduler_yield)
+    """
+
+    def __init__(self, path: str, batch_rows: int = TIERING_BATCH_ROWS):
+        self.path = path
+        self.batch_rows = batch_rows
+
+    def run_once(self, conn: sqlite3.Connection = None, hot_days: int = None,
+                 should_stop: Callable[[], bool] = None) -> Dict[str, int]:
+        """
+        Archive everything older than the horizon; returns rows moved per table.
+        conn must be in autocommit mode (isolation_level=None); without one a
+        connection is opened for the pass. should_stop is checked between
+        batches.
+        """
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None,
+                                   uri=self.path.startswith('file:'))
+        should_stop = should_stop or (lambda: False)
+        try:
+            if hot_days is None:
+                hot_days = self._hot_days(conn)
+            cutoff = (date.today() - timedelta(days=hot_days)).isoformat()
+            moved = {}
+            for table, column in TIERED_TABLES.items():
+                if should_stop():
+                    break
+                moved[table] = self._tier_table(conn, table, column, cutoff, should_stop)
+            if any(moved.values()):
+                logging.info(f"Audit tiering moved rows older than {cutoff}: {moved}")
+            return moved
+        finally:
+            if own_conn:
+                conn.close()
+
+    # ------------------------------------------------------------------
+    # Tiering
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _hot_days(conn: sqlite3.Connection) -> int:
+        try:
+            row = conn.execute("SELECT value FROM settings WHERE key = ?", (TIERING_HOT_DAYS_SETTING,)).fetchone()
+            return max(1, int(row[0])) if row else TIERING_HOT_DAYS
+        except (sqlite3.Error, TypeError, ValueError):
+            return TIERING_HOT_DAYS
+
+    def _tier_table(self, conn: sqlite3.Connection, table: str, column: str, cutoff: str,
+                    should_stop: Callable[[], bool]) -> int:
+        if table == 'security_audit':
+            # Hash chained by id: move the whole id prefix up to the newest entry
+            # dated before the horizon, even entries a fast clock stamped later
+            last_id = conn.execute(f"SELECT MAX(id) FROM {table} WHERE {column} < ?", (cutoff,)).fetchone()[0]
+            if last_id is None:
+                return 0
+            bound, bound_args = "id <= ?", (last_id,)
+        else:
+            bound, bound_args = f"{column} < ?", (cutoff,)
+
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS tier_batch(id INTEGER PRIMARY KEY, year INTEGER)")
+        moved = 0
+        while not should_stop():
+            conn.execute("DELETE FROM temp.tier_batch")
+            conn.execute(f"""
+                INSERT INTO temp.tier_batch(id, year)
+                SELECT id, CAST(substr({column}, 1, 4) AS INTEGER) FROM main.{table}
+                WHERE {bound} ORDER BY id LIMIT ?
+            """, (*bound_args, self.batch_rows))
+            first = conn.execute("SELECT id, year FROM temp.tier_batch ORDER BY id LIMIT 1").fetchone()
+            if first is None:
+                break
+            first_id, year = first
+            if year is None or not 1900 <= year <= 9999:
+                logging.warning(f"Audit tiering stopped at an undated {table} row (id {first_id})")
+                break
+            # One archive per batch: keep only the leading run of ids from the same year
+            conn.execute("""
+                DELETE FROM temp.tier_batch
+                WHERE id >= (SELECT MIN(id) FROM temp.tier_batch WHERE year IS NOT ?)
+            """, (year,))
+            count = conn.execute("SELECT COUNT(*) FROM temp.tier_batch").fetchone()[0]
+            moved_run = self._tier_year(conn, table, year)
+            moved += moved_run
+            if moved_run < count:
+                logging.warning(f"Audit tiering: {count - moved_run} {table} row(s) for {year} were not archived")
+                break
+        return moved
+
+    def _tier_year(self, conn: sqlite3.Connection, table: str, year: int) -> int:
+        """Move the rows listed in temp.tier_batch into year's archive; returns how many"""
+        path = archive_path(self.path, year)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn.execute(f"ATTACH DATABASE ? AS {_ARCHIVE_ALIAS}", (path,))
+        try:
+            columns = self._prepare_archive(conn, table)
+            column_list = ", ".join(columns)
+
+            # 1. Copy into the archive (its own commit)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(f"""
+                    INSERT OR IGNORE INTO {_ARCHIVE_ALIAS}.{table}({column_list})
+                    SELECT {column_list} FROM main.{table} WHERE id IN (SELECT id FROM temp.tier_batch)
+                """)
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+
+            # 2. Delete what the archive now holds and update the manifest
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                deleted = conn.execute(f"""
+                    DELETE FROM main.{table}
+                    WHERE id IN (SELECT id FROM temp.tier_batch)
+                      AND id IN (SELECT id FROM {_ARCHIVE_ALIAS}.{table} WHERE id IN (SELECT id FROM temp.tier_batch))
+                """).rowcount
+                self._update_manifest(conn, table, year, deleted)
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            return deleted
+        finally:
+            try:
+                conn.execute(f"DETACH DATABASE {_ARCHIVE_ALIAS}")
+            except sqlite3.Error as e:
+                logging.warning(f"Could not detach audit archive {year}: {e}")
+
+    @staticmethod
+    def _prepare_archive(conn: sqlite3.Connection, table: str) -> List[str]:
+        """Create (or extend) the archive copy of table; returns the columns both have"""
+        hot_columns = [r[1] for r in conn.execute(f"PRAGMA main.table_info({table})").fetchall()]
+        archive_columns = [r[1] for r in conn.execute(f"PRAGMA {_ARCHIVE_ALIAS}.table_info({table})").fetchall()]
+        if not archive_columns:
+            sql = conn.execute("SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?",
+                               (table,)).fetchone()[0]
+            sql = re.sub(r'CREATE TABLE\s+(IF NOT EXISTS\s+)?"?\w+"?',
+                         f"CREATE TABLE IF NOT EXISTS {_ARCHIVE_ALIAS}.{table}", sql, count=1)
+            # Archived ids come from the hot table; the archive never allocates its own
+            conn.execute(sql.replace("AUTOINCREMENT", ""))
+            for (index_sql,) in conn.execute("""
+                SELECT sql FROM main.sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL
+            """, (table,)).fetchall():
+                conn.execute(re.sub(r'CREATE INDEX\s+(IF NOT EXISTS\s+)?(\w+)',
+                                    rf"CREATE INDEX IF NOT EXISTS {_ARCHIVE_ALIAS}.\2", index_sql, count=1))
+            for event in ("UPDATE", "DELETE"):
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {_ARCHIVE_ALIAS}.trg_{table}_no_{event.lower()}
+                    BEFORE {event} ON {table}
+                    BEGIN SELECT RAISE(ABORT, 'audit archives are append-only'); END
+                """)
+            archive_columns = hot_columns
+        else:
+            # A column added to the hot table since this archive was created
+            for name in hot_columns:
+                if name not in archive_columns:
+                    conn.execute(f"ALTER TABLE {_ARCHIVE_ALIAS}.{table} ADD COLUMN {name}")
+                    archive_columns.append(name)
+        return [name for name in hot_columns if name in archive_columns]
+
+    @staticmethod
+    def _update_manifest(conn: sqlite3.Connection, table: str, year: int, moved: int):
+        stats = conn.execute(f"SELECT COUNT(*), MIN(id), MAX(id) FROM {_ARCHIVE_ALIAS}.{table}").fetchone()
+        last_hash = None
+        if table == 'security_audit':
+            row = conn.execute(f"SELECT entry_hash FROM {_ARCHIVE_ALIAS}.security_audit ORDER BY id DESC LIMIT 1").fetchone()
+            last_hash = row[0] if row else None
+        conn.execute("""
+            INSERT INTO main.audit_tiers(table_name, year, rows, first_id, last_id, last_hash, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(table_name, year) DO UPDATE SET
+                rows = excluded.rows, first_id = excluded.first_id, last_id = excluded.last_id,
+                last_hash = excluded.last_hash, updated_at = excluded.updated_at
+        """, (table, year, stats[0], stats[1], stats[2], last_hash, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
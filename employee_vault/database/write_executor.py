@@ -0,0 +1,244 @@
+"""
+Dedicated database writer thread for Employee Vault
+
+All queued writes run on a single background thread that owns its own
+write connection. Adjacent jobs are batched into one transaction, and
+"database is locked" contention is handled with timed waits on the writer
+thread, so the Qt main thread never blocks on a network file lock.
+"""
+
+import queue
+import logging
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+
+
+_STOP = object()
+
+
+class _WriteJob:
+    """A single queued write: fn(conn, *args) plus the future that receives its result"""
+    __slots__ = ("fn", "args", "kwargs", "label", "future")
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict, label: str):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.label = label
+        self.future = Future()
+
+
+class DBWriteExecutor:
+    """
+    Single-writer executor for SQLite.
+
+    Usage:
+        writer = DBWriteExecutor(db_path)
+        future = writer.execute("UPDATE settings SET value=? WHERE key=?", (v, k))
+        writer.submit(lambda conn: conn.execute(...), label="my_write")
+
+    Every job receives the writer's connection as its first argument and runs
+    inside a BEGIN IMMEDIATE transaction shared with any other jobs that were
+    already queued behind it (up to max_batch). If a batch fails for a reason
+    other than lock contention, its jobs are retried one by one so a single bad
+    job cannot fail its neighbours.
+    """
+
+    def __init__(self, path: str, is_network_path: bool = False, max_batch: int = 50,
+                 lock_wait_timeout: float = 30.0):
+        self.path = path
+        self.is_network_path = is_network_path
+        self.max_batch = max_batch
+        self.lock_wait_timeout = lock_wait_timeout
+
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._conn = None
+        self.generation = 0  # Incremented after every committed transaction
+        self._thread = threading.Thread(target=self._run, name="DBWriter", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, fn: Callable, *args, label: str = None, **kwargs) -> Future:
+        """Queue fn(conn, *args, **kwargs) for the writer thread. Returns a Future."""
+        job = _WriteJob(fn, args, kwargs, label or getattr(fn, "__name__", "write"))
+        if self._stop_event.is_set():
+            job.future.set_exception(RuntimeError("Database writer has been shut down"))
+            return job.future
+        job.future.add_done_callback(lambda f, j=job: self._log_failure(j, f))
+        self._queue.put(job)
+        return job.future
+
+    def execute(self, sql: str, params: tuple = (), label: str = None) -> Future:
+        """Queue a single statement. The Future resolves to the cursor's rowcount."""
+        return self.submit(lambda conn: conn.execute(sql, params).rowcount, label=label or sql.split()[0])
+
+    def executemany(self, sql: str, seq_of_params: List[tuple], label: str = None) -> Future:
+        """Queue an executemany. The Future resolves to the total rowcount."""
+        seq = list(seq_of_params)
+        return self.submit(lambda conn: conn.executemany(sql, seq).rowcount, label=label or sql.split()[0])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every job queued before this call has been committed"""
+        if not self._thread.is_alive():
+            return True
+        try:
+            self.submit(lambda conn: None, label="flush").result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    @property
+    def pending(self) -> int:
+        """Approximate number of queued jobs"""
+        return self._queue.qsize()
+
+    def is_writer_thread(self) -> bool:
+        """True when called from the writer thread itself"""
+        return threading.current_thread() is self._thread
+
+    def shutdown(self, timeout: float = 5.0):
+        """Drain queued writes, close the write connection and stop the thread"""
+        if self._stop_event.is_set():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+        self._stop_event.set()
+        if self._thread.is_alive():
+            logging.warning(f"Database writer did not stop within {timeout}s ({self.pending} job(s) pending)")
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _connect(self):
+        # isolation_level=None: transactions are managed explicitly with BEGIN IMMEDIATE.
+        # A short busy_timeout keeps SQLite from blocking inside C for long stretches;
+        # contention is handled by _run_transaction's timed waits instead.
+        conn = sqlite3.connect(self.path, timeout=0.25, isolation_level=None,
+                               uri=self.path.startswith('file:'))
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON;")
+        conn.execute("PRAGMA busy_timeout=250;")
+        conn.execute("PRAGMA synchronous=FULL;" if self.is_network_path else "PRAGMA synchronous=NORMAL;")
+        return conn
+
+    def _run(self):
+        try:
+            self._conn = self._connect()
+        except sqlite3.Error as e:
+            logging.error(f"Database writer could not open {self.path}: {e}")
+            self._stop_event.set()
+            self._fail_pending(e)
+            return
+
+        stopping = False
+        while not stopping:
+            job = self._queue.get()
+            if job is _STOP:
+                break
+
+            batch = [job]
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stopping = True
+                    break
+                batch.append(nxt)
+
+            self._run_batch(batch)
+
+        try:
+            self._conn.close()
+        except sqlite3.Error:
+            pass
+        self._stop_event.set()
+        self._fail_pending(RuntimeError("Database writer has been shut down"))
+
+    def _run_batch(self, batch: List[_WriteJob]):
+        batch = [job for job in batch if job.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        if self._run_transaction(batch):
+            return
+        # One job broke the shared transaction - isolate it
+        for job in batch:
+            self._run_transaction([job])
+
+    def _run_transaction(self, jobs: List[_WriteJob]) -> bool:
+        """
+        Run jobs in one transaction, waiting out lock contention.
+
+        Returns False only when a multi-job batch failed for a non-lock reason
+        and should be retried job by job.
+        """
+        conn = self._conn
+        delay = 0.05
+        waited = 0.0
+        while True:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                results = [job.fn(conn, *job.args, **job.kwargs) for job in jobs]
+                conn.execute("COMMIT")
+                self.generation += 1
+            except sqlite3.OperationalError as e:
+                self._rollback()
+                if "locked" in str(e).lower() or "busy" in str(e).lower():
+                    if waited < self.lock_wait_timeout:
+                        # Timed wait on the writer thread - the UI keeps running
+                        self._stop_event.wait(delay)
+                        waited += delay
+                        delay = min(delay * 2, 2.0)
+                        continue
+                    logging.error(f"Database writer gave up after {waited:.1f}s of lock contention")
+                    for job in jobs:
+                        job.future.set_exception(e)
+                    return True
+                if len(jobs) > 1:
+                    return False
+                jobs[0].future.set_exception(e)
+                return True
+            except Exception as e:
+                self._rollback()
+                if len(jobs) > 1:
+                    return False
+                jobs[0].future.set_exception(e)
+                return True
+
+            if waited:
+                logging.info(f"Database writer committed {len(jobs)} job(s) after waiting {waited:.1f}s for lock")
+            for job, result in zip(jobs, results):
+                job.future.set_result(result)
+            return True
+
+    def _rollback(self):
+        try:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+        except sqlite3.Error:
+            pass
+
+    def _fail_pending(self, error: Exception):
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if job is not _STOP and job.future.set_running_or_notify_cancel():
+                job.future.set_exception(error)
+
+    @staticmethod
+    def _log_failure(job: _WriteJob, future: Future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logging.error(f"Queued database write '{job.label}' failed: {error}")
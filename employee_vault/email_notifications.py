@@ -242,14 +242,15 @@ class EmailNotifier:
 def get_email_config_from_db(db) -> Dict:
     """Load email configuration from database settings"""
     try:
+        settings = db.settings.snapshot
         return {
-            'smtp_server': db.get_setting('email_smtp_server', 'smtp.gmail.com'),
-            'smtp_port': int(db.get_setting('email_smtp_port', '587')),
-            'username': db.get_setting('email_username', ''),
-            'password': db.get_setting('email_password', ''),
-            'from_email': db.get_setting('email_from', ''),
-            'admin_email': db.get_setting('email_admin', ''),
-            'enabled': db.get_setting('email_notifications_enabled', 'false') == 'true'
+            'smtp_server': settings.get('email_smtp_server', 'smtp.gmail.com'),
+            'smtp_port': settings.get_int('email_smtp_port', 587),
+            'username': settings.get('email_username', ''),
+            'password': settings.get('email_password', ''),
+            'from_email': settings.get('email_from', ''),
+            'admin_email': settings.get('email_admin', ''),
+            'enabled': settings.get('email_notifications_enabled', 'false') == 'true'
         }
     except Exception as e:
         logging.error(f"Failed to load email config: {e}")
@@ -259,13 +260,15 @@ def get_email_config_from_db(db) -> Dict:
 def save_email_config_to_db(db, config: Dict) -> bool:
     """Save email configuration to database settings"""
     try:
-        db.set_setting('email_smtp_server', config.get('smtp_server', 'smtp.gmail.com'))
-        db.set_setting('email_smtp_port', str(config.get('smtp_port', 587)))
-        db.set_setting('email_username', config.get('username', ''))
-        db.set_setting('email_password', config.get('password', ''))
-        db.set_setting('email_from', config.get('from_email', ''))
-        db.set_setting('email_admin', config.get('admin_email', ''))
-        db.set_setting('email_notifications_enabled', 'true' if config.get('enabled') else 'false')
+        db.settings.set_many({
+            'email_smtp_server': config.get('smtp_server', 'smtp.gmail.com'),
+            'email_smtp_port': str(config.get('smtp_port', 587)),
+            'email_username': config.get('username', ''),
+            'email_password': config.get('password', ''),
+            'email_from': config.get('from_email', ''),
+            'email_admin': config.get('admin_email', ''),
+            'email_notifications_enabled': 'true' if config.get('enabled') else 'false',
+        })
         db.conn.commit()
         return True
     except Exception as e:
@@ -0,0 +1,304 @@
+"""
+Control-plane heartbeat for EmployeeVault
+One place that asks the shared database "has anything changed for me?".
+
+Each tick is a single read (DB.control_plane_status) on a background thread
+that returns the employee data and settings revisions, the force-close request, this user's
+session and lock leases and the number of users online. Subscribers are called
+only when a field they care about changes, instead of every screen running its
+own timer against the share.
+
+The tick interval follows the user: HEARTBEAT_ACTIVE_MS while there is input,
+HEARTBEAT_IDLE_MS after IDLE_AFTER_SECONDS without any, HEARTBEAT_BACKGROUND_MS
+while the window is minimized or hidden, with exponential backoff after a
+failed probe. Lease renewal (the only write) rides on the tick at its own,
+slower cadence.
+"""
+
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QThread, QTimer, Signal
+
+from employee_vault import metrics
+
+# Fields published by the heartbeat
+FIELD_DATA_REVISION = "data_revision"   # bumped by any client's employee insert / update / delete
+FIELD_SETTINGS_REVISION = "settings_revision"  # bumped by any client's settings write
+FIELD_FORCE_CLOSE = "force_close"       # dict while an admin has requested a close, else None
+FIELD_SESSION = "session"               # True while this user's session lease is live
+FIELD_LOCKS = "locks"                   # live record locks held by this user
+FIELD_USERS_ONLINE = "users_online"     # users with a live session
+FIELDS = (FIELD_DATA_REVISION, FIELD_SETTINGS_REVISION, FIELD_FORCE_CLOSE, FIELD_SESSION, FIELD_LOCKS, FIELD_USERS_ONLINE)
+
+MODE_ACTIVE = "active"
+MODE_IDLE = "idle"
+MODE_BACKGROUND = "background"
+
+# Tick interval per mode (ms)
+HEARTBEAT_ACTIVE_MS = 5000
+HEARTBEAT_IDLE_MS = 30000
+HEARTBEAT_BACKGROUND_MS = 60000
+# Ceiling for the failure backoff (ms)
+HEARTBEAT_MAX_BACKOFF_MS = 120000
+# Seconds without input before the heartbeat slows down
+IDLE_AFTER_SECONDS = 120
+# Seconds between lease renewals while active / otherwise (leases last 30-60 min)
+LEASE_RENEW_ACTIVE_SECONDS = 60
+LEASE_RENEW_IDLE_SECONDS = 300
+
+_INTERVALS = {
+    MODE_ACTIVE: HEARTBEAT_ACTIVE_MS,
+    MODE_IDLE: HEARTBEAT_IDLE_MS,
+    MODE_BACKGROUND: HEARTBEAT_BACKGROUND_MS,
+}
+
+
+class _ProbeWorker(QThread):
+    """Long-lived thread that runs one control-plane probe per request"""
+
+    probed = Signal(object)  # status dict, or None when the probe failed
+
+    def __init__(self, db, username: str, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.username = username
+        self._wake = threading.Event()
+        self._stopping = False
+
+    def request(self):
+        self._wake.set()
+
+    def stop(self, timeout_ms: int = 2000):
+        self._stopping = True
+        self._wake.set()
+        self.wait(timeout_ms)
+
+    def run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopping:
+                return
+            try:
+                status = self.db.control_plane_status(self.username)
+            except Exception as e:
+                logging.warning(f"Heartbeat probe failed: {e}")
+                metrics.incr("heartbeat.probe_failed")
+                status = None
+            if self._stopping:
+                return
+            self.probed.emit(status)
+
+
+class HeartbeatService(QObject):
+    """
+    Per-client heartbeat.
+
+    Usage:
+        heartbeat = HeartbeatService(db, username, parent)
+        heartbeat.subscribe(FIELD_DATA_REVISION, on_revision, owner=widget)
+        heartbeat.ticked.connect(on_tick)       # after every successful probe
+        heartbeat.start()
+        heartbeat.note_activity()               # from the window's input events
+        heartbeat.set_background(minimized)
+
+    The first probe only establishes the baseline: subscribers see a field's
+    initial value, so a handler that reacts to changes should ignore the first
+    call (or compare with a value it recorded itself).
+    """
+
+    field_changed = Signal(str, object)  # field, new value
+    ticked = Signal(object)              # full status dict
+    mode_changed = Signal(str)
+
+    def __init__(self, db, username: str, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.username = username
+        self.status: Dict[str, object] = {}
+        self.mode = MODE_ACTIVE
+        self.ticks = 0
+        self._subscribers: Dict[str, List[tuple]] = {}
+        self._background = False
+        self._last_activity = time.monotonic()
+        self._last_renewal = time.monotonic()  # The session was just created
+        self._failures = 0
+        self._in_flight = False
+        self._force_close_raw = None
+        self._worker: Optional[_ProbeWorker] = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def subscribe(self, field: str, callback: Callable[[object], None], owner: QObject = None):
+        """
+        Call callback(value) whenever field changes, and right away if it is
+        already known. With owner, the subscription ends when owner is deleted.
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown heartbeat field: {field}")
+        entry = (callback, owner)
+        self._subscribers.setdefault(field, []).append(entry)
+        if owner is not None:
+            owner.destroyed.connect(lambda *_: self._drop_owner(owner))
+        if field in self.status:
+            self._notify(field, entry, self.status[field])
+
+    def unsubscribe(self, field: str, callback: Callable[[object], None]):
+        self._subscribers[field] = [e for e in self._subscribers.get(field, []) if e[0] != callback]
+
+    def _drop_owner(self, owner: QObject):
+        for field, entries in self._subscribers.items():
+            self._subscribers[field] = [e for e in entries if e[1] is not owner]
+
+    # ------------------------------------------------------------------
+    # Lifecycle and inputs
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._worker is None:
+            self._worker = _ProbeWorker(self.db, self.username, self)
+            self._worker.probed.connect(self._on_probed)
+            self._worker.start()
+        self._tick()
+
+    def stop(self):
+        """Stop ticking and wait for a running probe"""
+        self._timer.stop()
+        worker, self._worker = self._worker, None
+        self._in_flight = False
+        if worker is not None:
+            worker.probed.disconnect(self._on_probed)
+            worker.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None
+
+    def poke(self):
+        """Probe now (e.g. the window was just activated)"""
+        if self._worker is not None and not self._in_flight:
+            self._timer.stop()
+            self._tick()
+
+    def note_activity(self):
+        """Record user input; cheap enough to call for every mouse / key event"""
+        self._last_activity = time.monotonic()
+        if self.mode == MODE_IDLE and self._worker is not None:
+            self._set_mode(MODE_ACTIVE)
+            if not self._in_flight and self._timer.remainingTime() > HEARTBEAT_ACTIVE_MS:
+                self._timer.start(HEARTBEAT_ACTIVE_MS)
+
+    def set_background(self, background: bool):
+        """The window was minimized / hidden (True) or restored (False)"""
+        if background == self._background:
+            return
+        self._background = background
+        if background:
+            self._set_mode(MODE_BACKGROUND)
+        else:
+            self._last_activity = time.monotonic()
+            self._set_mode(MODE_ACTIVE)
+            self.poke()
+
+    def describe(self) -> str:
+        """Short status line for diagnostics screens"""
+        text = f"heartbeat: {self.mode}"
+        if self._failures:
+            text += f" ({self._failures} failed)"
+        return text
+
+    # ------------------------------------------------------------------
+    # Ticking
+    # ------------------------------------------------------------------
+
+    def _tick(self):
+        if self._worker is None or self._in_flight:
+            return
+        self._in_flight = True
+        self._renew_leases_if_due()
+        self._worker.request()
+
+    def _renew_leases_if_due(self):
+        due = LEASE_RENEW_ACTIVE_SECONDS if self.mode == MODE_ACTIVE else LEASE_RENEW_IDLE_SECONDS
+        now = time.monotonic()
+        if now - self._last_renewal >= due:
+            self._last_renewal = now
+            try:
+                self.db.heartbeat(self.username)
+            except Exception as e:
+                logging.warning(f"Lease renewal failed: {e}")
+
+    def _on_probed(self, status):
+        self._in_flight = False
+        if status is None:
+            self._failures += 1
+        else:
+            self._failures = 0
+            self.ticks += 1
+            self._apply(status)
+        self._schedule()
+
+    def _apply(self, status: dict):
+        raw = status.get(FIELD_FORCE_CLOSE)
+        if raw != self._force_close_raw or FIELD_FORCE_CLOSE not in self.status:
+            self._force_close_raw = raw
+            status[FIELD_FORCE_CLOSE] = self.db.parse_force_close(raw)
+        else:
+            status[FIELD_FORCE_CLOSE] = self.status[FIELD_FORCE_CLOSE]
+
+        changed = [f for f in FIELDS if f not in self.status or self.status[f] != status.get(f)]
+        for field in changed:
+            self.status[field] = status.get(field)
+        for field in changed:
+            value = self.status[field]
+            self.field_changed.emit(field, value)
+            for entry in list(self._subscribers.get(field, [])):
+                self._notify(field, entry, value)
+        self.ticked.emit(dict(self.status))
+
+    def _notify(self, field: str, entry: tuple, value):
+        callback, owner = entry
+        if owner is not None:
+            try:
+                owner.objectName()  # Raises RuntimeError once the owner is deleted
+            except RuntimeError:
+                self._drop_owner(owner)
+                return
+        try:
+            callback(value)
+        except Exception as e:
+            logging.error(f"Heartbeat subscriber for {field} failed: {e}", exc_info=True)
+
+    def _schedule(self):
+        if self._worker is None:
+            return
+        if self._background:
+            mode = MODE_BACKGROUND
+        elif time.monotonic() - self._last_activity >= IDLE_AFTER_SECONDS:
+            mode = MODE_IDLE
+        else:
+            mode = MODE_ACTIVE
+        self._set_mode(mode)
+        interval = _INTERVALS[mode]
+        if self._failures:
+            interval = min(interval * 2 ** self._failures, HEARTBEAT_MAX_BACKOFF_MS)
+        self._timer.start(interval)
+
+    def _set_mode(self, mode: str):
+        if mode != self.mode:
+            logging.debug(f"Heartbeat: {self.mode} -> {mode}")
+            self.mode = mode
+            self.mode_changed.emit(mode)
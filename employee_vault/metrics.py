@@ -0,0 +1,262 @@
+"""
+Performance metrics for Employee Vault
+
+One process-wide registry of named latency histograms and counters, so slow
+clients can be diagnosed from the field without attaching a profiler. The
+admin diagnostics overlay (Ctrl+Shift+M) shows p50/p95/p99 per operation and
+the slowest individual calls, and can export them to JSON or CSV; the current
+session is also written to logs/metrics_last_session.json on exit.
+
+    with metrics.timer("dashboard.refresh"):
+        ...
+
+    @metrics.timed("db.all_employees")
+    def all_employees(self, ...):
+
+    metrics.incr("photo.cache_miss")
+    metrics.observe("ui.cell_paint", elapsed_ms)
+
+Names are dotted "<area>.<operation>" (db.*, ui.*, photo.*, idcard.*,
+backup.*, login.*). Recording is a lock, a log() and two additions, so it is
+cheap enough for paint handlers. Histograms use fixed log-spaced buckets
+(about 9% resolution), so memory stays constant however long the app runs.
+"""
+
+import csv
+import json
+import math
+import time
+import heapq
+import socket
+import logging
+import threading
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Smallest bucket bound (ms) and buckets per doubling of latency
+_BUCKET_MIN_MS = 0.01
+_BUCKETS_PER_DOUBLING = 8
+# 0.01ms .. ~10 minutes
+_BUCKET_COUNT = _BUCKETS_PER_DOUBLING * 26
+# Number of individual slowest calls kept for the overlay / export
+SLOWEST_KEPT = 50
+
+
+def _bucket_index(ms: float) -> int:
+    if ms <= _BUCKET_MIN_MS:
+        return 0
+    index = int(math.log2(ms / _BUCKET_MIN_MS) * _BUCKETS_PER_DOUBLING) + 1
+    return min(index, _BUCKET_COUNT - 1)
+
+
+def _bucket_value(index: int) -> float:
+    """Representative latency of a bucket (geometric middle of its bounds)"""
+    if index == 0:
+        return _BUCKET_MIN_MS
+    return _BUCKET_MIN_MS * 2 ** ((index - 0.5) / _BUCKETS_PER_DOUBLING)
+
+
+class Histogram:
+    """Latency histogram with log-spaced buckets (not thread-safe; the registry locks)"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, ms: float):
+        self.count += 1
+        self.total += ms
+        if ms < self.min:
+            self.min = ms
+        if ms > self.max:
+            self.max = ms
+        index = _bucket_index(ms)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100.0))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(_bucket_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total, 3),
+            'mean_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(self.percentile(50), 3),
+            'p95_ms': round(self.percentile(95), 3),
+            'p99_ms': round(self.percentile(99), 3),
+            'max_ms': round(self.max, 3),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe store of histograms, counters and the slowest calls"""
+
+    def __init__(self, slowest_kept: int = SLOWEST_KEPT):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._slowest: List[tuple] = []  # min-heap of (ms, seq, name, detail, wall time)
+        self._slowest_kept = slowest_kept
+        self._seq = 0
+        self.enabled = True
+        self.started = datetime.now()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def observe(self, name: str, ms: float, detail: str = None):
+        """Record one latency sample in milliseconds"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(ms)
+            if len(self._slowest) < self._slowest_kept or ms > self._slowest[0][0]:
+                self._seq += 1
+                entry = (ms, self._seq, name, detail, time.time())
+                if len(self._slowest) < self._slowest_kept:
+                    heapq.heappush(self._slowest, entry)
+                else:
+                    heapq.heapreplace(self._slowest, entry)
+
+    def incr(self, name: str, amount: int = 1):
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str, detail: str = None, slow_ms: float = None):
+        """
+        Time the block and record it under name. With slow_ms, a call slower
+        than that is also logged as a warning.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.observe(name, elapsed, detail)
+            if slow_ms is not None and elapsed > slow_ms:
+                logging.warning(f"Slow {name} ({elapsed:.1f}ms)" + (f": {detail}" if detail else ""))
+
+    def timed(self, name: str = None, slow_ms: float = None):
+        """Decorator form of timer(); name defaults to module.qualname"""
+        def decorator(func):
+            metric = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    self.observe(metric, elapsed)
+                    if slow_ms is not None and elapsed > slow_ms:
+                        logging.warning(f"Slow {metric} ({elapsed:.1f}ms)")
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._slowest.clear()
+            self.started = datetime.now()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> List[dict]:
+        """Per-operation summaries, slowest p95 first"""
+        with self._lock:
+            rows = [dict(name=name, **h.summary()) for name, h in self._histograms.items()]
+        rows.sort(key=lambda r: r['p95_ms'], reverse=True)
+        return rows
+
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def slowest(self, limit: int = 20) -> List[dict]:
+        """The slowest individual calls recorded this session"""
+        with self._lock:
+            entries = heapq.nlargest(limit, self._slowest)
+        return [{
+            'name': name,
+            'ms': round(ms, 3),
+            'detail': detail or "",
+            'time': datetime.fromtimestamp(at).isoformat(timespec='seconds'),
+        } for ms, _, name, detail, at in entries]
+
+    def report(self) -> dict:
+        return {
+            'host': socket.gethostname(),
+            'session_started': self.started.isoformat(timespec='seconds'),
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'operations': self.snapshot(),
+            'counters': self.counters(),
+            'slowest': self.slowest(SLOWEST_KEPT),
+        }
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def export_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def export_csv(self, path: str):
+        """One row per operation and per counter, then the slowest calls"""
+        columns = ['kind', 'name', 'count', 'total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'detail', 'time']
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval="")
+            writer.writeheader()
+            for row in self.snapshot():
+                writer.writerow(dict(kind='timer', **row))
+            for name, value in sorted(self.counters().items()):
+                writer.writerow({'kind': 'counter', 'name': name, 'count': value})
+            for entry in self.slowest(SLOWEST_KEPT):
+                writer.writerow({'kind': 'slow_call', 'name': entry['name'], 'max_ms': entry['ms'],
+                                 'detail': entry['detail'], 'time': entry['time']})
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Process-wide metrics registry"""
+    return _registry
+
+
+# Module-level shortcuts: "from employee_vault import metrics; metrics.timer(...)"
+observe = _registry.observe
+incr = _registry.incr
+timer = _registry.timer
+timed = _registry.timed
+snapshot = _registry.snapshot
+slowest = _registry.slowest
+export_json = _registry.export_json
+export_csv = _registry.export_csv
@@ -5,12 +5,15 @@ v4.6.0: Enhanced with lazy photo loading
 """
 
 import os
+import logging
 from collections import OrderedDict
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QSize, QThread, Signal, QObject, QRunnable, QThreadPool
 from PySide6.QtGui import QColor, QPixmap, QIcon, QImage, QPainter, QPainterPath
 from typing import Any, Set, Optional
 
 from employee_vault.config import HEADERS, ALERT_DAYS, contract_days_left, PHOTOS_DIR, get_employee_photos
+from employee_vault.utils import get_photo_derivative
+from employee_vault import metrics
 
 
 # Phase 1.3: Async photo loading infrastructure
@@ -30,8 +33,11 @@ class PhotoLoadRunnable(QRunnable):
     def run(self):
         """Load photo in background thread"""
         try:
-            image = QImage(self.photo_path)
+            # Read the smallest pre-sized derivative that covers the avatar
+            with metrics.timer("photo.thumbnail_load", detail=self.emp_id):
+                image = QImage(get_photo_derivative(self.photo_path, self.target_size))
             if image.isNull():
+                metrics.incr("photo.thumbnail_unreadable")
                 self.signals.photo_loaded.emit(self.emp_id, None)
                 return
 
@@ -249,6 +255,15 @@ class EmployeesTableModel(QAbstractTableModel):
             self._photo_cache.clear()
             self._photo_path_cache.clear()
             self._loading_photos.clear()
+
+    def reload_photo(self, emp_id: str):
+        """Drop emp_id's cached photo and repaint its row (the photo was stored after the last refresh)"""
+        self.invalidate_photo_cache(emp_id)
+        for i, emp in enumerate(self.data_list):
+            if emp.get("emp_id") == emp_id:
+                index = self.index(i, 1)  # Photo column
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+                break
     
     def update_photo_cache(self, emp_id: str, pixmap):
         """Update photo cache from background loader - Phase 1.3: with LRU eviction"""
@@ -392,6 +407,7 @@ class EmployeesTableModel(QAbstractTableModel):
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role==Qt.DisplayRole and orientation==Qt.Horizontal: return HEADERS[section]
         return super().headerData(section, orientation, role)
+    @metrics.timed("ui.model_reset")
     def setDataList(self, data):
         self.beginResetModel()
         self.data_list=data
@@ -610,3 +626,91 @@ class UserTableModel(QAbstractTableModel):
         self.beginResetModel()
         self.users = users
         self.endResetModel()
+
+
+class AuditLogModel(QAbstractTableModel):
+    """
+    Audit log model that loads pages on demand.
+
+    fetch_page(after, limit) returns the next rows, newest first, after the
+    (timestamp, id) key of the last loaded row (see DB.get_audit_page). The
+    view calls fetchMore() as the user scrolls, so only visible history is
+    ever read from the database.
+    """
+
+    COLUMNS = [("ID", 'id'), ("Timestamp", 'timestamp'), ("Username", 'username'),
+               ("Action", 'action'), ("Table", 'table_name'), ("Record ID", 'record_id'),
+               ("Old Value", 'old_value'), ("New Value", 'new_value'), ("Details", 'details')]
+
+    ACTION_COLORS = {
+        'LOGIN': "#4CAF50",   # Green
+        'LOGOUT': "#9E9E9E",  # Gray
+        'INSERT': "#2196F3",  # Blue
+        'UPDATE': "#FF9800",  # Orange
+        'DELETE': "#F44336",  # Red
+    }
+
+    def __init__(self, fetch_page, page_size: int = 200, parent=None):
+        super().__init__(parent)
+        self._fetch_page = fetch_page
+        self.page_size = page_size
+        self.rows = []
+        self._exhausted = False
+
+    def set_fetcher(self, fetch_page):
+        """Replace the page source (e.g. after filters change) and start over"""
+        self.beginResetModel()
+        self._fetch_page = fetch_page
+        self.rows = []
+        self._exhausted = False
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        after = (self.rows[-1]['timestamp'], self.rows[-1]['id']) if self.rows else None
+        try:
+            page = self._fetch_page(after, self.page_size)
+        except Exception as e:
+            logging.error(f"Failed to load audit log page: {e}")
+            page = []
+        if len(page) < self.page_size:
+            self._exhausted = True
+        if page:
+            start = len(self.rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+            self.rows.extend(page)
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        key = self.COLUMNS[index.column()][1]
+        value = row.get(key)
+
+        if role == Qt.DisplayRole:
+            text = "" if value is None else str(value)
+            if key == 'details' and len(text) > 100:
+                return text[:100] + "..."
+            return text
+        if role == Qt.ToolTipRole and key == 'details':
+            return value or None
+        if role == Qt.ForegroundRole and key == 'action':
+            color = self.ACTION_COLORS.get(value)
+            return QColor(color) if color else None
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section][0]
+        return None
@@ -0,0 +1,169 @@
+"""
+Startup timeline and idle preloading for Employee Vault
+
+main.py imports this module first, so its import time is the zero point of
+the timeline. Each startup phase calls mark(); report() logs the phases up to
+a milestone (e.g. the login dialog becoming interactive), appends the run to
+logs/startup_timeline.jsonl and warns when the run is over budget or much
+slower than recent runs on the same PC.
+
+Modules that are not needed for the login path (dialogs, reports, ID cards,
+import/export) are imported on first use, or one per idle tick by
+IdlePreloader once the main window is up.
+"""
+
+import os
+import json
+import time
+import logging
+import importlib
+import statistics
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer
+
+_START = time.perf_counter()
+
+# Time budget for the login dialog to become interactive (ms)
+STARTUP_LOGIN_BUDGET_MS = 3000
+# A run slower than this multiple of the recent median is logged as a regression
+STARTUP_REGRESSION_FACTOR = 1.5
+# Number of previous runs the median is taken over
+STARTUP_HISTORY_RUNS = 10
+# History lines kept in the timeline file
+STARTUP_HISTORY_MAX_LINES = 200
+
+_phases: List[Tuple[str, float]] = []
+
+
+def mark(phase: str) -> float:
+    """Record that a startup phase finished; returns ms since process start"""
+    elapsed = (time.perf_counter() - _START) * 1000
+    _phases.append((phase, elapsed))
+    logging.debug(f"Startup: {phase} at {elapsed:.0f}ms")
+    return elapsed
+
+
+def timeline() -> List[Tuple[str, float]]:
+    """[(phase, ms since start)] in the order they were marked"""
+    return list(_phases)
+
+
+def _read_history(path: str) -> List[dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except OSError:
+        return []
+    runs = []
+    for line in lines:
+        try:
+            runs.append(json.loads(line))
+        except ValueError:
+            continue
+    return runs
+
+
+def report(milestone: str, history_path: Optional[str] = None,
+           budget_ms: float = STARTUP_LOGIN_BUDGET_MS) -> float:
+    """
+    Mark the milestone, log the timeline and check it against the budget and
+    the median of previous runs. Returns the milestone time in ms.
+    """
+    total = mark(milestone)
+    steps = []
+    previous = 0.0
+    for phase, at in _phases:
+        steps.append(f"{phase} +{at - previous:.0f}ms")
+        previous = at
+    logging.info(f"Startup timeline to {milestone} ({total:.0f}ms): " + ", ".join(steps))
+
+    if total > budget_ms:
+        logging.warning(f"Startup to {milestone} took {total:.0f}ms (budget {budget_ms:.0f}ms)")
+
+    if not history_path:
+        return total
+    try:
+        history = [run for run in _read_history(history_path) if run.get('milestone') == milestone]
+        recent = [run['total_ms'] for run in history[-STARTUP_HISTORY_RUNS:] if 'total_ms' in run]
+        if len(recent) >= 3:
+            median = statistics.median(recent)
+            if total > median * STARTUP_REGRESSION_FACTOR:
+                logging.warning(f"Startup regression: {milestone} took {total:.0f}ms, "
+                                f"median of last {len(recent)} runs is {median:.0f}ms")
+
+        entry = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'milestone': milestone,
+            'total_ms': round(total, 1),
+            'phases': [[phase, round(at, 1)] for phase, at in _phases],
+        }
+        all_runs = _read_history(history_path)
+        if len(all_runs) >= STARTUP_HISTORY_MAX_LINES:
+            # Rewrite with the newest half so the file stays small
+            keep = all_runs[-(STARTUP_HISTORY_MAX_LINES // 2):] + [entry]
+            with open(history_path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(run) + "\n" for run in keep)
+        else:
+            with open(history_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+    except Exception as e:
+        logging.warning(f"Could not record startup timeline: {e}")
+    return total
+
+
+# Modules that are imported on first use; IdlePreloader warms them after login
+DEFERRED_MODULES = [
+    "employee_vault.ui.dialogs.user_management",
+    "employee_vault.ui.dialogs.bulk_operations",
+    "employee_vault.ui.dialogs.print_dialogs",
+    "employee_vault.ui.dialogs.id_card",
+    "employee_vault.ui.dialogs.letter_generation",
+    "employee_vault.ui.dialogs.store_management",
+    "employee_vault.ui.dialogs.session_monitor",
+    "employee_vault.ui.dialogs.excel_import",
+    "employee_vault.ui.dialogs.user_guide",
+]
+
+
+class IdlePreloader(QObject):
+    """
+    Import deferred modules one at a time while the UI is idle.
+
+    Each module is imported on its own zero-delay timer tick, so pending
+    input and paint events are processed between imports. Third-party
+    libraries such as pandas and reportlab stay lazy inside those modules
+    and still load on first use.
+    """
+
+    def __init__(self, modules: List[str] = None, start_delay_ms: int = 3000, parent=None):
+        super().__init__(parent)
+        self._pending = list(modules if modules is not None else DEFERRED_MODULES)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._import_next)
+        self._start_delay_ms = start_delay_ms
+        self._total_ms = 0.0
+
+    def start(self):
+        self._timer.start(self._start_delay_ms)
+
+    def stop(self):
+        self._timer.stop()
+        self._pending.clear()
+
+    def _import_next(self):
+        if not self._pending:
+            return
+        name = self._pending.pop(0)
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logging.warning(f"Idle preload of {name} failed: {e}")
+        self._total_ms += (time.perf_counter() - started) * 1000
+        if self._pending:
+            self._timer.start(0)
+        else:
+            logging.info(f"Idle preload finished: {self._total_ms:.0f}ms")
@@ -0,0 +1,62 @@
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from employee_vault import alert_engine
+from employee_vault.alert_engine import RULE_CONTRACT_EXPIRING, RULE_MISSING_PHOTO, evaluate_alerts
+
+
+@pytest.fixture
+def folders(tmp_path, monkeypatch):
+    files_dir, photos_dir = tmp_path / "employee_files", tmp_path / "photos"
+    files_dir.mkdir()
+    photos_dir.mkdir()
+    monkeypatch.setattr(alert_engine, "FILES_DIR", str(files_dir))
+    monkeypatch.setattr(alert_engine, "PHOTOS_DIR", str(photos_dir))
+    monkeypatch.setattr(alert_engine, "_photo_folders", {})
+    monkeypatch.setattr(alert_engine, "_legacy_photos", (None, frozenset()))
+    return files_dir, photos_dir
+
+
+def _employee(emp_id, expiry_in=None):
+    expiry = (date.today() + timedelta(days=expiry_in)).strftime("%m-%d-%Y") if expiry_in is not None else ""
+    return {'emp_id': emp_id, 'name': emp_id, 'contract_expiry': expiry}
+
+
+def test_photo_folders_are_relisted_only_when_they_change(folders, monkeypatch):
+    files_dir, photos_dir = folders
+    (files_dir / "E-1" / "photos").mkdir(parents=True)
+    (files_dir / "E-1" / "photos" / "front.jpg").write_bytes(b"x")
+    (files_dir / "E-2" / "photos").mkdir(parents=True)
+    (photos_dir / "E-3.png").write_bytes(b"x")
+
+    listed = []
+    has_photo = alert_engine._folder_has_photo
+    monkeypatch.setattr(alert_engine, "_folder_has_photo", lambda folder: listed.append(folder) or has_photo(folder))
+    ids = ['E-1', 'E-2', 'E-3', 'E-4']
+
+    assert alert_engine._employees_with_photos(ids) == {'E-1', 'E-3'}
+    assert len(listed) == 2  # E-3 is in the legacy folder, E-4 has no folder at all
+    assert alert_engine._employees_with_photos(ids) == {'E-1', 'E-3'}
+    assert len(listed) == 2
+
+    new_photo = files_dir / "E-2" / "photos" / "id.png"
+    new_photo.write_bytes(b"x")
+    stat = os.stat(files_dir / "E-2" / "photos")
+    os.utime(files_dir / "E-2" / "photos", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert alert_engine._employees_with_photos(ids) == {'E-1', 'E-2', 'E-3'}
+    assert listed[2:] == [str(files_dir / "E-2" / "photos")]
+
+    alerts = evaluate_alerts([_employee(i) for i in ids])
+    assert [emp_id for rule, emp_id in alerts if rule == RULE_MISSING_PHOTO] == ['E-4']
+
+
+def test_expiring_window_follows_the_requested_days(folders):
+    employees = [_employee('E-1', 10), _employee('E-2', 45), _employee('E-3', 90)]
+
+    default = evaluate_alerts(employees, check_photos=False)
+    assert sorted(e for rule, e in default if rule == RULE_CONTRACT_EXPIRING) == ['E-1']
+
+    wide = evaluate_alerts(employees, check_photos=False, expiring_days=60)
+    assert sorted(e for rule, e in wide if rule == RULE_CONTRACT_EXPIRING) == ['E-1', 'E-2']
@@ -2,8 +2,13 @@
 UI Package for Employee Vault
 """
 
-from . import widgets
-from . import dialogs
-from . import pages
+import importlib
 
+# Subpackages load on first access - the login path only needs widgets
 __all__ = ["widgets", "dialogs", "pages"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,94 @@
+"""
+Database actions started from the UI
+Shared by the dialogs and pages that write on the user's behalf, so a refused
+or failed write is reported the same way everywhere. The writes themselves run
+on DB.writer; their results come back to the GUI thread through a queued signal,
+so the window never blocks while the database file is locked.
+"""
+
+import logging
+from concurrent.futures import Future
+
+from PySide6.QtCore import QObject, Signal, Slot
+from PySide6.QtWidgets import QMessageBox, QWidget
+
+
+class _WriteRelay(QObject):
+    """Carries a writer Future's outcome from the writer thread to the GUI thread"""
+    finished = Signal(object, object)
+
+    def __init__(self, owner: QObject, callback):
+        super().__init__(owner)
+        self._callback = callback
+        self.finished.connect(self._deliver)
+
+    @Slot(object, object)
+    def _deliver(self, result, error):
+        try:
+            self._callback(result, error)
+        finally:
+            self.deleteLater()
+
+
+def on_write_done(future: Future, owner: QObject, callback) -> None:
+    """
+    Call callback(result, error) on owner's (GUI) thread once future completes.
+    error is None on success. Nothing is delivered if owner has been destroyed
+    or the future was cancelled.
+    """
+    relay = _WriteRelay(owner, callback)
+
+    def _emit(done: Future):
+        if done.cancelled():
+            return
+        error = done.exception()
+        try:
+            relay.finished.emit(None if error else done.result(), error)
+        except RuntimeError:
+            pass  # owner (and with it the relay) was closed while the write was queued
+
+    future.add_done_callback(_emit)
+
+
+def run_bulk_write(parent: QWidget, username, operation, *args, on_success=None, **kwargs) -> bool:
+    """
+    Queue a bulk write as the signed-in user; on_success(result) runs on the GUI
+    thread once it has committed. Returns False, after telling the user, when there
+    is no user or the database refuses the permission or the request. A write that
+    later fails (e.g. the database stayed locked) is reported when it completes.
+    """
+    if not username:
+        QMessageBox.warning(parent, "Not Allowed", "No signed-in user - bulk changes are not allowed.")
+        return False
+    try:
+        future = operation(*args, **kwargs)
+    except PermissionError as e:
+        QMessageBox.warning(parent, "Not Allowed", str(e))
+        return False
+    except ValueError as e:
+        QMessageBox.warning(parent, "Not Saved", str(e))
+        return False
+
+    def _done(result, error):
+        if error is not None:
+            logging.error(f"Bulk write failed: {error}")
+            QMessageBox.warning(parent, "Not Saved", str(error))
+        elif on_success is not None:
+            on_success(result)
+
+    on_write_done(future, parent, _done)
+    return True
+
+
+def show_restore_conflicts(parent: QWidget, name, emp_id, conflicts) -> None:
+    """Explain why an archived employee could not be restored (find_restore_conflicts() dicts)"""
+    lines = "\n".join(
+        f"• {c['label']} '{c['value']}' is assigned to {c['name']} (ID: {c['emp_id']})"
+        for c in conflicts
+    ) or "• A government ID is already assigned to an active employee"
+    QMessageBox.warning(
+        parent,
+        "Cannot Restore",
+        f"Employee {name} ({emp_id}) was not restored:\n\n{lines}\n\n"
+        "Correct the duplicate ID on the active employee, then restore again."
+    )
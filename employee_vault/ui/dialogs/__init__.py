@@ -2,10 +2,16 @@
 UI Dialogs Package
 """
 
+import importlib
+
 # Dialogs can be imported individually as needed
 # Example: from employee_vault.ui.dialogs.login import LoginDialog
 
-# Built-in User Guide
-from .user_guide import UserGuideDialog
-
 __all__ = ['UserGuideDialog']
+
+
+def __getattr__(name):
+    # Built-in User Guide (loaded on first use)
+    if name == 'UserGuideDialog':
+        return importlib.import_module('.user_guide', __name__).UserGuideDialog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -13,12 +13,130 @@ from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 
-from employee_vault.config import PHOTOS_DIR
+from employee_vault.config import PHOTOS_DIR, get_employee_folder, get_employee_photos
 from employee_vault.ui.widgets import ModernAnimatedButton, AnimatedDialogBase
+from employee_vault.ui.widgets.animated_input import NeumorphicGradientLineEdit, NeumorphicGradientTextEdit
 from employee_vault.ui.modern_ui_helper import show_success_toast, show_error_toast, show_warning_toast
 from employee_vault.ui.ios_button_styles import apply_ios_style
 
 
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif')
+
+# Ingest workers still finishing after their dialog was closed (kept alive until done)
+_detached_workers = set()
+
+
+class PhotoIngestWorker(QThread):
+    """
+    Background worker for folder uploads.
+
+    Walks the folder and matches filenames to employees in one pass, then fans
+    the photos out to a process pool (utils.photo_ingest) so decoding, resizing
+    and background removal use every core while the window stays responsive.
+    """
+    # filename, status ('ok' / 'failed' / 'not_found' / 'skipped'), message
+    item_finished = Signal(str, str, str)
+    progress = Signal(int, int)  # done, total
+    finished_ingest = Signal(dict)  # counts by status, plus 'cancelled'
+
+    def __init__(self, folder_path: str, employees: Dict[str, dict], extract_id,
+                 remove_bg: bool = False, overwrite: bool = True, parent=None):
+        super().__init__(parent)
+        self.folder_path = folder_path
+        self.employees = employees
+        self.extract_id = extract_id
+        self.remove_bg = remove_bg
+        self.overwrite = overwrite
+        self._cancelled = False
+
+    def cancel(self):
+        """Stop submitting work; photos already being processed still finish"""
+        self._cancelled = True
+
+    def run(self):
+        from concurrent.futures import wait, FIRST_COMPLETED
+        from employee_vault.utils.photo_ingest import PROFILE_PHOTO_STEM, create_ingest_pool, ingest_photo
+
+        counts = {'ok': 0, 'failed': 0, 'not_found': 0, 'skipped': 0, 'cancelled': 0}
+
+        def report(filename, status, message=""):
+            counts[status] += 1
+            self.item_finished.emit(filename, status, message)
+
+        # Pass 1: match every file to an employee and a destination
+        image_files = []
+        for root, dirs, files in os.walk(self.folder_path):
+            for file in files:
+                if file.lower().endswith(IMAGE_EXTENSIONS):
+                    image_files.append(os.path.join(root, file))
+
+        total = len(image_files)
+        done = 0
+        jobs = []
+        claimed = set()
+        for img_path in image_files:
+            filename = os.path.basename(img_path)
+            emp_id = self.extract_id(filename)
+            if emp_id not in self.employees:
+                report(filename, 'not_found', emp_id)
+                done += 1
+                continue
+            if emp_id in claimed:
+                report(filename, 'skipped', "Another photo for this employee is already queued")
+                done += 1
+                continue
+            if not self.overwrite and (get_employee_photos(emp_id) or
+                                       os.path.exists(os.path.join(PHOTOS_DIR, f"{emp_id}.png"))):
+                report(filename, 'skipped', "Photo exists")
+                done += 1
+                continue
+            try:
+                dest_path = os.path.join(get_employee_folder(emp_id, 'photos'), f"{PROFILE_PHOTO_STEM}.png")
+            except Exception as e:
+                report(filename, 'failed', str(e))
+                done += 1
+                continue
+            claimed.add(emp_id)
+            jobs.append((filename, emp_id, img_path, dest_path))
+        self.progress.emit(done, total)
+
+        if not jobs or self._cancelled:
+            counts['cancelled'] = len(jobs) if self._cancelled else 0
+            self.finished_ingest.emit(counts)
+            return
+
+        # Pass 2: process in parallel, reporting results as they complete
+        pool = create_ingest_pool(self.remove_bg, job_count=len(jobs))
+        try:
+            pending = {}
+            for filename, emp_id, img_path, dest_path in jobs:
+                pending[pool.submit(ingest_photo, img_path, dest_path)] = (filename, emp_id)
+
+            while pending:
+                if self._cancelled:
+                    for future in list(pending):
+                        if future.cancel():
+                            counts['cancelled'] += 1
+                            del pending[future]
+                finished, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    filename, emp_id = pending.pop(future)
+                    try:
+                        future.result()
+                        emp_name = self.employees[emp_id].get('name', 'Unknown')
+                        report(filename, 'ok', f"{emp_id} ({emp_name})")
+                        logging.info(f"Batch photo uploaded: {emp_id}")
+                    except Exception as e:
+                        report(filename, 'failed', str(e))
+                        logging.error(f"Error processing {filename}: {e}")
+                    done += 1
+                    self.progress.emit(done, total)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        self.finished_ingest.emit(counts)
+
+
 class BatchPhotoUploadDialog(AnimatedDialogBase):
     """Dialog for batch uploading employee photos from ZIP or folder"""
 
@@ -27,6 +145,7 @@ class BatchPhotoUploadDialog(AnimatedDialogBase):
         self.db = db
         self.source_type = "folder"  # "zip" or "folder"
         self.selected_path = None
+        self.ingest_worker = None
         
         self.setWindowTitle("📦 Batch Photo Upload")
         self.resize(800, 600)
@@ -131,11 +250,17 @@ class BatchPhotoUploadDialog(AnimatedDialogBase):
         self.upload_btn.clicked.connect(self._upload_photos)
         self.upload_btn.setEnabled(False)
 
+        self.cancel_btn = ModernAnimatedButton("⏹ Cancel Upload")
+        apply_ios_style(self.cancel_btn, 'red')
+        self.cancel_btn.clicked.connect(self._cancel_upload)
+        self.cancel_btn.setVisible(False)
+
         close_btn = ModernAnimatedButton("✗ Close")
         apply_ios_style(close_btn, 'gray')
         close_btn.clicked.connect(self.reject)
 
         btn_layout.addWidget(self.upload_btn)
+        btn_layout.addWidget(self.cancel_btn)
         btn_layout.addWidget(close_btn)
         layout.addLayout(btn_layout)
 
@@ -266,110 +391,92 @@ class BatchPhotoUploadDialog(AnimatedDialogBase):
             self._upload_from_zip()
 
     def _upload_from_folder(self):
-        """Upload photos from a folder"""
+        """Upload photos from a folder using the parallel ingestion worker"""
         folder_path = self.selected_path
         if not folder_path or not os.path.isdir(folder_path):
             show_warning_toast(self, "Please select a valid folder")
             return
+        if self.ingest_worker is not None and self.ingest_worker.isRunning():
+            return
 
         self.results_text.text_edit.clear()
         self.results_text.append("<b>🚀 Starting batch upload from folder...</b>\n")
-        self.progress.setVisible(True)
-        self.upload_btn.setEnabled(False)
 
         try:
             # Get all employees for matching
             all_employees = self.db.get_all_employees()
             emp_ids = {emp['emp_id']: emp for emp in all_employees}
-
-            self.results_text.append(f"📋 Found {len(emp_ids)} employees in database\n")
-
-            # Find all image files
-            image_extensions = ('.jpg', '.jpeg', '.png', '.bmp', '.gif')
-            image_files = []
-            
-            for root, dirs, files in os.walk(folder_path):
-                for file in files:
-                    if file.lower().endswith(image_extensions):
-                        image_files.append(os.path.join(root, file))
-
-            self.progress.setMaximum(len(image_files))
-            successful = 0
-            failed = 0
-            not_found = 0
-            skipped = 0
-
-            for idx, img_path in enumerate(image_files):
-                self.progress.setValue(idx + 1)
-                QApplication.processEvents()
-
-                filename = os.path.basename(img_path)
-                emp_id = self._extract_employee_id(filename)
-
-                if emp_id in emp_ids:
-                    dest_path = os.path.join(PHOTOS_DIR, f"{emp_id}.png")
-                    
-                    # Check if photo exists and overwrite option
-                    if os.path.exists(dest_path) and not self.overwrite_check.isChecked():
-                        self.results_text.append(
-                            f"<span style='color: #888888;'>⊘</span> {filename} - Photo exists, skipped"
-                        )
-                        skipped += 1
-                        continue
-                    
-                    try:
-                        # Load and process image
-                        pixmap = QPixmap(img_path)
-
-                        if not pixmap.isNull():
-                            # Optionally remove background
-                            if self.remove_bg_check.isChecked():
-                                try:
-                                    from employee_vault.utils import remove_background
-                                    import tempfile
-                                    
-                                    # Save to temp, remove bg, load back
-                                    temp_file = os.path.join(tempfile.gettempdir(), f"temp_{emp_id}.png")
-                                    pixmap.save(temp_file, "PNG")
-                                    remove_background(temp_file, temp_file)
-                                    pixmap = QPixmap(temp_file)
-                                    os.remove(temp_file)
-                                except Exception as bg_err:
-                                    logging.warning(f"Background removal failed for {emp_id}: {bg_err}")
-                            
-                            pixmap.save(dest_path, "PNG")
-                            emp_name = emp_ids[emp_id].get('name', 'Unknown')
-                            self.results_text.append(
-                                f"<span style='color: #4CAF50;'>✓</span> {filename} → {emp_id} ({emp_name})"
-                            )
-                            successful += 1
-                            logging.info(f"Batch photo uploaded: {emp_id}")
-                        else:
-                            self.results_text.append(
-                                f"<span style='color: #ff6b6b;'>✗</span> {filename} - Invalid image"
-                            )
-                            failed += 1
-                    except Exception as e:
-                        self.results_text.append(
-                            f"<span style='color: #ff6b6b;'>✗</span> {filename} - Error: {e}"
-                        )
-                        failed += 1
-                        logging.error(f"Error processing {filename}: {e}")
-                else:
-                    self.results_text.append(
-                        f"<span style='color: #ffaa00;'>⚠</span> {filename} - Employee '{emp_id}' not found"
-                    )
-                    not_found += 1
-
-            # Summary
-            self._show_summary(successful, failed, not_found, skipped)
-
         except Exception as e:
             show_error_toast(self, f"Error processing folder:\n{e}")
             logging.error(f"Batch photo upload error: {e}")
-        finally:
-            self.progress.setVisible(False)
-            self.upload_btn.setEnabled(True)
+            return
+
+        self.results_text.append(f"📋 Found {len(emp_ids)} employees in database\n")
+        self.progress.setValue(0)
+        self.progress.setMaximum(0)  # Busy indicator until the folder has been scanned
+        self.progress.setVisible(True)
+        self.upload_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(True)
+
+        self.ingest_worker = PhotoIngestWorker(
+            folder_path, emp_ids, self._extract_employee_id,
+            remove_bg=self.remove_bg_check.isChecked(),
+            overwrite=self.overwrite_check.isChecked(),
+            parent=self
+        )
+        self.ingest_worker.item_finished.connect(self._on_ingest_item)
+        self.ingest_worker.progress.connect(self._on_ingest_progress)
+        self.ingest_worker.finished_ingest.connect(self._on_ingest_finished)
+        self.ingest_worker.start()
+
+    def _on_ingest_progress(self, done: int, total: int):
+        self.progress.setMaximum(max(total, 1))
+        self.progress.setValue(done)
+
+    def _on_ingest_item(self, filename: str, status: str, message: str):
+        if status == 'ok':
+            self.results_text.append(f"<span style='color: #4CAF50;'>✓</span> {filename} → {message}")
+        elif status == 'skipped':
+            self.results_text.append(f"<span style='color: #888888;'>⊘</span> {filename} - {message}, skipped")
+        elif status == 'not_found':
+            self.results_text.append(
+                f"<span style='color: #ffaa00;'>⚠</span> {filename} - Employee '{message}' not found"
+            )
+        else:
+            self.results_text.append(f"<span style='color: #ff6b6b;'>✗</span> {filename} - Error: {message}")
+
+    def _on_ingest_finished(self, counts: dict):
+        self.progress.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.upload_btn.setEnabled(True)
+        if counts.get('cancelled'):
+            self.results_text.append(
+                f"\n<span style='color: #888888;'>⏹ Upload cancelled - {counts['cancelled']} photo(s) not processed</span>"
+            )
+        self._show_summary(counts['ok'], counts['failed'], counts['not_found'], counts['skipped'])
+
+    def _cancel_upload(self):
+        """Cancel a running folder upload"""
+        if self.ingest_worker is not None and self.ingest_worker.isRunning():
+            self.ingest_worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.results_text.append("<i>Cancelling... waiting for photos in progress</i>")
+
+    def reject(self):
+        # Cancel a running ingest and let the photos in progress finish in the
+        # background, detached from this dialog, instead of blocking the window
+        worker = self.ingest_worker
+        if worker is not None and worker.isRunning():
+            worker.cancel()
+            worker.item_finished.disconnect(self._on_ingest_item)
+            worker.progress.disconnect(self._on_ingest_progress)
+            worker.finished_ingest.disconnect(self._on_ingest_finished)
+            worker.setParent(None)
+            _detached_workers.add(worker)
+            worker.finished.connect(lambda w=worker: _detached_workers.discard(w))
+            self.ingest_worker = None
+        super().reject()
 
     def _upload_from_zip(self):
         """Upload photos from ZIP file"""
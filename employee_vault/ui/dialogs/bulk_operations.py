@@ -20,6 +20,7 @@ from employee_vault.ui.widgets import *
 from employee_vault.ui.widgets import apply_table_fixes
 from employee_vault.ui.widgets import ModernAnimatedButton, AnimatedDialogBase
 from employee_vault.ui.modern_ui_helper import show_success_toast, show_error_toast, show_warning_toast
+from employee_vault.ui.db_actions import run_bulk_write
 from employee_vault.ui.ios_button_styles import apply_ios_style
 
 class BulkOperationsDialog(AnimatedDialogBase):
@@ -28,6 +29,8 @@ class BulkOperationsDialog(AnimatedDialogBase):
         # v4.4.1: Use fade animation for bulk operations
         super().__init__(parent, animation_style="fade")
         self.db = db
+        # Audit/permission context for bulk writes; without a signed-in user they are refused
+        self.current_user = getattr(parent, 'current_user', None)
         self.employees = employees
         self.setWindowTitle("📦 Bulk Operations")
         self.resize(550, 450)
@@ -127,12 +130,13 @@ class BulkOperationsDialog(AnimatedDialogBase):
                                     QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            for emp in selected:
-                self.db.conn.execute("UPDATE employees SET department=? WHERE emp_id=?",
-                    (dept, emp['emp_id']))
-            self.db.conn.commit()
-            show_success_toast(self, f"Updated {len(selected)} employee(s) successfully!")
-            self.status_label.setText(f"✅ Changed department for {len(selected)} employees")
+            def _updated(count):
+                show_success_toast(self, f"Updated {count} employee(s) successfully!")
+                self.status_label.setText(f"✅ Changed department for {count} employees")
+
+            run_bulk_write(self, self.current_user, self.db.bulk_update,
+                           [emp['emp_id'] for emp in selected], {'department': dept},
+                           username=self.current_user, on_success=_updated)
 
     def bulk_change_position(self):
         selected = self.get_selected_employees()
@@ -148,12 +152,13 @@ class BulkOperationsDialog(AnimatedDialogBase):
                                     QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            for emp in selected:
-                self.db.conn.execute("UPDATE employees SET position=? WHERE emp_id=?",
-                    (position, emp['emp_id']))
-            self.db.conn.commit()
-            show_success_toast(self, f"Updated {len(selected)} employee(s) successfully!")
-            self.status_label.setText(f"✅ Changed position for {len(selected)} employees")
+            def _updated(count):
+                show_success_toast(self, f"Updated {count} employee(s) successfully!")
+                self.status_label.setText(f"✅ Changed position for {count} employees")
+
+            run_bulk_write(self, self.current_user, self.db.bulk_update,
+                           [emp['emp_id'] for emp in selected], {'position': position},
+                           username=self.current_user, on_success=_updated)
 
     def bulk_change_agency(self):
         selected = self.get_selected_employees()
@@ -172,12 +177,13 @@ class BulkOperationsDialog(AnimatedDialogBase):
                                     QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            for emp in selected:
-                self.db.conn.execute("UPDATE employees SET agency=? WHERE emp_id=?",
-                    (agency_value, emp['emp_id']))
-            self.db.conn.commit()
-            show_success_toast(self, f"Updated {len(selected)} employee(s) successfully!")
-            self.status_label.setText(f"✅ Changed agency for {len(selected)} employees")
+            def _updated(count):
+                show_success_toast(self, f"Updated {count} employee(s) successfully!")
+                self.status_label.setText(f"✅ Changed agency for {count} employees")
+
+            run_bulk_write(self, self.current_user, self.db.bulk_update,
+                           [emp['emp_id'] for emp in selected], {'agency': agency_value},
+                           username=self.current_user, on_success=_updated)
 
     def bulk_archive(self):
         selected = self.get_selected_employees()
@@ -193,10 +199,13 @@ class BulkOperationsDialog(AnimatedDialogBase):
                                     QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            for emp in selected:
-                self.db.archive_employee(emp['emp_id'], "admin", reason)
-            show_success_toast(self, f"Archived {len(selected)} employee(s) successfully!")
-            self.status_label.setText(f"✅ Archived {len(selected)} employees")
+            def _archived(archived):
+                show_success_toast(self, f"Archived {len(archived)} employee(s) successfully!")
+                self.status_label.setText(f"✅ Archived {len(archived)} employees")
+
+            run_bulk_write(self, self.current_user, self.db.bulk_archive,
+                           [emp['emp_id'] for emp in selected], username=self.current_user, reason=reason,
+                           on_success=_archived)
 
     def bulk_export(self):
         selected = self.get_selected_employees()
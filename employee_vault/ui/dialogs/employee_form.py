@@ -14,7 +14,11 @@ from PySide6.QtGui import *
 
 from employee_vault.config import *
 from employee_vault.database import DB
-from employee_vault.utils import remove_background
+from employee_vault import metrics
+from employee_vault.upload_manager import (UploadManager, UPLOAD_MAX_FILE_BYTES, STATUS_UPLOADED,
+                                           STATUS_DUPLICATE, STATUS_SKIPPED, STATUS_FAILED,
+                                           STATUS_CANCELLED, is_partial_upload)
+from employee_vault.utils import remove_background, get_photo_derivative
 from employee_vault.validators import *
 from employee_vault.models import *
 from employee_vault.ui.widgets import *
@@ -23,6 +27,7 @@ from employee_vault.ui.modern_ui_helper import show_success_toast, show_error_to
 from employee_vault.ui.widgets import disable_cursor_changes
 from employee_vault.ui.widgets import ModernAnimatedButton, PulseButton, titlecase, normalize_ph_phone
 from employee_vault.ui.ios_button_styles import apply_ios_style
+from employee_vault.ui.db_actions import on_write_done
 
 # Import fuzzy string matching for duplicate name detection
 try:
@@ -117,6 +122,49 @@ class PhotoProcessingWorker(QThread):
             self.finished.emit(self.source_path, False)  # Return original on failure
 
 
+class PhotoPersistWorker(QThread):
+    """
+    Long-lived thread that stores profile photos after the employee row is
+    committed, so a save never holds the database lock while an image is
+    encoded or written to the share. Jobs run in submission order, so two
+    saves of the same employee cannot overwrite each other out of order.
+    """
+    persisted = Signal(str, str, bool)  # (emp_id, photo path or error message, success)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        import queue
+        self._jobs = queue.Queue()
+
+    def submit(self, emp_id: str, source_path: str):
+        self._jobs.put((emp_id, source_path))
+        if not self.isRunning():
+            self.start()
+
+    def stop(self, timeout_ms: int = 30000):
+        """Finish the queued photos, then end the thread"""
+        self._jobs.put(None)
+        if self.isRunning() and not self.wait(timeout_ms):
+            logging.warning(f"Photo persistence did not finish within {timeout_ms} ms")
+
+    def run(self):
+        from employee_vault.utils.photo_ingest import persist_profile_photo
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            emp_id, source_path = job
+            try:
+                with metrics.timer("photo.persist", detail=emp_id):
+                    dest_path = persist_profile_photo(source_path, get_employee_folder(emp_id, 'photos'))
+                logging.info(f"Photo saved to {dest_path}")
+                self.persisted.emit(emp_id, dest_path, True)
+            except Exception as e:
+                logging.error(f"Failed to save photo for {emp_id}: {e}")
+                self.persisted.emit(emp_id, str(e), False)
+
+
 # ============================================================================
 # DRAFT AUTO-SAVE CONSTANTS
 # ============================================================================
@@ -124,6 +172,8 @@ DRAFT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.pat
 
 
 class EmployeeForm(QWidget):
+    photo_saved = Signal(str, str)  # (emp_id, photo path) - stored after the save committed
+
     # Agencies helpers
     def _reload_agencies_into_combo(self):
         self.agency_combo.blockSignals(True)  # Prevent signals during update
@@ -328,11 +378,10 @@ class EmployeeForm(QWidget):
     def _load_stores_list(self):
         """Load stores from settings or return defaults"""
         try:
-            result = self.db.conn.execute("SELECT value FROM settings WHERE key='stores_list'").fetchone()
-            if result:
-                import json
-                return json.loads(result[0])
-        except:
+            stores = self.db.settings.get_json('stores_list')
+            if stores is not None:
+                return list(stores)
+        except Exception:
             pass
 
         # Default stores
@@ -345,7 +394,7 @@ class EmployeeForm(QWidget):
         try:
             import json
             stores_json = json.dumps(stores)
-            self.db.conn.execute("INSERT OR REPLACE INTO settings(key, value) VALUES('stores_list', ?)", (stores_json,))
+            self.db.set_setting('stores_list', stores_json)
             self.db.conn.commit()
         except Exception as e:
             show_warning_toast(
@@ -477,51 +526,24 @@ class EmployeeForm(QWidget):
         Check for duplicate government IDs (SSS, TIN, PhilHealth, Pag-IBIG)
         Returns list of error messages if duplicates found
         """
-        errors = []
-
-        # Get all government ID fields and their values
-        gov_ids = {
-            'SSS Number': self.sss_edit.text().strip(),
-            'TIN Number': self.tin_edit.text().strip(),
-            'PhilHealth Number': self.philhealth_edit.text().strip(),
-            'Pag-IBIG Number': self.pagibig_edit.text().strip()
-        }
-
-        # Check each government ID for duplicates
-        for id_type, id_value in gov_ids.items():
-            if not id_value:  # Skip empty values
-                continue
-
-            # Get the column name for database query
-            column_map = {
-                'SSS Number': 'sss_number',
-                'TIN Number': 'tin_number',
-                'PhilHealth Number': 'philhealth_number',
-                'Pag-IBIG Number': 'pagibig_number'
-            }
-            column_name = column_map[id_type]
-
-            # Query database for duplicate
-            try:
-                existing = self.db.conn.execute(
-                    f"SELECT emp_id, name FROM employees WHERE {column_name} = ?",
-                    (id_value,)
-                ).fetchone()
-
-                if existing:
-                    # If editing, check if it's the same employee
-                    if self.current_employee and existing['emp_id'] == self.current_employee.get('emp_id'):
-                        continue  # Same employee, not a duplicate
-
-                    # Found duplicate
-                    errors.append(
-                        f"❌ Duplicate {id_type}: '{id_value}' is already assigned to "
-                        f"{existing['name']} (ID: {existing['emp_id']})"
-                    )
-            except Exception as e:
-                logging.error(f"Error checking duplicate {id_type}: {e}")
+        # All four IDs in one indexed lookup, matched without dashes or spaces
+        exclude_emp_id = self.current_employee.get('emp_id') if self.current_employee else None
+        try:
+            conflicts = self.db.find_gov_id_conflicts({
+                'sss_number': self.sss_edit.text().strip(),
+                'tin_number': self.tin_edit.text().strip(),
+                'philhealth_number': self.philhealth_edit.text().strip(),
+                'pagibig_number': self.pagibig_edit.text().strip(),
+            }, exclude_emp_id=exclude_emp_id)
+        except Exception as e:
+            logging.error(f"Error checking duplicate government IDs: {e}")
+            return []
 
-        return errors
+        return [
+            f"❌ Duplicate {c['label']}: '{c['value']}' is already assigned to "
+            f"{c['name']} (ID: {c['emp_id']})"
+            for c in conflicts
+        ]
 
     def _check_duplicate_name(self, full_name: str) -> List[Dict[str, Any]]:
         """
@@ -533,16 +555,14 @@ class EmployeeForm(QWidget):
         Returns:
             List of similar employees with similarity scores
         """
-        # Get all employees
-        all_employees = self.db.all_employees()
+        # Only employees sharing enough name keys (tokens, phonetic codes,
+        # trigrams) with full_name are scored - see database/name_index.py
+        exclude_emp_id = self.current_employee.get('emp_id') if self.current_employee else None
+        candidates = self.db.find_name_candidates(full_name, exclude_emp_id=exclude_emp_id)
 
         # Find similar names
         similar = []
-        for emp in all_employees:
-            # Skip if editing the same employee
-            if self.current_employee and emp.get('emp_id') == self.current_employee.get('emp_id'):
-                continue
-
+        for emp in candidates:
             emp_name = emp.get('name', '')
             if not emp_name:
                 continue
@@ -708,12 +728,17 @@ class EmployeeForm(QWidget):
         self.files_list=None
         self.photo_label=None
         self.photo_path=None  # Initialize photo path to prevent cross-contamination bug
+        self._photo_persister=None  # PhotoPersistWorker, started on the first photo save
+        self.upload_manager = UploadManager(self.db, self)
+        self.upload_manager.file_progress.connect(self._on_upload_file_progress)
+        self.upload_manager.batch_progress.connect(self._on_upload_progress)
+        self.upload_manager.file_finished.connect(self._on_upload_file_finished)
+        self.upload_manager.batch_finished.connect(self._on_upload_batch_finished)
         self.still_working=None
         self.has_unsaved_changes=False  # Track if form has unsaved changes
 
         # Record locking for multi-user concurrent editing
         self.current_lock_id = None  # Track current record lock
-        self.lock_refresh_timer = None  # Timer to refresh lock every 5 minutes
 
         self.agency_combo=QComboBox()
         # Add this exact line below the line above
@@ -1324,6 +1349,26 @@ class EmployeeForm(QWidget):
         up_files.clicked.connect(self._upload_files)
         fb.addWidget(up_files)
 
+        # Background upload progress (hidden while nothing is uploading)
+        self.upload_progress_row = QWidget()
+        upload_row = QHBoxLayout(self.upload_progress_row)
+        upload_row.setContentsMargins(0, 0, 0, 0)
+        self.upload_progress_label = QLabel()
+        self.upload_progress_label.setStyleSheet("color: rgba(255, 255, 255, 0.8); font-size: 11px;")
+        self.upload_progress_bar = QProgressBar()
+        self.upload_progress_bar.setRange(0, 1000)
+        self.upload_progress_bar.setTextVisible(False)
+        self.upload_progress_bar.setFixedHeight(8)
+        upload_cancel = QPushButton("✕")
+        upload_cancel.setToolTip("Cancel uploads (partial files resume when uploaded again)")
+        upload_cancel.setFixedWidth(32)
+        upload_cancel.clicked.connect(lambda: self.upload_manager.cancel())
+        upload_row.addWidget(self.upload_progress_label, 1)
+        upload_row.addWidget(self.upload_progress_bar, 2)
+        upload_row.addWidget(upload_cancel)
+        self.upload_progress_row.hide()
+        fb.addWidget(self.upload_progress_row)
+
         # Add files_box to Additional Information section
         additional_layout.addWidget(files_box)
         additional_section.add_layout(additional_layout)
@@ -1689,8 +1734,9 @@ class EmployeeForm(QWidget):
             # v5.2: Check new folder structure first, then legacy location
             photos = get_employee_photos(emp.get('emp_id', ''))
             if photos:
-                # Use first photo as profile photo
-                self._set_photo_pixmap(QPixmap(photos[0]), 160)
+                # Use first photo as profile photo (display-sized derivative when available)
+                with metrics.timer("photo.form_load", detail=emp.get('emp_id', '')):
+                    self._set_photo_pixmap(QPixmap(get_photo_derivative(photos[0], 160)), 160)
             else:
                 # Legacy: check old PHOTOS_DIR location
                 p=os.path.join(PHOTOS_DIR,f"{emp.get('emp_id','')}.png")
@@ -2348,83 +2394,60 @@ class EmployeeForm(QWidget):
         files,_=QFileDialog.getOpenFileNames(self,"Select Files")
         if not files: return
 
-        # Image extensions for photos
-        image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.tiff', '.ico'}
+        # Copied on the upload thread - the form stays usable meanwhile
+        self.upload_manager.enqueue(emp_id, files, self.current_user)
+        self.upload_progress_label.setText(f"Uploading {len(files)} file(s)...")
+        self.upload_progress_bar.setValue(0)
+        self.upload_progress_row.show()
 
-        # File size limit: 10MB
-        MAX_FILE_SIZE_MB = 10
-        MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
+    def _on_upload_file_progress(self, batch_id, filename, done, total):
+        if total:
+            self.upload_progress_label.setText(f"Uploading {filename} ({done * 100 // total}%)")
 
-        try:
-            photos_uploaded = 0
-            docs_uploaded = 0
-            skipped_files = []
-
-            for fp in files:
-                filename = os.path.basename(fp)
-                ext = os.path.splitext(filename)[1].lower()
-
-                # Validate file size
-                file_size = os.path.getsize(fp)
-                if file_size > MAX_FILE_SIZE_BYTES:
-                    size_mb = file_size / (1024 * 1024)
-                    skipped_files.append(f"{filename} ({size_mb:.1f}MB)")
-                    continue
-
-                # Route photos to photos folder, documents to files folder
-                if ext in image_extensions:
-                    folder = get_employee_folder(emp_id, 'photos')
-                    file_type = "photo"
-                    photos_uploaded += 1
-                else:
-                    folder = get_employee_folder(emp_id, 'files')
-                    file_type = "document"
-                    docs_uploaded += 1
-
-                # Validate filename and create safe path
-                safe_dest = safe_file_path(folder, filename, allow_subdirs=False)
-                shutil.copy2(fp, safe_dest)
-                logging.info(f"{file_type.capitalize()} uploaded: {filename} for employee {emp_id}")
-
-                # QUICK WIN #5: Enhanced audit logging - log file uploads
-                try:
-                    self.db.log_action(
-                        username=self.current_user,
-                        action="FILE_UPLOADED",
-                        table_name="employee_files",
-                        record_id=emp_id,
-                        details=f"Uploaded {file_type}: {filename}"
-                    )
-                except:
-                    pass  # Don't fail upload if logging fails
+    def _on_upload_progress(self, batch_id, done, total):
+        self.upload_progress_bar.setValue(int(done * 1000 / total) if total else 1000)
 
+    def _on_upload_file_finished(self, batch_id, emp_id, filename, status, message):
+        # Show each file as soon as it lands if the form still shows that employee
+        if status == STATUS_UPLOADED and emp_id == self.entries["emp_id"].text().strip():
             self._refresh_files_list(emp_id)
 
-            # Show detailed success message
-            msg_parts = []
-            if photos_uploaded > 0:
-                msg_parts.append(f"{photos_uploaded} photo(s)")
-            if docs_uploaded > 0:
-                msg_parts.append(f"{docs_uploaded} document(s)")
-
-            if msg_parts:
-                show_success_toast(self, f"{' and '.join(msg_parts)} uploaded securely!")
-
-            # Warn about skipped files
-            if skipped_files:
-                show_warning_toast(
-                    self,
-                    f"Skipped {len(skipped_files)} file(s) exceeding {MAX_FILE_SIZE_MB}MB limit:\n" +
-                    "\n".join(skipped_files[:5]) +
-                    (f"\n...and {len(skipped_files)-5} more" if len(skipped_files) > 5 else "")
-                )
+    def _on_upload_batch_finished(self, batch_id, summary):
+        if not self.upload_manager.busy:
+            self.upload_progress_row.hide()
+        files = summary.get('files', {})
+        if summary.get('error'):
+            show_error_toast(self, f"Failed to upload files: {summary['error']}")
+            return
 
-        except ValueError as e:
-            show_error_toast(self, f"Invalid file path: {e}")
-            logging.error(f"File upload security error: {e}")
-        except Exception as e:
-            show_error_toast(self, f"Failed to upload files: {e}")
-            logging.error(f"File upload failed: {e}")
+        # Show detailed success message
+        uploaded = files.get(STATUS_UPLOADED, [])
+        photos_uploaded = summary.get('photos', 0)
+        msg_parts = []
+        if photos_uploaded > 0:
+            msg_parts.append(f"{photos_uploaded} photo(s)")
+        if len(uploaded) - photos_uploaded > 0:
+            msg_parts.append(f"{len(uploaded) - photos_uploaded} document(s)")
+        if msg_parts:
+            show_success_toast(self, f"{' and '.join(msg_parts)} uploaded securely!")
+
+        problems = []
+        if files.get(STATUS_DUPLICATE):
+            problems.append(f"Already attached (identical content): {len(files[STATUS_DUPLICATE])}")
+        if files.get(STATUS_SKIPPED):
+            problems.append(f"Skipped, larger than {UPLOAD_MAX_FILE_BYTES // (1024 * 1024)}MB: {len(files[STATUS_SKIPPED])}")
+        if files.get(STATUS_FAILED):
+            problems.append(f"Failed: {len(files[STATUS_FAILED])}")
+        if files.get(STATUS_CANCELLED):
+            problems.append(f"Cancelled (upload again to resume): {len(files[STATUS_CANCELLED])}")
+        if problems:
+            names = [name for status in (STATUS_DUPLICATE, STATUS_SKIPPED, STATUS_FAILED, STATUS_CANCELLED)
+                     for name in files.get(status, [])]
+            show_warning_toast(
+                self,
+                "\n".join(problems) + "\n\n" + "\n".join(names[:5]) +
+                (f"\n...and {len(names)-5} more" if len(names) > 5 else "")
+            )
             
     def _refresh_files_list(self, emp_id):
         """Refresh both photos and documents lists (v5.2 new folder structure)"""
@@ -2474,7 +2497,7 @@ class EmployeeForm(QWidget):
                 ext = os.path.splitext(file)[1].lower()
 
                 # Skip images - they should only appear in photos tab
-                if ext in image_extensions:
+                if ext in image_extensions or is_partial_upload(file):
                     continue
 
                 # Choose icon based on extension
@@ -2705,12 +2728,18 @@ class EmployeeForm(QWidget):
         self.save_btn.setEnabled(False)
         self.save_btn.setText("⏳ Saving...")
 
+        queued = False
         try:
-            self._perform_save()
+            queued = self._perform_save()
         finally:
-            self._save_in_progress = False
-            self.save_btn.setEnabled(True)
-            self.save_btn.setText("💾 Save Employee")
+            # A queued write keeps the button disabled until _on_employee_saved
+            if not queued:
+                self._finish_save()
+
+    def _finish_save(self):
+        self._save_in_progress = False
+        self.save_btn.setEnabled(True)
+        self.save_btn.setText("💾 Save Employee")
 
     def _perform_save(self):
         logging.info("Starting _perform_save")
@@ -2865,139 +2894,122 @@ class EmployeeForm(QWidget):
               "contract_start_date":contract_start,"contract_months":contract_months,
               "tin_number":tin_number,"pagibig_number":pagibig_number,"philhealth_number":philhealth_number}
         logging.info(f"Data dictionary complete: emp_id={emp_id}, name={name}")
+        updating = bool(self.current_employee)
         try:
-            # PHASE 1 FIX: Wrap multi-step operation in transaction for data integrity
-            # Note: SQLite in Python already uses implicit transactions, no need for explicit BEGIN
-
-            try:
-                logging.info("Entering database transaction...")
-                if self.current_employee:
-                    logging.info(f"Updating employee {self.current_employee['emp_id']}...")
-                    self.db.update_employee(self.current_employee["emp_id"], data)
-                    logging.info("Database update complete")
-
-                    # v3.6: Save photo if uploaded
-                    if hasattr(self, 'photo_path') and self.photo_path:
-                        logging.info(f"Saving photo from {self.photo_path}...")
-                        try:
-                            # v5.2: Save to new folder structure with standardized filename
-                            photos_folder = get_employee_folder(self.current_employee['emp_id'], 'photos')
-                            # Use standardized filename 'profile.png' for easy retrieval
-                            dest_path = os.path.join(photos_folder, "profile.png")
-                            # Convert and save as PNG (background already removed during upload)
-                            pixmap = QPixmap(self.photo_path)
-                            pixmap.save(dest_path, "PNG")
-                            logging.info(f"Photo saved to {dest_path}")
-                        except Exception as e:
-                            logging.error(f"Failed to save photo: {e}")
-                            # Photo save failure is non-critical, continue
-                    else:
-                        logging.info("No photo to save")
-
-                    # Commit transaction if all succeeded + checkpoint for multi-PC sync
-                    logging.info("Committing database transaction with checkpoint...")
-                    self.db.commit_and_checkpoint()
-                    logging.info("Transaction committed with checkpoint")
-
-                    # Show success message with employee name and automatically return to list
-                    employee_name = name
-                    logging.info(f"Update successful for {employee_name}")
-                    show_success_toast(self, f"✓ Employee Updated Successfully!\n\n{employee_name}\n\nReturning to employee list...")
-                    self.current_employee=None
-                    self.has_unsaved_changes = False  # Reset unsaved changes flag
-                    self._delete_draft()  # Delete any draft after successful save
-                    self._release_current_lock()  # Release lock after successful save
-                    self.on_saved()  # Switch back to list after updating
-                else:
-                    logging.info(f"Inserting new employee {emp_id}...")
-                    self.db.insert_employee(data)
-                    logging.info("Database insert complete")
-
-                    # v3.6: Save photo if uploaded (CRITICAL FIX)
-                    if hasattr(self, 'photo_path') and self.photo_path and emp_id:
-                        logging.info(f"Saving photo from {self.photo_path}...")
-                        try:
-                            # v5.2: Save to new folder structure with standardized filename
-                            photos_folder = get_employee_folder(emp_id, 'photos')
-                            # Use standardized filename 'profile.png' for easy retrieval
-                            dest_path = os.path.join(photos_folder, "profile.png")
-                            # Convert and save as PNG (background already removed during upload)
-                            pixmap = QPixmap(self.photo_path)
-                            if not pixmap.isNull():
-                                pixmap.save(dest_path, "PNG")
-                                logging.info(f"Photo saved to {dest_path}")
-                            else:
-                                logging.warning("Photo pixmap is null, not saving")
-                        except Exception as e:
-                            logging.error(f"Failed to save photo: {e}")
-                            # Photo save failure is non-critical, continue
-                    else:
-                        logging.info("No photo to save")
-
-                    # Commit transaction if all succeeded + checkpoint for multi-PC sync
-                    logging.info("Committing database transaction with checkpoint...")
-                    self.db.commit_and_checkpoint()
-                    logging.info("Transaction committed with checkpoint")
-
-                    logging.info("Insert successful, showing success message")
-                    show_success_toast(self, "Employee saved successfully!")
-
-                    # Delete draft after successful save
-                    self._delete_draft()
-
-                    # Clear form for new entry but stay on form page
-                    self.current_employee = None
-                    self.has_unsaved_changes = False  # Reset unsaved changes flag
-                    for e in self.entries.values():
-                        e.clear()
-                        self._set_valid(e)
-                    self.notes.clear()
-                    # v5.1: Clear both files lists
-                    self.files_list.clear()
-                    if hasattr(self, 'photos_list'): self.photos_list.clear()
-                    self._update_file_tab_counts()
-                    self.contract_hint.clear()
-                    self.still_working.setChecked(True)
-                    self.photo_label.setText("📷")
-                    self.photo_label.setPixmap(QPixmap())
-                    self.photo_path = None  # v3.6: Clear photo path
-                    self.contract_user_changed = False
-                    self.resign_user_changed = False
-                    self.date_entries["hire_date"].setDate(QDate.currentDate())
-                    self.date_entries["resign_date"].setDate(QDate.currentDate())
-                    self.date_entries["contract_expiry"].setDate(QDate.currentDate())
-                    self.date_entries["contract_start_date"].setDate(QDate.currentDate())
-                    self.contract_months_combo.combo_box.setCurrentIndex(0)
-                    self.no_middle_name_check.setChecked(False)
-                    # Reset all dropdowns to default "Select..." state
-                    self.agency_combo.setCurrentIndex(0)
-                    self.department_combo.combo_box.setCurrentIndex(0)
-                    self.department_display.hide()
-                    self._reload_agencies_into_combo()
-                    self._update_emp_id_preview()
-                    self._update_contract_hint()
-                    # Refresh data in background but don't switch pages
-                    self.on_saved(cancel_only=False, switch_page=False)
-
-            except Exception as e:
-                # Rollback transaction on any error
-                self.db.conn.rollback()
-                logging.error(f"Transaction rolled back due to error: {e}")
-                raise  # Re-raise to be caught by outer exception handler
+            # The write and its audit row commit together on the database writer thread;
+            # the result comes back to _on_employee_saved, so a locked database never freezes the form
+            if updating:
+                logging.info(f"Queueing update of employee {self.current_employee['emp_id']}...")
+                future = self.db.update_employee(self.current_employee["emp_id"], data)
+            else:
+                logging.info(f"Queueing insert of new employee {emp_id}...")
+                future = self.db.insert_employee(data)
         except PermissionError as ex:
             show_error_toast(self, f"Access denied: {ex}\n\nPlease contact your administrator.")
             logging.error(f"Permission error in _save_employee: {ex}")
+            return False
+        on_write_done(future, self, lambda _result, error: self._on_employee_saved(data, updating, error))
+        return True
+
+    def _on_employee_saved(self, data, updating, error):
+        """Finish a save once the writer thread has committed (or rejected) it"""
+        try:
+            if isinstance(error, ValueError):
+                show_error_toast(self, f"Invalid data: {error}")
+                logging.error(f"Validation error in _save_employee: {error}")
+                return
+            if error is not None:
+                logging.error(f"Error saving employee {data['emp_id']}: {error!r}")
+                show_error_toast(self, f"Could not save employee.\n\nError: {str(error)}\n\nPlease check:\n• All required fields are filled\n• Employee ID is valid\n• You have permission to save")
+                return
+            logging.info("Database write committed")
+
+            # Schedule a checkpoint so other PCs see the change soon
+            self.db.commit_and_checkpoint()
+
+            if updating:
+                # v3.6: Save photo if uploaded - stored in the background after the commit
+                if getattr(self, 'photo_path', None):
+                    self._persist_photo(data['emp_id'], self.photo_path)
+                else:
+                    logging.info("No photo to save")
+
+                # Show success message with employee name and automatically return to list
+                employee_name = data['name']
+                logging.info(f"Update successful for {employee_name}")
+                show_success_toast(self, f"✓ Employee Updated Successfully!\n\n{employee_name}\n\nReturning to employee list...")
+                self.current_employee=None
+                self.has_unsaved_changes = False  # Reset unsaved changes flag
+                self._delete_draft()  # Delete any draft after successful save
+                self._release_current_lock()  # Release lock after successful save
+                self.on_saved()  # Switch back to list after updating
+            else:
+                # v3.6: Save photo if uploaded (CRITICAL FIX) - stored in the background after the commit
+                if getattr(self, 'photo_path', None) and data['emp_id']:
+                    self._persist_photo(data['emp_id'], self.photo_path)
+                else:
+                    logging.info("No photo to save")
+
+                logging.info("Insert successful, showing success message")
+                show_success_toast(self, "Employee saved successfully!")
+
+                # Delete draft after successful save
+                self._delete_draft()
+
+                # Clear form for new entry but stay on form page
+                self.current_employee = None
+                self.has_unsaved_changes = False  # Reset unsaved changes flag
+                for e in self.entries.values():
+                    e.clear()
+                    self._set_valid(e)
+                self.notes.clear()
+                # v5.1: Clear both files lists
+                self.files_list.clear()
+                if hasattr(self, 'photos_list'): self.photos_list.clear()
+                self._update_file_tab_counts()
+                self.contract_hint.clear()
+                self.still_working.setChecked(True)
+                self.photo_label.setText("📷")
+                self.photo_label.setPixmap(QPixmap())
+                self.photo_path = None  # v3.6: Clear photo path
+                self.contract_user_changed = False
+                self.resign_user_changed = False
+                self.date_entries["hire_date"].setDate(QDate.currentDate())
+                self.date_entries["resign_date"].setDate(QDate.currentDate())
+                self.date_entries["contract_expiry"].setDate(QDate.currentDate())
+                self.date_entries["contract_start_date"].setDate(QDate.currentDate())
+                self.contract_months_combo.combo_box.setCurrentIndex(0)
+                self.no_middle_name_check.setChecked(False)
+                # Reset all dropdowns to default "Select..." state
+                self.agency_combo.setCurrentIndex(0)
+                self.department_combo.combo_box.setCurrentIndex(0)
+                self.department_display.hide()
+                self._reload_agencies_into_combo()
+                self._update_emp_id_preview()
+                self._update_contract_hint()
+                # Refresh data in background but don't switch pages
+                self.on_saved(cancel_only=False, switch_page=False)
+        finally:
+            self._finish_save()
+
+    def _persist_photo(self, emp_id, source_path):
+        """Queue the profile photo for storage; the employee row is already committed"""
+        if self._photo_persister is None:
+            self._photo_persister = PhotoPersistWorker(self)
+            self._photo_persister.persisted.connect(self._on_photo_persisted)
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self._photo_persister.stop)
+        logging.info(f"Queueing photo for {emp_id} from {source_path}...")
+        self._photo_persister.submit(emp_id, source_path)
+
+    def _on_photo_persisted(self, emp_id, result, success):
+        if not success:
+            # Photo save failure is non-critical - the employee itself was saved
+            show_warning_toast(self, f"Employee {emp_id} was saved, but the photo could not be stored.\n\n{result}")
             return
-        except ValueError as ex:
-            show_error_toast(self, f"Invalid data: {ex}")
-            logging.error(f"Validation error in _save_employee: {ex}")
-            return
-        except Exception as ex:
-            import traceback
-            error_details = traceback.format_exc()
-            logging.error(f"Error saving employee: {error_details}")
-            show_error_toast(self, f"Could not save employee.\n\nError: {str(ex)}\n\nPlease check:\n• All required fields are filled\n• Employee ID is valid\n• You have permission to save")
-            return
+        get_thumbnail_cache().invalidate(emp_id)
+        self.photo_saved.emit(emp_id, result)
 
     # ============================================================================
     # AUTO-COMPLETE FUNCTIONALITY
@@ -3076,24 +3088,15 @@ class EmployeeForm(QWidget):
     def _acquire_lock(self, emp_id: str) -> bool:
         """Acquire lock for editing employee. Returns True if successful, False if locked by another user."""
         try:
-            from PySide6.QtCore import QTimer
             from PySide6.QtWidgets import QMessageBox
 
             record_id = f"employee:{emp_id}"
 
             # Try to acquire lock
             if self.db.acquire_lock(record_id, self.current_user):
-                # Lock acquired successfully
+                # Lock acquired successfully - the lease is renewed by the
+                # main window's session heartbeat (DB.heartbeat) while held
                 self.current_lock_id = record_id
-
-                # Set up lock refresh timer (every 5 minutes)
-                if self.lock_refresh_timer:
-                    self.lock_refresh_timer.stop()
-
-                self.lock_refresh_timer = QTimer(self)
-                self.lock_refresh_timer.timeout.connect(lambda: self._refresh_lock())
-                self.lock_refresh_timer.start(300000)  # 5 minutes
-
                 return True
             else:
                 # Lock is held by someone else
@@ -3131,21 +3134,12 @@ class EmployeeForm(QWidget):
             logging.error(f"Error acquiring lock for {emp_id}: {e}")
             return True  # Allow editing on error (fail open)
 
-    def _refresh_lock(self):
-        """Refresh the current lock to prevent expiry"""
-        if self.current_lock_id:
-            self.db.refresh_lock(self.current_lock_id, self.current_user)
-
     def _release_current_lock(self):
         """Release the current record lock"""
         if self.current_lock_id:
             self.db.release_lock(self.current_lock_id, self.current_user)
             self.current_lock_id = None
 
-        if self.lock_refresh_timer:
-            self.lock_refresh_timer.stop()
-            self.lock_refresh_timer = None
-
     def closeEvent(self, event):
         """Release lock when form is closed"""
         self._release_current_lock()
@@ -12,10 +12,20 @@ from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 
-try:
-    import pandas as pd
-except ImportError:
-    pd = None
+# pandas is imported when the dialog opens, not when this module is loaded
+pd = None
+
+
+def _load_pandas():
+    """Import pandas on first use; returns None if it is not installed"""
+    global pd
+    if pd is None:
+        try:
+            import pandas
+            pd = pandas
+        except ImportError:
+            pass
+    return pd
 
 from employee_vault.ui.widgets import (
     ModernAnimatedButton, AnimatedDialogBase,
@@ -66,7 +76,7 @@ class ExcelImportDialog(AnimatedDialogBase):
         layout.addWidget(header)
 
         # Check if pandas is available
-        if pd is None:
+        if _load_pandas() is None:
             error_label = QLabel(
                 "<p style='color: #ff6b6b;'><b>Error:</b> Required library 'pandas' is not installed.</p>"
                 "<p>Please install it with: <code>pip install pandas openpyxl</code></p>"
@@ -544,16 +554,21 @@ class ExcelImportDialog(AnimatedDialogBase):
             updated_count = 0
             error_count = 0
 
-            for idx, row in self.df.iterrows():
-                self.progress.setValue(idx + 1)
-                QApplication.processEvents()
+            # Build employee data dictionaries (NaN -> None)
+            batch = [
+                {db_field: (None if pd.isna(row.get(excel_col)) else str(row.get(excel_col)))
+                 for db_field, excel_col in self.column_mappings.items()}
+                for _, row in self.df.iterrows()
+            ]
 
-                # Build employee data dictionary
-                emp_data = {}
-                for db_field, excel_col in self.column_mappings.items():
-                    value = row.get(excel_col)
-                    # Convert NaN to None
-                    emp_data[db_field] = None if pd.isna(value) else str(value)
+            # Government IDs already used (or repeated within the file): one set-based check
+            gov_id_conflicts = {}
+            for conflict in self.db.find_gov_id_batch_conflicts(batch):
+                gov_id_conflicts.setdefault(conflict['row'], conflict)
+
+            for position, emp_data in enumerate(batch):
+                self.progress.setValue(position + 1)
+                QApplication.processEvents()
 
                 emp_id = emp_data.get('emp_id')
 
@@ -561,6 +576,13 @@ class ExcelImportDialog(AnimatedDialogBase):
                     error_count += 1
                     continue
 
+                conflict = gov_id_conflicts.get(position)
+                if conflict:
+                    holder = conflict['emp_id'] or f"row {conflict.get('other_row', 0) + 1}"
+                    logging.warning(f"Skipped {emp_id}: {conflict['label']} {conflict['value']} already used by {holder}")
+                    error_count += 1
+                    continue
+
                 # Handle duplicates
                 if emp_id in existing_ids:
                     if self.dup_skip.isChecked():
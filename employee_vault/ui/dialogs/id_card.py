@@ -17,6 +17,7 @@ from PySide6.QtGui import *
 
 from employee_vault.config import *
 from employee_vault.database import DB
+from employee_vault import metrics
 from employee_vault.validators import *
 from employee_vault.utils import *
 from employee_vault.models import *
@@ -52,6 +53,7 @@ class IDCardGeneratorBackend:
 
         logging.info(f"IDCardGenerator initialized with database: {db_path}")
 
+    @metrics.timed("idcard.render")
     def generate_card(self, employee_id: int, template: str = "standard", side: str = "front"):
         """
         Generate ID card for a single employee
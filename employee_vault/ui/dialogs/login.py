@@ -17,11 +17,13 @@ from PySide6.QtGui import *
 from employee_vault.config import *
 from employee_vault.config import _verify_pwd, _hash_pwd, _needs_password_rehash, _check_pwd, _verify_pin, _hash_pin, validate_pin_strength, PIN_MIN_LENGTH, PIN_MAX_LENGTH
 from employee_vault.database import DB
+from employee_vault import metrics
 from employee_vault.validators import *
 from employee_vault.utils import *
 from employee_vault.models import *
 from employee_vault.ui.widgets import *
 from employee_vault.ui.widgets import ModernAnimatedButton, AnimatedDialogBase, FloatingLabelLineEdit, GlowLineEdit, AnimatedLoginCard
+from employee_vault.ui.db_actions import on_write_done
 
 # v5.1: Load theme colors for login card
 def _load_login_theme_colors():
@@ -110,9 +112,16 @@ class LoginWorker(QThread):
                     return
 
             # Failed authentication
-            self.db.record_login_attempt(user["username"], success=False)
+            attempt = self.db.record_login_attempt(user["username"], success=False)
             self._log_failed_attempt()
 
+            # The attempt is written by the DB writer thread - wait for it (we are
+            # off the UI thread here) so the remaining-attempts count includes it
+            try:
+                attempt.result(timeout=10)
+            except Exception as e:
+                logging.warning(f"Login attempt not recorded yet: {e}")
+
             # Get remaining attempts
             failed_count = self.db.get_recent_failed_attempts(self.username)
             remaining = 5 - failed_count
@@ -1041,8 +1050,8 @@ class LoginDialog(QDialog):
 
     def attempt_login(self):
         """Phase 2: Async login with instant UI response"""
-        # Performance instrumentation (Phase 0)
-        start = time.perf_counter()
+        # Performance instrumentation - see _record_login()
+        start = self._login_started = time.perf_counter()
 
         u = self.card.username_edit.text().strip().lower()
         p = self.card.password_edit.text()
@@ -1053,7 +1062,7 @@ class LoginDialog(QDialog):
         # Quick validation (stays on UI thread - fast)
         if not u or not p:
             self.card.error_label.setText("⚠️ Please enter username and PIN")
-            print(f"[PERF] Login attempt (validation fail): {(time.perf_counter() - start)*1000:.2f}ms")
+            metrics.incr("login.rejected_empty")
             return
 
         # Quick format check for existing PIN users
@@ -1061,17 +1070,17 @@ class LoginDialog(QDialog):
         if r and "pin" in r.keys() and r["pin"]:
             if not p.isdigit():
                 self.card.error_label.setText("⚠️ PIN must be numbers only (4-6 digits)")
-                print(f"[PERF] Login attempt (PIN format): {(time.perf_counter() - start)*1000:.2f}ms")
+                metrics.incr("login.rejected_pin_format")
                 return
             if not (4 <= len(p) <= 6):
                 self.card.error_label.setText("⚠️ PIN must be 4-6 digits")
-                print(f"[PERF] Login attempt (PIN length): {(time.perf_counter() - start)*1000:.2f}ms")
+                metrics.incr("login.rejected_pin_length")
                 return
 
         # Phase 2: UI responds INSTANTLY - show loading immediately
         self.card.set_loading(True)
         self.card.login_btn.setEnabled(False)
-        print(f"[PERF] Login UI ready (instant): {(time.perf_counter() - start)*1000:.2f}ms")
+        metrics.observe("login.ui_ready", (time.perf_counter() - start) * 1000)
 
         # Phase 2.1: Start background worker (non-blocking)
         self.login_worker = LoginWorker(self.db, u, p)
@@ -1089,7 +1098,7 @@ class LoginDialog(QDialog):
             self.card.set_loading(False)
             self.card.login_btn.setEnabled(True)
             self._force_pin_change(user["username"])
-            print(f"[PERF] Login complete (PIN setup required)")
+            self._record_login("pin_setup")
             return
 
         # Success - show animation and proceed
@@ -1097,7 +1106,7 @@ class LoginDialog(QDialog):
         self.card.show_success()
         # Quick transition to dashboard
         QTimer.singleShot(150, self.accept)
-        print(f"[PERF] Login complete (success)")
+        self._record_login("success")
 
     def _on_login_failed(self, error_message):
         """Phase 2: Handler for failed login from worker thread"""
@@ -1116,7 +1125,7 @@ class LoginDialog(QDialog):
             self.card.password_edit.clear()
             self.card.password_edit.setFocus()
 
-        print(f"[PERF] Login complete (failed)")
+        self._record_login("failed")
 
     def _on_migration_required(self, username):
         """Phase 2: Handler for password migration from worker thread"""
@@ -1124,7 +1133,14 @@ class LoginDialog(QDialog):
         self.card.login_btn.setEnabled(True)
         self.card.error_label.setText("⚠️ Migration required: Please set up your new PIN")
         QTimer.singleShot(1500, lambda: self._force_pin_change(username))
-        print(f"[PERF] Login complete (migration)")
+        self._record_login("migration")
+
+    def _record_login(self, outcome: str):
+        """Record the time from pressing Login to the worker's answer"""
+        started = getattr(self, '_login_started', None)
+        if started is not None:
+            metrics.observe("login.round_trip", (time.perf_counter() - started) * 1000, outcome)
+        metrics.incr(f"login.{outcome}")
     
     def _force_pin_change(self, username):
         """Force user to set up a new PIN (for migration or first-time setup)"""
@@ -1418,51 +1434,56 @@ class LoginDialog(QDialog):
                                    "• Avoid repeated digits (1111, 2222, etc.)")
                 return
 
-            try:
-                created_username = username.line_edit.text().strip()
-                self.db.create_user(created_username, name.line_edit.text().strip(), pw.line_edit.text(), role="user")
-
-                # v4.6.0: Security questions removed - admin resets PIN if needed
-                QMessageBox.information(
-                    dlg,
-                    "Account Created Successfully",
-                    f"Account '{created_username}' has been created!\n\n"
-                    "You can now log in with your username and PIN.\n\n"
-                    "If you forget your PIN, contact an administrator for a reset."
-                )
-                
-                dlg.accept()  # Close the signup dialog
+            created_username = username.line_edit.text().strip()
 
-            except sqlite3.IntegrityError as e:
-                logging.error(f"IntegrityError during user creation: {e}")
-                error_msg = str(e).lower()
-                
-                # Check if it's specifically a username conflict
-                if "unique" in error_msg or "username" in error_msg:
-                    QMessageBox.critical(
+            def _registered(_result, error):
+                ok.setEnabled(True)
+                if error is None:
+                    # v4.6.0: Security questions removed - admin resets PIN if needed
+                    QMessageBox.information(
                         dlg,
-                        "Username Already Taken",
-                        f"The username '{username.text().strip()}' is already in use.\n\n"
-                        "Please choose a different username and try again."
+                        "Account Created Successfully",
+                        f"Account '{created_username}' has been created!\n\n"
+                        "You can now log in with your username and PIN.\n\n"
+                        "If you forget your PIN, contact an administrator for a reset."
                     )
+
+                    dlg.accept()  # Close the signup dialog
+                elif isinstance(error, sqlite3.IntegrityError):
+                    logging.error(f"IntegrityError during user creation: {error}")
+                    error_msg = str(error).lower()
+
+                    # Check if it's specifically a username conflict
+                    if "unique" in error_msg or "username" in error_msg:
+                        QMessageBox.critical(
+                            dlg,
+                            "Username Already Taken",
+                            f"The username '{created_username}' is already in use.\n\n"
+                            "Please choose a different username and try again."
+                        )
+                    else:
+                        # Other integrity error (like NOT NULL constraint)
+                        QMessageBox.critical(
+                            dlg,
+                            "Account Creation Failed",
+                            f"Failed to create account due to database constraint.\n\n"
+                            f"Error: {str(error)}\n\n"
+                            "Please contact an administrator."
+                        )
                 else:
-                    # Other integrity error (like NOT NULL constraint)
+                    logging.error(f"Unexpected error during user creation: {error}")
                     QMessageBox.critical(
                         dlg,
                         "Account Creation Failed",
-                        f"Failed to create account due to database constraint.\n\n"
-                        f"Error: {str(e)}\n\n"
+                        f"An unexpected error occurred:\n\n{str(error)}\n\n"
                         "Please contact an administrator."
                     )
-            except Exception as e:
-                logging.error(f"Unexpected error during user creation: {e}")
-                QMessageBox.critical(
-                    dlg,
-                    "Account Creation Failed",
-                    f"An unexpected error occurred:\n\n{str(e)}\n\n"
-                    "Please contact an administrator."
-                )
-        
+
+            # The account is written on the database writer thread; _registered reports the outcome
+            ok.setEnabled(False)
+            on_write_done(self.db.create_user(created_username, name.line_edit.text().strip(), pw.line_edit.text(), role="user"),
+                          dlg, _registered)
+
         ok.clicked.connect(do_register); cancel.clicked.connect(dlg.reject); dlg.exec()
 
     def _setup_security_questions(self, username, parent_dialog, password_strength):
@@ -6,24 +6,72 @@ v4.6.0: New photo editing capabilities
 
 import os
 import math
+from typing import Optional
 from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 
 
+# Longest edge of the interactive proxy image. Drag, zoom and rotate only
+# ever touch this proxy, so their cost does not depend on the camera resolution.
+PROXY_MAX_EDGE = 1600
+
+
+def render_circular_crop(source: QImage, matrix: QTransform, size: int) -> QImage:
+    """Render a circular size x size crop of source through matrix (thread-safe)"""
+    # QImage/QPainter are safe to use off the GUI thread (QPixmap is not)
+    result = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    result.fill(Qt.transparent)
+
+    painter = QPainter(result)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+
+    path = QPainterPath()
+    path.addEllipse(0, 0, size, size)
+    painter.setClipPath(path)
+
+    painter.setTransform(matrix)
+    painter.drawImage(0, 0, source)
+    painter.end()
+    return result
+
+
+class CropRenderWorker(QThread):
+    """Background worker that applies the recorded crop matrix to the full-resolution source"""
+    finished_render = Signal(QImage)
+
+    def __init__(self, source: QImage, matrix: QTransform, size: int, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.matrix = matrix
+        self.size = size
+
+    def run(self):
+        self.finished_render.emit(render_circular_crop(self.source, self.matrix, self.size))
+
+
 class CircularCropWidget(QWidget):
-    """Widget for cropping and positioning image within a circular area"""
+    """
+    Widget for cropping and positioning image within a circular area.
+
+    All interactive transforms are applied to a screen-sized proxy of the
+    source image and recorded as a QTransform; the full-resolution source is
+    only touched once, by CropRenderWorker, when the crop is applied.
+    """
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumSize(400, 400)
         self.setMouseTracking(True)
         
-        self.original_pixmap = None
-        self.display_pixmap = None
+        self.source_image = None    # Full-resolution QImage (never transformed interactively)
+        self.proxy_pixmap = None    # Screen-sized proxy used for all painting
+        self.proxy_ratio = 1.0      # proxy size / source size
         self.rotation = 0
-        self.scale = 1.0
+        self.scale = 1.0            # Relative to the proxy
         self.offset = QPointF(0, 0)
+        self._view_transform = QTransform()
         
         # Dragging state
         self.dragging = False
@@ -35,43 +83,62 @@ class CircularCropWidget(QWidget):
         self.setStyleSheet("background-color: #1a1a2e;")
         self.setCursor(Qt.OpenHandCursor)
     
-    def set_image(self, pixmap: QPixmap):
-        """Set the image to edit"""
-        self.original_pixmap = pixmap
-        self._update_display()
+    def set_image(self, image):
+        """Set the image to edit (QImage or QPixmap)"""
+        if isinstance(image, QPixmap):
+            image = image.toImage()
+        self.source_image = image
+        self._build_proxy()
         self._fit_image_to_circle()
         self.update()
+
+    def _proxy_max_edge(self) -> int:
+        """Longest proxy edge: the screen size in device pixels, capped at PROXY_MAX_EDGE"""
+        screen = self.screen() or QGuiApplication.primaryScreen()
+        if not screen:
+            return PROXY_MAX_EDGE
+        size = screen.size() * screen.devicePixelRatio()
+        return min(PROXY_MAX_EDGE, max(size.width(), size.height()))
+
+    def _build_proxy(self):
+        """Downscale the source once into the interactive proxy"""
+        if self.source_image is None or self.source_image.isNull():
+            self.proxy_pixmap = None
+            return
+
+        max_edge = self._proxy_max_edge()
+        src_w, src_h = self.source_image.width(), self.source_image.height()
+        if max(src_w, src_h) > max_edge:
+            proxy = self.source_image.scaled(max_edge, max_edge, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        else:
+            proxy = self.source_image
+        self.proxy_pixmap = QPixmap.fromImage(proxy)
+        self.proxy_ratio = self.proxy_pixmap.width() / src_w
     
     def _fit_image_to_circle(self):
         """Scale image to fit within the circle initially"""
-        if not self.original_pixmap:
+        if not self.proxy_pixmap:
             return
         
         # Calculate scale to fit the smaller dimension to circle diameter
-        img_size = min(self.original_pixmap.width(), self.original_pixmap.height())
+        img_size = min(self.proxy_pixmap.width(), self.proxy_pixmap.height())
         target_size = self.circle_radius * 2
         self.scale = target_size / img_size * 1.1  # Slightly larger for adjustment room
         self.offset = QPointF(0, 0)
         self._update_display()
     
     def _update_display(self):
-        """Update the display pixmap with current transforms"""
-        if not self.original_pixmap:
+        """Recompute the proxy-to-widget transform (no pixel work)"""
+        if not self.proxy_pixmap:
             return
         
-        # Apply rotation
+        center = QPointF(self.width() / 2, self.height() / 2)
         transform = QTransform()
+        transform.translate(center.x() + self.offset.x(), center.y() + self.offset.y())
         transform.rotate(self.rotation)
-        rotated = self.original_pixmap.transformed(transform, Qt.SmoothTransformation)
-        
-        # Apply scale
-        new_width = int(rotated.width() * self.scale)
-        new_height = int(rotated.height() * self.scale)
-        self.display_pixmap = rotated.scaled(
-            new_width, new_height,
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
+        transform.scale(self.scale, self.scale)
+        transform.translate(-self.proxy_pixmap.width() / 2, -self.proxy_pixmap.height() / 2)
+        self._view_transform = transform
         self.update()
     
     def rotate_image(self, degrees: int):
@@ -95,61 +162,37 @@ class CircularCropWidget(QWidget):
         self.scale = 1.0
         self.offset = QPointF(0, 0)
         self._fit_image_to_circle()
+
+    def get_transform_matrix(self, size: int = 400) -> QTransform:
+        """
+        Matrix mapping full-resolution source pixels to the size x size crop.
+
+        Composed as: source -> proxy -> widget -> circle bounding box -> output.
+        """
+        left = self.width() / 2 - self.circle_radius
+        top = self.height() / 2 - self.circle_radius
+        output_scale = size / (self.circle_radius * 2)
+        return (QTransform.fromScale(self.proxy_ratio, self.proxy_ratio)
+                * self._view_transform
+                * QTransform.fromTranslate(-left, -top)
+                * QTransform.fromScale(output_scale, output_scale))
+
+    def create_render_worker(self, size: int = 400, parent=None) -> Optional['CropRenderWorker']:
+        """Create a worker that renders the final crop from the full-resolution source"""
+        if self.source_image is None or self.source_image.isNull():
+            return None
+        return CropRenderWorker(self.source_image, self.get_transform_matrix(size), size, parent)
     
     def get_cropped_image(self, size: int = 400) -> QPixmap:
-        """Get the cropped circular image"""
-        if not self.display_pixmap:
+        """Get the cropped circular image (synchronous; prefer create_render_worker)"""
+        if self.source_image is None or self.source_image.isNull():
             return QPixmap()
-        
-        # Create result image with transparency
-        result = QImage(size, size, QImage.Format_ARGB32)
-        result.fill(Qt.transparent)
-        
-        painter = QPainter(result)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform)
-        
-        # Create circular clipping path
-        path = QPainterPath()
-        path.addEllipse(0, 0, size, size)
-        painter.setClipPath(path)
-        
-        # Calculate source rect from the view
-        center = QPointF(self.width() / 2, self.height() / 2)
-        
-        # Map the circle area to the image
-        if self.display_pixmap:
-            img_center = QPointF(
-                center.x() + self.offset.x(),
-                center.y() + self.offset.y()
-            )
-            
-            # Calculate scale ratio for output
-            output_scale = size / (self.circle_radius * 2)
-            
-            # Source rectangle in display pixmap coordinates
-            src_x = self.display_pixmap.width() / 2 - self.circle_radius + self.offset.x()
-            src_y = self.display_pixmap.height() / 2 - self.circle_radius + self.offset.y()
-            
-            # Adjust for the offset from center of widget
-            widget_center_x = self.width() / 2
-            widget_center_y = self.height() / 2
-            img_offset_x = widget_center_x - self.display_pixmap.width() / 2
-            img_offset_y = widget_center_y - self.display_pixmap.height() / 2
-            
-            src_rect = QRectF(
-                -self.offset.x() + self.display_pixmap.width() / 2 - self.circle_radius,
-                -self.offset.y() + self.display_pixmap.height() / 2 - self.circle_radius,
-                self.circle_radius * 2,
-                self.circle_radius * 2
-            )
-            
-            dest_rect = QRectF(0, 0, size, size)
-            
-            painter.drawPixmap(dest_rect, self.display_pixmap, src_rect)
-        
-        painter.end()
-        return QPixmap.fromImage(result)
+        return QPixmap.fromImage(render_circular_crop(self.source_image, self.get_transform_matrix(size), size))
+
+    def resizeEvent(self, event):
+        """Keep the image anchored to the widget centre"""
+        super().resizeEvent(event)
+        self._update_display()
     
     def paintEvent(self, event):
         """Paint the widget"""
@@ -162,11 +205,12 @@ class CircularCropWidget(QWidget):
         
         center = QPointF(self.width() / 2, self.height() / 2)
         
-        # Draw the image
-        if self.display_pixmap:
-            img_x = center.x() - self.display_pixmap.width() / 2 + self.offset.x()
-            img_y = center.y() - self.display_pixmap.height() / 2 + self.offset.y()
-            painter.drawPixmap(int(img_x), int(img_y), self.display_pixmap)
+        # Draw the proxy through the recorded transform
+        if self.proxy_pixmap:
+            painter.save()
+            painter.setTransform(self._view_transform)
+            painter.drawPixmap(0, 0, self.proxy_pixmap)
+            painter.restore()
         
         # Draw overlay (darken area outside circle)
         overlay_path = QPainterPath()
@@ -210,7 +254,7 @@ class CircularCropWidget(QWidget):
             delta = event.position() - self.last_pos
             self.offset += QPointF(delta.x(), delta.y())
             self.last_pos = event.position()
-            self.update()
+            self._update_display()
     
     def mouseReleaseEvent(self, event):
         """End dragging"""
@@ -247,6 +291,7 @@ class PhotoEditorDialog(QDialog):
         self.original_path = image_path
         self.show_remove_bg = show_remove_bg
         self.remove_bg_checked = False
+        self._render_worker = None
         
         self._setup_ui()
         
@@ -254,9 +299,11 @@ class PhotoEditorDialog(QDialog):
         if pixmap and not pixmap.isNull():
             self.crop_widget.set_image(pixmap)
         elif image_path and os.path.exists(image_path):
-            pix = QPixmap(image_path)
-            if not pix.isNull():
-                self.crop_widget.set_image(pix)
+            reader = QImageReader(image_path)
+            reader.setAutoTransform(True)  # Honour EXIF orientation from phone cameras
+            image = reader.read()
+            if not image.isNull():
+                self.crop_widget.set_image(image)
     
     def _setup_ui(self):
         """Setup the user interface"""
@@ -453,16 +500,40 @@ class PhotoEditorDialog(QDialog):
         """)
         apply_btn.clicked.connect(self._apply)
         buttons.addWidget(apply_btn)
+        self.apply_btn = apply_btn
         
         layout.addLayout(buttons)
     
     def _apply(self):
-        """Apply changes and close"""
-        self.result_pixmap = self.crop_widget.get_cropped_image(400)
+        """Render the crop from the full-resolution source in a worker, then close"""
         # Store checkbox state if shown
         if self.show_remove_bg and hasattr(self, 'remove_bg_checkbox'):
             self.remove_bg_checked = self.remove_bg_checkbox.isChecked()
+
+        worker = self.crop_widget.create_render_worker(400, self)
+        if worker is None:
+            self.result_pixmap = QPixmap()
+            self.accept()
+            return
+
+        self.apply_btn.setEnabled(False)
+        self.apply_btn.setText("Applying...")
+        self.crop_widget.setEnabled(False)
+        self._render_worker = worker
+        worker.finished_render.connect(self._on_render_finished)
+        worker.start()
+
+    def _on_render_finished(self, image: QImage):
+        """Receive the rendered crop on the UI thread"""
+        self.result_pixmap = QPixmap.fromImage(image)
+        self._render_worker = None
         self.accept()
+
+    def reject(self):
+        """Don't close while a render is in flight (the worker holds the source image)"""
+        if self._render_worker is not None and self._render_worker.isRunning():
+            return
+        super().reject()
     
     def get_result(self) -> QPixmap:
         """Get the resulting cropped pixmap"""
@@ -22,6 +22,7 @@ from employee_vault.ui.widgets import *
 from employee_vault.ui.widgets import disable_cursor_changes
 from employee_vault.ui.widgets import ModernAnimatedButton, SmoothAnimatedDialog
 from employee_vault.ui.ios_button_styles import apply_ios_style
+from employee_vault.ui.db_actions import run_bulk_write
 
 
 def print_with_preview(parent, content, title="Print Preview"):
@@ -933,6 +934,8 @@ class BulkOperationsDialog(SmoothAnimatedDialog):
         # v4.4.1: Use smooth fade for bulk operations
         super().__init__(parent, animation_style="fade")
         self.db = db
+        # Audit/permission context for bulk writes; without a signed-in user they are refused
+        self.current_user = getattr(parent, 'current_user', None)
         self.employees = employees
         self.setWindowTitle("📦 Bulk Operations")
         self.resize(700, 600)
@@ -1032,12 +1035,13 @@ class BulkOperationsDialog(SmoothAnimatedDialog):
                                     QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            for emp in selected:
-                self.db.conn.execute("UPDATE employees SET department=? WHERE emp_id=?",
-                    (dept, emp['emp_id']))
-            self.db.conn.commit()
-            QMessageBox.information(self, "Success", f"Updated {len(selected)} employee(s)!")
-            self.status_label.setText(f"✅ Changed department for {len(selected)} employees")
+            def _updated(count):
+                QMessageBox.information(self, "Success", f"Updated {count} employee(s)!")
+                self.status_label.setText(f"✅ Changed department for {count} employees")
+
+            run_bulk_write(self, self.current_user, self.db.bulk_update,
+                           [emp['emp_id'] for emp in selected], {'department': dept},
+                           username=self.current_user, on_success=_updated)
 
     def bulk_change_position(self):
         selected = self.get_selected_employees()
@@ -1053,12 +1057,13 @@ class BulkOperationsDialog(SmoothAnimatedDialog):
                                     QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            for emp in selected:
-                self.db.conn.execute("UPDATE employees SET position=? WHERE emp_id=?",
-                    (position, emp['emp_id']))
-            self.db.conn.commit()
-            QMessageBox.information(self, "Success", f"Updated {len(selected)} employee(s)!")
-            self.status_label.setText(f"✅ Changed position for {len(selected)} employees")
+            def _updated(count):
+                QMessageBox.information(self, "Success", f"Updated {count} employee(s)!")
+                self.status_label.setText(f"✅ Changed position for {count} employees")
+
+            run_bulk_write(self, self.current_user, self.db.bulk_update,
+                           [emp['emp_id'] for emp in selected], {'position': position},
+                           username=self.current_user, on_success=_updated)
 
     def bulk_change_agency(self):
         selected = self.get_selected_employees()
@@ -1077,12 +1082,13 @@ class BulkOperationsDialog(SmoothAnimatedDialog):
                                     QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            for emp in selected:
-                self.db.conn.execute("UPDATE employees SET agency=? WHERE emp_id=?",
-                    (agency_value, emp['emp_id']))
-            self.db.conn.commit()
-            QMessageBox.information(self, "Success", f"Updated {len(selected)} employee(s)!")
-            self.status_label.setText(f"✅ Changed agency for {len(selected)} employees")
+            def _updated(count):
+                QMessageBox.information(self, "Success", f"Updated {count} employee(s)!")
+                self.status_label.setText(f"✅ Changed agency for {count} employees")
+
+            run_bulk_write(self, self.current_user, self.db.bulk_update,
+                           [emp['emp_id'] for emp in selected], {'agency': agency_value},
+                           username=self.current_user, on_success=_updated)
 
     def bulk_archive(self):
         selected = self.get_selected_employees()
@@ -1098,10 +1104,13 @@ class BulkOperationsDialog(SmoothAnimatedDialog):
                                     QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            for emp in selected:
-                self.db.archive_employee(emp['emp_id'], "admin", reason)
-            QMessageBox.information(self, "Success", f"Archived {len(selected)} employee(s)!")
-            self.status_label.setText(f"✅ Archived {len(selected)} employees")
+            def _archived(archived):
+                QMessageBox.information(self, "Success", f"Archived {len(archived)} employee(s)!")
+                self.status_label.setText(f"✅ Archived {len(archived)} employees")
+
+            run_bulk_write(self, self.current_user, self.db.bulk_archive,
+                           [emp['emp_id'] for emp in selected], username=self.current_user, reason=reason,
+                           on_success=_archived)
 
     def bulk_export(self):
         selected = self.get_selected_employees()
@@ -13,6 +13,7 @@ from PySide6.QtGui import *
 
 from employee_vault.config import *
 from employee_vault.database import DB
+from employee_vault.heartbeat import FIELD_USERS_ONLINE
 from employee_vault.validators import *
 from employee_vault.utils import *
 from employee_vault.models import *
@@ -23,7 +24,7 @@ from employee_vault.ui.ios_button_styles import apply_ios_style
 
 class SessionMonitorDialog(AnimatedDialogBase):
     """Dialog for monitoring active sessions with idle status and force logout"""
-    def __init__(self, db, parent=None, current_user=None):
+    def __init__(self, db, parent=None, current_user=None, heartbeat=None):
         # v4.4.1: Use fade animation for session monitor
         super().__init__(parent, animation_style="fade")
         self.db = db
@@ -76,6 +77,16 @@ class SessionMonitorDialog(AnimatedDialogBase):
 
         self.load_sessions()
 
+        # Reload when someone logs in or out (reported by the main window's heartbeat)
+        if heartbeat is not None:
+            self._users_online = heartbeat.status.get(FIELD_USERS_ONLINE)
+            heartbeat.subscribe(FIELD_USERS_ONLINE, self._on_users_online, owner=self)
+
+    def _on_users_online(self, count):
+        if count != self._users_online:
+            self._users_online = count
+            self.load_sessions()
+
     def _on_selection_changed(self):
         """Enable/disable force logout button based on selection"""
         selected_rows = self.table.selectionModel().selectedRows()
@@ -19,6 +19,7 @@ from employee_vault.models import *
 from employee_vault.ui.widgets import *
 from employee_vault.ui.widgets import ModernAnimatedButton, AnimatedDialogBase, apply_table_fixes
 from employee_vault.ui.ios_button_styles import apply_ios_style
+from employee_vault.ui.db_actions import on_write_done
 from employee_vault.ui.dialogs.permissions import PermissionEditorDialog
 
 
@@ -543,15 +544,17 @@ class AddEditUserDialog(AnimatedDialogBase):
                                   f"Username '{username}' already exists!\n\nPlease choose a different username.")
                 return
 
-            try:
-                self.db.create_user(username, name, password, role)
+            def _created(_result, error):
+                if error is not None:
+                    QMessageBox.critical(self, "Error", f"Failed to create user: {error}")
+                    return
                 QMessageBox.information(self, "Success",
                                       f"User '{name}' created successfully!\n\n"
                                       f"Username: {username}\n"
                                       f"Role: {role.upper()}")
                 self.accept()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to create user: {e}")
+
+            on_write_done(self.db.create_user(username, name, password, role), self, _created)
         else:
             # Edit existing user
             try:
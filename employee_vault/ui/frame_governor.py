@@ -0,0 +1,473 @@
+"""
+Frame Governor for EmployeeVault
+Keeps decorative animation (glows, rotating borders, particles, animated
+backgrounds, drop shadows) inside a small frame budget.
+
+Decorations register with the governor instead of running unconditionally:
+
+    governor = get_frame_governor()
+    governor.add_animation(self.border_anim)          # looping QAbstractAnimation
+    governor.add_timer(self.glow_timer, 50)           # decorative QTimer, base interval
+    governor.add_shadow(panel, corner_radius=16)      # QGraphicsDropShadowEffect on a card
+    with governor.measure():                          # inside a decorative paintEvent
+        ...
+
+Everything is paused while the application is inactive or its watched
+windows are minimized / not exposed. While running, the governor measures
+the paint time spent in measure() blocks and the event-loop lag; when either
+stays over budget for several windows in a row it steps the effect level down:
+
+    LEVEL_FULL     - everything as designed
+    LEVEL_REDUCED  - decorative timers at half rate, half the particles
+    LEVEL_STATIC   - looping decorations stopped, no particles, animated
+                     backgrounds show a cached frame, drop shadows are
+                     swapped for pre-rendered 9-patch pixmaps
+
+After a long quiet period it steps back up. The AnimationManager
+performance mode sets the floor (power saver never goes above REDUCED,
+reduced motion is always STATIC).
+"""
+
+import time
+import logging
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+from PySide6.QtCore import QAbstractAnimation, QEvent, QObject, QPointF, QRectF, Qt, QTimer, Signal
+from PySide6.QtGui import QColor, QGuiApplication, QPainter, QPainterPath, QPixmap
+from PySide6.QtWidgets import QGraphicsDropShadowEffect, QGraphicsEffect, QWidget
+
+LEVEL_FULL = 0
+LEVEL_REDUCED = 1
+LEVEL_STATIC = 2
+_LEVEL_NAMES = {LEVEL_FULL: "full", LEVEL_REDUCED: "reduced", LEVEL_STATIC: "static"}
+
+# Share of one core decorative painting may use
+DECOR_CPU_BUDGET = 0.03
+# Mean event-loop lateness (ms) that counts as a dropped-frame window
+FRAME_LAG_BUDGET_MS = 25.0
+# Length of one measurement window (ms)
+GOVERNOR_WINDOW_MS = 2000
+# Event-loop lag probe interval (ms)
+LAG_PROBE_INTERVAL_MS = 100
+# Consecutive over-budget windows before stepping down (sustained overrun)
+OVERRUN_WINDOWS_TO_STEP_DOWN = 3
+# Consecutive quiet windows before stepping back up (~1 minute)
+QUIET_WINDOWS_TO_STEP_UP = 30
+
+
+# =============================================================================
+# 9-PATCH SHADOWS
+# =============================================================================
+
+@lru_cache(maxsize=32)
+def shadow_pixmap(blur: int, rgba: tuple, corner_radius: int) -> QPixmap:
+    """
+    Pre-rendered soft shadow of a rounded rect, sized for 9-patch drawing:
+    corners are (blur + corner_radius) square, the 1px middle row/column stretches.
+    """
+    margin = blur + corner_radius
+    size = margin * 2 + 1
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    base = QColor(*rgba)
+    steps = max(blur, 1)
+    # Stacked translucent rounded rects approximate a gaussian falloff
+    for i in range(steps):
+        inset = blur * i / steps
+        color = QColor(base)
+        color.setAlphaF(base.alphaF() * 2.0 / steps * (i + 1) / steps)
+        path = QPainterPath()
+        rect = QRectF(inset, inset, size - 2 * inset, size - 2 * inset)
+        radius = corner_radius + blur - inset
+        path.addRoundedRect(rect, radius, radius)
+        painter.fillPath(path, color)
+    painter.end()
+    return pixmap
+
+
+def draw_nine_patch(painter: QPainter, pixmap: QPixmap, target: QRectF, margin: int):
+    """Draw pixmap into target keeping the margin-sized corners unscaled"""
+    size = pixmap.width()
+    m = float(min(margin, target.width() / 2, target.height() / 2))
+    src_m = float(margin)
+    xs_dst = (target.left(), target.left() + m, target.right() - m, target.right())
+    ys_dst = (target.top(), target.top() + m, target.bottom() - m, target.bottom())
+    xs_src = (0.0, src_m, size - src_m, float(size))
+    for row in range(3):
+        for col in range(3):
+            dst = QRectF(QPointF(xs_dst[col], ys_dst[row]), QPointF(xs_dst[col + 1], ys_dst[row + 1]))
+            src = QRectF(QPointF(xs_src[col], xs_src[row]), QPointF(xs_src[col + 1], xs_src[row + 1]))
+            if dst.width() > 0 and dst.height() > 0:
+                painter.drawPixmap(dst, pixmap, src)
+
+
+class NinePatchShadowEffect(QGraphicsEffect):
+    """
+    Drop shadow drawn from a cached pixmap.
+
+    QGraphicsDropShadowEffect renders the widget offscreen and blurs it on
+    every repaint; this draws a pre-rendered rounded-rect shadow and then the
+    widget directly, which is close enough for cards and panels.
+    """
+
+    def __init__(self, blur: float, offset: QPointF, color: QColor, corner_radius: int = 12, parent=None):
+        super().__init__(parent)
+        self._blur = max(1, int(blur / 2))  # Visible spread of a gaussian is about half its radius
+        self._offset = QPointF(offset)
+        self._rgba = color.getRgb()
+        self._corner_radius = corner_radius
+
+    def boundingRectFor(self, rect: QRectF) -> QRectF:
+        shadow = rect.translated(self._offset).adjusted(-self._blur, -self._blur, self._blur, self._blur)
+        return rect.united(shadow)
+
+    def draw(self, painter: QPainter):
+        rect = self.sourceBoundingRect(Qt.LogicalCoordinates)
+        target = rect.translated(self._offset).adjusted(-self._blur, -self._blur, self._blur, self._blur)
+        pixmap = shadow_pixmap(self._blur, self._rgba, self._corner_radius)
+        draw_nine_patch(painter, pixmap, target, self._blur + self._corner_radius)
+        self.drawSource(painter)
+
+
+# =============================================================================
+# REGISTERED DECORATIONS
+# =============================================================================
+
+class _AnimationEntry:
+    def __init__(self, animation: QAbstractAnimation):
+        self.target = animation
+        self.paused_by_governor = False
+
+    def apply(self, active: bool, level: int):
+        anim = self.target
+        if not active or level >= LEVEL_STATIC:
+            if anim.state() == QAbstractAnimation.Running:
+                anim.pause()
+                self.paused_by_governor = True
+        elif self.paused_by_governor:
+            if anim.state() == QAbstractAnimation.Paused:
+                anim.resume()
+            self.paused_by_governor = False
+
+
+class _TimerEntry:
+    def __init__(self, timer: QTimer, base_interval: int):
+        self.target = timer
+        self.base_interval = base_interval
+        self.stopped_by_governor = False
+
+    def apply(self, active: bool, level: int):
+        timer = self.target
+        if not active or level >= LEVEL_STATIC:
+            if timer.isActive():
+                timer.stop()
+                self.stopped_by_governor = True
+            return
+        interval = self.base_interval * (2 if level == LEVEL_REDUCED else 1)
+        if self.stopped_by_governor:
+            timer.start(interval)
+            self.stopped_by_governor = False
+        elif timer.interval() != interval:
+            timer.setInterval(interval)
+
+
+class _ShadowEntry:
+    def __init__(self, widget: QWidget, effect: QGraphicsDropShadowEffect, corner_radius: int):
+        self.target = widget
+        self.corner_radius = corner_radius
+        self.blur = effect.blurRadius()
+        self.offset = QPointF(effect.offset())
+        self.color = QColor(effect.color())
+        self.installed = effect  # The effect the governor expects on the widget
+
+    def apply(self, active: bool, level: int):
+        widget = self.target
+        current = widget.graphicsEffect()
+        if current is not self.installed:
+            return  # The widget swapped its own effect (e.g. an opacity fade) - leave it alone
+        if level >= LEVEL_STATIC and isinstance(current, QGraphicsDropShadowEffect):
+            self.installed = NinePatchShadowEffect(self.blur, self.offset, self.color, self.corner_radius, widget)
+            widget.setGraphicsEffect(self.installed)
+        elif level < LEVEL_STATIC and isinstance(current, NinePatchShadowEffect):
+            shadow = QGraphicsDropShadowEffect(widget)
+            shadow.setBlurRadius(self.blur)
+            shadow.setOffset(self.offset)
+            shadow.setColor(self.color)
+            self.installed = shadow
+            widget.setGraphicsEffect(shadow)
+
+
+class _CallbackEntry:
+    def __init__(self, owner: QObject, callback: Callable[[bool, int], None]):
+        self.target = owner
+        self.callback = callback
+
+    def apply(self, active: bool, level: int):
+        self.target.objectName()  # Raises RuntimeError once the owner is deleted
+        self.callback(active, level)
+
+
+# =============================================================================
+# GOVERNOR
+# =============================================================================
+
+class FrameGovernor(QObject):
+    """Pauses and steps down decorative effects to keep them within budget"""
+
+    state_changed = Signal(bool, int)  # running, level
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries: List[object] = []
+        self._windows: List[QWidget] = []
+        self._level = LEVEL_FULL
+        self._floor = LEVEL_FULL
+        self._running = True
+
+        self._paint_ms = 0.0
+        self._lag_total = 0.0
+        self._lag_samples = 0
+        self._window_started = time.perf_counter()
+        self._overruns = 0
+        self._quiet = 0
+        self.last_paint_share = 0.0
+        self.last_lag_ms = 0.0
+
+        self._window_timer = QTimer(self)
+        self._window_timer.timeout.connect(self._close_window)
+        self._probe_timer = QTimer(self)
+        self._probe_timer.setTimerType(Qt.PreciseTimer)
+        self._probe_timer.timeout.connect(self._probe)
+        self._last_probe = 0.0
+
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.applicationStateChanged.connect(lambda _state: self._update_running())
+        self._connect_animation_manager()
+        self._update_running()
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def add_animation(self, animation: QAbstractAnimation):
+        """Govern a looping decorative animation"""
+        self._add(_AnimationEntry(animation))
+
+    def add_timer(self, timer: QTimer, base_interval: int):
+        """Govern a decorative repaint timer running at base_interval ms"""
+        self._add(_TimerEntry(timer, base_interval))
+
+    def add_shadow(self, widget: QWidget, corner_radius: int = 12):
+        """Let the widget's QGraphicsDropShadowEffect be swapped for a 9-patch shadow at LEVEL_STATIC"""
+        effect = widget.graphicsEffect()
+        if isinstance(effect, QGraphicsDropShadowEffect):
+            self._add(_ShadowEntry(widget, effect, corner_radius))
+
+    def add_callback(self, owner: QObject, callback: Callable[[bool, int], None]):
+        """Call callback(running, level) now and whenever the governor state changes"""
+        self._add(_CallbackEntry(owner, callback))
+
+    def watch_window(self, window: QWidget):
+        """Pause decorations while this top-level window is minimized or hidden"""
+        if window not in self._windows:
+            self._windows.append(window)
+            window.installEventFilter(self)
+            self._update_running()
+
+    def _add(self, entry):
+        self._entries.append(entry)
+        self._apply_entry(entry)
+        self._update_measuring()
+
+    # ------------------------------------------------------------------
+    # Queries for decorations
+    # ------------------------------------------------------------------
+
+    @property
+    def level(self) -> int:
+        return self._level
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def allows_motion(self) -> bool:
+        """True when looping decorations may run"""
+        return self._running and self._level < LEVEL_STATIC
+
+    def frame_interval(self, base_interval: int) -> int:
+        """Timer interval to use for a decoration designed for base_interval ms"""
+        return base_interval * (2 if self._level == LEVEL_REDUCED else 1)
+
+    def particle_count(self, requested: int) -> int:
+        """Number of particles a one-off effect may use"""
+        if not self.allows_motion():
+            return 0
+        return requested // 2 if self._level == LEVEL_REDUCED else requested
+
+    @contextmanager
+    def measure(self):
+        """Account the enclosed decorative painting against the budget"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._paint_ms += (time.perf_counter() - started) * 1000
+
+    def status(self) -> dict:
+        """Snapshot for diagnostics screens"""
+        return {
+            'running': self._running,
+            'level': _LEVEL_NAMES[self._level],
+            'floor': _LEVEL_NAMES[self._floor],
+            'paint_share': round(self.last_paint_share, 4),
+            'lag_ms': round(self.last_lag_ms, 1),
+            'decorations': len(self._entries),
+        }
+
+    # ------------------------------------------------------------------
+    # Visibility
+    # ------------------------------------------------------------------
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.WindowStateChange, QEvent.Show, QEvent.Hide):
+            QTimer.singleShot(0, self._update_running)
+            if event.type() == QEvent.Show and isinstance(obj, QWidget) and obj.windowHandle() is not None:
+                obj.windowHandle().installEventFilter(self)
+        elif event.type() == QEvent.Expose:
+            QTimer.singleShot(0, self._update_running)
+        return False
+
+    def _window_visible(self, window: QWidget) -> bool:
+        if not window.isVisible() or window.isMinimized():
+            return False
+        handle = window.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def _update_running(self):
+        app = QGuiApplication.instance()
+        active = app is None or app.applicationState() == Qt.ApplicationActive
+        windows = []
+        for window in list(self._windows):
+            try:
+                windows.append(self._window_visible(window))
+            except RuntimeError:
+                self._windows.remove(window)
+        running = active and (not self._windows or any(windows))
+        if running != self._running:
+            self._running = running
+            logging.debug(f"Frame governor: decorations {'resumed' if running else 'paused'}")
+            self._apply_all()
+
+    # ------------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------------
+
+    def _update_measuring(self):
+        measuring = self._running and bool(self._entries)
+        if measuring and not self._window_timer.isActive():
+            self._reset_window()
+            self._window_timer.start(GOVERNOR_WINDOW_MS)
+            self._last_probe = time.perf_counter()
+            self._probe_timer.start(LAG_PROBE_INTERVAL_MS)
+        elif not measuring and self._window_timer.isActive():
+            self._window_timer.stop()
+            self._probe_timer.stop()
+
+    def _reset_window(self):
+        self._paint_ms = 0.0
+        self._lag_total = 0.0
+        self._lag_samples = 0
+        self._window_started = time.perf_counter()
+
+    def _probe(self):
+        now = time.perf_counter()
+        self._lag_total += max(0.0, (now - self._last_probe) * 1000 - LAG_PROBE_INTERVAL_MS)
+        self._lag_samples += 1
+        self._last_probe = now
+
+    def _close_window(self):
+        elapsed_ms = (time.perf_counter() - self._window_started) * 1000
+        self.last_paint_share = self._paint_ms / elapsed_ms if elapsed_ms > 0 else 0.0
+        self.last_lag_ms = self._lag_total / self._lag_samples if self._lag_samples else 0.0
+        self._reset_window()
+        self._evaluate(self.last_paint_share, self.last_lag_ms)
+
+    def _evaluate(self, paint_share: float, lag_ms: float):
+        """Feed one measurement window into the step-down / step-up hysteresis"""
+        if paint_share > DECOR_CPU_BUDGET or lag_ms > FRAME_LAG_BUDGET_MS:
+            self._quiet = 0
+            self._overruns += 1
+            if self._overruns >= OVERRUN_WINDOWS_TO_STEP_DOWN and self._level < LEVEL_STATIC:
+                self._overruns = 0
+                logging.info(f"Frame governor: over budget (paint {paint_share:.1%} of a core, "
+                             f"lag {lag_ms:.0f}ms) - stepping effects down")
+                self._set_level(self._level + 1)
+        else:
+            self._overruns = 0
+            if paint_share < DECOR_CPU_BUDGET / 2 and lag_ms < FRAME_LAG_BUDGET_MS / 2:
+                self._quiet += 1
+                if self._quiet >= QUIET_WINDOWS_TO_STEP_UP and self._level > self._floor:
+                    self._quiet = 0
+                    self._set_level(self._level - 1)
+
+    # ------------------------------------------------------------------
+    # Levels
+    # ------------------------------------------------------------------
+
+    def _connect_animation_manager(self):
+        try:
+            from employee_vault.animation_manager import get_animation_manager
+            manager = get_animation_manager()
+        except Exception as e:
+            logging.debug(f"Frame governor without animation manager: {e}")
+            return
+        manager.performance_mode_changed.connect(lambda _mode: self._update_floor(manager))
+        self._update_floor(manager)
+
+    def _update_floor(self, manager):
+        if not manager.should_animate("micro"):
+            floor = LEVEL_STATIC
+        elif manager.performance_mode == manager.POWER_SAVER:
+            floor = LEVEL_REDUCED
+        else:
+            floor = LEVEL_FULL
+        self._floor = floor
+        self._set_level(max(self._level, floor) if floor > LEVEL_FULL else floor)
+
+    def _set_level(self, level: int):
+        level = max(self._floor, min(LEVEL_STATIC, level))
+        if level == self._level:
+            return
+        self._level = level
+        logging.info(f"Frame governor: effect level {_LEVEL_NAMES[level]}")
+        self._apply_all()
+
+    def _apply_entry(self, entry) -> bool:
+        try:
+            entry.apply(self._running, self._level)
+            return True
+        except RuntimeError:
+            return False  # Underlying Qt object was deleted
+
+    def _apply_all(self):
+        self._entries = [entry for entry in self._entries if self._apply_entry(entry)]
+        self._update_measuring()
+        self.state_changed.emit(self._running, self._level)
+
+
+_frame_governor: Optional[FrameGovernor] = None
+
+
+def get_frame_governor() -> FrameGovernor:
+    """Get or create the global frame governor (requires a QApplication)"""
+    global _frame_governor
+    if _frame_governor is None:
+        _frame_governor = FrameGovernor()
+    return _frame_governor
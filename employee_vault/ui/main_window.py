@@ -21,14 +21,14 @@ from PySide6.QtGui import *
 
 from employee_vault.config import *
 from employee_vault.database import DB
-from employee_vault.utils import remove_background
+from employee_vault.utils import remove_background, get_photo_derivative
+from employee_vault.alert_engine import AlertEngine, RULE_CONTRACT_EXPIRED, RULE_CONTRACT_EXPIRING
+from employee_vault.heartbeat import HeartbeatService, FIELD_DATA_REVISION, FIELD_SETTINGS_REVISION, FIELD_FORCE_CLOSE
+from employee_vault import metrics
 from employee_vault.ui.pages.dashboard import EnhancedDashboardPage
 from employee_vault.ui.pages.employees import EmployeesPage
 from employee_vault.ui.dialogs.employee_form import EmployeeForm
-from employee_vault.ui.dialogs.user_management import UserManagementDialog
-from employee_vault.ui.dialogs.bulk_operations import BulkOperationsDialog
-from employee_vault.ui.dialogs.id_card import IDCardGeneratorBackenderator
-from employee_vault.ui.dialogs.print_dialogs import BatchPrintDialog, PrintSystemDialog
+# Other dialogs are imported where they are opened (see employee_vault.startup for idle preloading)
 
 
 # Phase 3.1: DatabaseInitWorker - Async initial data loading
@@ -50,17 +50,15 @@ class DatabaseInitWorker(QThread):
             logging.error(f"Database init worker error: {e}")
             # Emit empty data on error
             self.data_ready.emit({'employees': [], 'db_mtime': None})
-from employee_vault.ui.dialogs.letter_generation import LetterGenerationDialog
-from employee_vault.ui.dialogs.store_management import StoreManagementDialog
-from employee_vault.ui.dialogs.permissions import PermissionEditorDialog
-from employee_vault.ui.dialogs.session_monitor import SessionMonitorDialog
 from employee_vault.ui.dialogs.login import LoginDialog
 from employee_vault.ui.widgets import *
 from employee_vault.ui.modern_ui_helper import show_success_toast, show_error_toast, show_warning_toast, show_info_toast
+from employee_vault.ui.db_actions import run_bulk_write, on_write_done, show_restore_conflicts
 from employee_vault.ui.widgets import disable_cursor_changes
 from employee_vault.ui.widgets import ModernAnimatedButton, PulseButton
-from employee_vault.ui.widgets import AnimatedGradientBackground
+from employee_vault.ui.widgets import AnimatedGradientBackground, MetricsOverlay
 from employee_vault.ui.widgets import NotificationCenter, NotificationBell, FloatingNotificationPanel
+from employee_vault.ui.frame_governor import get_frame_governor
 from employee_vault.ui.widgets import get_thumbnail_cache
 from employee_vault.ui.ios_button_styles import apply_ios_style
 from employee_vault.ui.widgets.page_transitions import PageTransitionManager
@@ -76,36 +74,6 @@ except ImportError:
     create_celebration_effect = None
 
 
-# ============================================================================
-# BACKGROUND WORKER FOR DATABASE CHECKPOINT (v5.3)
-# ============================================================================
-class CheckpointWorker(QThread):
-    """Background thread worker for database checkpoint operations.
-    Prevents UI freezes by running checkpoint in separate thread."""
-    finished = Signal(bool)  # success
-    error = Signal(str)  # error message
-    
-    def __init__(self, db, parent=None):
-        super().__init__(parent)
-        self.db = db
-        self._running = False
-    
-    def run(self):
-        if self._running:
-            return  # Prevent overlapping checkpoint operations
-        
-        self._running = True
-        try:
-            if self.db:
-                self.db.checkpoint_database()
-                self.finished.emit(True)
-        except Exception as e:
-            logging.warning(f"Background checkpoint failed: {e}")
-            self.error.emit(str(e))
-            self.finished.emit(False)
-        finally:
-            self._running = False
-
 class MainWindow(QMainWindow):
     def __init__(self, db, username, user_row, icon=None):
         super().__init__(); self.setWindowTitle(f"{APP_TITLE} — {user_row['name']}")
@@ -157,23 +125,17 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logging.warning(f"Could not create session: {e}")
 
-        # v2.0: Setup session keepalive timer
-        self.session_timer = QTimer(self)
-        self.session_timer.timeout.connect(lambda: self.db.update_session_activity(self.current_user))
-        self.session_timer.start(60000)  # Update every minute
-
-        # v5.2: Periodic checkpoint timer for multi-PC sync
-        # Forces WAL checkpoint every 30 seconds to ensure changes are visible across PCs
-        self.checkpoint_timer = QTimer(self)
-        self.checkpoint_timer.timeout.connect(self._periodic_checkpoint)
-        self.checkpoint_timer.start(30000)  # Checkpoint every 30 seconds
+        # Control-plane heartbeat: one probe per tick replaces the separate keepalive,
+        # auto-refresh, force-close and idle timers. It renews the session lease, and
+        # each tick drives the idle check. (WAL checkpoints run in DB.checkpointer.)
+        self.heartbeat = HeartbeatService(self.db, self.current_user, self)
+        self.heartbeat.ticked.connect(self._on_heartbeat_tick)
+        self._data_revision = None
+        self._session_locked = False
 
         # WEEK 2 FEATURE #1: Idle timeout (auto-lock after inactivity)
         self.idle_timeout_minutes = 30  # Configurable: 30 minutes default
         self.last_activity_time = datetime.now()
-        self.idle_timer = QTimer(self)
-        self.idle_timer.timeout.connect(self._check_idle_timeout)
-        self.idle_timer.start(60000)  # Check every minute
 
         # Install event filter to track user activity
         self.installEventFilter(self)
@@ -197,6 +159,7 @@ class MainWindow(QMainWindow):
 
         # Create the form first
         self.emp_form = EmployeeForm(self.db, self.current_user, self._on_form_saved)
+        self.emp_form.photo_saved.connect(self._on_employee_photo_saved)
 
         # Create a scroll area and put the form inside it
         self.form_scroll_area = QScrollArea()
@@ -507,6 +470,10 @@ class MainWindow(QMainWindow):
         self._glow_animation.setEasingCurve(QEasingCurve.InOutSine)
         self._glow_animation.setLoopCount(-1)
         self._glow_animation.start()
+        # Decorative loop: paused while minimized/inactive and under frame budget pressure
+        frame_governor = get_frame_governor()
+        frame_governor.watch_window(self)
+        frame_governor.add_animation(self._glow_animation)
         center_layout.addWidget(self.company_label, 0, Qt.AlignVCenter)
 
         top_header_layout.addWidget(center_widget, 0, Qt.AlignCenter)
@@ -633,9 +600,10 @@ class MainWindow(QMainWindow):
         pm=QPixmap(64,64); pm.fill(Qt.transparent); p=QPainter(pm); p.setRenderHint(QPainter.Antialiasing,True); p.setBrush(QColor("#3d6cff")); p.setPen(Qt.NoPen); p.drawEllipse(0,0,64,64); p.end()
         self.tray=QSystemTrayIcon(QIcon(pm), self); self.tray.setToolTip("Cuddly Employees Information"); self.tray.setVisible(True)
 
-        # Timers - v2.0 FIXED: 3 seconds for better multi-user sync
-        self.timer=QTimer(self); self.timer.setInterval(3000); self.timer.timeout.connect(self._auto_refresh); self.timer.start()
-        self.contract_timer=QTimer(self); self.contract_timer.setInterval(30*60*1000); self.contract_timer.timeout.connect(self._notify_contracts); self.contract_timer.start()
+        # Reload when another user changes employee data (replaces the 3s mtime poll)
+        self.heartbeat.subscribe(FIELD_DATA_REVISION, self._on_data_revision)
+        # Settings snapshot reloads only when some client wrote a setting
+        self.heartbeat.subscribe(FIELD_SETTINGS_REVISION, self.db.settings.refresh)
 
         # QUICK WIN #3: Setup keyboard shortcuts
         self._setup_keyboard_shortcuts()
@@ -649,6 +617,9 @@ class MainWindow(QMainWindow):
         # Initialize sidebar in collapsed state
         self._initialize_sidebar_collapsed()
 
+        # First probe records the baseline data revision before the initial load
+        self.heartbeat.start()
+
         # Phase 3.1: Load data asynchronously after window is shown (100ms delay)
         QTimer.singleShot(100, self._load_initial_data)
 
@@ -665,10 +636,12 @@ class MainWindow(QMainWindow):
         self._db_mtime = data['db_mtime']
 
         # Now populate UI with loaded data
-        self.dashboard.refresh(self.employees)
-        self.employees_page.set_data(self.employees)
+        with metrics.timer("ui.initial_populate"):
+            self.dashboard.refresh(self.employees)
+            self.employees_page.set_data(self.employees)
+            self.alert_engine.set_employees(self.employees)
 
-        print(f"[PERF] Initial data loaded: {len(self.employees)} employees")
+        logging.info(f"Initial data loaded: {len(self.employees)} employees")
 
     def _initialize_sidebar_collapsed(self):
         """Initialize sidebar sections to collapsed/icon-only mode on startup"""
@@ -806,8 +779,34 @@ class MainWindow(QMainWindow):
         self.shortcut_dashboard = QShortcut(QKeySequence("Ctrl+D"), self)
         self.shortcut_dashboard.activated.connect(lambda: self._show_page(self.dashboard))
 
+        # Ctrl+Shift+M - Performance diagnostics overlay (admins only)
+        if self.user_row.get('role') == 'admin':
+            self.shortcut_metrics = QShortcut(QKeySequence("Ctrl+Shift+M"), self)
+            self.shortcut_metrics.activated.connect(self._toggle_metrics_overlay)
+
+    def _toggle_metrics_overlay(self):
+        """Show/hide the admin performance overlay (created on first use)"""
+        if getattr(self, 'metrics_overlay', None) is None:
+            self.metrics_overlay = MetricsOverlay(self, status_provider=self._diagnostics_status)
+        self.metrics_overlay.toggle()
+
+    def _diagnostics_status(self) -> str:
+        """Extra header text for the performance overlay"""
+        parts = [f"animations: {get_frame_governor().status()['level']}", self.heartbeat.describe()]
+        replica = getattr(self.db, 'replica', None)
+        if replica is not None:
+            state = replica.status()
+            age = state['age_seconds']
+            parts.append(f"replica: {'fresh' if state['fresh'] else 'stale'}"
+                         + (f" ({age:.0f}s)" if age is not None else ""))
+        return " · ".join(parts)
+
     def _setup_notification_center(self):
         """v5.3: Setup notification center for contract expiry alerts"""
+        # Shared alert engine - re-evaluates on data reloads and at midnight only
+        self.alert_engine = AlertEngine(self)
+        self.alert_engine.alerts_changed.connect(self._on_alerts_changed)
+
         # Create notification center (hidden by default)
         self.notification_center = NotificationCenter(self.db, self)
         
@@ -818,16 +817,8 @@ class MainWindow(QMainWindow):
         # Connect notification center signals
         self.notification_center.notification_clicked.connect(self._handle_notification_click)
         
-        # Start monitoring
-        self.notification_center.start_monitoring()
-        
-        # Sync badge count
-        QTimer.singleShot(5000, self._update_notification_badge)
-        
-        # v5.4: Start force close monitor (checks every 10 seconds if admin requested shutdown)
-        self.force_close_timer = QTimer(self)
-        self.force_close_timer.timeout.connect(self._check_force_close)
-        self.force_close_timer.start(10000)  # Check every 10 seconds
+        # v5.4: Force close monitor - the heartbeat reports when an admin requests shutdown
+        self.heartbeat.subscribe(FIELD_FORCE_CLOSE, self._on_force_close_requested)
         
     def _toggle_notification_panel(self):
         """Toggle the notification panel visibility"""
@@ -863,18 +854,18 @@ class MainWindow(QMainWindow):
             else:
                 show_info_toast(self, "Viewing contract expiry alerts")
 
-    def _check_force_close(self):
-        """v5.4: Check if admin has requested force close for all users"""
+    def _on_force_close_requested(self, force_close_data):
+        """v5.4: Heartbeat reported the force close flag (dict while an admin requested it, else None)"""
         try:
-            force_close_data = self.db.check_force_close()
-            if force_close_data:
+            if force_close_data and not getattr(self, '_force_close_shown', False):
                 # Don't close the admin who triggered it
                 requested_by = force_close_data.get('requested_by', '')
                 if requested_by == self.current_user and self.user_permissions.get('user_management'):
                     return  # Admin who triggered it stays open
                 
-                # Stop the timer to prevent multiple dialogs
-                self.force_close_timer.stop()
+                # Prevent multiple dialogs
+                self._force_close_shown = True
+                self.heartbeat.stop()
                 
                 # Show message to user
                 message = force_close_data.get('message', 'Application is being updated. Please restart.')
@@ -914,12 +905,10 @@ class MainWindow(QMainWindow):
                     logging.warning(f"Could not auto-save draft: {e}")
             
             # Clean up session
-            if hasattr(self, 'session_timer'):
-                self.session_timer.stop()
-            if hasattr(self, 'force_close_timer'):
-                self.force_close_timer.stop()
-            if hasattr(self, 'notification_center'):
-                self.notification_center.stop_monitoring()
+            if hasattr(self, 'heartbeat'):
+                self.heartbeat.stop()
+            if hasattr(self, 'alert_engine'):
+                self.alert_engine.stop()
             
             # Remove session from database
             self.db.remove_session(self.current_user)
@@ -997,6 +986,7 @@ class MainWindow(QMainWindow):
         menu.addAction("🆔 ID Card Generator", self._show_id_card_generator)
         menu.addSeparator()
         menu.addAction("📥 Import from Excel/CSV", self._show_import_dialog)
+        menu.addAction("📥 Import from JSON", self._import_json)
         menu.addAction("📦 Batch Photo Upload", self._show_batch_photo_upload)
         menu.addAction("🔧 Quick Fix Actions", self._show_quick_fix_actions)
         menu.addSeparator()
@@ -1048,7 +1038,7 @@ class MainWindow(QMainWindow):
         
         img=QLabel()
         if photo and os.path.exists(photo):
-            img.setPixmap(QPixmap(photo).scaled(60, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            img.setPixmap(QPixmap(get_photo_derivative(photo, 60)).scaled(60, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation))
         else:
             img.setText("📷")
         header.addWidget(img); info=QVBoxLayout(); status="🟢 Active" if not emp.get("resign_date") else "🔴 Resigned"; info.addWidget(QLabel(f"<b>{emp.get('name','?')}</b> — {status}")); info.addWidget(QLabel(f"{emp.get('emp_id','?')} • {emp.get('position','N/A')}")); header.addLayout(info,1); v.addLayout(header)
@@ -1274,20 +1264,8 @@ class MainWindow(QMainWindow):
             active_employees = [e for e in self.employees if not e.get('resign_date')]
             self.employees_page.set_data(active_employees)
         elif filter_type == "expiring":
-            # Filter to employees with contracts expiring within 30 days
-            from datetime import datetime, timedelta
-            today = datetime.now().date()
-            expiring_employees = []
-            for emp in self.employees:
-                if emp.get('contract_expiry'):
-                    try:
-                        expiry_date = datetime.strptime(emp['contract_expiry'], "%m-%d-%Y").date()
-                        days = (expiry_date - today).days
-                        if 0 <= days <= 30:
-                            expiring_employees.append(emp)
-                    except ValueError:
-                        # Invalid date format, skip this employee
-                        pass
+            # Filter to employees with contracts expiring within 30 days (from the alert engine)
+            expiring_employees = [a['employee'] for a in self.alert_engine.by_rule(RULE_CONTRACT_EXPIRING)]
             self.employees_page.set_data(expiring_employees)
 
     def _handle_dashboard_open_employee(self, emp_id: str):
@@ -1347,11 +1325,14 @@ class MainWindow(QMainWindow):
         if not ok:
             return
 
-        # Archive employees instead of deleting
-        for row in rows:
-            emp_id = row["emp_id"]
-            self.db.archive_employee(emp_id, self.current_user, reason or "No reason specified")
+        # Archive employees instead of deleting (one set-based transaction on the writer thread)
+        run_bulk_write(self, self.current_user, self.db.bulk_archive, [row["emp_id"] for row in rows],
+                       username=self.current_user, reason=reason or "No reason specified",
+                       on_success=self._on_employees_archived)
 
+    def _on_employees_archived(self, archived):
+        """Move the archived employees' files and photos aside once the archive has committed"""
+        for emp_id in archived:
             # Move file folders to archive
             src_folder = os.path.join(FILES_DIR, emp_id)
             if os.path.isdir(src_folder):
@@ -1375,7 +1356,7 @@ class MainWindow(QMainWindow):
                     pass
 
         show_success_toast(
-            self, f"{len(rows)} employee(s) have been archived.\n\n"
+            self, f"{len(archived)} employee(s) have been archived.\n\n"
             "You can restore them from the Archive Manager."
         )
 
@@ -1396,19 +1377,17 @@ class MainWindow(QMainWindow):
             # On cancel/ESC, go to Dashboard instead of employees page
             if switch_page: self._show_page(self.dashboard)
 
+    def _on_employee_photo_saved(self, emp_id, photo_path):
+        """A saved employee's photo finished storing in the background"""
+        self.employees_page.model.reload_photo(emp_id)
+
     def _refresh_all(self):
-        """Refresh all data - checkpoint WAL first to get changes from all PCs"""
-        try:
-            # Step 1: Checkpoint to merge any pending WAL changes from all users
-            self.db.checkpoint_database()
-            logging.info("Checkpoint completed before refresh")
-        except Exception as e:
-            logging.warning(f"Checkpoint before refresh failed: {e}")
-        
-        # Step 2: Reload fresh data from the merged database
-        self.employees = self.db.all_employees()
-        self.dashboard.refresh(self.employees)
-        self.employees_page.set_data(self.employees)
+        """Refresh all data (WAL readers already see every commit - no checkpoint needed first)"""
+        with metrics.timer("ui.refresh_all"):
+            self.employees = self.db.all_employees()
+            self.dashboard.refresh(self.employees)
+            self.employees_page.set_data(self.employees)
+            self.alert_engine.set_employees(self.employees)
         logging.info(f"Data refreshed: {len(self.employees)} employees loaded")
 
     def _show_enhanced_search(self):
@@ -1477,6 +1456,7 @@ class MainWindow(QMainWindow):
 
     def _show_id_card_generator(self):
         """Open ID card generator"""
+        from employee_vault.ui.dialogs.id_card import IDCardGeneratorBackenderator
         dlg = IDCardGeneratorBackenderator(self, self.db)
         dlg.exec()
 
@@ -1497,6 +1477,64 @@ class MainWindow(QMainWindow):
             self._refresh_all()
             show_success_toast(self, "Employees imported successfully!")
 
+    def _import_json(self):
+        """Import employees from a JSON export, skipping rows with duplicate government IDs"""
+        path, _ = QFileDialog.getOpenFileName(self, "Import Employees", "", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                employees = json.load(f)
+        except (OSError, ValueError) as e:
+            show_error_toast(self, f"Failed to read file:\n{e}")
+            return
+        if not isinstance(employees, list) or not all(isinstance(emp, dict) for emp in employees):
+            show_warning_toast(self, "No valid employee data found in file")
+            return
+
+        reply = QMessageBox.question(
+            self, "Import Employees",
+            f"Import {len(employees)} employee record(s) from {os.path.basename(path)}.\n\n"
+            "Update employees whose ID already exists?\n"
+            "(No skips them.)",
+            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel,
+            QMessageBox.No
+        )
+        if reply == QMessageBox.Cancel:
+            return
+
+        try:
+            future = self.db.import_employees(employees, username=self.current_user,
+                                              update_existing=reply == QMessageBox.Yes)
+        except PermissionError as e:
+            show_error_toast(self, str(e))
+            return
+        on_write_done(future, self, self._on_json_imported)
+
+    def _on_json_imported(self, result, error):
+        """Report a JSON import once the writer thread has committed (or rolled back) it"""
+        if isinstance(error, sqlite3.IntegrityError):
+            # Another client saved a conflicting government ID during the import
+            show_warning_toast(self, "Import cancelled: a government ID was assigned to another "
+                                     "employee meanwhile.\n\nNothing was imported. Please try again.")
+            return
+        if error is not None:
+            logging.error(f"JSON import error: {error}")
+            show_error_toast(self, f"Import failed, nothing was imported:\n{error}")
+            return
+
+        for c in result['conflicts']:
+            holder = c['emp_id'] or f"row {c.get('other_row', 0) + 1}"
+            logging.warning(f"Import skipped row {c['row'] + 1}: {c['label']} {c['value']} already used by {holder}")
+        message = (f"Import complete!\n\n🆕 Added: {result['added']}\n🔄 Updated: {result['updated']}\n"
+                   f"⏭️ Skipped: {result['skipped']}")
+        if result['conflicts']:
+            show_warning_toast(self, f"{message}\n\n{len(result['conflicts'])} row(s) had a government ID "
+                                     "already assigned to another employee")
+        else:
+            show_success_toast(self, message)
+        self._refresh_all()
+
     def _show_quick_fix_actions(self):
         """Open quick fix actions dialog"""
         from employee_vault.ui.dialogs.quick_fix_actions import QuickFixActionsDialog
@@ -1507,11 +1545,13 @@ class MainWindow(QMainWindow):
 
     def _show_print_system(self):
         """Open print system dialog"""
+        from employee_vault.ui.dialogs.print_dialogs import PrintSystemDialog
         dlg = PrintSystemDialog(self, self.db, self.employees)
         dlg.exec()
 
     def _show_bulk_operations(self):
         """Open bulk operations dialog"""
+        from employee_vault.ui.dialogs.bulk_operations import BulkOperationsDialog
         dlg = BulkOperationsDialog(self, self.db, self.employees)
         if dlg.exec() == QDialog.Accepted:
             self._refresh_all()
@@ -1842,21 +1882,26 @@ class MainWindow(QMainWindow):
             backup_folder = os.path.join(folder, f"employee_vault_backup_{timestamp}")
             os.makedirs(backup_folder, exist_ok=True)
 
-            # Copy database files
-            files_copied = 0
-            for fn in [DB_FILE, DB_FILE + "-wal", DB_FILE + "-shm"]:
-                if os.path.exists(fn):
-                    dest = os.path.join(backup_folder, os.path.basename(fn))
-                    shutil.copy2(fn, dest)
-                    files_copied += 1
-
-            # v5.2: Backup employee files (new structure includes photos in subfolders)
-            if os.path.exists(FILES_DIR):
-                shutil.copytree(FILES_DIR, os.path.join(backup_folder, "employee_files"))
-            
-            # Also backup legacy photos folder if it exists (for backwards compatibility)
-            if os.path.exists(PHOTOS_DIR):
-                shutil.copytree(PHOTOS_DIR, os.path.join(backup_folder, "employee_photos"))
+            with metrics.timer("backup.manual", detail=backup_folder):
+                # Copy database files
+                files_copied = 0
+                for fn in [DB_FILE, DB_FILE + "-wal", DB_FILE + "-shm"]:
+                    if os.path.exists(fn):
+                        dest = os.path.join(backup_folder, os.path.basename(fn))
+                        shutil.copy2(fn, dest)
+                        files_copied += 1
+
+                # Yearly audit archives (the only copy of history moved out of the database)
+                from employee_vault.database.tiering import ARCHIVE_FOLDER, backup_archives
+                files_copied += len(backup_archives(DB_FILE, os.path.join(backup_folder, ARCHIVE_FOLDER)))
+
+                # v5.2: Backup employee files (new structure includes photos in subfolders)
+                if os.path.exists(FILES_DIR):
+                    shutil.copytree(FILES_DIR, os.path.join(backup_folder, "employee_files"))
+
+                # Also backup legacy photos folder if it exists (for backwards compatibility)
+                if os.path.exists(PHOTOS_DIR):
+                    shutil.copytree(PHOTOS_DIR, os.path.join(backup_folder, "employee_photos"))
 
             # Create backup info file
             info = {
@@ -1926,8 +1971,7 @@ class MainWindow(QMainWindow):
         wheel_guard = WheelGuard(dlg)
 
         try:
-            config_str = self.db.get_setting('backup_config', '{}')
-            config = json.loads(config_str)
+            config = self.db.settings.get_json('backup_config', {})  # Parsed once per settings revision
         except Exception:
             config = {}  # Use defaults if loading fails
 
@@ -2280,21 +2324,17 @@ class MainWindow(QMainWindow):
         # Load archived employees
         self._load_archived(table, info_label, restore_btn, delete_btn)
 
-        # Create an auto-refresh timer that is a child of the dialog
-        # This ensures the timer is destroyed when the dialog is closed.
-        refresh_timer = QTimer(dlg)
-        refresh_timer.setInterval(5000) # 15 seconds (or your preference)
+        # Reload when another user archives or restores someone (the data revision
+        # covers archived_employees). The subscription ends with the dialog.
+        shown_revision = self.heartbeat.status.get(FIELD_DATA_REVISION)
 
-        # Connect the timer's timeout signal to the _load_archived function
-        # We use a lambda to pass all the required arguments.
-        refresh_timer.timeout.connect(lambda: self._load_archived(
-            table, info_label, restore_btn, delete_btn
-        ))
-
-        # Start the timer
-        refresh_timer.start()
+        def reload_if_changed(revision):
+            nonlocal shown_revision
+            if revision != shown_revision:
+                shown_revision = revision
+                self._load_archived(table, info_label, restore_btn, delete_btn)
 
-        # --- END OF ADDED CODE ---
+        self.heartbeat.subscribe(FIELD_DATA_REVISION, reload_if_changed, owner=dlg)
 
         # This line should already be here:
         dlg.exec()
@@ -2347,7 +2387,18 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            if self.db.restore_employee(emp_id, self.current_user):
+            # An active employee may have been given one of its government IDs since
+            conflicts = self.db.find_restore_conflicts(emp_id)
+            if conflicts:
+                show_restore_conflicts(self, name, emp_id, conflicts)
+                return
+            try:
+                restored = self.db.restore_employee(emp_id, self.current_user)
+            except sqlite3.IntegrityError:
+                # Taken by another client between the check and the restore
+                show_restore_conflicts(self, name, emp_id, self.db.find_restore_conflicts(emp_id))
+                return
+            if restored:
                 # Restore files
                 archive_folder = os.path.join(FILES_DIR, "_archived", emp_id)
                 if os.path.isdir(archive_folder):
@@ -2437,6 +2488,7 @@ class MainWindow(QMainWindow):
 
     def _show_user_management(self):
         """Show user management dialog"""
+        from employee_vault.ui.dialogs.user_management import UserManagementDialog
         dlg = UserManagementDialog(self.db, self.current_user, self)
         dlg.exec()
 
@@ -2450,16 +2502,19 @@ class MainWindow(QMainWindow):
 
     def _show_letter_generation(self):
         """Show letter generation dialog"""
+        from employee_vault.ui.dialogs.letter_generation import LetterGenerationDialog
         dialog = LetterGenerationDialog(self.db, self.current_user, parent=self)
         dialog.exec()
 
     def _show_session_monitor(self):
         """Show active sessions monitor"""
-        dialog = SessionMonitorDialog(self.db, parent=self)
+        from employee_vault.ui.dialogs.session_monitor import SessionMonitorDialog
+        dialog = SessionMonitorDialog(self.db, parent=self, heartbeat=self.heartbeat)
         dialog.exec()
 
     def _show_store_management(self):
         """Show store management dialog"""
+        from employee_vault.ui.dialogs.store_management import StoreManagementDialog
         dialog = StoreManagementDialog(self.db, parent=self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             # Refresh might be needed if stores are used elsewhere
@@ -2480,32 +2535,51 @@ class MainWindow(QMainWindow):
         filter_box = QGroupBox("Filters")
         filter_layout = QHBoxLayout(filter_box)
 
-        # Username filter
+        # Username filter (distinct values come from an index skip-scan, not a row sample)
         filter_layout.addWidget(QLabel("Username:"))
         username_filter = NeumorphicGradientComboBox("All Users")
         username_filter.setMinimumHeight(70)
         username_filter.addItem("All Users")
-        # Get unique usernames from audit log
-        users = set()
-        for log in self.db.get_audit_log(limit=1000):
-            users.add(log['username'])
-        for user in sorted(users):
-            username_filter.addItem(user)
+        username_filter.addItems(self.db.get_audit_distinct('username'))
         filter_layout.addWidget(username_filter)
 
         # Action filter
         filter_layout.addWidget(QLabel("Action:"))
         action_filter = NeumorphicGradientComboBox("All Actions")
         action_filter.setMinimumHeight(70)
-        action_filter.addItems(["All Actions", "LOGIN", "LOGOUT", "INSERT", "UPDATE", "DELETE"])
+        action_filter.addItem("All Actions")
+        action_filter.addItems(self.db.get_audit_distinct('action'))
         filter_layout.addWidget(action_filter)
 
+        # Table filter
+        filter_layout.addWidget(QLabel("Table:"))
+        table_filter = NeumorphicGradientComboBox("All Tables")
+        table_filter.setMinimumHeight(70)
+        table_filter.addItem("All Tables")
+        table_filter.addItems(self.db.get_audit_distinct('table_name'))
+        filter_layout.addWidget(table_filter)
+
         # Record ID filter
         filter_layout.addWidget(QLabel("Employee ID:"))
         record_filter = QLineEdit()
         record_filter.setPlaceholderText("Filter by Employee ID")
         filter_layout.addWidget(record_filter)
 
+        # Date range filter
+        date_check = QCheckBox("Date range:")
+        filter_layout.addWidget(date_check)
+        date_from = QDateEdit(QDate.currentDate().addMonths(-1))
+        date_from.setCalendarPopup(True)
+        date_from.setDisplayFormat("yyyy-MM-dd")
+        date_to = QDateEdit(QDate.currentDate())
+        date_to.setCalendarPopup(True)
+        date_to.setDisplayFormat("yyyy-MM-dd")
+        for w in (date_from, date_to):
+            w.setEnabled(False)
+            filter_layout.addWidget(w)
+        date_check.toggled.connect(date_from.setEnabled)
+        date_check.toggled.connect(date_to.setEnabled)
+
         # Refresh button
         refresh_btn = ModernAnimatedButton("🔄 Refresh")
         apply_ios_style(refresh_btn, 'blue')
@@ -2513,60 +2587,53 @@ class MainWindow(QMainWindow):
 
         layout.addWidget(filter_box)
 
-        # Table for audit log
-        from PySide6.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
-        table = QTableWidget()
+        # Audit log view - rows are paged in by the model as the user scrolls
+        from PySide6.QtWidgets import QTableView, QHeaderView
+        from employee_vault.models import AuditLogModel
+        table = QTableView()
         disable_cursor_changes(table)  # Remove hand cursor
-        table.setColumnCount(8)
-        table.setHorizontalHeaderLabels(["ID", "Timestamp", "Username", "Action", "Table", "Record ID", "Old Value", "New Value", "Details"])
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
-        table.horizontalHeader().setStretchLastSection(True)
         table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.verticalHeader().setVisible(False)
+        table.setWordWrap(False)
+
+        def current_filters():
+            """Filters for DB.get_audit_page from the current widget state"""
+            filters = {
+                'username': None if username_filter.currentText() == "All Users" else username_filter.currentText(),
+                'action': None if action_filter.currentText() == "All Actions" else action_filter.currentText(),
+                'table_name': None if table_filter.currentText() == "All Tables" else table_filter.currentText(),
+                'record_id': record_filter.text().strip() or None,
+            }
+            if date_check.isChecked():
+                filters['date_from'] = date_from.date().toString("yyyy-MM-dd")
+                filters['date_to'] = date_to.date().toString("yyyy-MM-dd")
+            return filters
+
+        def make_fetcher(filters):
+            return lambda after, limit: self.db.get_audit_page(limit=limit, after=after, **filters)
+
+        model = AuditLogModel(make_fetcher(current_filters()), parent=table)
+        table.setModel(model)
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setStretchLastSection(True)
+        for col, width in enumerate([60, 150, 110, 90, 110, 100, 140, 140]):
+            table.setColumnWidth(col, width)
+
+        # Stats
+        stats_label = QLabel()
+        def update_stats():
+            more = " (scroll for more)" if model.canFetchMore() else ""
+            stats_label.setText(f"Showing {model.rowCount()} entries{more}")
 
         def load_logs():
-            """Load logs with current filters"""
-            username = None if username_filter.currentText() == "All Users" else username_filter.currentText()
-            action = None if action_filter.currentText() == "All Actions" else action_filter.currentText()
-            record_id = record_filter.text().strip() or None
-
-            logs = self.db.get_audit_log(limit=500, username=username, action=action, record_id=record_id)
-
-            table.setRowCount(len(logs))
-            for i, log in enumerate(logs):
-                table.setItem(i, 0, QTableWidgetItem(str(log.get('id', ''))))
-                table.setItem(i, 1, QTableWidgetItem(log.get('timestamp', '')))
-                table.setItem(i, 2, QTableWidgetItem(log.get('username', '')))
-
-                # Color code actions
-                action_item = QTableWidgetItem(log.get('action', ''))
-                action_text = log.get('action', '')
-                if action_text == 'LOGIN':
-                    action_item.setForeground(QColor('#4CAF50'))  # Green
-                elif action_text == 'LOGOUT':
-                    action_item.setForeground(QColor('#9E9E9E'))  # Gray
-                elif action_text == 'INSERT':
-                    action_item.setForeground(QColor('#2196F3'))  # Blue
-                elif action_text == 'UPDATE':
-                    action_item.setForeground(QColor('#FF9800'))  # Orange
-                elif action_text == 'DELETE':
-                    action_item.setForeground(QColor('#F44336'))  # Red
-                table.setItem(i, 3, action_item)
-
-                table.setItem(i, 4, QTableWidgetItem(log.get('table_name', '') or ''))
-                table.setItem(i, 5, QTableWidgetItem(log.get('record_id', '') or ''))
-                table.setItem(i, 6, QTableWidgetItem(log.get('old_value', '') or ''))
-                table.setItem(i, 7, QTableWidgetItem(log.get('new_value', '') or ''))
-
-                # Show details in a separate column
-                details_text = log.get('details', '') or ''
-                details_item = QTableWidgetItem(details_text[:100] + ('...' if len(details_text) > 100 else ''))
-                details_item.setToolTip(details_text)  # Full text on hover
-                table.setItem(i, 8, details_item)
-
-            # Adjust column widths
-            table.resizeColumnsToContents()
-            table.setColumnWidth(8, 200)  # Details column wider
+            """Restart paging with the current filters"""
+            model.set_fetcher(make_fetcher(current_filters()))
+            model.fetchMore()
+            update_stats()
+
+        model.rowsInserted.connect(lambda *_: update_stats())
 
         # Initial load
         load_logs()
@@ -2575,27 +2642,38 @@ class MainWindow(QMainWindow):
         refresh_btn.clicked.connect(load_logs)
         username_filter.currentTextChanged.connect(load_logs)
         action_filter.currentTextChanged.connect(load_logs)
+        table_filter.currentTextChanged.connect(load_logs)
+        record_filter.returnPressed.connect(load_logs)
+        date_check.toggled.connect(load_logs)
+        date_from.dateChanged.connect(load_logs)
+        date_to.dateChanged.connect(load_logs)
 
         layout.addWidget(table)
-
-        # Stats
-        stats_label = QLabel()
-        def update_stats():
-            stats_label.setText(f"Showing {table.rowCount()} entries")
-        update_stats()
         layout.addWidget(stats_label)
 
-        # Export button
+        # Export button - streams every matching entry page by page
         export_btn = ModernAnimatedButton("📥 Export to JSON")
         apply_ios_style(export_btn, 'green')
         def export_logs():
             filename, _ = QFileDialog.getSaveFileName(dlg, "Save Audit Log", "audit_log.json", "JSON Files (*.json)")
             if filename:
                 try:
-                    logs = self.db.get_audit_log(limit=5000)
-                    with open(filename, 'w') as f:
-                        json.dump(logs, f, indent=2)
-                    show_success_toast(dlg, f"Audit log exported to {filename}")
+                    filters = current_filters()
+                    count = 0
+                    after = None
+                    with open(filename, 'w', encoding='utf-8') as f:
+                        f.write("[")
+                        while True:
+                            page = self.db.get_audit_page(limit=1000, after=after, **filters)
+                            for log in page:
+                                f.write(",\n  " if count else "\n  ")
+                                f.write(json.dumps(log))
+                                count += 1
+                            if len(page) < 1000:
+                                break
+                            after = (page[-1]['timestamp'], page[-1]['id'])
+                        f.write("\n]\n")
+                    show_success_toast(dlg, f"Exported {count} audit entries to {filename}")
                 except Exception as e:
                     show_error_toast(dlg, f"Failed to export: {str(e)}")
         export_btn.clicked.connect(export_logs)
@@ -3230,7 +3308,10 @@ class MainWindow(QMainWindow):
         except Exception as e:
             show_error_toast(self, f"Failed to export Excel:\n{str(e)}")
 
-    def _toggle_theme(self): self.setStyleSheet("" if self.styleSheet() else APP_QSS)
+    def _toggle_theme(self):
+        # APP_QSS is built lazily by config.__getattr__, which star imports do not reach
+        from employee_vault import config
+        self.setStyleSheet("" if self.styleSheet() else config.APP_QSS)
     def _show_theme_selector(self):
         """Show theme selector dialog"""
         # v4.4.1: Animated dialog for theme selector
@@ -3765,8 +3846,8 @@ class MainWindow(QMainWindow):
         # Start animation
         self.sidebar_animation_group.start()
 
-        # Performance instrumentation (Phase 0)
-        print(f"[PERF] Sidebar toggle: {(time.perf_counter() - start)*1000:.2f}ms")
+        # Performance instrumentation - time to set up and start the animation
+        metrics.observe("ui.sidebar_toggle", (time.perf_counter() - start) * 1000)
 
     def _upload_user_photo(self):
         """v3.9: Upload user photo - clickable with photo editor"""
@@ -3933,11 +4014,9 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logging.warning(f"Could not end session: {e}")
 
-        # Stop all timers
-        if hasattr(self, 'session_timer'):
-            self.session_timer.stop()
-        if hasattr(self, 'idle_timer'):
-            self.idle_timer.stop()
+        # Stop the heartbeat (keepalive, refresh, idle check)
+        if hasattr(self, 'heartbeat'):
+            self.heartbeat.stop()
 
         # Create fade-out animation for main window using window opacity
         from PySide6.QtCore import QPropertyAnimation
@@ -4032,6 +4111,7 @@ class MainWindow(QMainWindow):
             self._logout()
         elif clicked == exit_btn:
             # Exit program completely - checkpoint database before closing
+            self.heartbeat.stop()
             try:
                 if hasattr(self, 'db') and self.db:
                     logging.info("Checkpointing database before exit...")
@@ -4048,41 +4128,37 @@ class MainWindow(QMainWindow):
             event.ignore()
 
     def changeEvent(self, event):
-        """Handle window state changes - auto-refresh when window gains focus"""
+        """Handle window state changes - probe for changes on focus, slow the heartbeat while minimized"""
         from PySide6.QtCore import QEvent
-        if event.type() == QEvent.Type.ActivationChange:
-            if self.isActiveWindow():
-                # Window gained focus - check for database changes
-                try:
-                    current_mtime = db_latest_mtime(DB_FILE)
-                    if hasattr(self, '_last_db_mtime') and current_mtime > self._last_db_mtime:
-                        self._last_db_mtime = current_mtime
-                        self._refresh_all()
-                        logging.debug("Focus-refresh: Database updated while window was inactive")
-                except Exception as e:
-                    logging.debug(f"Focus-refresh check failed: {e}")
+        if hasattr(self, 'heartbeat'):
+            if event.type() == QEvent.Type.ActivationChange and self.isActiveWindow():
+                # Window gained focus - check for database changes now
+                self.heartbeat.poke()
+            elif event.type() == QEvent.Type.WindowStateChange:
+                self.heartbeat.set_background(self.isMinimized())
         super().changeEvent(event)
 
-    def _auto_refresh(self):
+    def _on_data_revision(self, revision):
         """
         Enhanced auto-refresh for real-time multi-user synchronization.
 
         v2.1.2 MULTI-USER IMPROVEMENTS:
         - Optimized for 5-7 concurrent users
-        - Detects database changes before refreshing (performance boost)
+        - Refreshes only when the heartbeat reports a new employee data revision
         - Better handling of concurrent writes
         - Notifies user when data changes from other users
         - Auto-refresh on window focus (v5.1)
         """
+        if revision is None:
+            return
+        if self._data_revision is None:
+            self._data_revision = revision  # Baseline from the first heartbeat
+            return
+        if self._session_locked:
+            return  # Picked up again when the session is unlocked
         try:
-            # Check if database has been modified by another user
-            current_mtime = db_latest_mtime(DB_FILE)
-            if not hasattr(self, '_last_db_mtime'):
-                self._last_db_mtime = current_mtime
-
-            # Only refresh if database actually changed (performance optimization)
-            if current_mtime > self._last_db_mtime:
-                self._last_db_mtime = current_mtime
+            if revision != self._data_revision:
+                self._data_revision = revision
 
                 # Store current selection to restore after refresh
                 current_page_index = self.stack.currentIndex()
@@ -4098,8 +4174,6 @@ class MainWindow(QMainWindow):
                 # Optional: Show subtle notification
                 if hasattr(self, 'statusBar'):
                     self.statusBar().showMessage("Data updated", 2000)
-            else:
-                logging.debug("Auto-refresh: No changes detected (skipped refresh)")
 
         except sqlite3.OperationalError as e:
             if "locked" in str(e).lower():
@@ -4149,6 +4223,9 @@ class MainWindow(QMainWindow):
         if event.type() in [QEvent.MouseMove, QEvent.MouseButtonPress,
                            QEvent.KeyPress, QEvent.Wheel]:
             self.last_activity_time = datetime.now()
+            self.heartbeat.note_activity()
+            if self.db.maintenance is not None:
+                self.db.maintenance.note_activity()
         
         # Resize animated background when content area resizes
         if hasattr(self, 'content_area') and obj == self.content_area and event.type() == QEvent.Resize:
@@ -4157,16 +4234,17 @@ class MainWindow(QMainWindow):
                 
         return super().eventFilter(obj, event)
 
-    def _periodic_checkpoint(self):
-        """Periodically checkpoint WAL for multi-PC synchronization (runs in background thread)"""
+    def _on_heartbeat_tick(self, status):
+        """Per-tick housekeeping that needs no extra database round trip"""
+        # Release the write lock held by any audit row written without a commit
+        # (the old 30s checkpoint timer used to commit these as a side effect)
         try:
-            if hasattr(self, 'db') and self.db:
-                # Use background worker to prevent UI freezes
-                if not hasattr(self, '_checkpoint_worker') or not self._checkpoint_worker.isRunning():
-                    self._checkpoint_worker = CheckpointWorker(self.db, self)
-                    self._checkpoint_worker.start()
-        except Exception as e:
-            logging.warning(f"Periodic checkpoint failed: {e}")
+            self.db.commit_pending()
+        except sqlite3.Error as e:
+            logging.debug(f"Pending commit deferred: {e}")
+        if self._session_locked:
+            return
+        self._check_idle_timeout()
 
     def _check_idle_timeout(self):
         """Check if user has been idle and auto-close program after 30 minutes"""
@@ -4312,14 +4390,8 @@ class MainWindow(QMainWindow):
         """Auto-close the program due to inactivity"""
         from PySide6.QtWidgets import QApplication
         
-        # Stop all timers
-        self.idle_timer.stop()
-        if hasattr(self, 'timer'):
-            self.timer.stop()
-        if hasattr(self, 'session_timer'):
-            self.session_timer.stop()
-        if hasattr(self, 'checkpoint_timer'):
-            self.checkpoint_timer.stop()
+        # Stop the heartbeat (keepalive, refresh, idle check)
+        self.heartbeat.stop()
 
         # Log the auto-close
         try:
@@ -4348,10 +4420,8 @@ class MainWindow(QMainWindow):
 
     def _lock_session(self):
         """Lock the session and require re-authentication"""
-        # Stop timers
-        self.idle_timer.stop()
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        # Pause refresh and idle checks (the heartbeat keeps the session lease alive)
+        self._session_locked = True
 
         # Hide main window
         self.hide()
@@ -4368,22 +4438,28 @@ class MainWindow(QMainWindow):
             # Re-authenticated successfully
             self.last_activity_time = datetime.now()
             self._warning_shown = False
-            self.idle_timer.start()
-            if hasattr(self, 'timer'):
-                self.timer.start()
+            self._session_locked = False
+            self._on_data_revision(self.heartbeat.status.get(FIELD_DATA_REVISION))
             self.show()
             logging.info(f"Session unlocked: {self.current_user} re-authenticated")
         else:
             # User cancelled - logout
             self._logout()
 
-    def _notify_contracts(self):
-        expired=[e for e in self.employees if (contract_days_left(e) or 999999) < 0]
-        soon=[e for e in self.employees if 0 <= (contract_days_left(e) or 999999) <= ALERT_DAYS]
-        if expired: self.tray.showMessage("Contract expired", f"{len(expired)} contract(s) expired.", QSystemTrayIcon.Information, 8000)
-        if soon: self.tray.showMessage("Contract expiring", f"{len(soon)} contract(s) will expire ≤ {ALERT_DAYS} days.", QSystemTrayIcon.Information, 8000)
-        
+    def _on_alerts_changed(self, alerts, diff):
+        """Alert engine published a new alert set - update tray, notification center and dashboard"""
+        new_rules = {a['rule'] for a in diff['added']}
+        expired = self.alert_engine.by_rule(RULE_CONTRACT_EXPIRED)
+        soon = self.alert_engine.by_rule(RULE_CONTRACT_EXPIRING)
+        # Only pop tray messages when contracts newly cross a threshold
+        if expired and RULE_CONTRACT_EXPIRED in new_rules:
+            self.tray.showMessage("Contract expired", f"{len(expired)} contract(s) expired.", QSystemTrayIcon.Information, 8000)
+        if soon and RULE_CONTRACT_EXPIRING in new_rules:
+            self.tray.showMessage("Contract expiring", f"{len(soon)} contract(s) will expire ≤ {ALERT_DAYS} days.", QSystemTrayIcon.Information, 8000)
+
         # v5.3: Update notification center
         if hasattr(self, 'notification_center'):
-            self.notification_center.check_contract_expiry()
+            self.notification_center.show_contract_alerts(expired, soon)
             self._update_notification_badge()
+
+        self.dashboard.apply_alerts(self.alert_engine, diff)
@@ -2,7 +2,19 @@
 UI Pages Package
 """
 
-from .dashboard import EnhancedDashboardPage, QuickStatsCard
-from .employees import EmployeesPage
+import importlib
+
+# Pages are heavy (dashboard.py alone is several thousand lines); load on first access
+_LAZY = {
+    "EnhancedDashboardPage": ".dashboard",
+    "QuickStatsCard": ".dashboard",
+    "EmployeesPage": ".employees",
+}
 
 __all__ = ["EnhancedDashboardPage", "QuickStatsCard", "EmployeesPage"]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
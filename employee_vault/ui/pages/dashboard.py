@@ -18,9 +18,11 @@ from PySide6.QtGui import *
 
 from employee_vault.ui.widgets import ModernAnimatedButton, PulseButton, titlecase, GlassCard, GlassPanelDark, CountUpLabel, DatePicker
 from employee_vault.ui.modern_ui_helper import show_success_toast, show_error_toast, show_warning_toast, show_info_toast
+from employee_vault.ui.db_actions import run_bulk_write, show_restore_conflicts
 from employee_vault.config import *
 from employee_vault.glassmorphism_theme import *
 from employee_vault.database import DB
+from employee_vault import metrics
 
 # Import animation manager and particle effects
 try:
@@ -249,6 +251,15 @@ class QuickStatsCard(QFrame):
     def get_animatedValue(self):
         return self.current_value
 
+    def set_value(self, value):
+        """Update the displayed value in place (without rebuilding the card)"""
+        self.target_value = value
+        self.animation.stop()
+        if hasattr(self.value_label, 'set_target_value'):
+            self.value_label.set_target_value(value, animate=True)
+        else:
+            self.set_animatedValue(value)
+
     def set_animatedValue(self, value):
         self.current_value = int(value)
         self.value_label.setText(f"{self.current_value:,}")  # Added comma formatting
@@ -341,6 +352,12 @@ class EnhancedDashboardPage(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Filled from the shared alert engine (see apply_alerts)
+        self._expiring_employees = []
+        self._missing_photos_employees = []
+        self._expiring_card = None
+        self._missing_photos_card = None
+
         layout = QVBoxLayout(self)
 
         title = QLabel("<h1>📊 Dashboard</h1>")
@@ -848,6 +865,7 @@ class EnhancedDashboardPage(QWidget):
         self.completeness_label.setText(html)
         self.completeness_label.setVisible(True)
 
+    @metrics.timed("ui.dashboard_refresh")
     def refresh(self, employees):
         # Clear previous stats
         for i in reversed(range(self.stats_layout.count())):
@@ -856,37 +874,10 @@ class EnhancedDashboardPage(QWidget):
         total = len(employees)
         active = sum(1 for e in employees if not e.get('resign_date'))
 
-        # Count expiring contracts and check for reminders
-        expiring = 0
-        expiring_employees = []
-        missing_photos = 0
-        missing_photos_employees = []
-        from datetime import datetime, timedelta
-        today = datetime.now().date()
-        alert_date = today + timedelta(days=30)
-
-        for emp in employees:
-            emp_id = emp.get('emp_id', '')
-            
-            # Check for missing photos
-            photo_path = os.path.join(PHOTOS_DIR, f"{emp_id}.png")
-            if not os.path.exists(photo_path):
-                missing_photos += 1
-                missing_photos_employees.append(emp)
-            
-            if emp.get('contract_expiry'):
-                try:
-                    expiry_date = datetime.strptime(emp['contract_expiry'], "%m-%d-%Y").date()
-                    days = (expiry_date - today).days
-                    if 0 <= days <= 30:
-                        expiring += 1
-                        expiring_employees.append(emp)
-                except ValueError:
-                    # Invalid date format, skip this employee
-                    pass
-
-        # Store missing photos list for click handler
-        self._missing_photos_employees = missing_photos_employees
+        # Expiring contracts and missing photos come from the alert engine
+        # (apply_alerts updates these cards when its evaluation finishes)
+        expiring = len(self._expiring_employees)
+        missing_photos = len(self._missing_photos_employees)
 
         # 4 stats cards with card types for filtering
         total_card = QuickStatsCard("Total Employees", total, "👥", "#2196F3", "total")
@@ -909,14 +900,12 @@ class EnhancedDashboardPage(QWidget):
         missing_photos_card.clicked.connect(self._handle_card_click)
         missing_photos_card.setStyleSheet("opacity: 0;")
         self.stats_layout.addWidget(missing_photos_card)
+        self._expiring_card = expiring_card
+        self._missing_photos_card = missing_photos_card
         
         # Staggered entrance animation for cards
         self._animate_cards_entrance([total_card, active_card, expiring_card, missing_photos_card])
 
-        # Show contract renewal reminder if there are expiring contracts
-        if expiring_employees:
-            self._show_contract_reminder(expiring_employees)
-
         # QUICK WIN #8: Update data completeness widget
         completeness = self._check_data_completeness(employees)
         self._update_completeness_display(completeness)
@@ -955,12 +944,34 @@ class EnhancedDashboardPage(QWidget):
         if hasattr(self, 'recent_skeleton'):
             self.recent_skeleton.setVisible(False)
     
+    def apply_alerts(self, engine, diff):
+        """Update the alert-driven cards from the shared alert engine"""
+        from employee_vault.alert_engine import RULE_CONTRACT_EXPIRING, RULE_MISSING_PHOTO
+
+        self._expiring_employees = [a['employee'] for a in engine.by_rule(RULE_CONTRACT_EXPIRING)]
+        self._missing_photos_employees = [a['employee'] for a in engine.by_rule(RULE_MISSING_PHOTO)]
+        if self._expiring_card is not None:
+            self._expiring_card.set_value(len(self._expiring_employees))
+        if self._missing_photos_card is not None:
+            self._missing_photos_card.set_value(len(self._missing_photos_employees))
+
+        # Show contract renewal reminder when contracts newly enter the window
+        if any(a['rule'] == RULE_CONTRACT_EXPIRING for a in diff['added']):
+            self._show_contract_reminder(self._expiring_employees)
+
     def _animate_cards_entrance(self, cards):
         """Animate dashboard cards with staggered entrance"""
         for i, card in enumerate(cards):
             # Simple opacity animation with delay
             card.setStyleSheet("opacity: 0;")
-            QTimer.singleShot(i * 80, lambda c=card: c.setStyleSheet(""))
+            QTimer.singleShot(i * 80, lambda c=card: self._reveal_card(c))
+
+    @staticmethod
+    def _reveal_card(card):
+        try:
+            card.setStyleSheet("")
+        except RuntimeError:
+            pass  # A newer refresh already replaced (deleted) the card
 
     def _show_contract_reminder(self, expiring_employees):
         """Show contract renewal reminder dialog"""
@@ -3405,6 +3416,8 @@ class BulkOperationsDialog(QDialog):
     def __init__(self, parent, db, employees):
         super().__init__(parent)
         self.db = db
+        # Audit/permission context for bulk writes; without a signed-in user they are refused
+        self.current_user = getattr(parent, 'current_user', None)
         self.employees = employees
         self.setWindowTitle("📦 Bulk Operations")
         self.resize(700, 600)
@@ -3492,12 +3505,13 @@ class BulkOperationsDialog(QDialog):
                                     QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            for emp in selected:
-                self.db.conn.execute("UPDATE employees SET department=? WHERE emp_id=?",
-                    (dept, emp['emp_id']))
-            self.db.conn.commit()
-            show_success_toast(self, f"Updated {len(selected)} employee(s)!")
-            self.status_label.setText(f"✅ Changed department for {len(selected)} employees")
+            def _updated(count):
+                show_success_toast(self, f"Updated {count} employee(s)!")
+                self.status_label.setText(f"✅ Changed department for {count} employees")
+
+            run_bulk_write(self, self.current_user, self.db.bulk_update,
+                           [emp['emp_id'] for emp in selected], {'department': dept},
+                           username=self.current_user, on_success=_updated)
 
     def bulk_change_position(self):
         selected = self.get_selected_employees()
@@ -3513,12 +3527,13 @@ class BulkOperationsDialog(QDialog):
                                     QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            for emp in selected:
-                self.db.conn.execute("UPDATE employees SET position=? WHERE emp_id=?",
-                    (position, emp['emp_id']))
-            self.db.conn.commit()
-            show_success_toast(self, f"Updated {len(selected)} employee(s)!")
-            self.status_label.setText(f"✅ Changed position for {len(selected)} employees")
+            def _updated(count):
+                show_success_toast(self, f"Updated {count} employee(s)!")
+                self.status_label.setText(f"✅ Changed position for {count} employees")
+
+            run_bulk_write(self, self.current_user, self.db.bulk_update,
+                           [emp['emp_id'] for emp in selected], {'position': position},
+                           username=self.current_user, on_success=_updated)
 
     def bulk_change_agency(self):
         selected = self.get_selected_employees()
@@ -3537,12 +3552,13 @@ class BulkOperationsDialog(QDialog):
                                     QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            for emp in selected:
-                self.db.conn.execute("UPDATE employees SET agency=? WHERE emp_id=?",
-                    (agency_value, emp['emp_id']))
-            self.db.conn.commit()
-            show_success_toast(self, f"Updated {len(selected)} employee(s)!")
-            self.status_label.setText(f"✅ Changed agency for {len(selected)} employees")
+            def _updated(count):
+                show_success_toast(self, f"Updated {count} employee(s)!")
+                self.status_label.setText(f"✅ Changed agency for {count} employees")
+
+            run_bulk_write(self, self.current_user, self.db.bulk_update,
+                           [emp['emp_id'] for emp in selected], {'agency': agency_value},
+                           username=self.current_user, on_success=_updated)
 
     def bulk_archive(self):
         selected = self.get_selected_employees()
@@ -3558,10 +3574,13 @@ class BulkOperationsDialog(QDialog):
                                     QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            for emp in selected:
-                self.db.archive_employee(emp['emp_id'], "admin", reason)
-            show_success_toast(self, f"Archived {len(selected)} employee(s)!")
-            self.status_label.setText(f"✅ Archived {len(selected)} employees")
+            def _archived(archived):
+                show_success_toast(self, f"Archived {len(archived)} employee(s)!")
+                self.status_label.setText(f"✅ Archived {len(archived)} employees")
+
+            run_bulk_write(self, self.current_user, self.db.bulk_archive,
+                           [emp['emp_id'] for emp in selected], username=self.current_user, reason=reason,
+                           on_success=_archived)
 
     def bulk_export(self):
         selected = self.get_selected_employees()
@@ -5359,11 +5378,14 @@ class MainWindow(QMainWindow):
         if not ok:
             return
 
-        # Archive employees instead of deleting
-        for row in rows:
-            emp_id = row["emp_id"]
-            self.db.archive_employee(emp_id, self.current_user, reason or "No reason specified")
+        # Archive employees instead of deleting (one set-based transaction on the writer thread)
+        run_bulk_write(self, self.current_user, self.db.bulk_archive, [row["emp_id"] for row in rows],
+                       username=self.current_user, reason=reason or "No reason specified",
+                       on_success=self._on_employees_archived)
 
+    def _on_employees_archived(self, archived):
+        """Move the archived employees' files and photos aside once the archive has committed"""
+        for emp_id in archived:
             # Move file folders to archive
             src_folder = os.path.join(FILES_DIR, emp_id)
             if os.path.isdir(src_folder):
@@ -5387,7 +5409,7 @@ class MainWindow(QMainWindow):
                     pass
 
         show_success_toast(
-            self, f"{len(rows)} employee(s) have been archived.\n\n"
+            self, f"{len(archived)} employee(s) have been archived.\n\n"
             "You can restore them from the Archive Manager."
         )
 
@@ -5778,8 +5800,16 @@ class MainWindow(QMainWindow):
                 imported = 0
                 updated = 0
                 skipped = 0
+
+                # Rows whose government IDs are already used (or repeated in the file)
+                conflicting_rows = {c['row'] for c in self.db.find_gov_id_batch_conflicts(employees)}
                 
-                for emp in employees:
+                for row_no, emp in enumerate(employees):
+                    if row_no in conflicting_rows:
+                        logging.warning(f"Import skipped {emp.get('emp_id') or emp.get('name')}: duplicate government ID")
+                        skipped += 1
+                        continue
+
                     emp_id = emp.get('emp_id')
                     
                     # Generate ID if missing
@@ -6501,7 +6531,18 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            if self.db.restore_employee(emp_id, self.current_user):
+            # An active employee may have been given one of its government IDs since
+            conflicts = self.db.find_restore_conflicts(emp_id)
+            if conflicts:
+                show_restore_conflicts(self, name, emp_id, conflicts)
+                return
+            try:
+                restored = self.db.restore_employee(emp_id, self.current_user)
+            except sqlite3.IntegrityError:
+                # Taken by another client between the check and the restore
+                show_restore_conflicts(self, name, emp_id, self.db.find_restore_conflicts(emp_id))
+                return
+            if restored:
                 # Restore files
                 archive_folder = os.path.join(FILES_DIR, "_archived", emp_id)
                 if os.path.isdir(archive_folder):
@@ -7432,7 +7473,10 @@ class MainWindow(QMainWindow):
         dlg = AdvancedReportsDialog(parent or self, self.db)
         dlg.exec()
 
-    def _toggle_theme(self): self.setStyleSheet("" if self.styleSheet() else APP_QSS)
+    def _toggle_theme(self):
+        # APP_QSS is built lazily by config.__getattr__, which star imports do not reach
+        from employee_vault import config
+        self.setStyleSheet("" if self.styleSheet() else config.APP_QSS)
     def _show_theme_selector(self):
         """Show theme selector dialog"""
         # v4.4.1: Animated dialog for theme selector
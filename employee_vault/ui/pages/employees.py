@@ -15,6 +15,7 @@ from PySide6.QtGui import *
 
 from employee_vault.config import *
 from employee_vault.database import DB
+from employee_vault import metrics
 from employee_vault.models import *
 from employee_vault.ui.widgets import *
 from employee_vault.ui.widgets import ModernAnimatedButton, apply_table_fixes, SmoothAnimatedDialog
@@ -87,10 +88,11 @@ class HTMLDelegate(QStyledItemDelegate):
         doc.documentLayout().draw(painter, ctx)
         painter.restore()
 
-        # Performance instrumentation (Phase 0) - log slow paints only
+        # Performance instrumentation - every paint goes into the metrics histogram
         elapsed = (time.perf_counter() - start)*1000
+        metrics.observe("ui.cell_paint", elapsed)
         if elapsed > 5:  # Log paints >5ms
-            print(f"[PERF] Cell paint: {elapsed:.2f}ms")
+            logging.debug(f"Slow cell paint: {elapsed:.2f}ms")
 
 class EmployeesPage(QWidget):
     # Signal to request refresh from parent
@@ -488,6 +490,7 @@ class EmployeesPage(QWidget):
         self.proxy.setTerm(search_text)
         self.model.set_search_term(search_text)
 
+    @metrics.timed("ui.employees_refresh")
     def set_data(self, employees):
         """Set employee data with stagger animation"""
         self.model.setDataList(employees)
@@ -1,6 +1,7 @@
 """
 Particle Effects System for EmployeeVault
 Confetti, sparkles, and celebration animations
+Particle counts and tick rate follow the frame governor level
 """
 
 import random
@@ -9,6 +10,8 @@ from PySide6.QtCore import Qt, QTimer, QPointF, QRectF
 from PySide6.QtWidgets import QWidget
 from PySide6.QtGui import QPainter, QColor, QPen, QBrush, QPainterPath
 
+from employee_vault.ui.frame_governor import get_frame_governor
+
 
 class Particle:
     """Individual particle with physics - Optimized with reset() for object pooling"""
@@ -107,6 +110,7 @@ class ParticleEmitter(QWidget):
         self.setAttribute(Qt.WA_TranslucentBackground)
 
         # Object pooling optimization - pre-allocate particles
+        self._governor = get_frame_governor()
         self.max_particles = max_particles
         self.particle_pool = [Particle() for _ in range(max_particles)]
         self.active_particles = []
@@ -114,6 +118,10 @@ class ParticleEmitter(QWidget):
 
         self.update_timer = QTimer(self)
         self.update_timer.timeout.connect(self.update_particles)
+
+    def _available(self, requested: int) -> int:
+        """Particles an emit call may create: scaled by the governor level, capped by the pool"""
+        return min(self._governor.particle_count(requested), self.max_particles - len(self.active_particles))
     
     def emit_confetti(self, count: int = 50, origin: QPointF = None):
         """Emit colorful confetti particles - Using object pool"""
@@ -131,7 +139,7 @@ class ParticleEmitter(QWidget):
 
         shapes = ["circle", "square", "triangle"]
 
-        particles_to_create = min(count, self.max_particles - len(self.active_particles))
+        particles_to_create = self._available(count)
         for i in range(particles_to_create):
             angle = random.uniform(0, 2 * math.pi)
             speed = random.uniform(3, 10)
@@ -154,7 +162,7 @@ class ParticleEmitter(QWidget):
         if origin is None:
             origin = QPointF(self.width() / 2, self.height() / 2)
 
-        particles_to_create = min(count, self.max_particles - len(self.active_particles))
+        particles_to_create = self._available(count)
         for _ in range(particles_to_create):
             angle = random.uniform(0, 2 * math.pi)
             speed = random.uniform(2, 6)
@@ -178,7 +186,7 @@ class ParticleEmitter(QWidget):
             origin = QPointF(self.width() / 2, self.height() / 2)
 
         # Green sparkles in circle pattern
-        particles_to_create = min(24, self.max_particles - len(self.active_particles))
+        particles_to_create = self._available(24)
         for i in range(particles_to_create):
             angle = (i / 24) * 2 * math.pi
             speed = 8
@@ -209,7 +217,7 @@ class ParticleEmitter(QWidget):
         main_color = random.choice(colors)
 
         # Radial burst
-        particles_to_create = min(40, self.max_particles - len(self.active_particles))
+        particles_to_create = self._available(40)
         for i in range(particles_to_create):
             angle = (i / 40) * 2 * math.pi
             speed = random.uniform(5, 12)
@@ -233,7 +241,7 @@ class ParticleEmitter(QWidget):
             QColor(255, 107, 107),
         ]
 
-        particles_to_create = min(count, self.max_particles - len(self.active_particles))
+        particles_to_create = self._available(count)
         for i in range(particles_to_create):
             t = i / count
             x = start.x() + (end.x() - start.x()) * t
@@ -256,8 +264,8 @@ class ParticleEmitter(QWidget):
     
     def start_animation(self):
         """Start particle animation timer"""
-        if not self.update_timer.isActive():
-            self.update_timer.start(16)  # ~60 FPS
+        if not self.update_timer.isActive() and self.active_particles:
+            self.update_timer.start(self._governor.frame_interval(16))  # ~60 FPS at full level
     
     def update_particles(self):
         """Update all particles - Optimized with object pooling"""
@@ -274,11 +282,13 @@ class ParticleEmitter(QWidget):
         if not self.active_particles:
             return
 
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        with self._governor.measure():
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.Antialiasing)
 
-        for particle in self.active_particles:
-            particle.draw(painter)
+            for particle in self.active_particles:
+                particle.draw(painter)
+            painter.end()
 
     def clear(self):
         """Clear all particles"""
@@ -295,6 +305,9 @@ def create_celebration_effect(widget: QWidget, effect_type: str = "confetti"):
         widget: Parent widget to overlay effect on
         effect_type: "confetti", "sparkles", "success", "firework"
     """
+    if not get_frame_governor().allows_motion():
+        return None
+
     emitter = ParticleEmitter(widget)
     emitter.setGeometry(widget.rect())
     emitter.raise_()
@@ -312,7 +325,8 @@ def create_celebration_effect(widget: QWidget, effect_type: str = "confetti"):
     
     # Auto-cleanup after animation
     def cleanup():
-        if not emitter.particles:
+        if not emitter.active_particles:
+            emitter.update_timer.stop()
             emitter.deleteLater()
     
     emitter.update_timer.timeout.connect(cleanup)
@@ -0,0 +1,133 @@
+"""
+Style Registry for EmployeeVault
+One place that compiles style sheets per theme instead of every widget
+building and parsing its own CSS.
+
+Widgets register a named rule block once (at import time), keyed by
+objectName / class, with visual states written as dynamic-property
+selectors, e.g. QLabel#neumorphicFloatingLabel[floating="true"]. At runtime
+a widget only flips the property with set_style_state(), which re-polishes
+that one widget and only when the state actually changed.
+
+    compile_stylesheet(theme, is_light)  base theme + every registered block,
+                                         cached per theme; the ThemeManager
+                                         sets it as the application sheet
+    apply_component_style(owner, name)   sets one cached block on a compound
+                                         widget (line edit + label, ...)
+
+Component blocks exist because many containers set their own sheets with
+bare or generic rules ("QLabel { color: ... }"), and Qt always prefers an
+ancestor's sheet over the application sheet regardless of specificity. A
+compound widget carrying its block once keeps its look inside any
+container; owners are tracked weakly so a theme switch re-applies one block
+per owner instead of cascading through every child.
+
+A theme switch is therefore not a single setStyleSheet: it is the
+application sheet plus one call per live component owner. Widgets that are
+not in the registry yet still build their own sheets at construction time.
+"""
+
+import logging
+import weakref
+from typing import Callable, Dict, Optional, Tuple
+
+from PySide6.QtWidgets import QWidget
+
+# builder(theme_name, is_light) -> style sheet text
+StyleBuilder = Callable[[str, bool], str]
+
+_builders: Dict[str, StyleBuilder] = {}
+_cache: Dict[Tuple[str, str, bool], str] = {}
+_owners: Dict[str, "weakref.WeakSet"] = {}
+_active: Optional[Tuple[str, bool]] = None
+
+
+def theme_colors(theme_name: str, is_light: bool = False) -> dict:
+    """Colour dict for a theme from MODERN_THEMES / MODERN_THEMES_LIGHT"""
+    from employee_vault.config import MODERN_THEMES, MODERN_THEMES_LIGHT
+
+    themes = MODERN_THEMES_LIGHT if is_light else MODERN_THEMES
+    return themes.get(theme_name, themes["default"])
+
+
+def register_style(name: str, rules):
+    """
+    Register a rule block. rules is either static style sheet text or a
+    builder(theme_name, is_light) returning it.
+    """
+    _builders[name] = rules if callable(rules) else (lambda theme_name, is_light, text=rules: text)
+    for key in [k for k in _cache if k[0] in (name, "")]:
+        del _cache[key]
+
+
+def active_theme() -> Tuple[str, bool]:
+    """(theme name, is_light) last applied by the ThemeManager"""
+    if _active is None:
+        from employee_vault.config import load_theme_preference
+        return load_theme_preference(), False
+    return _active
+
+
+def component_stylesheet(name: str, theme_name: str = None, is_light: bool = None) -> str:
+    """Compiled text of one registered block (active theme by default)"""
+    if theme_name is None or is_light is None:
+        active_name, active_light = active_theme()
+        theme_name = active_name if theme_name is None else theme_name
+        is_light = active_light if is_light is None else is_light
+    key = (name, theme_name, is_light)
+    if key not in _cache:
+        _cache[key] = _builders[name](theme_name, is_light)
+    return _cache[key]
+
+
+def compile_stylesheet(theme_name: str, is_light: bool = False) -> str:
+    """Base theme style sheet plus every registered block, cached per theme"""
+    key = ("", theme_name, is_light)
+    if key not in _cache:
+        from employee_vault.config import get_modern_stylesheet
+
+        parts = [get_modern_stylesheet(theme_name, is_light)]
+        parts.extend(component_stylesheet(name, theme_name, is_light) for name in sorted(_builders))
+        _cache[key] = "\n".join(parts)
+    return _cache[key]
+
+
+def apply_component_style(owner: QWidget, name: str):
+    """Give a compound widget its registered block (one parse per owner)"""
+    owner.setStyleSheet(component_stylesheet(name))
+    _owners.setdefault(name, weakref.WeakSet()).add(owner)
+
+
+def set_active_theme(theme_name: str, is_light: bool = False):
+    """
+    Record the applied theme and re-apply component blocks to live owners
+    when it changed. Called by the ThemeManager right after setStyleSheet.
+    """
+    global _active
+    previous = active_theme()
+    _active = (theme_name, is_light)
+    if previous == _active:
+        return
+    for name, owners in _owners.items():
+        text = component_stylesheet(name)
+        for owner in list(owners):
+            try:
+                owner.setStyleSheet(text)
+            except RuntimeError:
+                pass  # C++ object already deleted
+    logging.debug(f"Style registry: switched to {theme_name} ({'light' if is_light else 'dark'})")
+
+
+def set_style_state(widget: QWidget, prop: str, value) -> bool:
+    """
+    Set a dynamic property used by [prop="value"] selectors and re-polish the
+    widget. Does nothing when the value is unchanged; returns True if it changed.
+    """
+    if widget.property(prop) == value:
+        return False
+    widget.setProperty(prop, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+    return True
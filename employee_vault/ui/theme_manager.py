@@ -177,15 +177,21 @@ class ThemeManager(QObject):
 
     def apply_theme(self):
         """Apply the current theme to the application with smooth transition"""
-        from employee_vault.config import get_modern_stylesheet
+        from employee_vault.ui import style_registry
         from PySide6.QtWidgets import QGraphicsOpacityEffect
         from PySide6.QtCore import QPropertyAnimation, QEasingCurve
 
         active = self.get_active_theme()
         is_light = active == self.LIGHT
 
-        # Use get_modern_stylesheet with current color theme and light/dark mode
-        stylesheet = get_modern_stylesheet(self.current_color_theme, is_light)
+        # Compiled application style sheet per theme (base theme + registered widget rules);
+        # set_active_theme then re-applies the component blocks to their owners
+        stylesheet = style_registry.compile_stylesheet(self.current_color_theme, is_light)
+        color_theme = self.current_color_theme
+
+        def set_app_style():
+            app.setStyleSheet(stylesheet)
+            style_registry.set_active_theme(color_theme, is_light)
 
         # Use theme-specific animation duration and easing curve
         transition_duration = self.animation_profile.transition_duration
@@ -223,7 +229,7 @@ class ThemeManager(QObject):
                 
                 # Apply new stylesheet between animations
                 def apply_new_style():
-                    app.setStyleSheet(stylesheet)
+                    set_app_style()
                     fade_in.start()
                 
                 fade_out.finished.connect(apply_new_style)
@@ -234,7 +240,7 @@ class ThemeManager(QObject):
             
             # If no windows animated, apply directly
             if not windows or not any(w.isVisible() for w in windows):
-                app.setStyleSheet(stylesheet)
+                set_app_style()
 
         self.current_applied = active
 
@@ -64,6 +64,7 @@ from .thumbnail_cache import (
 from .animated_login_card import AnimatedLoginCard
 from .animated_background import AnimatedGradientBackground, AnimatedBackgroundContainer
 from .stacked_card_gallery import StackedCardGallery, StackedCard, GalleryPreviewDialog
+from .metrics_overlay import MetricsOverlay
 
 # New animation system imports
 try:
@@ -2,12 +2,17 @@
 Animated Gradient Background Widget
 Creates a smooth, animated gradient background that uses theme colors.
 Performance-conscious with configurable FPS and enable/disable toggle.
+Governed by the frame governor: paused while the window is hidden or
+inactive, half rate at the reduced level, and a cached still frame at the
+static level.
 """
 
 import math
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import Qt, QTimer, QPointF, Property, QVariantAnimation, QEasingCurve
-from PySide6.QtGui import QPainter, QLinearGradient, QRadialGradient, QColor, QPainterPath
+from PySide6.QtGui import QPainter, QLinearGradient, QRadialGradient, QColor, QPainterPath, QPixmap
+
+from employee_vault.ui.frame_governor import get_frame_governor
 
 
 class AnimatedGradientBackground(QWidget):
@@ -60,6 +65,12 @@ class AnimatedGradientBackground(QWidget):
         self._anim.setLoopCount(-1)  # Infinite loop
         self._anim.setEasingCurve(QEasingCurve.Type.Linear)
         self._anim.valueChanged.connect(self._on_value_changed)
+
+        # Still frame shown while the governor holds the animation
+        self._static_frame = None
+        self._governed_pause = False
+        self._governor = get_frame_governor()
+        self._governor.add_callback(self, self._on_governor_state)
         
     def _update_gradient_colors(self):
         """Parse theme colors into QColor objects"""
@@ -77,6 +88,7 @@ class AnimatedGradientBackground(QWidget):
         """Update gradient colors when theme changes"""
         self._theme_colors = theme_colors
         self._update_gradient_colors()
+        self._static_frame = None
         self.update()
         
     def set_enabled(self, enabled: bool):
@@ -95,11 +107,12 @@ class AnimatedGradientBackground(QWidget):
         """Set animation frame rate (affects performance)"""
         self._fps = max(1, min(60, fps))  # Clamp between 1-60
         if self._timer.isActive():
-            self._timer.setInterval(1000 // self._fps)
+            self._timer.setInterval(self._governor.frame_interval(1000 // self._fps))
             
     def set_mode(self, mode: str):
         """Set animation mode"""
         self._mode = mode
+        self._static_frame = None
         self.update()
         
     def set_intensity(self, intensity: float):
@@ -110,13 +123,38 @@ class AnimatedGradientBackground(QWidget):
         """Start the background animation"""
         if not self._enabled:
             return
-        self._anim.start()
-        self._timer.start(1000 // self._fps)
+        if not self._governor.allows_motion():
+            self._governed_pause = True
+            self.update()
+            return
+        self._governed_pause = False
+        if self._anim.state() == QVariantAnimation.State.Paused:
+            self._anim.resume()
+        else:
+            self._anim.start()
+        self._timer.start(self._governor.frame_interval(1000 // self._fps))
         
     def stop(self):
         """Stop the background animation"""
+        self._governed_pause = False
         self._anim.stop()
         self._timer.stop()
+
+    def _on_governor_state(self, running: bool, level: int):
+        if not self._enabled:
+            return
+        if self._governor.allows_motion():
+            if self._governed_pause:
+                self.start()
+            elif self._timer.isActive():
+                self._timer.setInterval(self._governor.frame_interval(1000 // self._fps))
+        elif self._timer.isActive():
+            # Hold the current frame; the animation resumes where it left off
+            self._anim.pause()
+            self._timer.stop()
+            self._governed_pause = True
+            self._static_frame = None
+            self.update()
         
     def _on_tick(self):
         """Timer tick - update angle for rotation effects"""
@@ -130,15 +168,31 @@ class AnimatedGradientBackground(QWidget):
     def paintEvent(self, event):
         """Paint the animated gradient background"""
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-        
         rect = self.rect()
         
         if not self._enabled:
             # Just fill with solid background color
             painter.fillRect(rect, self._bg_color)
             return
-            
+
+        if self._governed_pause:
+            # Static: blit the cached frame instead of recomputing gradients and paths
+            if self._static_frame is None or self._static_frame.size() != rect.size():
+                self._static_frame = QPixmap(rect.size())
+                self._static_frame.fill(Qt.GlobalColor.transparent)
+                frame_painter = QPainter(self._static_frame)
+                self._paint_frame(frame_painter, rect)
+                frame_painter.end()
+            painter.drawPixmap(0, 0, self._static_frame)
+            return
+
+        with self._governor.measure():
+            self._paint_frame(painter, rect)
+
+    def _paint_frame(self, painter, rect):
+        """Paint one frame of the gradient at the current animation state"""
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+
         # Fill base background first
         painter.fillRect(rect, self._bg_color)
         
@@ -19,6 +19,7 @@ from PySide6.QtWidgets import (
 )
 
 from employee_vault.config import IOS_INPUT_STYLE
+from employee_vault.ui.style_registry import apply_component_style, register_style, set_style_state
 
 
 class FloatingLabelLineEdit(QWidget):
@@ -401,6 +402,101 @@ class ModernValidatedInput(QWidget):
 # NEUMORPHIC GRADIENT INPUT FIELD
 # =============================================================================
 
+# Style blocks for the neumorphic inputs, applied once per widget. The floating
+# label only flips its "floating" property while it animates.
+_NEUMORPHIC_FLOATING_LABEL_QSS = """
+QLabel#neumorphicFloatingLabel {
+    color: rgba(255, 255, 255, 0.5);
+    font-size: 14px;
+    background: transparent;
+    padding-left: 12px;
+}
+QLabel#neumorphicFloatingLabel[floating="true"] {
+    color: rgba(74, 158, 255, 0.9);
+    font-size: 11px;
+    font-weight: bold;
+}
+"""
+
+register_style("neumorphic_line_edit", """
+QLineEdit#neumorphicInnerLineEdit {
+    background: transparent;
+    border: none;
+    color: #FFFFFF;
+    font-size: 14px;
+    padding: 12px 8px 12px 12px;
+    selection-background-color: rgba(74, 158, 255, 0.4);
+}
+QLineEdit#neumorphicInnerLineEdit:focus {
+    color: #FFFFFF;
+}
+QLineEdit#neumorphicInnerLineEdit:disabled {
+    color: rgba(255, 255, 255, 0.6);
+}
+""" + _NEUMORPHIC_FLOATING_LABEL_QSS)
+
+register_style("neumorphic_combo_box", """
+QComboBox#neumorphicInnerComboBox {
+    background: transparent;
+    border: none;
+    color: #FFFFFF;
+    font-size: 14px;
+    padding: 8px 12px;
+    selection-background-color: rgba(74, 158, 255, 0.4);
+}
+QComboBox#neumorphicInnerComboBox::drop-down {
+    border: none;
+    width: 30px;
+}
+QComboBox#neumorphicInnerComboBox::down-arrow {
+    image: none;
+    border-left: 5px solid transparent;
+    border-right: 5px solid transparent;
+    border-top: 6px solid rgba(255, 255, 255, 0.7);
+    width: 0px;
+    height: 0px;
+    margin-right: 8px;
+}
+QComboBox#neumorphicInnerComboBox:focus {
+    color: #FFFFFF;
+}
+QComboBox#neumorphicInnerComboBox:disabled {
+    color: rgba(255, 255, 255, 0.6);
+}
+
+/* Popup List Styling - Simple Dark Background (matches Agency dropdown) */
+QComboBox#neumorphicInnerComboBox QAbstractItemView {
+    background: rgba(30, 35, 45, 0.98);
+    border: 2px solid rgba(66, 165, 245, 0.8);
+    border-radius: 4px;
+    padding: 2px;
+    outline: none;
+    selection-background-color: rgba(66, 165, 245, 0.3);
+    color: white;
+}
+
+/* Individual Item Styling - With rounded backgrounds */
+QComboBox#neumorphicInnerComboBox QAbstractItemView::item {
+    min-height: 32px;
+    padding: 8px 14px;
+    border-radius: 8px;
+    color: white;
+    background: transparent;
+    margin: 2px 4px;
+}
+
+/* Hover Effect - Rounded blue background */
+QComboBox#neumorphicInnerComboBox QAbstractItemView::item:hover {
+    background-color: rgba(66, 165, 245, 0.25);
+}
+
+/* Selected Effect - Stronger rounded blue background */
+QComboBox#neumorphicInnerComboBox QAbstractItemView::item:selected {
+    background-color: rgba(66, 165, 245, 0.4);
+}
+""" + _NEUMORPHIC_FLOATING_LABEL_QSS)
+
+
 class NeumorphicGradientLineEdit(QWidget):
     def setCompleter(self, completer):
         self.line_edit.setCompleter(completer)
@@ -447,22 +543,7 @@ class NeumorphicGradientLineEdit(QWidget):
 
         self.line_edit = QLineEdit(self)
         self.line_edit.setObjectName("neumorphicInnerLineEdit")
-        self.line_edit.setStyleSheet("""
-            QLineEdit#neumorphicInnerLineEdit {
-                background: transparent;
-                border: none;
-                color: #FFFFFF;
-                font-size: 14px;
-                padding: 12px 8px 12px 12px;
-                selection-background-color: rgba(74, 158, 255, 0.4);
-            }
-            QLineEdit#neumorphicInnerLineEdit:focus {
-                color: #FFFFFF;
-            }
-            QLineEdit#neumorphicInnerLineEdit:disabled {
-                color: rgba(255, 255, 255, 0.6);
-            }
-        """)
+        apply_component_style(self, "neumorphic_line_edit")
         self.line_edit.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         margin = self._margin
         self.line_edit.setGeometry(margin, self._input_y, self.width() - margin * 2, self._input_height)
@@ -476,14 +557,8 @@ class NeumorphicGradientLineEdit(QWidget):
         self._floating_label = QLabel(placeholder, self)
         self._floating_label.setAttribute(Qt.WA_TransparentForMouseEvents)
         self._floating_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-        self._floating_label.setStyleSheet("""
-            QLabel {
-                color: rgba(255, 255, 255, 0.5);
-                font-size: 14px;
-                background: transparent;
-                padding-left: 12px;
-            }
-        """)
+        self._floating_label.setObjectName("neumorphicFloatingLabel")
+        self._floating_label.setProperty("floating", False)
         
         # === CHANGED: Use rest_y parameter ===
         self._floating_label.setGeometry(margin, int(self._rest_y), self.width() - margin * 2, 20)
@@ -594,25 +669,8 @@ class NeumorphicGradientLineEdit(QWidget):
         # === CHANGED: Adjust style change threshold to be dynamic ===
         threshold = (self._rest_y + self._float_y) / 2
         
-        if value < threshold:
-            self._floating_label.setStyleSheet("""
-                QLabel {
-                    color: rgba(74, 158, 255, 0.9);
-                    font-size: 11px;
-                    font-weight: bold;
-                    background: transparent;
-                    padding-left: 12px;
-                }
-            """)
-        else:
-            self._floating_label.setStyleSheet("""
-                QLabel {
-                    color: rgba(255, 255, 255, 0.5);
-                    font-size: 14px;
-                    background: transparent;
-                    padding-left: 12px;
-                }
-            """)
+        # Property flip only - re-polishes the label when it crosses the threshold
+        set_style_state(self._floating_label, "floating", value < threshold)
         self.update()
         
     label_y = Property(float, get_label_y, set_label_y)
@@ -734,15 +792,7 @@ class NeumorphicGradientLineEdit(QWidget):
             margin = self._margin
             width = max(self.width() - margin * 2, 100)
             self._floating_label.setGeometry(margin, int(self._float_y), width, 20)
-            self._floating_label.setStyleSheet("""
-                QLabel {
-                    color: rgba(74, 158, 255, 0.9);
-                    font-size: 11px;
-                    font-weight: bold;
-                    background: transparent;
-                    padding-left: 12px;
-                }
-            """)
+            set_style_state(self._floating_label, "floating", True)
 
     def text(self): return self.line_edit.text()
     def setText(self, text):
@@ -756,15 +806,7 @@ class NeumorphicGradientLineEdit(QWidget):
                 margin = self._margin
                 width = max(self.width() - margin * 2, 100)
                 self._floating_label.setGeometry(margin, int(self._float_y), width, 20)
-                self._floating_label.setStyleSheet("""
-                    QLabel {
-                        color: rgba(74, 158, 255, 0.9);
-                        font-size: 11px;
-                        font-weight: bold;
-                        background: transparent;
-                        padding-left: 12px;
-                    }
-                """)
+                set_style_state(self._floating_label, "floating", True)
     def setEchoMode(self, mode): self.line_edit.setEchoMode(mode)
     def setPlaceholderText(self, text): self._placeholder = text; self._floating_label.setText(text)
     def setMaxLength(self, length): self.line_edit.setMaxLength(length)
@@ -817,6 +859,7 @@ class NeumorphicGradientComboBox(QWidget):
         # Create combo box
         self.combo_box = QComboBox(self)
         self.combo_box.setObjectName("neumorphicInnerComboBox")
+        apply_component_style(self, "neumorphic_combo_box")
 
         # Enable transparency for rounded corners - deferred to avoid initialization issues
         self._transparency_configured = False
@@ -860,66 +903,6 @@ class NeumorphicGradientComboBox(QWidget):
         self.combo_box.showPopup = showPopup_with_transparency
         self.combo_box.hidePopup = hidePopup_stop_animation
 
-        self.combo_box.setStyleSheet("""
-            QComboBox#neumorphicInnerComboBox {
-                background: transparent;
-                border: none;
-                color: #FFFFFF;
-                font-size: 14px;
-                padding: 8px 12px;
-                selection-background-color: rgba(74, 158, 255, 0.4);
-            }
-            QComboBox#neumorphicInnerComboBox::drop-down {
-                border: none;
-                width: 30px;
-            }
-            QComboBox#neumorphicInnerComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 6px solid rgba(255, 255, 255, 0.7);
-                width: 0px;
-                height: 0px;
-                margin-right: 8px;
-            }
-            QComboBox#neumorphicInnerComboBox:focus {
-                color: #FFFFFF;
-            }
-            QComboBox#neumorphicInnerComboBox:disabled {
-                color: rgba(255, 255, 255, 0.6);
-            }
-
-            /* Popup List Styling - Simple Dark Background (matches Agency dropdown) */
-            QComboBox QAbstractItemView {
-                background: rgba(30, 35, 45, 0.98);
-                border: 2px solid rgba(66, 165, 245, 0.8);
-                border-radius: 4px;
-                padding: 2px;
-                outline: none;
-                selection-background-color: rgba(66, 165, 245, 0.3);
-                color: white;
-            }
-
-            /* Individual Item Styling - With rounded backgrounds */
-            QComboBox QAbstractItemView::item {
-                min-height: 32px;
-                padding: 8px 14px;
-                border-radius: 8px;
-                color: white;
-                background: transparent;
-                margin: 2px 4px;
-            }
-
-            /* Hover Effect - Rounded blue background */
-            QComboBox QAbstractItemView::item:hover {
-                background-color: rgba(66, 165, 245, 0.25);
-            }
-
-            /* Selected Effect - Stronger rounded blue background */
-            QComboBox QAbstractItemView::item:selected {
-                background-color: rgba(66, 165, 245, 0.4);
-            }
-        """)
         margin = self._margin
         self.combo_box.setGeometry(margin, self._input_y, self.width() - margin * 2, self._input_height)
         self.combo_box.currentIndexChanged.connect(self._on_selection_changed)
@@ -934,14 +917,8 @@ class NeumorphicGradientComboBox(QWidget):
         self._floating_label = QLabel(placeholder, self)
         self._floating_label.setAttribute(Qt.WA_TransparentForMouseEvents)
         self._floating_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-        self._floating_label.setStyleSheet("""
-            QLabel {
-                color: rgba(255, 255, 255, 0.5);
-                font-size: 14px;
-                background: transparent;
-                padding-left: 12px;
-            }
-        """)
+        self._floating_label.setObjectName("neumorphicFloatingLabel")
+        self._floating_label.setProperty("floating", False)
         self._floating_label.setGeometry(margin, int(self._rest_y), self.width() - margin * 2, 20)
 
         # Lazy animation initialization
@@ -1076,25 +1053,8 @@ class NeumorphicGradientComboBox(QWidget):
 
         threshold = (self._rest_y + self._float_y) / 2
 
-        if value < threshold:
-            self._floating_label.setStyleSheet("""
-                QLabel {
-                    color: rgba(74, 158, 255, 0.9);
-                    font-size: 11px;
-                    font-weight: bold;
-                    background: transparent;
-                    padding-left: 12px;
-                }
-            """)
-        else:
-            self._floating_label.setStyleSheet("""
-                QLabel {
-                    color: rgba(255, 255, 255, 0.5);
-                    font-size: 14px;
-                    background: transparent;
-                    padding-left: 12px;
-                }
-            """)
+        # Property flip only - re-polishes the label when it crosses the threshold
+        set_style_state(self._floating_label, "floating", value < threshold)
         self.update()
 
     label_y = Property(float, get_label_y, set_label_y)
@@ -1220,15 +1180,7 @@ class NeumorphicGradientComboBox(QWidget):
             margin = self._margin
             width = max(self.width() - margin * 2, 100)
             self._floating_label.setGeometry(margin, int(self._float_y), width, 20)
-            self._floating_label.setStyleSheet("""
-                QLabel {
-                    color: rgba(74, 158, 255, 0.9);
-                    font-size: 11px;
-                    font-weight: bold;
-                    background: transparent;
-                    padding-left: 12px;
-                }
-            """)
+            set_style_state(self._floating_label, "floating", True)
 
     # API compatibility methods
     def addItem(self, text, data=None):
@@ -1336,6 +1288,54 @@ class NeumorphicGradientPasswordInput(NeumorphicGradientLineEdit):
     toggle_scale = Property(float, get_toggle_scale, set_toggle_scale)
 
 
+register_style("neumorphic_text_edit", """
+QTextEdit#neumorphicInnerTextEdit {
+    background: transparent;
+    border: none;
+    color: rgba(255, 255, 255, 0.95);
+    font-size: 14px;
+    padding: 4px 8px;
+    selection-background-color: rgba(74, 158, 255, 0.3);
+    outline: none;
+}
+QTextEdit#neumorphicInnerTextEdit:focus {
+    outline: none;
+}
+QTextEdit#neumorphicInnerTextEdit QScrollBar:vertical {
+    background: rgba(255, 255, 255, 0.05);
+    width: 8px;
+    border-radius: 4px;
+    margin: 2px;
+}
+QTextEdit#neumorphicInnerTextEdit QScrollBar::handle:vertical {
+    background: rgba(74, 158, 255, 0.4);
+    border-radius: 4px;
+    min-height: 20px;
+}
+QTextEdit#neumorphicInnerTextEdit QScrollBar::handle:vertical:hover {
+    background: rgba(74, 158, 255, 0.6);
+}
+QTextEdit#neumorphicInnerTextEdit QScrollBar::add-line:vertical,
+QTextEdit#neumorphicInnerTextEdit QScrollBar::sub-line:vertical {
+    height: 0px;
+}
+QLabel#neumorphicTextEditLabel {
+    color: rgba(255, 255, 255, 0.5);
+    font-size: 13px;
+    background: transparent;
+    padding: 0px 4px;
+}
+QLabel#neumorphicTextEditLabelBg {
+    background: qlineargradient(
+        x1:0, y1:0, x2:0, y2:1,
+        stop:0 rgba(28, 28, 35, 0.9),
+        stop:1 rgba(28, 28, 35, 0.0)
+    );
+    border-radius: 4px;
+}
+""")
+
+
 class NeumorphicGradientTextEdit(QWidget):
     """
     Modern multi-line text input with floating label and rotating gradient border.
@@ -1398,65 +1398,20 @@ class NeumorphicGradientTextEdit(QWidget):
 
         # Text Edit widget
         self.text_edit = QTextEdit(self)
+        self.text_edit.setObjectName("neumorphicInnerTextEdit")
         self.text_edit.setPlaceholderText("")  # We handle placeholder via label
-        self.text_edit.setStyleSheet("""
-            QTextEdit {
-                background: transparent;
-                border: none;
-                color: rgba(255, 255, 255, 0.95);
-                font-size: 14px;
-                padding: 4px 8px;
-                selection-background-color: rgba(74, 158, 255, 0.3);
-                outline: none;
-            }
-            QTextEdit:focus {
-                outline: none;
-            }
-            QScrollBar:vertical {
-                background: rgba(255, 255, 255, 0.05);
-                width: 8px;
-                border-radius: 4px;
-                margin: 2px;
-            }
-            QScrollBar::handle:vertical {
-                background: rgba(74, 158, 255, 0.4);
-                border-radius: 4px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: rgba(74, 158, 255, 0.6);
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-        """)
         self.text_edit.installEventFilter(self)
 
         # Label (floating)
         self.label = QLabel(placeholder, self)
-        self.label.setStyleSheet("""
-            QLabel {
-                color: rgba(255, 255, 255, 0.5);
-                font-size: 13px;
-                background: transparent;
-                padding: 0px 4px;
-            }
-        """)
+        self.label.setObjectName("neumorphicTextEditLabel")
         self.label.setAttribute(Qt.WA_TransparentForMouseEvents)
 
         # Label background for readability when floated
         self.label_bg = QLabel(self)
-        self.label_bg.setStyleSheet("""
-            QLabel {
-                background: qlineargradient(
-                    x1:0, y1:0, x2:0, y2:1,
-                    stop:0 rgba(28, 28, 35, 0.9),
-                    stop:1 rgba(28, 28, 35, 0.0)
-                );
-                border-radius: 4px;
-            }
-        """)
+        self.label_bg.setObjectName("neumorphicTextEditLabelBg")
         self.label_bg.setAttribute(Qt.WA_TransparentForMouseEvents)
+        apply_component_style(self, "neumorphic_text_edit")
         self.label_bg.hide()
 
         # Animations - lazy initialization
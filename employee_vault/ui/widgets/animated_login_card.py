@@ -16,6 +16,8 @@ from PySide6.QtWidgets import (
     QPushButton, QCheckBox, QApplication, QGraphicsOpacityEffect, QSizePolicy
 )
 
+from employee_vault.ui.frame_governor import get_frame_governor
+
 # Import RippleEffect for modern button interactions
 try:
     from employee_vault.ui.widgets.advanced_effects import RippleEffect
@@ -234,6 +236,11 @@ class AnimatedLoginCard(QWidget):
         self.glow_timer.timeout.connect(self._update_button_glow_tick)
         self.glow_timer.start(50)
 
+        # Both loops are decorative - the frame governor pauses / slows them
+        self._frame_governor = get_frame_governor()
+        self._frame_governor.add_animation(self.border_anim)
+        self._frame_governor.add_timer(self.glow_timer, 50)
+
         # Loading state
         self.is_loading = False
         self.loading_angle = 0
@@ -696,15 +703,18 @@ class AnimatedLoginCard(QWidget):
         """Called when widget becomes visible - ensure all animations are running"""
         super().showEvent(event)
         
-        # Ensure border animation is running
-        if hasattr(self, 'border_anim'):
-            if self.border_anim.state() != QVariantAnimation.State.Running:
+        if hasattr(self, '_frame_governor'):
+            self._frame_governor.watch_window(self.window())
+
+        # Ensure border animation is running (unless the frame governor holds it)
+        if hasattr(self, 'border_anim') and self._frame_governor.allows_motion():
+            if self.border_anim.state() == QVariantAnimation.State.Stopped:
                 self.border_anim.start()
         
         # Ensure glow timer is running
-        if hasattr(self, 'glow_timer'):
+        if hasattr(self, 'glow_timer') and self._frame_governor.allows_motion():
             if not self.glow_timer.isActive():
-                self.glow_timer.start(50)
+                self.glow_timer.start(self._frame_governor.frame_interval(50))
         
         # Force initial repaint
         self.update()
@@ -1029,6 +1039,10 @@ class AnimatedLoginCard(QWidget):
 
     def paintEvent(self, event):
         """Custom paint: frosted glass background + animated border with glow effect (v2.0)"""
+        with self._frame_governor.measure():
+            self._paint_card(event)
+
+    def _paint_card(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
@@ -66,9 +66,10 @@ class ContractExpiryChecker(QObject):
         Returns:
             List of employee dictionaries with expiring contracts
         """
+        from employee_vault.config import ALERT_DAYS
+        from employee_vault.alert_engine import evaluate_alerts, RULE_CONTRACT_EXPIRING
+
         expiring = []
-        today = datetime.now()
-        warning_date = today + timedelta(days=self.warning_days)
 
         try:
             # Query employees with contract_expiry dates
@@ -80,29 +81,23 @@ class ContractExpiryChecker(QObject):
                   AND resign_date IS NULL
             """).fetchall()
 
-            for row in rows:
-                try:
-                    # Parse contract expiry date
-                    expiry_str = row['contract_expiry']
-                    expiry_date = datetime.strptime(expiry_str, "%Y-%m-%d")
-
-                    # Check if expiring within warning period
-                    if today <= expiry_date <= warning_date:
-                        days_until_expiry = (expiry_date - today).days
-
-                        expiring.append({
-                            'emp_id': row['emp_id'],
-                            'name': row['name'],
-                            'position': row['position'] or 'N/A',
-                            'department': row['department'] or 'N/A',
-                            'contract_expiry': expiry_str,
-                            'days_until_expiry': days_until_expiry,
-                            'agency': row['agency'] or 'Direct Hire'
-                        })
-
-                except (ValueError, TypeError) as e:
-                    logging.warning(f"Invalid date format for {row['emp_id']}: {e}")
+            # Same date rules as the alert engine (contract_expiry is MM-DD-YYYY)
+            # Evaluated over the widest window, so a warning_days above ALERT_DAYS is honoured
+            alerts = evaluate_alerts([dict(row) for row in rows], check_photos=False,
+                                     expiring_days=max(self.warning_days, ALERT_DAYS))
+            for alert in alerts.values():
+                if alert['rule'] != RULE_CONTRACT_EXPIRING or alert['days_left'] > self.warning_days:
                     continue
+                row = alert['employee']
+                expiring.append({
+                    'emp_id': row['emp_id'],
+                    'name': row['name'],
+                    'position': row['position'] or 'N/A',
+                    'department': row['department'] or 'N/A',
+                    'contract_expiry': row['contract_expiry'],
+                    'days_until_expiry': alert['days_left'],
+                    'agency': row['agency'] or 'Direct Hire'
+                })
 
         except Exception as e:
             logging.error(f"Database error getting expiring contracts: {e}")
@@ -13,6 +13,8 @@ from PySide6.QtWidgets import (
     QVBoxLayout, QLabel, QPushButton
 )
 
+from employee_vault.ui.frame_governor import get_frame_governor
+
 
 class GlassPanel(QFrame):
     """
@@ -35,8 +37,9 @@ class GlassPanel(QFrame):
             }}
         """)
 
-        # Subtle shadow for depth
+        # Subtle shadow for depth (9-patch pixmap when the frame governor is at its static level)
         self.setGraphicsEffect(self._create_shadow())
+        get_frame_governor().add_shadow(self, corner_radius=16)
 
     def _create_shadow(self):
         """Create subtle shadow effect"""
@@ -108,6 +111,7 @@ class GlassPanelDark(QFrame):
         shadow.setOffset(0, 5)
         shadow.setColor(QColor(0, 0, 0, 100))
         self.setGraphicsEffect(shadow)
+        get_frame_governor().add_shadow(self, corner_radius=16)
 
     def paintEvent(self, event):
         """Custom paint for dark glass effect"""
@@ -421,6 +425,7 @@ class GlassmorphicButton(QPushButton):
         shadow.setOffset(0, 4)
         shadow.setColor(QColor(0, 0, 0, 80))
         self.setGraphicsEffect(shadow)
+        get_frame_governor().add_shadow(self, corner_radius=22)
 
         # Get current theme's animation profile
         try:
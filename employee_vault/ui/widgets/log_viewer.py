@@ -5,34 +5,101 @@ Admin-only widget for viewing application logs in real-time
 
 import logging
 import os
+import shutil
+from collections import deque
 from datetime import datetime
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton,
+    QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton,
     QLabel, QCheckBox, QFileDialog
 )
-from PySide6.QtCore import Qt, Signal, QObject, QTimer
-from PySide6.QtGui import QColor, QTextCursor, QTextCharFormat
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QColor, QTextCharFormat, QSyntaxHighlighter
+
+from employee_vault.utils.log_queue import attach_handler, detach_handler, get_log_files
+
+# Records kept in memory for export / crash dumps
+LOG_BUFFER_SIZE = 5000
+# Lines kept in the view (older blocks are discarded by Qt)
+LOG_VIEW_MAX_BLOCKS = 2000
+# Pending records are flushed into the view at most this often
+LOG_FLUSH_INTERVAL_MS = 100
+
+# Level -> (line prefix, color)
+_LEVEL_STYLES = (
+    (logging.CRITICAL, "🔴 ", QColor(156, 39, 176)),  # Purple
+    (logging.ERROR, "❌ ", QColor(244, 67, 54)),  # Red
+    (logging.WARNING, "⚠️ ", QColor(255, 152, 0)),  # Orange
+    (logging.NOTSET, "ℹ️ ", QColor(74, 158, 255)),  # Blue
+)
 
 
-class LogSignal(QObject):
-    """Qt Signal emitter for log messages"""
-    log_message = Signal(str, int)  # message, level
+def _level_prefix(level: int) -> str:
+    for threshold, prefix, _ in _LEVEL_STYLES:
+        if level >= threshold:
+            return prefix
+    return _LEVEL_STYLES[-1][1]
 
 
 class LogHandler(logging.Handler):
-    """Custom logging handler that emits Qt signals"""
-    def __init__(self, signal_emitter):
+    """
+    Logging handler that collects formatted records into ring buffers.
+
+    Runs on the log listener thread; the viewer drains `pending` on a timer,
+    so no Qt signal is emitted per record.
+    """
+    def __init__(self, buffer_size: int = LOG_BUFFER_SIZE, pending_size: int = LOG_VIEW_MAX_BLOCKS - 1):
         super().__init__()
-        self.signal_emitter = signal_emitter
+        self.buffer = deque(maxlen=buffer_size)  # (level, message) for export
+        self.pending = deque(maxlen=pending_size)  # lines not yet shown
+        self.dropped = 0  # pending lines evicted before they were shown
 
     def emit(self, record):
-        """Emit log record as Qt signal"""
         try:
             msg = self.format(record)
-            self.signal_emitter.log_message.emit(msg, record.levelno)
+            self.buffer.append((record.levelno, msg))
+            if len(self.pending) == self.pending.maxlen:
+                self.dropped += 1
+            self.pending.append(_level_prefix(record.levelno) + msg)
         except Exception:
             self.handleError(record)
 
+    def take_pending(self):
+        """Return (lines, dropped) and clear the lines waiting to be displayed"""
+        self.acquire()
+        try:
+            lines = list(self.pending)
+            self.pending.clear()
+            dropped, self.dropped = self.dropped, 0
+            return lines, dropped
+        finally:
+            self.release()
+
+    def snapshot(self):
+        """Copy of the ring buffer as (level, message) tuples"""
+        self.acquire()
+        try:
+            return list(self.buffer)
+        finally:
+            self.release()
+
+
+class LogLevelHighlighter(QSyntaxHighlighter):
+    """Colors each line by the level prefix LogHandler puts in front of it"""
+
+    def __init__(self, document):
+        super().__init__(document)
+        self._formats = []
+        for _, prefix, color in _LEVEL_STYLES:
+            fmt = QTextCharFormat()
+            fmt.setForeground(color)
+            self._formats.append((prefix, fmt))
+
+    def highlightBlock(self, text):
+        for prefix, fmt in self._formats:
+            if text.startswith(prefix):
+                self.setFormat(0, len(text), fmt)
+                return
+
 
 class LogViewerWidget(QWidget):
     """
@@ -43,24 +110,22 @@ class LogViewerWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.auto_scroll = True
-        self.log_buffer = []  # Store all logs for export
 
         # Setup UI
         self._setup_ui()
 
-        # Setup logging handler
-        self.log_signal = LogSignal()
-        self.log_handler = LogHandler(self.log_signal)
+        # Setup logging handler (runs on the log listener thread)
+        self.log_handler = LogHandler()
         self.log_handler.setFormatter(logging.Formatter(
             '%(asctime)s - %(levelname)s - %(message)s',
             datefmt='%H:%M:%S'
         ))
+        attach_handler(self.log_handler)
 
-        # Connect signal to slot
-        self.log_signal.log_message.connect(self._append_log)
-
-        # Add handler to root logger
-        logging.getLogger().addHandler(self.log_handler)
+        # Coalesce appends: one batch per tick instead of one insert per record
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self._flush_pending)
+        self.flush_timer.start(LOG_FLUSH_INTERVAL_MS)
 
     def _setup_ui(self):
         """Setup the log viewer UI"""
@@ -134,10 +199,14 @@ class LogViewerWidget(QWidget):
         layout.addLayout(header)
 
         # Log text area
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setUndoRedoEnabled(False)
+        self.log_text.setMaximumBlockCount(LOG_VIEW_MAX_BLOCKS)
+        self.log_text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.highlighter = LogLevelHighlighter(self.log_text.document())
         self.log_text.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background: rgba(20, 25, 30, 0.95);
                 border: 2px solid rgba(74, 158, 255, 0.3);
                 border-radius: 8px;
@@ -158,41 +227,20 @@ class LogViewerWidget(QWidget):
         legend.addStretch()
         layout.addLayout(legend)
 
-    def _append_log(self, message, level):
-        """Append log message with color coding"""
-        # Store in buffer
-        self.log_buffer.append(message)
-
-        # Color based on level
-        if level >= logging.CRITICAL:
-            color = QColor(156, 39, 176)  # Purple
-            prefix = "🔴 "
-        elif level >= logging.ERROR:
-            color = QColor(244, 67, 54)  # Red
-            prefix = "❌ "
-        elif level >= logging.WARNING:
-            color = QColor(255, 152, 0)  # Orange
-            prefix = "⚠️ "
-        else:
-            color = QColor(74, 158, 255)  # Blue
-            prefix = "ℹ️ "
-
-        # Format and append
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(QTextCursor.End)
-
-        # Set color
-        fmt = QTextCharFormat()
-        fmt.setForeground(color)
-        cursor.setCharFormat(fmt)
-
-        # Insert text
-        cursor.insertText(prefix + message + "\n")
+    def _flush_pending(self):
+        """Append every record that arrived since the last tick in one batch"""
+        lines, dropped = self.log_handler.take_pending()
+        if not lines:
+            return
+        if dropped:
+            lines.insert(0, f"⚠️ ... {dropped} earlier line(s) skipped (see export)")
+
+        self.log_text.appendPlainText("\n".join(lines))
 
         # Auto-scroll if enabled
         if self.auto_scroll:
-            self.log_text.setTextCursor(cursor)
-            self.log_text.ensureCursorVisible()
+            scrollbar = self.log_text.verticalScrollBar()
+            scrollbar.setValue(scrollbar.maximum())
 
     def _toggle_auto_scroll(self, checked):
         """Toggle auto-scroll"""
@@ -216,15 +264,28 @@ class LogViewerWidget(QWidget):
 
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(f"EmployeeVault Logs - Exported at {datetime.now()}\n")
-                    f.write("=" * 80 + "\n\n")
-                    f.write("\n".join(self.log_buffer))
-
+                self._write_export(filename)
                 logging.info(f"Logs exported to: {filename}")
             except Exception as e:
                 logging.error(f"Failed to export logs: {e}")
 
+    def _write_export(self, filename):
+        """
+        Stream logs to filename without building them in memory: the rotated
+        log files (oldest first) when file logging is active, otherwise the
+        in-memory ring buffer.
+        """
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(f"EmployeeVault Logs - Exported at {datetime.now()}\n")
+            f.write("=" * 80 + "\n\n")
+
+            log_files = get_log_files()
+            for path in log_files:
+                with open(path, 'r', encoding='utf-8', errors='replace') as src:
+                    shutil.copyfileobj(src, f)
+            if not log_files:
+                f.writelines(f"{msg}\n" for _, msg in self.log_handler.snapshot())
+
     def auto_export_on_crash(self):
         """Auto-export logs on application crash"""
         logs_dir = "logs"
@@ -237,7 +298,7 @@ class LogViewerWidget(QWidget):
             with open(crash_log, 'w', encoding='utf-8') as f:
                 f.write(f"EmployeeVault Crash Log - {datetime.now()}\n")
                 f.write("=" * 80 + "\n\n")
-                f.write("\n".join(self.log_buffer))
+                f.writelines(f"{msg}\n" for _, msg in self.log_handler.snapshot())
 
             return crash_log
         except Exception as e:
@@ -247,5 +308,6 @@ class LogViewerWidget(QWidget):
     def closeEvent(self, event):
         """Auto-export logs when widget is closed"""
         # Remove handler to prevent memory leaks
-        logging.getLogger().removeHandler(self.log_handler)
+        self.flush_timer.stop()
+        detach_handler(self.log_handler)
         super().closeEvent(event)
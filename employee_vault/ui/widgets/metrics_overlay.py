@@ -0,0 +1,223 @@
+"""
+Performance Diagnostics Overlay
+Admin-only panel over the main window showing the metrics registry:
+p50/p95/p99 per operation, counters and the slowest individual calls,
+with export to JSON or CSV for field diagnosis.
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, Optional
+
+from PySide6.QtWidgets import (
+    QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QHeaderView, QAbstractItemView, QFileDialog, QTabWidget
+)
+from PySide6.QtCore import Qt, QTimer
+
+from employee_vault.metrics import get_metrics
+
+# The tables are refreshed this often while the overlay is visible
+OVERLAY_REFRESH_MS = 1000
+# Rows shown in the slowest-calls tab
+OVERLAY_SLOWEST_ROWS = 25
+
+_OPERATION_COLUMNS = ["Operation", "Count", "p50 ms", "p95 ms", "p99 ms", "Max ms", "Total ms"]
+_SLOWEST_COLUMNS = ["Time", "Operation", "ms", "Detail"]
+
+
+class MetricsOverlay(QFrame):
+    """
+    Floating diagnostics panel anchored to the top-right of its parent.
+
+    status_provider() may return extra "key: value" text for the header
+    (read replica freshness, animation level, ...).
+    """
+
+    def __init__(self, parent=None, status_provider: Optional[Callable[[], str]] = None):
+        super().__init__(parent)
+        self.setObjectName("metricsOverlay")
+        self._status_provider = status_provider
+        self._setup_ui()
+        self.hide()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        if parent is not None:
+            parent.installEventFilter(self)
+
+    def _setup_ui(self):
+        self.setStyleSheet("""
+            QFrame#metricsOverlay {
+                background: rgba(20, 25, 30, 0.94);
+                border: 1.5px solid rgba(74, 158, 255, 0.5);
+                border-radius: 10px;
+            }
+            QLabel { color: rgba(255, 255, 255, 0.9); background: transparent; }
+            QTableWidget {
+                background: transparent;
+                color: rgba(255, 255, 255, 0.9);
+                gridline-color: rgba(255, 255, 255, 0.08);
+                border: none;
+                font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+                font-size: 11px;
+            }
+            QHeaderView::section {
+                background: rgba(74, 158, 255, 0.25);
+                color: white;
+                border: none;
+                padding: 3px 6px;
+            }
+            QPushButton {
+                background: rgba(74, 158, 255, 0.35);
+                border: 1px solid rgba(74, 158, 255, 0.6);
+                border-radius: 6px;
+                color: white;
+                padding: 4px 12px;
+            }
+            QPushButton:hover { background: rgba(74, 158, 255, 0.55); }
+        """)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(6)
+
+        header = QHBoxLayout()
+        title = QLabel("📈 Performance (Admin Only)")
+        title.setStyleSheet("font-size: 14px; font-weight: bold;")
+        header.addWidget(title)
+        header.addStretch()
+        for text, slot in (("💾 JSON", self._export_json), ("💾 CSV", self._export_csv),
+                           ("↺ Reset", self._reset), ("✕", self.hide)):
+            btn = QPushButton(text)
+            btn.clicked.connect(slot)
+            header.addWidget(btn)
+        layout.addLayout(header)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("font-size: 11px; color: rgba(255, 255, 255, 0.6);")
+        layout.addWidget(self.status_label)
+
+        self.tabs = QTabWidget()
+        self.operations_table = self._make_table(_OPERATION_COLUMNS)
+        self.slowest_table = self._make_table(_SLOWEST_COLUMNS)
+        self.counters_table = self._make_table(["Counter", "Value"])
+        self.tabs.addTab(self.operations_table, "Operations")
+        self.tabs.addTab(self.slowest_table, "Slowest calls")
+        self.tabs.addTab(self.counters_table, "Counters")
+        layout.addWidget(self.tabs)
+
+    def _make_table(self, columns):
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionMode(QAbstractItemView.NoSelection)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    # ------------------------------------------------------------------
+    # Show / position
+    # ------------------------------------------------------------------
+
+    def toggle(self):
+        if self.isVisible():
+            self.hide()
+        else:
+            self.show()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._reposition()
+        self.raise_()
+        self.refresh()
+        self.refresh_timer.start(OVERLAY_REFRESH_MS)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def eventFilter(self, obj, event):
+        if obj is self.parentWidget() and event.type() == event.Type.Resize and self.isVisible():
+            self._reposition()
+        return False
+
+    def _reposition(self):
+        parent = self.parentWidget()
+        if parent is None:
+            return
+        width = min(760, max(420, parent.width() - 40))
+        height = min(520, max(300, parent.height() - 80))
+        self.setGeometry(parent.width() - width - 20, 60, width, height)
+
+    # ------------------------------------------------------------------
+    # Data
+    # ------------------------------------------------------------------
+
+    def refresh(self):
+        registry = get_metrics()
+        operations = registry.snapshot()
+        self._fill(self.operations_table, [
+            [row['name'], row['count'], row['p50_ms'], row['p95_ms'], row['p99_ms'], row['max_ms'], row['total_ms']]
+            for row in operations
+        ])
+        self._fill(self.slowest_table, [
+            [entry['time'][11:], entry['name'], entry['ms'], entry['detail']]
+            for entry in registry.slowest(OVERLAY_SLOWEST_ROWS)
+        ])
+        self._fill(self.counters_table, [[name, value] for name, value in sorted(registry.counters().items())])
+
+        status = f"Since {registry.started.strftime('%H:%M:%S')} · {len(operations)} operations"
+        if self._status_provider is not None:
+            try:
+                extra = self._status_provider()
+                if extra:
+                    status += f" · {extra}"
+            except Exception as e:
+                logging.debug(f"Metrics overlay status failed: {e}")
+        self.status_label.setText(status)
+
+    def _fill(self, table: QTableWidget, rows):
+        table.setUpdatesEnabled(False)
+        try:
+            table.setRowCount(len(rows))
+            for r, values in enumerate(rows):
+                for c, value in enumerate(values):
+                    text = f"{value:.2f}" if isinstance(value, float) else str(value)
+                    item = table.item(r, c)
+                    if item is None:
+                        item = QTableWidgetItem()
+                        if not isinstance(value, str):
+                            item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                        table.setItem(r, c, item)
+                    item.setText(text)
+        finally:
+            table.setUpdatesEnabled(True)
+
+    # ------------------------------------------------------------------
+    # Actions
+    # ------------------------------------------------------------------
+
+    def _export(self, extension: str, file_filter: str, writer):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Export Performance Metrics",
+            f"employee_vault_metrics_{timestamp}.{extension}", file_filter
+        )
+        if filename:
+            try:
+                writer(filename)
+                logging.info(f"Performance metrics exported to: {filename}")
+            except Exception as e:
+                logging.error(f"Failed to export performance metrics: {e}")
+
+    def _export_json(self):
+        self._export("json", "JSON Files (*.json);;All Files (*.*)", get_metrics().export_json)
+
+    def _export_csv(self):
+        self._export("csv", "CSV Files (*.csv);;All Files (*.*)", get_metrics().export_csv)
+
+    def _reset(self):
+        get_metrics().reset()
+        self.refresh()
@@ -291,71 +291,19 @@ class NotificationCenter(QWidget):
         """)
         self.container_layout.insertWidget(0, self.empty_label)
         
-        # Timer for periodic checks
-        self.check_timer = QTimer(self)
-        self.check_timer.timeout.connect(self.check_contract_expiry)
-        self.check_timer.setInterval(5 * 60 * 1000)  # Check every 5 minutes
-        
-        # Initial check after 3 seconds
-        QTimer.singleShot(3000, self.check_contract_expiry)
-        
-    def start_monitoring(self):
-        """Start monitoring for notifications"""
-        self.check_timer.start()
-        logging.info("Notification center monitoring started")
-        
-    def stop_monitoring(self):
-        """Stop monitoring"""
-        self.check_timer.stop()
-        
-    def check_contract_expiry(self):
-        """Check for expiring contracts and create notifications"""
+    def show_contract_alerts(self, expired: List[dict], expiring: List[dict]):
+        """
+        Create notifications from the alert engine's contract alerts.
+        Called by the main window whenever the engine publishes a new alert set.
+        """
         try:
-            today = datetime.now()
-            
-            # Query employees with contract_expiry dates
-            rows = self.db.conn.execute("""
-                SELECT emp_id, name, position, department, contract_expiry, agency
-                FROM employees
-                WHERE contract_expiry IS NOT NULL
-                  AND contract_expiry != ''
-                  AND resign_date IS NULL
-                ORDER BY contract_expiry ASC
-            """).fetchall()
-            
-            expired_count = 0
-            expiring_soon = []
-            
-            for row in rows:
-                try:
-                    expiry_str = row['contract_expiry']
-                    # Try different date formats
-                    expiry_date = None
-                    for fmt in ["%Y-%m-%d", "%m-%d-%Y", "%d-%m-%Y"]:
-                        try:
-                            expiry_date = datetime.strptime(expiry_str, fmt)
-                            break
-                        except ValueError:
-                            continue
-                    
-                    if not expiry_date:
-                        continue
-                        
-                    days_left = (expiry_date - today).days
-                    
-                    if days_left < 0:
-                        expired_count += 1
-                    elif days_left <= 30:
-                        expiring_soon.append({
-                            'emp_id': row['emp_id'],
-                            'name': row['name'],
-                            'days_left': days_left,
-                            'expiry_date': expiry_str
-                        })
-                        
-                except Exception as e:
-                    logging.warning(f"Date parse error: {e}")
-                    continue
+            expired_count = len(expired)
+            expiring_soon = [{
+                'emp_id': a['emp_id'],
+                'name': a['name'],
+                'days_left': a['days_left'],
+                'expiry_date': a.get('expiry_date')
+            } for a in expiring]
             
             # Add notifications
             if expired_count > 0:
@@ -30,6 +30,7 @@ from PySide6.QtGui import (
 
 from employee_vault.config import PASSWORD_MIN_LENGTH, validate_password_strength, load_theme_preference, MODERN_THEMES
 from employee_vault.database import DB
+from employee_vault.ui.style_registry import apply_component_style, register_style, set_style_state
 
 # ======================================================================
 # GLOBAL CURSOR UTILITIES - Remove Distracting Hand Cursor
@@ -3055,6 +3056,89 @@ class ModernCalendarWidget(QCalendarWidget):
 # CalendarPopup - Modern glassmorphism calendar with animations
 # ======================================================================
 
+def _calendar_day_qss(theme_name: str, is_light: bool) -> str:
+    """Day-button rules for CalendarPopup; the state lives in the dayState property"""
+    theme = MODERN_THEMES.get(theme_name, MODERN_THEMES.get("default", MODERN_THEMES[list(MODERN_THEMES.keys())[0]]))
+    primary = theme.get('primary', '#4a9eff')
+    primary_dark = theme.get('primary_dark', primary)
+
+    # Theme-aware colors (same dark/light split as CalendarPopup)
+    if theme_name.lower() in ['dark', 'midnight', 'ocean', 'default']:
+        text_color = "white"
+        disabled_color = "rgba(255, 255, 255, 0.35)"
+        hover_bg = f"{primary}35"
+        press_bg = f"{primary}50"
+        tile_bg = "rgba(255, 255, 255, 0.06)"
+    else:
+        text_color = "#1a1a2e"
+        disabled_color = "rgba(0, 0, 0, 0.3)"
+        hover_bg = f"{primary}25"
+        press_bg = f"{primary}40"
+        tile_bg = "rgba(0, 0, 0, 0.04)"
+
+    return f"""
+        QWidget#calendarGrid {{
+            background: transparent;
+        }}
+        /* Other-month days, very subtle */
+        QPushButton#calendarDay {{
+            background: transparent;
+            border: none;
+            border-radius: 17px;
+            color: {disabled_color};
+            font-size: 11px;
+            font-weight: 400;
+        }}
+        /* Normal day: clean tile */
+        QPushButton#calendarDay[dayState="normal"] {{
+            background: {tile_bg};
+            border: 1px solid transparent;
+            color: {text_color};
+            font-size: 12px;
+            font-weight: 500;
+        }}
+        QPushButton#calendarDay[dayState="normal"]:hover {{
+            background: {hover_bg};
+            border: 1px solid {primary}30;
+        }}
+        QPushButton#calendarDay[dayState="normal"]:pressed {{
+            background: {press_bg};
+        }}
+        /* Today: ring outline */
+        QPushButton#calendarDay[dayState="today"] {{
+            background: transparent;
+            border: 2px solid {primary};
+            color: {primary};
+            font-size: 12px;
+            font-weight: 600;
+        }}
+        QPushButton#calendarDay[dayState="today"]:hover {{
+            background: {hover_bg};
+        }}
+        QPushButton#calendarDay[dayState="today"]:pressed {{
+            background: {press_bg};
+        }}
+        /* Selected: solid accent */
+        QPushButton#calendarDay[dayState="selected"] {{
+            background: {primary};
+            border: none;
+            color: white;
+            font-size: 12px;
+            font-weight: 600;
+        }}
+        QPushButton#calendarDay[dayState="selected"]:hover {{
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 {primary}, stop:1 {primary_dark});
+        }}
+        QPushButton#calendarDay[dayState="selected"]:pressed {{
+            background: {primary_dark};
+        }}
+    """
+
+
+register_style("calendar_day", _calendar_day_qss)
+
+
 class CalendarPopup(QWidget):
     """
     Modern popup calendar with glassmorphism effects and smooth animations.
@@ -3202,7 +3286,9 @@ class CalendarPopup(QWidget):
         
         # Calendar grid container (for slide + fade animation)
         self.grid_container = QWidget()
-        self.grid_container.setStyleSheet("background: transparent;")
+        self.grid_container.setObjectName("calendarGrid")
+        # Day buttons are styled by one block on the grid; renders only flip dayState
+        apply_component_style(self.grid_container, "calendar_day")
         self.grid_layout = QGridLayout(self.grid_container)
         self.grid_layout.setSpacing(3)  # Slightly increased for hover effects
         self.grid_layout.setContentsMargins(0, 0, 0, 0)
@@ -3214,6 +3300,7 @@ class CalendarPopup(QWidget):
             row_buttons = []
             for col in range(7):
                 btn = QPushButton("")
+                btn.setObjectName("calendarDay")
                 btn.setFixedSize(34, 34)  # Square buttons
                 btn.setCursor(Qt.PointingHandCursor)
                 btn.clicked.connect(lambda checked=False, r=row, c=col: self._on_day_clicked(r, c))
@@ -3485,119 +3572,26 @@ class CalendarPopup(QWidget):
                     d = days_in_prev - start_day + cell_index + 1
                     btn.setText(str(d))
                     btn.setEnabled(False)
-                    btn.setStyleSheet(self._get_day_style(False, False, False))
+                    set_style_state(btn, "dayState", "other")
                 elif day <= days_in_month:
                     # Current month days
                     btn.setText(str(day))
                     current_date = QDate(year, month, day)
-                    is_today = (current_date == today)
-                    is_selected = (current_date == self._selected_date)
                     btn.setEnabled(True)
-                    btn.setStyleSheet(self._get_day_style(True, is_today, is_selected))
+                    if current_date == self._selected_date:
+                        set_style_state(btn, "dayState", "selected")
+                    elif current_date == today:
+                        set_style_state(btn, "dayState", "today")
+                    else:
+                        set_style_state(btn, "dayState", "normal")
                     day += 1
                 else:
                     # Next month days
                     btn.setText(str(next_day))
                     btn.setEnabled(False)
-                    btn.setStyleSheet(self._get_day_style(False, False, False))
+                    set_style_state(btn, "dayState", "other")
                     next_day += 1
 
-    def _get_day_style(self, enabled, is_today, is_selected):
-        primary = self.theme.get('primary', '#4a9eff')
-
-        # Theme-aware colors with shadcn-style enhancements
-        if self._is_dark_theme:
-            text_color = "white"
-            disabled_color = "rgba(255, 255, 255, 0.35)"
-            hover_bg = f"{primary}35"
-            press_bg = f"{primary}50"
-            tile_bg = "rgba(255, 255, 255, 0.06)"
-            # shadcn-style subtle shadows
-            hover_shadow = "0 2px 8px rgba(0, 0, 0, 0.3)"
-            selected_shadow = f"0 4px 12px {primary}60"
-        else:
-            text_color = "#1a1a2e"
-            disabled_color = "rgba(0, 0, 0, 0.3)"
-            hover_bg = f"{primary}25"
-            press_bg = f"{primary}40"
-            tile_bg = "rgba(0, 0, 0, 0.04)"
-            # shadcn-style subtle shadows for light theme
-            hover_shadow = "0 2px 6px rgba(0, 0, 0, 0.1)"
-            selected_shadow = f"0 4px 12px {primary}40"
-
-        # Common transition for smooth animations
-        transition = "all 150ms cubic-bezier(0.4, 0, 0.2, 1)"
-
-        if is_selected:
-            # Selected: solid accent with glow effect and smooth transitions
-            return f"""
-                QPushButton {{
-                    background: {primary};
-                    border: none;
-                    border-radius: 17px;
-                    color: white;
-                    font-weight: 600;
-                    font-size: 12px;
-                }}
-                QPushButton:hover {{
-                    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                        stop:0 {primary}, stop:1 {self.theme.get('primary_dark', primary)});
-                }}
-                QPushButton:pressed {{
-                    background: {self.theme.get('primary_dark', primary)};
-                }}
-            """
-        elif is_today:
-            # Today: ring outline with shadcn-style hover effect
-            return f"""
-                QPushButton {{
-                    background: transparent;
-                    border: 2px solid {primary};
-                    border-radius: 17px;
-                    color: {primary};
-                    font-weight: 600;
-                    font-size: 12px;
-                }}
-                QPushButton:hover {{
-                    background: {hover_bg};
-                    border: 2px solid {primary};
-                }}
-                QPushButton:pressed {{
-                    background: {press_bg};
-                }}
-            """
-        elif enabled:
-            # Normal day: shadcn-style clean tile with smooth transitions
-            return f"""
-                QPushButton {{
-                    background: {tile_bg};
-                    border: 1px solid transparent;
-                    border-radius: 17px;
-                    color: {text_color};
-                    font-size: 12px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background: {hover_bg};
-                    border: 1px solid {primary}30;
-                }}
-                QPushButton:pressed {{
-                    background: {press_bg};
-                }}
-            """
-        else:
-            # Disabled: other-month days, very subtle
-            return f"""
-                QPushButton {{
-                    background: transparent;
-                    border: none;
-                    border-radius: 17px;
-                    color: {disabled_color};
-                    font-size: 11px;
-                    font-weight: 400;
-                }}
-            """
-
     def _on_day_clicked(self, row, col):
         btn = self.day_buttons[row][col]
         if btn.isEnabled():
@@ -0,0 +1,380 @@
+"""
+Attachment upload queue for EmployeeVault
+One place that copies employee attachments onto the share.
+
+Uploads run on a background thread in the order they were queued, so the
+employee form stays usable while a batch of scanned documents crosses the
+network. Each file is:
+
+- hashed locally and skipped if an identical file (same size and SHA-256) is
+  already in the employee's folder
+- copied in UPLOAD_CHUNK_BYTES chunks to a partial file next to its
+  destination, with per-file and per-batch progress
+- moved into place with os.replace once complete
+
+A cancelled (or interrupted) copy leaves its partial file behind. Queuing the
+same source file again resumes from where it stopped; the partial is keyed on
+the source's path, size and mtime, so a changed source starts over. A batch
+writes one audit entry when it completes.
+"""
+
+import os
+import time
+import queue
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QThread, Signal
+
+from employee_vault import metrics
+from employee_vault.config import get_employee_folder
+
+# Bytes per read / write while copying to the share
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Files larger than this are skipped
+UPLOAD_MAX_FILE_BYTES = 10 * 1024 * 1024
+# Minimum seconds between progress signals for one file
+UPLOAD_PROGRESS_SECONDS = 0.1
+# Filenames listed in the audit entry (the rest are counted)
+UPLOAD_AUDIT_MAX_NAMES = 10
+
+# Partial copies: <dest folder>/.upload_<key>.part
+PARTIAL_PREFIX = ".upload_"
+PARTIAL_SUFFIX = ".part"
+
+# Uploads with these extensions go to the photos folder, everything else to files
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.tiff', '.ico'}
+
+# Per-file outcomes
+STATUS_UPLOADED = "uploaded"
+STATUS_DUPLICATE = "duplicate"    # identical content already present
+STATUS_SKIPPED = "skipped"        # larger than max_file_bytes
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"    # partial file kept for resume
+
+
+def is_partial_upload(filename: str) -> bool:
+    """True for an upload still in progress (or cancelled) - hide it from file lists"""
+    return filename.startswith(PARTIAL_PREFIX) and filename.endswith(PARTIAL_SUFFIX)
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file, read in UPLOAD_CHUNK_BYTES chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _UploadCancelled(Exception):
+    pass
+
+
+class _UploadWorker(QThread):
+    """Long-lived thread that works through queued batches one file at a time"""
+
+    file_progress = Signal(int, str, object, object)   # batch id, filename, bytes done, file bytes
+    batch_progress = Signal(int, object, object)       # batch id, bytes done, batch bytes
+    file_finished = Signal(int, str, str, str, str)    # batch id, emp_id, filename, status, message
+    batch_finished = Signal(int, object)               # batch id, summary dict
+
+    def __init__(self, max_file_bytes: int, parent=None):
+        super().__init__(parent)
+        self.max_file_bytes = max_file_bytes
+        self._jobs = queue.Queue()
+        self._cancelled = set()
+        self._cancel_all = False
+        self._lock = threading.Lock()
+        # (path, size, mtime_ns) -> sha256 of files already on the share
+        self._digests: Dict[tuple, str] = {}
+
+    def submit(self, batch: dict):
+        self._jobs.put(batch)
+
+    def cancel(self, batch_id: int):
+        with self._lock:
+            self._cancelled.add(batch_id)
+
+    def stop(self, timeout_ms: int = 5000):
+        """Cancel everything (partials are kept) and end the thread"""
+        with self._lock:
+            self._cancel_all = True
+        self._jobs.put(None)
+        if self.isRunning() and not self.wait(timeout_ms):
+            logging.warning(f"Upload thread did not stop within {timeout_ms} ms")
+
+    def _is_cancelled(self, batch_id: int) -> bool:
+        with self._lock:
+            return self._cancel_all or batch_id in self._cancelled
+
+    def run(self):
+        while True:
+            batch = self._jobs.get()
+            if batch is None:
+                return
+            try:
+                with metrics.timer("upload.batch", detail=f"{batch['emp_id']}: {len(batch['files'])} file(s)"):
+                    summary = self._run_batch(batch)
+            except Exception as e:
+                logging.error(f"Upload batch {batch['id']} failed: {e}", exc_info=True)
+                summary = {'emp_id': batch['emp_id'], 'username': batch['username'], 'error': str(e),
+                           'files': {}}
+            with self._lock:
+                self._cancelled.discard(batch['id'])
+            self.batch_finished.emit(batch['id'], summary)
+
+    # ------------------------------------------------------------------
+    # One batch
+    # ------------------------------------------------------------------
+
+    def _run_batch(self, batch: dict) -> dict:
+        batch_id, emp_id = batch['id'], batch['emp_id']
+        results = {status: [] for status in (STATUS_UPLOADED, STATUS_DUPLICATE, STATUS_SKIPPED,
+                                             STATUS_FAILED, STATUS_CANCELLED)}
+        summary = {'emp_id': emp_id, 'username': batch['username'], 'files': results, 'photos': 0}
+
+        sizes = {}
+        for path in batch['files']:
+            try:
+                sizes[path] = os.path.getsize(path)
+            except OSError:
+                sizes[path] = 0
+        total = sum(size for size in sizes.values() if size <= self.max_file_bytes)
+        done = 0
+        folders = {}
+
+        for path in batch['files']:
+            filename = os.path.basename(path)
+            size = sizes[path]
+
+            def finish(status, message=""):
+                results[status].append(filename)
+                self.file_finished.emit(batch_id, emp_id, filename, status, message)
+
+            if self._is_cancelled(batch_id):
+                finish(STATUS_CANCELLED)
+                continue
+            if size > self.max_file_bytes:
+                finish(STATUS_SKIPPED, f"{size / (1024 * 1024):.1f}MB exceeds the "
+                                       f"{self.max_file_bytes / (1024 * 1024):.0f}MB limit")
+                continue
+
+            is_photo = os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS
+            subfolder = 'photos' if is_photo else 'files'
+            try:
+                if subfolder not in folders:
+                    folders[subfolder] = get_employee_folder(emp_id, subfolder)
+                folder = folders[subfolder]
+                from employee_vault.ui.widgets.widgets import safe_file_path
+                dest = safe_file_path(folder, filename, allow_subdirs=False)
+
+                source_digest = hash_file(path)
+                duplicate = self._find_identical(folder, size, source_digest)
+                if duplicate:
+                    done += size
+                    self.batch_progress.emit(batch_id, done, total)
+                    finish(STATUS_DUPLICATE, f"identical to {duplicate}")
+                    continue
+
+                base = done
+
+                def progress(copied):
+                    self.file_progress.emit(batch_id, filename, copied, size)
+                    self.batch_progress.emit(batch_id, base + copied, total)
+
+                self._copy(batch_id, path, dest, size, source_digest, progress)
+                done += size
+                if is_photo:
+                    summary['photos'] += 1
+                logging.info(f"{'Photo' if is_photo else 'Document'} uploaded: {filename} for employee {emp_id}")
+                finish(STATUS_UPLOADED, dest)
+            except _UploadCancelled:
+                finish(STATUS_CANCELLED, "partial upload kept - queue the file again to resume")
+            except (OSError, ValueError) as e:
+                logging.error(f"Upload of {filename} for {emp_id} failed: {e}")
+                finish(STATUS_FAILED, str(e))
+
+        return summary
+
+    def _find_identical(self, folder: str, size: int, digest: str) -> Optional[str]:
+        """Name of a file in folder with the same size and content, if any"""
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            return None
+        for entry in entries:
+            if not entry.is_file() or is_partial_upload(entry.name):
+                continue
+            st = entry.stat()
+            if st.st_size != size:
+                continue
+            key = (entry.path, st.st_size, st.st_mtime_ns)
+            existing = self._digests.get(key)
+            if existing is None:
+                try:
+                    existing = hash_file(entry.path)
+                except OSError:
+                    continue
+                self._digests[key] = existing
+            if existing == digest:
+                return entry.name
+        return None
+
+    def _copy(self, batch_id: int, src: str, dest: str, size: int, digest: str, progress):
+        """Chunked copy through a partial file; resumes a partial left by an earlier attempt"""
+        st = os.stat(src)
+        key = hashlib.sha1(f"{os.path.abspath(src)}|{size}|{st.st_mtime_ns}|{os.path.basename(dest)}"
+                           .encode('utf-8')).hexdigest()[:16]
+        partial = os.path.join(os.path.dirname(dest), f"{PARTIAL_PREFIX}{key}{PARTIAL_SUFFIX}")
+
+        offset = 0
+        if os.path.exists(partial):
+            offset = os.path.getsize(partial)
+            if offset > size:
+                offset = 0
+            elif offset:
+                logging.info(f"Resuming upload of {os.path.basename(src)} at {offset}/{size} bytes")
+                metrics.incr("upload.resumed")
+
+        last_emit = 0.0
+        with open(src, 'rb') as fin, open(partial, 'ab' if offset else 'wb') as fout:
+            fin.seek(offset)
+            copied = offset
+            progress(copied)
+            while True:
+                if self._is_cancelled(batch_id):
+                    raise _UploadCancelled()
+                chunk = fin.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                fout.write(chunk)
+                copied += len(chunk)
+                now = time.monotonic()
+                if now - last_emit >= UPLOAD_PROGRESS_SECONDS:
+                    last_emit = now
+                    progress(copied)
+        progress(copied)
+
+        # A resumed copy is only as good as the earlier attempt - check it end to end
+        if offset and hash_file(partial) != digest:
+            os.remove(partial)
+            raise OSError(f"Resumed upload of {os.path.basename(src)} did not match the source - try again")
+
+        import shutil
+        shutil.copystat(src, partial)
+        os.replace(partial, dest)
+
+
+class UploadManager(QObject):
+    """
+    Background attachment uploads for one client.
+
+    Usage:
+        uploads = UploadManager(db, parent)
+        uploads.batch_progress.connect(on_progress)    # (batch_id, done_bytes, total_bytes)
+        uploads.file_finished.connect(on_file)         # (batch_id, emp_id, filename, status, message)
+        uploads.batch_finished.connect(on_batch)       # (batch_id, summary)
+        batch_id = uploads.enqueue(emp_id, paths, username)
+        uploads.cancel(batch_id)                       # partial files are kept for resume
+
+    summary is {'emp_id', 'username', 'photos', 'files': {status: [filenames]}}.
+    """
+
+    file_progress = Signal(int, str, object, object)
+    batch_progress = Signal(int, object, object)
+    file_finished = Signal(int, str, str, str, str)
+    batch_finished = Signal(int, object)
+
+    def __init__(self, db, parent=None, max_file_bytes: int = UPLOAD_MAX_FILE_BYTES):
+        super().__init__(parent)
+        self.db = db
+        self.max_file_bytes = max_file_bytes
+        self._next_id = 1
+        self._pending: Dict[int, dict] = {}
+        self._worker: Optional[_UploadWorker] = None
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def enqueue(self, emp_id: str, paths: List[str], username: str) -> int:
+        """Queue files for emp_id; returns the batch id used in the signals"""
+        if self._worker is None:
+            self._worker = _UploadWorker(self.max_file_bytes, self)
+            self._worker.file_progress.connect(self.file_progress)
+            self._worker.batch_progress.connect(self.batch_progress)
+            self._worker.file_finished.connect(self.file_finished)
+            self._worker.batch_finished.connect(self._on_batch_finished)
+            self._worker.start()
+        batch_id = self._next_id
+        self._next_id += 1
+        batch = {'id': batch_id, 'emp_id': emp_id, 'files': list(paths), 'username': username}
+        self._pending[batch_id] = batch
+        self._worker.submit(batch)
+        logging.info(f"Queued {len(paths)} file(s) for {emp_id} (upload batch {batch_id})")
+        return batch_id
+
+    def cancel(self, batch_id: Optional[int] = None):
+        """Cancel one batch, or every queued batch when batch_id is None"""
+        if self._worker is not None:
+            for pending_id in ([batch_id] if batch_id is not None else list(self._pending)):
+                self._worker.cancel(pending_id)
+
+    def stop(self):
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.stop()
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._pending)
+
+    def pending_batches(self) -> List[int]:
+        return sorted(self._pending)
+
+    # ------------------------------------------------------------------
+    # Completion
+    # ------------------------------------------------------------------
+
+    def _on_batch_finished(self, batch_id: int, summary: dict):
+        self._pending.pop(batch_id, None)
+        self._log_batch(summary)
+        self.batch_finished.emit(batch_id, summary)
+
+    def _log_batch(self, summary: dict):
+        """One audit entry per batch instead of one per file"""
+        files = summary.get('files', {})
+        uploaded = files.get(STATUS_UPLOADED, [])
+        if not uploaded:
+            return
+        photos = summary.get('photos', 0)
+        kinds = []
+        if photos:
+            kinds.append(f"{photos} photo(s)")
+        if len(uploaded) - photos:
+            kinds.append(f"{len(uploaded) - photos} document(s)")
+        names = ", ".join(uploaded[:UPLOAD_AUDIT_MAX_NAMES])
+        if len(uploaded) > UPLOAD_AUDIT_MAX_NAMES:
+            names += f" and {len(uploaded) - UPLOAD_AUDIT_MAX_NAMES} more"
+        details = f"Uploaded {' and '.join(kinds)}: {names}"
+        for status, label in ((STATUS_DUPLICATE, "duplicate"), (STATUS_SKIPPED, "skipped"),
+                              (STATUS_FAILED, "failed"), (STATUS_CANCELLED, "cancelled")):
+            if files.get(status):
+                details += f"; {len(files[status])} {label}"
+        try:
+            self.db.log_action_async(
+                username=summary.get('username'),
+                action="FILE_UPLOADED",
+                table_name="employee_files",
+                record_id=summary.get('emp_id'),
+                details=details
+            )
+        except Exception as e:
+            logging.warning(f"Could not log upload batch: {e}")
@@ -2,8 +2,10 @@
 Utilities package for Employee Vault
 """
 
-from .decorators import retry_on_lock, check_permission
-from .helpers import normalize_ph_phone, calculate_similarity, find_similar_employees, compress_image, remove_background
+from .decorators import retry_on_lock, check_permission, require_permission
+from .helpers import (normalize_ph_phone, calculate_similarity, find_similar_employees, compress_image,
+                      remove_background, get_rembg_session, generate_photo_derivatives, get_photo_derivative)
 
-__all__ = ['retry_on_lock', 'check_permission', 'normalize_ph_phone',
-           'calculate_similarity', 'find_similar_employees', 'compress_image', 'remove_background']
+__all__ = ['retry_on_lock', 'check_permission', 'require_permission', 'normalize_ph_phone',
+           'calculate_similarity', 'find_similar_employees', 'compress_image', 'remove_background',
+           'get_rembg_session', 'generate_photo_derivatives', 'get_photo_derivative']
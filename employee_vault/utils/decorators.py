@@ -3,15 +3,31 @@ Database decorators for retry logic and permission checking
 """
 
 import time
+import random
 import logging
 import sqlite3
 from functools import wraps
 
 
+def _lock_backoff_wait(seconds: float):
+    """
+    Wait out a lock backoff period with a plain sleep.
+
+    The event loop is deliberately not pumped here: timers and heartbeat ticks
+    would otherwise run on the same connection halfway through the retried
+    operation. Writes started from the UI go through DB.writer instead, so this
+    never runs on the Qt main thread for them.
+    """
+    time.sleep(seconds)
+
+
 def retry_on_lock(max_attempts=3, delay=0.5):
     """
     Retry database operations if database is locked.
 
+    Fire-and-forget writes should go through DB.writer instead; this decorator
+    is for writes whose result the caller needs synchronously.
+
     Args:
         max_attempts: Maximum number of retry attempts
         delay: Base delay between retries (exponential backoff)
@@ -29,9 +45,10 @@ def retry_on_lock(max_attempts=3, delay=0.5):
                 except sqlite3.OperationalError as e:
                     last_error = e
                     if "locked" in str(e).lower() and attempt < max_attempts - 1:
-                        wait_time = delay * (2 ** attempt)  # Exponential backoff
-                        logging.warning(f"Database locked, retrying in {wait_time}s... (attempt {attempt + 1}/{max_attempts})")
-                        time.sleep(wait_time)
+                        # Exponential backoff, jittered so PCs that collided on the lock do not retry in lockstep
+                        wait_time = delay * (2 ** attempt) * random.uniform(0.5, 1.0)
+                        logging.warning(f"Database locked, retrying in {wait_time:.2f}s... (attempt {attempt + 1}/{max_attempts})")
+                        _lock_backoff_wait(wait_time)
                         continue
                     # PHASE 2 FIX: Better error message for database locks
                     elif "locked" in str(e).lower():
@@ -86,37 +103,51 @@ def check_permission(permission_key: str):
                 logging.error(f"Permission check failed: No user context for {func.__name__}")
                 raise PermissionError("No user context for permission check")
 
-            # Get user info
-            try:
-                user = self.get_user(username)
-            except:
-                logging.error(f"Permission check failed: User {username} not found")
-                raise PermissionError(f"User {username} not found")
-
-            # Admin bypass
-            # Convert Row to dict if needed
-            if user:
-                if hasattr(user, 'keys'):  # It's a Row object
-                    user_dict = {key: user[key] for key in user.keys()}
-                else:
-                    user_dict = user
-
-                if user_dict.get('role') == 'admin':
-                    return func(self, *args, **kwargs)
-            else:
-                logging.error(f"Permission check failed: User object is None")
-                raise PermissionError("User not found")
-
-            # Check specific permission
-            try:
-                perms = self.get_user_permissions(username)
-            except:
-                perms = {}
-
-            if not perms.get(permission_key, False):
-                logging.warning(f"SECURITY: Permission denied - {username} attempted {permission_key} via {func.__name__}")
-                raise PermissionError(f"User '{username}' lacks permission: {permission_key}")
-
+            require_permission(self, username, permission_key, func.__name__)
             return func(self, *args, **kwargs)
         return wrapper
     return decorator
+
+
+def require_permission(db, username: str, permission_key: str, action: str = None):
+    """
+    Raise PermissionError unless username may use permission_key (admins may use all).
+
+    The check behind @check_permission, for methods that need a second
+    permission depending on their arguments.
+    """
+    action = action or permission_key
+    if not username:
+        logging.error(f"Permission check failed: No user context for {action}")
+        raise PermissionError("No user context for permission check")
+
+    # Get user info
+    try:
+        user = db.get_user(username)
+    except:
+        logging.error(f"Permission check failed: User {username} not found")
+        raise PermissionError(f"User {username} not found")
+
+    # Admin bypass
+    # Convert Row to dict if needed
+    if user:
+        if hasattr(user, 'keys'):  # It's a Row object
+            user_dict = {key: user[key] for key in user.keys()}
+        else:
+            user_dict = user
+
+        if user_dict.get('role') == 'admin':
+            return
+    else:
+        logging.error(f"Permission check failed: User object is None")
+        raise PermissionError("User not found")
+
+    # Check specific permission
+    try:
+        perms = db.get_user_permissions(username)
+    except:
+        perms = {}
+
+    if not perms.get(permission_key, False):
+        logging.warning(f"SECURITY: Permission denied - {username} attempted {permission_key} via {action}")
+        raise PermissionError(f"User '{username}' lacks permission: {permission_key}")
@@ -5,20 +5,204 @@ Helper utility functions
 import re
 import os
 from difflib import SequenceMatcher
-from PIL import Image
+from PIL import Image, ImageOps
 from io import BytesIO
 
 
+# Right-sized copies written alongside each profile photo:
+# 48 = table avatars, 128 = list/header thumbnails, 600 = display image
+PHOTO_DERIVATIVE_SIZES = (48, 128, 600)
+DERIVATIVES_FOLDER = "_derivatives"
+
+
+def _flatten_to_rgb(img: Image.Image) -> Image.Image:
+    """Convert any mode to RGB, compositing transparency onto white"""
+    if img.mode in ('RGB', 'L'):
+        return img
+    if img.mode in ('RGBA', 'LA') or 'transparency' in img.info:
+        img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[3])
+        return background
+    return img.convert('RGB')
+
+
+def _encode_jpeg_within_budget(img: Image.Image, max_bytes: int, quality: int,
+                               min_quality: int = 30, max_probes: int = 4) -> bytes:
+    """
+    Encode img as JPEG at the highest quality that fits max_bytes.
+
+    Tries the requested quality first, then binary-searches between
+    min_quality and quality, so at most max_probes encodes are spent. If
+    nothing fits, the min_quality encode is returned.
+    """
+    def encode(q):
+        buf = BytesIO()
+        img.save(buf, format='JPEG', quality=q, optimize=True)
+        return buf.getvalue()
+
+    data = encode(quality)
+    if len(data) <= max_bytes:
+        return data
+
+    lo, hi = min_quality, quality - 1
+    best = None
+    probes = 1
+    while lo <= hi and probes < max_probes:
+        mid = (lo + hi) // 2
+        candidate = encode(mid)
+        probes += 1
+        if len(candidate) <= max_bytes:
+            best = candidate
+            lo = mid + 1
+        else:
+            data = candidate
+            hi = mid - 1
+    if best is not None:
+        return best
+    return encode(min_quality) if hi >= min_quality else data
+
+
+def _write_atomic(path: str, data: bytes):
+    """Write bytes via a temp file + os.replace so readers never see a partial file"""
+    import tempfile
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp_", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_photo_derivatives(img: Image.Image, source_path: str,
+                            sizes: tuple = PHOTO_DERIVATIVE_SIZES) -> dict:
+    """
+    Write right-sized copies of an already decoded image next to source_path.
+
+    Derivatives go to <folder>/_derivatives/<stem>_<hash>_<size>.<ext>, where
+    hash is taken from source_path's content. Each one covers a size x size
+    square (shorter edge = size), so circular avatars can be cropped without
+    upscaling. Images with transparency stay PNG; everything else is JPEG.
+    A small manifest (<stem>.json) records the source hash, size and mtime so
+    get_photo_derivative can detect a replaced original with a single stat.
+
+    Returns:
+        Dict of {size: derivative_path}
+    """
+    import json
+    import hashlib
+
+    folder, filename = os.path.split(source_path)
+    stem = os.path.splitext(filename)[0]
+    out_dir = os.path.join(folder, DERIVATIVES_FOLDER)
+    os.makedirs(out_dir, exist_ok=True)
+
+    with open(source_path, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:12]
+
+    keep_alpha = img.mode in ('RGBA', 'LA') or 'transparency' in img.info
+    work = img.convert('RGBA') if keep_alpha else _flatten_to_rgb(img)
+    ext = 'png' if keep_alpha else 'jpg'
+
+    # Largest first so each smaller copy is resampled from the previous one
+    written = {}
+    for size in sorted(sizes, reverse=True):
+        scale = size / min(work.width, work.height)
+        if scale < 1:
+            work = work.resize((max(1, round(work.width * scale)), max(1, round(work.height * scale))),
+                               Image.Resampling.LANCZOS)
+        buf = BytesIO()
+        if keep_alpha:
+            work.save(buf, format='PNG')
+        else:
+            work.save(buf, format='JPEG', quality=85, optimize=True)
+        path = os.path.join(out_dir, f"{stem}_{digest}_{size}.{ext}")
+        _write_atomic(path, buf.getvalue())
+        written[size] = path
+
+    # Drop derivatives of an older version of this photo
+    stale = re.compile(re.escape(stem) + r'_[0-9a-f]{12}_\d+\.(?:jpg|png)$')
+    for name in os.listdir(out_dir):
+        path = os.path.join(out_dir, name)
+        if stale.match(name) and path not in written.values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    st = os.stat(source_path)
+    manifest = {
+        'hash': digest,
+        'source_size': st.st_size,
+        'source_mtime': st.st_mtime,
+        'files': {str(size): os.path.basename(path) for size, path in written.items()},
+    }
+    _write_atomic(os.path.join(out_dir, f"{stem}.json"), json.dumps(manifest).encode('utf-8'))
+    return written
+
+
+def generate_photo_derivatives(image_path: str, sizes: tuple = PHOTO_DERIVATIVE_SIZES) -> dict:
+    """Decode image_path once and write its derivatives. Returns {} on failure."""
+    try:
+        with Image.open(image_path) as img:
+            img.draft('RGB', (max(sizes), max(sizes)))
+            img.load()
+            return write_photo_derivatives(img, image_path, sizes)
+    except Exception as e:
+        import logging
+        logging.warning(f"Could not create photo derivatives for {image_path}: {e}")
+        return {}
+
+
+def get_photo_derivative(photo_path: str, size: int) -> str:
+    """
+    Return the smallest derivative of photo_path that is at least size pixels,
+    or photo_path itself if none exists or the original has changed since the
+    derivatives were written.
+    """
+    import json
+
+    if not photo_path:
+        return photo_path
+    folder, filename = os.path.split(photo_path)
+    out_dir = os.path.join(folder, DERIVATIVES_FOLDER)
+    try:
+        with open(os.path.join(out_dir, os.path.splitext(filename)[0] + ".json"), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        st = os.stat(photo_path)
+        if st.st_size != manifest['source_size'] or st.st_mtime != manifest['source_mtime']:
+            return photo_path
+        for candidate in sorted(int(k) for k in manifest['files']):
+            if candidate >= size:
+                path = os.path.join(out_dir, manifest['files'][str(candidate)])
+                if os.path.exists(path):
+                    return path
+                break
+    except (OSError, ValueError, KeyError):
+        pass
+    return photo_path
+
+
 def compress_image(image_path: str, max_size_kb: int = 500, quality: int = 85,
-                  max_dimension: int = 1200) -> bool:
+                  max_dimension: int = 1200, derivatives: bool = False) -> bool:
     """
     Compress an image file to reduce its size while maintaining quality
 
+    The JPEG quality is binary-searched against the byte budget, so a photo
+    costs at most four encodes instead of stepping down by 5 each time.
+
     Args:
         image_path: Path to the image file
         max_size_kb: Target maximum size in kilobytes (default: 500KB)
         quality: JPEG quality (1-100, default: 85)
         max_dimension: Maximum width/height in pixels (default: 1200)
+        derivatives: Also write the PHOTO_DERIVATIVE_SIZES copies from the
+            same decode (see write_photo_derivatives)
 
     Returns:
         True if compression was successful, False otherwise
@@ -26,15 +210,11 @@ def compress_image(image_path: str, max_size_kb: int = 500, quality: int = 85,
     try:
         # Open the image
         with Image.open(image_path) as img:
+            # Let the JPEG decoder downscale by a power of two while decoding
+            img.draft('RGB', (max_dimension, max_dimension))
+            img = ImageOps.exif_transpose(img)
             # Convert to RGB if necessary (handles RGBA, P, etc.)
-            if img.mode not in ('RGB', 'L'):
-                if img.mode == 'RGBA':
-                    # Create white background for transparent images
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    background.paste(img, mask=img.split()[3] if len(img.split()) == 4 else None)
-                    img = background
-                else:
-                    img = img.convert('RGB')
+            img = _flatten_to_rgb(img)
 
             # Resize if image is too large
             if max(img.width, img.height) > max_dimension:
@@ -42,24 +222,16 @@ def compress_image(image_path: str, max_size_kb: int = 500, quality: int = 85,
                 new_size = (int(img.width * ratio), int(img.height * ratio))
                 img = img.resize(new_size, Image.Resampling.LANCZOS)
 
-            # Save with compression
-            output_buffer = BytesIO()
-            img.save(output_buffer, format='JPEG', quality=quality, optimize=True)
-            output_size = output_buffer.tell()
+            data = _encode_jpeg_within_budget(img, max_size_kb * 1024, quality)
 
-            # If still too large, reduce quality iteratively
-            current_quality = quality
-            while output_size > max_size_kb * 1024 and current_quality > 30:
-                current_quality -= 5
-                output_buffer = BytesIO()
-                img.save(output_buffer, format='JPEG', quality=current_quality, optimize=True)
-                output_size = output_buffer.tell()
+        # Write compressed image back to file
+        with open(image_path, 'wb') as f:
+            f.write(data)
 
-            # Write compressed image back to file
-            with open(image_path, 'wb') as f:
-                f.write(output_buffer.getvalue())
+        if derivatives:
+            write_photo_derivatives(img, image_path)
 
-            return True
+        return True
 
     except Exception as e:
         import logging
@@ -184,6 +356,27 @@ def find_similar_employees(first_name: str, middle_name: str, last_name: str,
     return similar_employees
 
 
+_rembg_session = None
+
+
+def get_rembg_session():
+    """
+    Return this process's shared rembg session, creating it on first use.
+
+    Building a session loads the ONNX model, which is far more expensive than
+    running it, so every call in the same process reuses one session.
+    Returns None when rembg is not installed.
+    """
+    global _rembg_session
+    if _rembg_session is None:
+        try:
+            from rembg import new_session
+        except ImportError:
+            return None
+        _rembg_session = new_session()
+    return _rembg_session
+
+
 def remove_background(image_path: str, output_path: str = None) -> str:
     """
     Remove background from an image using AI-based rembg library.
@@ -215,7 +408,7 @@ def remove_background(image_path: str, output_path: str = None) -> str:
             input_data = f.read()
         
         # Remove background - returns PNG with alpha channel
-        output_data = remove(input_data)
+        output_data = remove(input_data, session=get_rembg_session())
         
         # Ensure output path has .png extension for transparency
         if not output_path.lower().endswith('.png'):
@@ -0,0 +1,159 @@
+"""
+Queued logging for Employee Vault
+
+The root logger only gets a QueueHandler, so logging on the UI thread costs a
+single queue put. A QueueListener thread owns the real file/console handlers
+and does all formatting and disk I/O (including rotation, which can be slow
+when logs/ lives on the network share).
+
+The queue is bounded: when it is full the oldest record is dropped and
+counted, and the listener writes a warning with the number of dropped
+records the next time it gets to run.
+"""
+
+import queue
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+LOG_QUEUE_SIZE = 10000
+
+
+class DropOldestQueue(queue.Queue):
+    """Bounded queue whose non-blocking put evicts the oldest item instead of failing"""
+
+    def __init__(self, maxsize: int = LOG_QUEUE_SIZE):
+        super().__init__(maxsize)
+        self.dropped = 0
+        self._put_lock = threading.Lock()
+
+    def put_nowait(self, item):
+        with self._put_lock:
+            while True:
+                try:
+                    return super().put_nowait(item)
+                except queue.Full:
+                    try:
+                        self.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def take_dropped(self) -> int:
+        """Return and reset the number of records dropped since the last call"""
+        with self._put_lock:
+            count, self.dropped = self.dropped, 0
+        return count
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues the record untouched.
+
+    The stock prepare() formats the message (and any traceback) on the calling
+    thread; here that work is left to the listener's handlers.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class DropReportingListener(QueueListener):
+    """QueueListener that logs a warning whenever records were dropped"""
+
+    def handle(self, record):
+        dropped = self.queue.take_dropped() if isinstance(self.queue, DropOldestQueue) else 0
+        if dropped:
+            super().handle(logging.LogRecord(
+                "employee_vault.logging", logging.WARNING, __file__, 0,
+                f"Log queue full - dropped {dropped} record(s)", None, None
+            ))
+        super().handle(record)
+
+
+_listener: Optional[DropReportingListener] = None
+_targets: List[logging.Handler] = []
+
+
+def start_queued_logging(handlers: List[logging.Handler], level: int = logging.INFO,
+                         maxsize: int = LOG_QUEUE_SIZE) -> DropReportingListener:
+    """
+    Route the root logger through a bounded queue to a background listener.
+
+    Existing root handlers are closed and replaced. Returns the listener.
+    """
+    global _listener, _targets
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        try:
+            handler.close()
+        except Exception:
+            pass
+
+    log_queue = DropOldestQueue(maxsize)
+    _targets = list(handlers)
+    _listener = DropReportingListener(log_queue, *_targets, respect_handler_level=True)
+    _listener.start()
+
+    root.setLevel(level)
+    root.addHandler(LazyQueueHandler(log_queue))
+    return _listener
+
+
+def stop_queued_logging():
+    """
+    Flush everything still queued and stop the listener thread.
+
+    The target handlers are then attached to the root logger directly so
+    records logged during interpreter shutdown are still written.
+    """
+    global _listener
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, LazyQueueHandler):
+            root.removeHandler(handler)
+    _listener.stop()
+    _listener = None
+    for handler in _targets:
+        handler.flush()
+        root.addHandler(handler)
+
+
+def attach_handler(handler: logging.Handler):
+    """
+    Add a handler that should run on the listener thread (e.g. the live log
+    viewer), so it never formats records on the thread that logged them.
+    Falls back to the root logger when queued logging is not running.
+    """
+    if _listener is not None:
+        _listener.handlers = _listener.handlers + (handler,)
+    else:
+        logging.getLogger().addHandler(handler)
+
+
+def detach_handler(handler: logging.Handler):
+    """Remove a handler added with attach_handler"""
+    if _listener is not None and handler in _listener.handlers:
+        _listener.handlers = tuple(h for h in _listener.handlers if h is not handler)
+    logging.getLogger().removeHandler(handler)
+
+
+def get_log_files() -> List[str]:
+    """Existing rotating log files, oldest first (employee_vault.log.N ... employee_vault.log)"""
+    import os
+    from logging.handlers import RotatingFileHandler
+
+    files = []
+    for handler in _targets:
+        if isinstance(handler, RotatingFileHandler):
+            base = handler.baseFilename
+            for i in range(handler.backupCount, 0, -1):
+                if os.path.exists(f"{base}.{i}"):
+                    files.append(f"{base}.{i}")
+            if os.path.exists(base):
+                files.append(base)
+    return files
@@ -0,0 +1,206 @@
+"""
+Parallel photo ingestion for batch uploads, and profile photo persistence
+
+The functions here run inside ProcessPoolExecutor workers. They only use PIL
+(no Qt), so each worker can decode, resize and optionally strip the background
+of a photo independently. A worker keeps one rembg session for its whole
+lifetime instead of rebuilding the ONNX model for every image.
+
+persist_profile_photo stores the single photo picked in the employee form. It
+runs on a background thread after the employee row has been committed.
+"""
+
+import os
+import logging
+import tempfile
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps
+
+from .helpers import PHOTO_DERIVATIVE_SIZES, _write_atomic, get_rembg_session, write_photo_derivatives
+
+# Longest edge of an ingested profile photo (matches compress_image's default)
+INGEST_MAX_DIMENSION = 1200
+
+# Profile photos saved from the employee form: profile.<ext> in the photos folder
+PROFILE_PHOTO_STEM = "profile"
+# Source formats stored without re-encoding (PIL format -> extension)
+PROFILE_PASSTHROUGH_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+# Quality of the single encode for sources that cannot be stored as-is
+PROFILE_JPEG_QUALITY = 90
+
+_EXIF_ORIENTATION = 0x0112
+
+# Set per worker process by init_ingest_worker
+_worker_remove_bg = False
+
+
+def init_ingest_worker(remove_bg: bool = False):
+    """ProcessPoolExecutor initializer: load the rembg session once per worker"""
+    global _worker_remove_bg
+    _worker_remove_bg = remove_bg
+    if remove_bg:
+        try:
+            if get_rembg_session() is None:
+                logging.warning("rembg not available in photo worker - backgrounds will be kept")
+        except Exception as e:
+            logging.warning(f"Could not create rembg session in photo worker: {e}")
+
+
+def create_ingest_pool(remove_bg: bool = False, job_count: int = None) -> ProcessPoolExecutor:
+    """
+    Create a process pool for photo ingestion.
+
+    One core is left free for the UI thread, and no more workers are started
+    than there are photos. Each worker loads its own rembg session when
+    remove_bg is set.
+    """
+    max_workers = max(1, (os.cpu_count() or 2) - 1)
+    if job_count:
+        max_workers = min(max_workers, job_count)
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               initializer=init_ingest_worker,
+                               initargs=(remove_bg,))
+
+
+def ingest_photo(src_path: str, dest_path: str, max_dimension: int = INGEST_MAX_DIMENSION) -> str:
+    """
+    Decode, orient, resize and save one photo as PNG at dest_path, plus its
+    thumbnail/display derivatives from the same decoded image. When dest_path
+    is a profile photo, profile photos with another extension are removed.
+
+    The file is written to a temporary name in the destination folder and then
+    moved into place with os.replace, so readers never see a half-written photo.
+
+    Returns:
+        dest_path
+
+    Raises:
+        Exception from PIL if the source is not a readable image
+    """
+    with Image.open(src_path) as src:
+        src.draft('RGB', (max_dimension, max_dimension))
+        img = ImageOps.exif_transpose(src)
+        img.load()
+
+    if img.mode not in ('RGB', 'RGBA', 'L'):
+        img = img.convert('RGBA' if 'A' in img.getbands() or 'transparency' in img.info else 'RGB')
+
+    if max(img.width, img.height) > max_dimension:
+        ratio = max_dimension / max(img.width, img.height)
+        img = img.resize((int(img.width * ratio), int(img.height * ratio)), Image.Resampling.LANCZOS)
+
+    if _worker_remove_bg:
+        try:
+            session = get_rembg_session()
+            if session is not None:
+                from rembg import remove
+                img = remove(img, session=session)
+        except Exception as e:
+            logging.warning(f"Background removal failed for {os.path.basename(src_path)}: {e}")
+
+    dest_dir = os.path.dirname(dest_path)
+    # Not an image suffix, so photo listings never pick up a half-written file
+    fd, temp_path = tempfile.mkstemp(prefix=".ingest_", suffix=".tmp", dir=dest_dir)
+    os.close(fd)
+    try:
+        img.save(temp_path, "PNG")
+        os.replace(temp_path, dest_path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    if os.path.splitext(os.path.basename(dest_path))[0] == PROFILE_PHOTO_STEM:
+        remove_other_profile_photos(dest_path)
+
+    try:
+        write_photo_derivatives(img, dest_path)
+    except Exception as e:
+        logging.warning(f"Could not create derivatives for {os.path.basename(dest_path)}: {e}")
+    return dest_path
+
+
+def remove_other_profile_photos(photo_path: str):
+    """
+    Delete the profile.<ext> files next to photo_path that have another
+    extension. Photo listings are sorted by name, so a profile photo saved
+    earlier in another format (profile.jpg vs profile.png) would shadow the
+    new one.
+    """
+    folder = os.path.dirname(photo_path)
+    keep = os.path.basename(photo_path)
+    for name in os.listdir(folder):
+        stem, ext = os.path.splitext(name)
+        if stem == PROFILE_PHOTO_STEM and ext and name != keep:
+            try:
+                os.remove(os.path.join(folder, name))
+            except OSError as e:
+                logging.warning(f"Could not remove old profile photo {name}: {e}")
+
+
+def persist_profile_photo(src_path: str, photos_folder: str,
+                          max_dimension: int = INGEST_MAX_DIMENSION) -> str:
+    """
+    Store src_path as the employee's profile photo in photos_folder.
+
+    A JPEG / PNG / WebP that is already upright and within max_dimension is
+    copied byte for byte, keeping its compression. Anything else is oriented,
+    resized and encoded once (PNG when it has transparency, else JPEG). The
+    result is written to a temporary name and moved into place with
+    os.replace, then profile photos with another extension are removed
+    (remove_other_profile_photos) and the derivatives are rewritten from the
+    same decode.
+
+    Returns:
+        Path of the stored photo (profile.<ext>)
+
+    Raises:
+        Exception from PIL or the filesystem if the photo could not be stored
+    """
+    with Image.open(src_path) as src:
+        source_format = src.format
+        upright = src.getexif().get(_EXIF_ORIENTATION, 1) == 1
+        passthrough = (source_format in PROFILE_PASSTHROUGH_FORMATS and upright
+                       and max(src.width, src.height) <= max_dimension)
+        if passthrough:
+            src.draft('RGB', (max(PHOTO_DERIVATIVE_SIZES), max(PHOTO_DERIVATIVE_SIZES)))
+            img = src.copy() if src.mode in ('RGB', 'RGBA', 'L') else src.convert(
+                'RGBA' if 'A' in src.getbands() or 'transparency' in src.info else 'RGB')
+        else:
+            src.draft('RGB', (max_dimension, max_dimension))
+            img = ImageOps.exif_transpose(src)
+            img.load()
+
+    if passthrough:
+        ext = PROFILE_PASSTHROUGH_FORMATS[source_format]
+        with open(src_path, 'rb') as f:
+            data = f.read()
+    else:
+        if img.mode not in ('RGB', 'RGBA', 'L'):
+            img = img.convert('RGBA' if 'A' in img.getbands() or 'transparency' in img.info else 'RGB')
+        if max(img.width, img.height) > max_dimension:
+            ratio = max_dimension / max(img.width, img.height)
+            img = img.resize((int(img.width * ratio), int(img.height * ratio)), Image.Resampling.LANCZOS)
+        buf = BytesIO()
+        if img.mode == 'RGBA':
+            ext = 'png'
+            img.save(buf, format='PNG', optimize=True)
+        else:
+            ext = 'jpg'
+            img.save(buf, format='JPEG', quality=PROFILE_JPEG_QUALITY, optimize=True)
+        data = buf.getvalue()
+
+    dest_path = os.path.join(photos_folder, f"{PROFILE_PHOTO_STEM}.{ext}")
+    _write_atomic(dest_path, data)
+
+    remove_other_profile_photos(dest_path)
+
+    try:
+        write_photo_derivatives(img, dest_path)
+    except Exception as e:
+        logging.warning(f"Could not create derivatives for {os.path.basename(dest_path)}: {e}")
+    return dest_path
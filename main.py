@@ -8,18 +8,23 @@ import sys
 import logging
 from logging.handlers import RotatingFileHandler
 import os
+
+# Startup timeline starts here - keep this the first application import
+from employee_vault import startup
+
 from PySide6.QtWidgets import QApplication, QDialog, QMessageBox
 from PySide6.QtGui import QIcon
-from PySide6.QtCore import QLockFile, QDir
+from PySide6.QtCore import QLockFile, QDir, QTimer
 
 # Import from modular packages
+# Only the login path is imported here; MainWindow (pages, dialogs) loads after login
 from employee_vault.app_config import (
-    APP_QSS, DB_FILE, resource_path, guard_or_exit, USE_NETWORK_DB
+    DB_FILE, resource_path, guard_or_exit, USE_NETWORK_DB, initialize_directories
 )
 from employee_vault.database import DB
 from employee_vault.ui.dialogs.login import LoginDialog
-from employee_vault.ui.main_window import MainWindow
 from employee_vault.ui.theme_manager import get_theme_manager
+from employee_vault.utils.log_queue import start_queued_logging, stop_queued_logging
 
 # PHASE 5: Enhanced logging with file rotation
 # Create logs directory if it doesn't exist
@@ -52,17 +57,16 @@ console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.INFO)
 console_handler.setFormatter(console_formatter)
 
-# Configure root logger
-root_logger = logging.getLogger()
-root_logger.setLevel(logging.INFO)
-root_logger.addHandler(file_handler)
-root_logger.addHandler(console_handler)
+# Configure root logger: records go through a bounded queue and a background
+# listener thread does the formatting and file I/O (logs/ may be on the share)
+start_queued_logging([file_handler, console_handler], level=logging.INFO)
 
 # Log startup
 logging.info("="*80)
 logging.info("Employee Vault Application Starting")
 logging.info(f"Log file: {log_file}")
 logging.info("="*80)
+startup.mark("imports_and_logging")
 
 
 def exception_hook(exc_type, exc_value, exc_traceback):
@@ -133,6 +137,10 @@ def main():
 
     # Create Qt application
     app = QApplication(sys.argv)
+    startup.mark("qt_app")
+
+    # Data/photo/backup folders (explicit - config no longer creates them on import)
+    initialize_directories()
 
     # FORCE DARK MODE: Set Fusion style and dark palette to prevent light mode issues
     # This ensures the app uses dark colors even if Windows is in light mode
@@ -191,6 +199,8 @@ def main():
         msg.exec()
         sys.exit(1)
 
+    startup.mark("database")
+
     # PHASE 5: Check database integrity on startup
     logging.info("Performing database integrity check...")
     is_healthy, issues = db.check_database_integrity()
@@ -210,11 +220,35 @@ def main():
     except Exception as e:
         logging.warning(f"File structure migration skipped or failed: {e}")
 
+    # Serve read-heavy screens from a local copy when the DB is on the network share
+    from employee_vault.config import READ_REPLICA_ENABLED, READ_REPLICA_PATH
+    if READ_REPLICA_ENABLED:
+        try:
+            db.enable_read_replica(READ_REPLICA_PATH)
+        except Exception as e:
+            logging.warning(f"Read replica unavailable, using the network database directly: {e}")
+
+    # Local (WAL) databases: checkpoint on a background thread instead of inside commits
+    try:
+        db.enable_checkpoint_manager()
+    except Exception as e:
+        logging.warning(f"Checkpoint manager unavailable, using SQLite automatic checkpoints: {e}")
+
+    # Take part in the maintenance election (audit tiering, optimize, ANALYZE, vacuum, quick_check)
+    try:
+        db.enable_maintenance_scheduler()
+    except Exception as e:
+        logging.warning(f"Maintenance scheduler unavailable: {e}")
+
     # Graceful database shutdown on app quit
     def on_app_quit():
         """Closes the database connection when the app exits."""
         logging.info("Application quitting, closing database connection...")
         try:
+            # Drain queued writes (keepalives, audit events) before backing up/closing
+            if hasattr(db, 'writer'):
+                db.writer.shutdown(timeout=3.0)
+
             # Backup network database to local before closing (with timeout to prevent hang)
             if USE_NETWORK_DB and hasattr(db, 'conn'):
                 try:
@@ -235,11 +269,28 @@ def main():
                 except Exception as backup_err:
                     logging.error(f"Failed to backup database on close: {backup_err}")
 
+            # Stop background checkpoints before the connection goes away
+            if getattr(db, 'checkpointer', None) is not None:
+                db.checkpointer.stop()
+            if getattr(db, 'maintenance', None) is not None:
+                db.maintenance.stop()
+
             if hasattr(db, 'conn'):
+                # Final TRUNCATE: fold the WAL into the database file before closing
+                db.checkpoint_database("TRUNCATE")
                 db.conn.close()
                 logging.info("Database connection closed successfully.")
         except Exception as e:
             logging.error(f"Error closing database on quit: {e}")
+        finally:
+            # Keep this session's performance metrics for field diagnosis
+            try:
+                from employee_vault.metrics import get_metrics
+                get_metrics().export_json(os.path.join(logs_dir, 'metrics_last_session.json'))
+            except Exception as e:
+                logging.warning(f"Could not write session metrics: {e}")
+            # Write out everything still queued for the log listener
+            stop_queued_logging()
 
     app.aboutToQuit.connect(on_app_quit)
 
@@ -248,8 +299,14 @@ def main():
     theme_manager.apply_theme()
     logging.info(f"Applied theme: {theme_manager.get_active_theme()}")
 
+    startup.mark("theme")
+
     # Show login dialog
     login = LoginDialog(db, app_icon)
+    startup.mark("login_dialog")
+    # Fires once the dialog's event loop is running, i.e. the login is interactive
+    startup_history = os.path.join(logs_dir, 'startup_timeline.jsonl')
+    QTimer.singleShot(0, lambda: startup.report("login_interactive", startup_history))
     if login.exec() != QDialog.Accepted:
         sys.exit(0)
 
@@ -270,16 +327,27 @@ def main():
     logging.info(f"User logged in: {username}, Role: {user_row.get('role', 'unknown')}")
 
     # Create and show main window
+    startup.mark("login_accepted")
+    from employee_vault.ui.main_window import MainWindow
+    startup.mark("main_window_import")
     main_window = MainWindow(db, username, user_row, app_icon)
 
     # Store reference in app to prevent garbage collection
     app.main_window = main_window
 
     main_window.showMaximized()
+    startup.mark("main_window_shown")
+
+    # Warm the dialogs that are imported on first use while the user is idle
+    preloader = startup.IdlePreloader(parent=main_window)
+    preloader.start()
 
     # Run application
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
+    # Required for the photo ingestion process pool in frozen (PyInstaller) builds
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()